@@ -22,6 +22,10 @@ cat > index.html << 'EOF'
 </html>
 EOF
 
+# storage_services.sh 에서 만든 버킷 (이름에 생성 시각이 들어가므로 export 로 전달)
+: "${BUCKET_NAME:?storage_services.sh 에서 만든 S3 버킷 이름을 BUCKET_NAME 으로 export 하세요}"
+: "${GCP_BUCKET_NAME:?storage_services.sh 에서 만든 GCS 버킷 이름을 GCP_BUCKET_NAME 으로 export 하세요}"
+
 # AWS에 웹 서버 배포
 aws s3 cp index.html s3://$BUCKET_NAME/index.html
 aws s3 website s3://$BUCKET_NAME --index-document index.html
@@ -7,6 +7,8 @@ echo "데이터베이스 서비스 기초 실습 시작..."
 
 # AWS RDS MySQL 인스턴스 생성
 echo "AWS RDS MySQL 인스턴스 생성 중..."
+# security_basics.sh 에서 만든 보안 그룹 (export 된 값이 없으면 그룹 이름으로 조회)
+SECURITY_GROUP_ID="${SECURITY_GROUP_ID:-$(aws ec2 describe-security-groups --filters Name=group-name,Values=basic-course-sg --query 'SecurityGroups[0].GroupId' --output text)}"
 aws rds create-db-instance     --db-instance-identifier basic-course-db     --db-instance-class db.t3.micro     --engine mysql     --master-username admin     --master-user-password BasicCourse123!     --allocated-storage 20     --vpc-security-group-ids $SECURITY_GROUP_ID     --db-subnet-group-name basic-course-subnet-group
 
 # GCP Cloud SQL MySQL 인스턴스 생성
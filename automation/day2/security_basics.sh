@@ -7,6 +7,8 @@ echo "보안 그룹 및 방화벽 실습 시작..."
 
 # AWS 보안 그룹 생성
 echo "AWS 보안 그룹 생성 중..."
+# networking_basics.sh 에서 만든 VPC (export 된 값이 없으면 Name 태그로 조회)
+VPC_ID="${VPC_ID:-$(aws ec2 describe-vpcs --filters Name=tag:Name,Values=basic-course-vpc --query 'Vpcs[0].VpcId' --output text)}"
 SECURITY_GROUP_ID=$(aws ec2 create-security-group --group-name basic-course-sg --description "Basic Course Security Group" --vpc-id $VPC_ID --query 'GroupId' --output text)
 
 # 보안 그룹 규칙 설정
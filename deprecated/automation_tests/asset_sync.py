@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+S3 / GCS 실습 자료 병렬 동기화
+로컬 자료 디렉터리를 여러 S3 버킷과 GCS 버킷에 동시에 업로드합니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차: 스토리지 서비스 기초 (storage_services.sh)
+  - Cloud Basic 2일차: 종합 실습 (comprehensive_practice.sh 정적 사이트 배포)
+- 주요 기능:
+  - 로컬 파일 해시는 한 번만 계산하여 모든 대상 버킷에 재사용합니다.
+  - 원격 객체의 해시(S3 ETag, GCS md5Hash)가 같으면 업로드를 건너뜁니다.
+  - 임계값 이상의 파일은 S3 멀티파트 / GCS 재개 가능 업로드를 사용합니다.
+  - (대상, 파일) 단위 작업을 스레드 풀에서 병렬 처리합니다.
+"""
+
+import os
+import sys
+import base64
+import hashlib
+import threading
+import logging
+import mimetypes
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from boto3.s3.transfer import TransferConfig
+from s3transfer.utils import ChunksizeAdjuster
+from botocore.exceptions import ClientError
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaFileUpload
+
+from client_registry import get_client_registry
+from gcp_discovery import build
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class LocalAsset:
+    """로컬 파일과 미리 계산한 해시 정보"""
+
+    __slots__ = ("path", "key", "size", "md5_hex", "md5_b64", "s3_etag")
+
+    def __init__(self, path: Path, key: str, size: int, md5_hex: str, md5_b64: str, s3_etag: str):
+        self.path = path
+        self.key = key
+        self.size = size
+        self.md5_hex = md5_hex
+        self.md5_b64 = md5_b64
+        self.s3_etag = s3_etag
+
+
+def hash_file(path: Path, multipart_threshold: int, chunk_size: int) -> Tuple[str, str, str]:
+    """
+    파일 해시 계산 (한 번 읽기)
+
+    Returns:
+        (md5 hex, md5 base64, S3 업로드 시 예상 ETag)
+    """
+    whole = hashlib.md5()
+    part_digests: List[bytes] = []
+    part = hashlib.md5()
+    part_size = 0
+
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            whole.update(block)
+            offset = 0
+            while offset < len(block):
+                take = min(len(block) - offset, chunk_size - part_size)
+                part.update(block[offset:offset + take])
+                part_size += take
+                offset += take
+                if part_size == chunk_size:
+                    part_digests.append(part.digest())
+                    part = hashlib.md5()
+                    part_size = 0
+    if part_size:
+        part_digests.append(part.digest())
+
+    size = path.stat().st_size
+    if size >= multipart_threshold and part_digests:
+        # 멀티파트 업로드 ETag: 파트별 MD5 를 이어 붙인 값의 MD5 + "-파트수"
+        s3_etag = f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+    else:
+        s3_etag = whole.hexdigest()
+    return whole.hexdigest(), base64.b64encode(whole.digest()).decode("ascii"), s3_etag
+
+
+class AssetSync:
+    """로컬 자료를 S3 / GCS 버킷으로 콘텐츠 해시 기반 동기화"""
+
+    def __init__(self, local_root: Path, prefix: str = "",
+                 aws_region: Optional[str] = None,
+                 max_workers: int = 16,
+                 multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 storage_service_factory: Optional[Callable[[], Any]] = None,
+                 s3_client: Any = None):
+        """
+        AssetSync 초기화
+
+        Args:
+            local_root: 업로드할 로컬 디렉터리
+            prefix: 버킷 내 객체 키 접두사
+            aws_region: S3 클라이언트 리전
+            max_workers: 동시 업로드 작업 수
+            multipart_threshold: 멀티파트/재개 가능 업로드 임계값(바이트)
+            chunk_size: 멀티파트 파트 / 재개 가능 업로드 청크 크기(바이트)
+            storage_service_factory: GCS storage 서비스 생성 함수 (스레드마다 호출)
+            s3_client: 사용할 S3 클라이언트 (기본: 공유 클라이언트 레지스트리)
+        """
+        self.local_root = Path(local_root)
+        self.prefix = prefix.strip("/")
+        self.max_workers = max_workers
+        self.multipart_threshold = multipart_threshold
+        self.chunk_size = chunk_size
+        self.s3_client = s3_client or get_client_registry().get_client("s3", aws_region)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=chunk_size,
+            max_concurrency=4,
+        )
+        # googleapiclient 의 http 객체는 스레드 안전하지 않으므로 스레드별로 서비스 생성
+        self._storage_service_factory = storage_service_factory or (
+            lambda: build("storage", "v1"))
+        self._local = threading.local()
+        self._assets: Optional[List[LocalAsset]] = None
+        self._hash_cache: Dict[Tuple[str, int, int], Tuple[str, str, str]] = {}
+
+    def _storage(self) -> Any:
+        service = getattr(self._local, "storage", None)
+        if service is None:
+            service = self._storage_service_factory()
+            self._local.storage = service
+        return service
+
+    def scan(self, refresh: bool = False) -> List[LocalAsset]:
+        """로컬 파일 목록과 해시 계산 (크기/수정 시각이 같으면 이전 해시 재사용)"""
+        if self._assets is not None and not refresh:
+            return self._assets
+
+        paths = sorted(p for p in self.local_root.rglob("*") if p.is_file())
+
+        def build_asset(path: Path) -> LocalAsset:
+            stat = path.stat()
+            cache_key = (str(path), stat.st_size, stat.st_mtime_ns)
+            hashes = self._hash_cache.get(cache_key)
+            if hashes is None:
+                # s3transfer 는 파트 크기를 S3 한도(최소 5MiB, 최대 10000 파트)에 맞춰 조정하므로
+                # 실제 업로드와 같은 파트 크기로 예상 ETag 를 계산
+                chunk_size = ChunksizeAdjuster().adjust_chunksize(self.chunk_size, stat.st_size)
+                hashes = hash_file(path, self.multipart_threshold, chunk_size)
+                self._hash_cache[cache_key] = hashes
+            relative = path.relative_to(self.local_root).as_posix()
+            key = f"{self.prefix}/{relative}" if self.prefix else relative
+            return LocalAsset(path, key, stat.st_size, *hashes)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._assets = list(executor.map(build_asset, paths))
+        logger.info(f"📦 로컬 자료 {len(self._assets)}개 해시 계산 완료")
+        return self._assets
+
+    def _list_s3(self, bucket: str) -> Dict[str, str]:
+        """S3 객체 키 → ETag"""
+        remote = {}
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        params = {"Bucket": bucket}
+        if self.prefix:
+            params["Prefix"] = f"{self.prefix}/"
+        for page in paginator.paginate(**params):
+            for obj in page.get("Contents", []):
+                remote[obj["Key"]] = obj["ETag"].strip('"')
+        return remote
+
+    def _list_gcs(self, bucket: str) -> Dict[str, str]:
+        """GCS 객체 이름 → md5Hash(base64)"""
+        remote = {}
+        objects = self._storage().objects()
+        params = {"bucket": bucket, "fields": "items(name,md5Hash),nextPageToken"}
+        if self.prefix:
+            params["prefix"] = f"{self.prefix}/"
+        request = objects.list(**params)
+        while request is not None:
+            response = request.execute()
+            for obj in response.get("items", []):
+                remote[obj["name"]] = obj.get("md5Hash")
+            request = objects.list_next(request, response)
+        return remote
+
+    def _upload_s3(self, bucket: str, asset: LocalAsset):
+        content_type = mimetypes.guess_type(asset.path.name)[0] or "application/octet-stream"
+        self.s3_client.upload_file(
+            str(asset.path), bucket, asset.key,
+            ExtraArgs={"ContentType": content_type},
+            Config=self.transfer_config,
+        )
+
+    def _upload_gcs(self, bucket: str, asset: LocalAsset):
+        content_type = mimetypes.guess_type(asset.path.name)[0] or "application/octet-stream"
+        resumable = asset.size >= self.multipart_threshold
+        media = MediaFileUpload(str(asset.path), mimetype=content_type, resumable=resumable,
+                                chunksize=self.chunk_size if resumable else -1)
+        request = self._storage().objects().insert(
+            bucket=bucket, name=asset.key, media_body=media, body={"md5Hash": asset.md5_b64})
+        if resumable:
+            response = None
+            while response is None:
+                _, response = request.next_chunk()
+        else:
+            request.execute()
+
+    def sync(self, s3_buckets: Optional[List[str]] = None,
+             gcs_buckets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        로컬 자료를 모든 대상 버킷에 동기화
+
+        Args:
+            s3_buckets: 대상 S3 버킷 목록
+            gcs_buckets: 대상 GCS 버킷 목록
+
+        Returns:
+            동기화 결과 요약 (uploaded, skipped, failed, bytes)
+        """
+        assets = self.scan()
+        targets = [("s3", b) for b in (s3_buckets or [])] + [("gcs", b) for b in (gcs_buckets or [])]
+        result: Dict[str, Any] = {"uploaded": 0, "skipped": 0, "failed": [], "bytes": 0}
+        if not targets:
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 1. 대상 버킷별 원격 목록을 동시에 조회
+            listings = {}
+            list_futures = {
+                executor.submit(self._list_s3 if provider == "s3" else self._list_gcs, bucket):
+                    (provider, bucket)
+                for provider, bucket in targets
+            }
+            for future in as_completed(list_futures):
+                provider, bucket = list_futures[future]
+                try:
+                    listings[(provider, bucket)] = future.result()
+                except (ClientError, HttpError) as e:
+                    logger.error(f"❌ {provider}://{bucket} 목록 조회 실패: {e}")
+                    result["failed"].append({"target": f"{provider}://{bucket}", "error": str(e)})
+
+            # 2. 해시가 다른 객체만 업로드
+            upload_futures = {}
+            for (provider, bucket), remote in listings.items():
+                for asset in assets:
+                    expected = asset.s3_etag if provider == "s3" else asset.md5_b64
+                    if remote.get(asset.key) == expected:
+                        result["skipped"] += 1
+                        continue
+                    upload = self._upload_s3 if provider == "s3" else self._upload_gcs
+                    future = executor.submit(upload, bucket, asset)
+                    upload_futures[future] = (provider, bucket, asset)
+
+            for future in as_completed(upload_futures):
+                provider, bucket, asset = upload_futures[future]
+                try:
+                    future.result()
+                    result["uploaded"] += 1
+                    result["bytes"] += asset.size
+                except (ClientError, HttpError, OSError) as e:
+                    logger.error(f"❌ 업로드 실패 {provider}://{bucket}/{asset.key}: {e}")
+                    result["failed"].append({"target": f"{provider}://{bucket}/{asset.key}",
+                                             "error": str(e)})
+
+        logger.info(f"✅ 자료 동기화 완료: 업로드 {result['uploaded']}개, "
+                    f"건너뜀 {result['skipped']}개, 실패 {len(result['failed'])}개")
+        return result
+
+
+def main():
+    """명령행 실행: python asset_sync.py <local_dir> [--s3 bucket]... [--gcs bucket]... [--prefix p]"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="S3 / GCS 실습 자료 병렬 동기화")
+    parser.add_argument("local_dir")
+    parser.add_argument("--s3", action="append", default=[], help="대상 S3 버킷 (여러 번 지정 가능)")
+    parser.add_argument("--gcs", action="append", default=[], help="대상 GCS 버킷 (여러 번 지정 가능)")
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("--region", default=os.getenv("AWS_DEFAULT_REGION"))
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    syncer = AssetSync(Path(args.local_dir), prefix=args.prefix, aws_region=args.region,
+                       max_workers=args.workers)
+    result = syncer.sync(args.s3, args.gcs)
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
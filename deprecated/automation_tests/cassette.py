@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+클라우드 API 녹화 / 재생 카세트
+boto3 클라이언트와 googleapiclient 서비스의 실제 요청 / 응답을 카세트 파일로 녹화하고, 네트워크 없이 그대로 재생합니다.
+
+- 주요 기능:
+  - boto3: 클라이언트 이벤트(provide-client-params / before-call / after-call)에 연결되어
+    API 파라미터 기준으로 응답(오류 포함)을 녹화하고, 재생 시에는 요청을 보내지 않고 응답을 돌려줍니다.
+  - googleapiclient: 서비스의 http 객체를 CassetteHttp 로 감싸며,
+    배치 요청(BatchHttpRequest)은 개별 요청 단위로 녹화 / 재생하므로 배치 구성이 달라도 재생할 수 있습니다.
+  - 같은 요청이 여러 번 녹화되면 녹화 순서대로 재생하고, 다 쓰면 마지막 응답을 반복합니다 (상태 폴링 재현).
+  - 카세트는 요청 키(파라미터 해시)별 응답 목록을 gzip JSON 으로 저장합니다.
+  - 재생은 기본적으로 메모리 속도이며, latency_scale 을 주면 녹화된 응답 시간에 비례해 대기합니다.
+  - 환경 변수 CLOUD_CASSETTE(파일 경로), CLOUD_CASSETTE_MODE(record / replay), CLOUD_CASSETTE_LATENCY 로
+    ClientRegistry / gcp_discovery.build 가 만드는 모든 클라이언트에 자동으로 연결됩니다.
+"""
+
+import io
+import os
+import json
+import gzip
+import time
+import atexit
+import base64
+import hashlib
+import threading
+import logging
+from http.client import responses as HTTP_REASONS
+from pathlib import Path
+from datetime import datetime
+from email.parser import FeedParser
+from typing import Dict, Any, List, Optional, Tuple
+
+import httplib2
+from botocore.awsrequest import AWSResponse
+from botocore.response import StreamingBody
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+MODES = ("record", "replay")
+
+# 호출마다 달라지는 파라미터 (요청 키에서 제외)
+VOLATILE_PARAMS = frozenset({"ClientToken", "ClientRequestToken", "IdempotencyToken"})
+
+
+class CassetteMissError(RuntimeError):
+    """재생 모드에서 녹화되지 않은 요청"""
+
+
+# ---- 직렬화 ----
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$b64": base64.b64encode(bytes(value)).decode("ascii")}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if "$dt" in value:
+                return datetime.fromisoformat(value["$dt"])
+            if "$b64" in value:
+                return base64.b64decode(value["$b64"])
+            if "$stream" in value:
+                data = base64.b64decode(value["$stream"])
+                return StreamingBody(io.BytesIO(data), len(data))
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def _param_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return "sha1:" + hashlib.sha1(bytes(value)).hexdigest()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return f"<{type(value).__name__}>"
+
+
+def _digest(data: Any) -> str:
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=_param_default)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _canonical_body(body: Any) -> Any:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+class Cassette:
+    """녹화 / 재생 카세트"""
+
+    def __init__(self, path: Path, mode: str = "replay", latency_scale: float = 0.0):
+        """
+        Args:
+            path: 카세트 파일 경로 (.json.gz)
+            mode: 'record' 또는 'replay'
+            latency_scale: 재생 시 녹화된 응답 시간에 곱할 배수 (0 이면 대기 없음)
+        """
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 카세트 모드: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self.hits = 0
+        self.recorded = 0
+        if mode == "replay":
+            self._load()
+
+    # ---- 파일 ----
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"카세트 버전이 다릅니다: {data.get('version')}")
+        self._interactions = data["interactions"]
+
+    def save(self):
+        """녹화 내용 저장 (녹화 모드에서만)"""
+        if self.mode != "record":
+            return
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": self._interactions}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        logger.info(f"📼 카세트 저장: {self.path} (응답 {self.recorded}개)")
+
+    # ---- 녹화 / 재생 ----
+
+    def record(self, key: str, response: Dict[str, Any], elapsed: float):
+        with self._lock:
+            self._interactions.setdefault(key, []).append(dict(response, elapsed=round(elapsed, 4)))
+            self.recorded += 1
+
+    def play(self, key: str) -> Dict[str, Any]:
+        """녹화된 응답 (녹화 순서대로, 다 쓰면 마지막 응답 반복)"""
+        with self._lock:
+            responses = self._interactions.get(key)
+            if not responses:
+                raise CassetteMissError(f"카세트 {self.path.name} 에 녹화되지 않은 요청: {key}")
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self.hits += 1
+            response = responses[min(cursor, len(responses) - 1)]
+        if self.latency_scale > 0 and response.get("elapsed"):
+            time.sleep(response["elapsed"] * self.latency_scale)
+        return response
+
+    def rewind(self):
+        """재생 위치 초기화"""
+        with self._lock:
+            self._cursors.clear()
+
+    # ---- boto3 ----
+
+    def attach(self, client: Any):
+        """boto3 클라이언트 이벤트에 녹화 / 재생 핸들러 등록"""
+        region = client.meta.region_name
+        events = client.meta.events
+
+        def on_params(params: Dict[str, Any], model: Any, context: Dict[str, Any], **kwargs):
+            stable = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+            context["cassette_key"] = (f"aws:{region}:{model.service_model.service_name}."
+                                       f"{model.name}:{_digest(stable)}")
+            context["cassette_started"] = time.perf_counter()
+
+        def on_before_call(context: Dict[str, Any], **kwargs):
+            response = self.play(context["cassette_key"])
+            parsed = _decode(response["parsed"])
+            return AWSResponse("", response["status"], {}, None), parsed
+
+        def on_after_call(http_response: Any, parsed: Dict[str, Any], context: Dict[str, Any], **kwargs):
+            key = context.get("cassette_key")
+            if key is None:
+                return
+            stored = dict(parsed)
+            for field, value in parsed.items():
+                if isinstance(value, StreamingBody):
+                    # 호출자가 읽을 수 있도록 같은 내용의 스트림으로 교체
+                    data = value.read()
+                    parsed[field] = StreamingBody(io.BytesIO(data), len(data))
+                    stored[field] = {"$stream": base64.b64encode(data).decode("ascii")}
+            metadata = parsed.get("ResponseMetadata", {})
+            stored["ResponseMetadata"] = {"HTTPStatusCode": metadata.get("HTTPStatusCode", http_response.status_code)}
+            self.record(key, {"status": http_response.status_code, "parsed": _encode(stored)},
+                        time.perf_counter() - context["cassette_started"])
+
+        events.register("provide-client-params", on_params, unique_id=f"cassette-params-{id(self)}")
+        if self.mode == "replay":
+            events.register_first("before-call", on_before_call, unique_id=f"cassette-replay-{id(self)}")
+        else:
+            events.register("after-call", on_after_call, unique_id=f"cassette-record-{id(self)}")
+
+    # ---- googleapiclient ----
+
+    def http(self, credentials: Any = None) -> "CassetteHttp":
+        """googleapiclient build(http=...) 에 넘길 http 객체"""
+        inner = None
+        if self.mode == "record":
+            import google.auth
+            from google_auth_httplib2 import AuthorizedHttp
+            if credentials is None:
+                credentials, _ = google.auth.default()
+            inner = AuthorizedHttp(credentials, http=httplib2.Http())
+        return CassetteHttp(inner, self)
+
+
+class CassetteHttp:
+    """httplib2.Http 형태의 녹화 / 재생 래퍼 (배치 요청은 개별 요청 단위로 처리)"""
+
+    def __init__(self, http: Any, cassette: Cassette):
+        self.http = http
+        self.cassette = cassette
+        self.credentials = getattr(http, "credentials", None)
+        self.redirect_codes = getattr(http, "redirect_codes", frozenset())
+
+    @staticmethod
+    def _key(method: str, uri: str, body: Any) -> str:
+        return f"gcp:{method} {uri}:{_digest(_canonical_body(body))}"
+
+    @staticmethod
+    def _stored(resp: Any, content: Any) -> Dict[str, Any]:
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", errors="replace")
+        headers = {h: resp[h] for h in ("content-type", "location") if h in resp}
+        stored: Dict[str, Any] = {"status": int(resp.status), "headers": headers}
+        try:
+            stored["json"] = json.loads(content) if content else None
+        except ValueError:
+            stored["text"] = content
+        return stored
+
+    @staticmethod
+    def _content(stored: Dict[str, Any]) -> str:
+        if "text" in stored:
+            return stored["text"]
+        return "" if stored["json"] is None else json.dumps(stored["json"], separators=(",", ":"))
+
+    def request(self, uri: str, method: str = "GET", body: Any = None,
+                headers: Optional[Dict[str, str]] = None, **kwargs) -> Tuple[httplib2.Response, bytes]:
+        content_type = (headers or {}).get("content-type", "")
+        if content_type.startswith("multipart/mixed") and "/batch" in uri:
+            return self._batch(uri, body, headers, **kwargs)
+
+        key = self._key(method, uri, body)
+        if self.cassette.mode == "replay":
+            stored = self.cassette.play(key)
+            resp = httplib2.Response(dict(stored["headers"], status=str(stored["status"])))
+            return resp, self._content(stored).encode("utf-8")
+
+        started = time.perf_counter()
+        resp, content = self.http.request(uri, method=method, body=body, headers=headers, **kwargs)
+        self.cassette.record(key, self._stored(resp, content), time.perf_counter() - started)
+        return resp, content
+
+    # ---- 배치 ----
+
+    @staticmethod
+    def _parse_multipart(content_type: str, body: Any) -> List[Tuple[str, str]]:
+        """multipart/mixed 본문 → (Content-ID, 파트 내용) 목록"""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        parser = FeedParser()
+        parser.feed(f"content-type: {content_type}\r\n\r\n{body}")
+        return [(part["Content-ID"], part.get_payload()) for part in parser.close().get_payload()]
+
+    def _parse_subrequest(self, payload: str) -> str:
+        request_line, rest = payload.split("\n", 1)
+        method, path, _ = request_line.strip().split(" ", 2)
+        parser = FeedParser()
+        parser.feed(rest)
+        message = parser.close()
+        body = message.get_payload() or None
+        return self._key(method, f"https://{message['Host']}{path}", body)
+
+    @staticmethod
+    def _parse_subresponse(payload: str) -> Tuple[httplib2.Response, str]:
+        status_line, rest = payload.split("\n", 1)
+        parser = FeedParser()
+        parser.feed(rest)
+        message = parser.close()
+        resp = httplib2.Response({k.lower(): v for k, v in message.items()})
+        resp.status = int(status_line.split(" ", 2)[1])
+        content = rest.split("\r\n\r\n", 1)[1] if "\r\n\r\n" in rest else message.get_payload()
+        return resp, content
+
+    def _batch(self, uri: str, body: Any, headers: Dict[str, str], **kwargs) -> Tuple[httplib2.Response, bytes]:
+        parts = self._parse_multipart(headers["content-type"], body)
+        keys = {content_id: self._parse_subrequest(payload) for content_id, payload in parts}
+
+        if self.cassette.mode == "record":
+            started = time.perf_counter()
+            resp, content = self.http.request(uri, method="POST", body=body, headers=headers, **kwargs)
+            elapsed = time.perf_counter() - started
+            if resp.status < 300:
+                for content_id, payload in self._parse_multipart(resp["content-type"], content):
+                    request_id = "<" + content_id[1:-1].replace("response-", "", 1) + ">"
+                    if request_id in keys:
+                        sub_resp, sub_content = self._parse_subresponse(payload)
+                        self.cassette.record(keys[request_id], self._stored(sub_resp, sub_content), elapsed)
+            return resp, content
+
+        boundary = f"batch_{_digest(sorted(keys.values()))}"
+        chunks = []
+        for content_id, key in keys.items():
+            stored = self.cassette.play(key)
+            content_type = stored["headers"].get("content-type", "application/json; charset=UTF-8")
+            chunks.append(f"--{boundary}\r\nContent-Type: application/http\r\n"
+                          f"Content-ID: <response-{content_id[1:]}\r\n\r\n"
+                          f"HTTP/1.1 {stored['status']} {HTTP_REASONS.get(stored['status'], '')}\r\n"
+                          f"Content-Type: {content_type}\r\n\r\n{self._content(stored)}\r\n")
+        content = "".join(chunks) + f"--{boundary}--\r\n"
+        resp = httplib2.Response({"status": "200", "content-type": f"multipart/mixed; boundary={boundary}"})
+        return resp, content.encode("utf-8")
+
+
+_cassette: Optional[Cassette] = None
+_cassette_loaded = False
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    환경 변수로 지정된 프로세스 공용 카세트 (CLOUD_CASSETTE 가 없으면 None)
+
+    녹화 모드는 프로세스 종료 시 자동 저장됩니다.
+    """
+    global _cassette, _cassette_loaded
+    if _cassette_loaded:
+        return _cassette
+    with _cassette_lock:
+        if not _cassette_loaded:
+            path = os.getenv("CLOUD_CASSETTE")
+            if path:
+                _cassette = Cassette(Path(path), os.getenv("CLOUD_CASSETTE_MODE", "replay"),
+                                     float(os.getenv("CLOUD_CASSETTE_LATENCY", "0")))
+                if _cassette.mode == "record":
+                    atexit.register(_cassette.save)
+                logger.info(f"📼 카세트 {_cassette.mode} 모드: {path}")
+            _cassette_loaded = True
+    return _cassette
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+프로세스 공용 AWS 클라이언트 레지스트리
+여러 워커 스레드가 동일한 boto3 클라이언트와 커넥션 풀을 공유하도록 관리합니다.
+
+- 주요 기능:
+  - (서비스, 리전, 자격 증명) 단위로 클라이언트를 한 번만 생성하여 재사용합니다.
+  - max_pool_connections, TCP keep-alive, 재시도 모드를 설정으로 조정할 수 있습니다.
+  - boto3 Session 은 스레드 안전하지 않으므로 생성 구간만 잠금으로 보호하고,
+    생성된 클라이언트(스레드 안전)는 잠금 없이 공유합니다.
+  - 생성된 클라이언트에는 프로세스 공용 적응형 속도 제한기가 연결됩니다.
+  - CLOUD_CASSETTE 가 지정되면 생성된 클라이언트에 녹화 / 재생 카세트가 연결됩니다.
+  - role_arn 을 지정하면 원본 자격 증명으로 해당 역할을 맡은 Session 을 쓰며,
+    AssumeRole 자격 증명은 프로세스 공용 캐시가 공유 / 미리 갱신합니다.
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Any, Optional, Tuple, Iterator
+from collections.abc import Mapping
+
+import boto3
+from botocore.config import Config
+
+from rate_limiter import AdaptiveRateLimiter, get_rate_limiter
+from cassette import get_cassette
+from role_credentials import get_role_credential_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_RETRY_MODE = "standard"
+DEFAULT_MAX_ATTEMPTS = 5
+
+ClientKey = Tuple[str, Optional[str], Tuple[Optional[str], Optional[str]]]
+
+
+class ClientRegistry:
+    """(서비스, 리전, 자격 증명) 키로 boto3 클라이언트를 공유하는 레지스트리"""
+
+    def __init__(self,
+                 max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+                 tcp_keepalive: bool = True,
+                 retry_mode: str = DEFAULT_RETRY_MODE,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None):
+        self.max_pool_connections = max_pool_connections
+        self.tcp_keepalive = tcp_keepalive
+        self.retry_mode = retry_mode
+        self.max_attempts = max_attempts
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple[Optional[str], Optional[str]], boto3.session.Session] = {}
+        self._clients: Dict[ClientKey, Any] = {}
+
+    def _botocore_config(self) -> Config:
+        """커넥션 풀/재시도 설정"""
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=self.tcp_keepalive,
+            retries={"mode": self.retry_mode, "max_attempts": self.max_attempts},
+        )
+
+    @staticmethod
+    def _credentials_key(profile_name: Optional[str],
+                         credentials: Optional[Dict[str, str]],
+                         role_arn: Optional[str] = None,
+                         role_session_name: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """자격 증명 식별 키 (비밀 키는 키에 포함하지 않음)"""
+        access_key = credentials.get("aws_access_key_id") if credentials else None
+        if role_arn:
+            return (profile_name, f"{access_key or ''}>{role_arn}#{role_session_name or ''}")
+        return (profile_name, access_key)
+
+    def _get_session(self, creds_key: Tuple[Optional[str], Optional[str]],
+                     profile_name: Optional[str],
+                     credentials: Optional[Dict[str, str]],
+                     role_arn: Optional[str] = None,
+                     role_session_name: Optional[str] = None) -> boto3.session.Session:
+        """자격 증명별 Session 조회 (호출자는 잠금을 보유해야 함)"""
+        session = self._sessions.get(creds_key)
+        if session is None:
+            if role_arn:
+                # AssumeRole 은 첫 API 호출 시 캐시가 수행하므로 여기서는 STS 를 호출하지 않음
+                source = self._get_session(self._credentials_key(profile_name, credentials),
+                                           profile_name, credentials)
+                sts = source.client("sts", config=self._botocore_config())
+                session = get_role_credential_cache().session(role_arn, sts, role_session_name)
+            else:
+                session = boto3.session.Session(profile_name=profile_name, **(credentials or {}))
+            self._sessions[creds_key] = session
+        return session
+
+    def get_client(self, service_name: str,
+                   region_name: Optional[str] = None,
+                   profile_name: Optional[str] = None,
+                   credentials: Optional[Dict[str, str]] = None,
+                   role_arn: Optional[str] = None,
+                   role_session_name: Optional[str] = None) -> Any:
+        """
+        공유 클라이언트 조회 (없으면 생성)
+
+        Args:
+            service_name: AWS 서비스 이름 (예: 'ec2')
+            region_name: 리전 이름
+            profile_name: AWS CLI 프로필 이름
+            credentials: aws_access_key_id / aws_secret_access_key / aws_session_token
+            role_arn: 맡을 역할 ARN (학습자 계정)
+            role_session_name: AssumeRole 세션 이름
+
+        Returns:
+            boto3 클라이언트
+        """
+        creds_key = self._credentials_key(profile_name, credentials, role_arn, role_session_name)
+        key = (service_name, region_name, creds_key)
+
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                session = self._get_session(creds_key, profile_name, credentials, role_arn, role_session_name)
+                client = session.client(service_name, region_name=region_name,
+                                        config=self._botocore_config())
+                if self.rate_limiter is not None:
+                    self.rate_limiter.attach(client)
+                cassette = get_cassette()
+                if cassette is not None:
+                    cassette.attach(client)
+                self._clients[key] = client
+                logger.debug(f"AWS 클라이언트 생성: {service_name} ({region_name})")
+        return client
+
+    def client_map(self, region_name: Optional[str] = None,
+                   profile_name: Optional[str] = None,
+                   credentials: Optional[Dict[str, str]] = None,
+                   role_arn: Optional[str] = None,
+                   role_session_name: Optional[str] = None) -> "RegistryClientMap":
+        """서비스 이름으로 공유 클라이언트를 조회하는 dict 형태의 뷰"""
+        return RegistryClientMap(self, region_name, profile_name, credentials, role_arn, role_session_name)
+
+    def clear(self):
+        """등록된 클라이언트 및 세션 제거"""
+        with self._lock:
+            self._clients.clear()
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+class RegistryClientMap(Mapping):
+    """CloudUtils.aws_clients 를 대체하는 지연 생성 클라이언트 맵"""
+
+    def __init__(self, registry: ClientRegistry, region_name: Optional[str],
+                 profile_name: Optional[str], credentials: Optional[Dict[str, str]],
+                 role_arn: Optional[str] = None, role_session_name: Optional[str] = None):
+        self._registry = registry
+        self._region_name = region_name
+        self._profile_name = profile_name
+        self._credentials = credentials
+        self._role_arn = role_arn
+        self._role_session_name = role_session_name
+
+    def __getitem__(self, service_name: str) -> Any:
+        return self._registry.get_client(service_name, self._region_name,
+                                         self._profile_name, self._credentials,
+                                         self._role_arn, self._role_session_name)
+
+    def __iter__(self) -> Iterator[str]:
+        # 지연 생성이므로 이미 생성된 클라이언트만 순회
+        creds_key = self._registry._credentials_key(self._profile_name, self._credentials,
+                                                    self._role_arn, self._role_session_name)
+        for service_name, region_name, key in list(self._registry._clients):
+            if region_name == self._region_name and key == creds_key:
+                yield service_name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+RegistrySettings = Tuple[int, bool, str, int, bool]
+
+_registries: Dict[RegistrySettings, ClientRegistry] = {}
+_registry_lock = threading.Lock()
+
+
+def _registry_settings(config: Dict[str, Any]) -> RegistrySettings:
+    """레지스트리 동작을 바꾸는 설정값 (설정에 없으면 환경 변수 / 기본값)"""
+    return (
+        int(config.get("aws_max_pool_connections",
+                       os.getenv("AWS_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS))),
+        bool(config.get("aws_tcp_keepalive", True)),
+        config.get("aws_retry_mode", DEFAULT_RETRY_MODE),
+        int(config.get("aws_max_attempts", DEFAULT_MAX_ATTEMPTS)),
+        bool(config.get("aws_rate_limit", True)),
+    )
+
+
+def get_client_registry(config: Optional[Dict[str, Any]] = None) -> ClientRegistry:
+    """
+    프로세스 공용 레지스트리 조회
+
+    레지스트리는 설정값(풀 크기, keep-alive, 재시도, 속도 제한 여부)별로 하나씩 만들어 공유하므로,
+    다른 설정으로 호출하면 먼저 만든 레지스트리의 설정을 조용히 따르지 않고 그 설정의 레지스트리를 반환합니다.
+    """
+    settings = _registry_settings(config or {})
+    registry = _registries.get(settings)
+    if registry is not None:
+        return registry
+
+    with _registry_lock:
+        registry = _registries.get(settings)
+        if registry is None:
+            max_pool_connections, tcp_keepalive, retry_mode, max_attempts, rate_limit = settings
+            registry = ClientRegistry(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=tcp_keepalive,
+                retry_mode=retry_mode,
+                max_attempts=max_attempts,
+                rate_limiter=get_rate_limiter() if rate_limit else None,
+            )
+            _registries[settings] = registry
+    return registry
@@ -17,12 +17,29 @@ import json
 import time
 import logging
 from pathlib import Path
-from typing import Dict, Any
-import boto3
-from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional
+from botocore.exceptions import BotoCoreError, ClientError
+from google.auth.exceptions import GoogleAuthError
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from httplib2 import HttpLib2Error
+
+# 같은 디렉터리의 공용 모듈 import
+sys.path.append(str(Path(__file__).parent))
+from client_registry import get_client_registry
+from readiness_poller import get_readiness_poller
+from run_history import get_run_history
+from gcp_discovery import build
+from gcp_batch import BatchExecutor, http_status
+from gcp_teardown import GcpTeardown
+from shard_scheduler import NoShardCapacityError, get_shard_scheduler, load_shard_config
+from quota_admission import AdmissionRejectedError, get_admission_controller
+from resource_registry import ResourceRegistry
+from profiling import AutomationProfiler, profiled_phase, print_profile_summary
+from iam_stack import CohortIamStack, IamStackError
+from warm_pool import WarmPool, Ec2PoolProvider, get_warm_pool, register_warm_pool
 
 # 로깅 설정
 logging.basicConfig(
@@ -35,6 +52,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 샤드 배치가 덮어쓰는 설정 (다른 샤드로 다시 배치할 때 원래 값으로 되돌림)
+SHARD_CONFIG_KEYS = ("aws_region", "aws_profile", "aws_role_arn", "gcp_region", "gcp_zone", "shard")
+
+# GCP API 호출이 실패할 수 있는 오류 (HTTP 응답, 인증 / 토큰 갱신, 전송 계층)
+GCP_ERRORS = (HttpError, GoogleAuthError, HttpLib2Error, OSError)
+
+
 class BasicCourseAutomation:
     """Cloud Basic 과정 자동화 클래스 (멱등성 적용)"""
     
@@ -42,22 +66,77 @@ class BasicCourseAutomation:
         self.base_path = base_path
         self.course_name = "cloud_basic"
         self.status = "not_started"
-        self.created_resources = {"aws": [], "gcp": []}
+        self.created_resources = ResourceRegistry()
         self.config = self.load_config()
-        self.aws_iam_client = boto3.client('iam', region_name=self.config['aws_region'])
-        self.aws_ec2_client = boto3.client('ec2', region_name=self.config['aws_region'])
-        self.aws_s3_client = boto3.client('s3', region_name=self.config['aws_region'])
+        self.client_registry = get_client_registry(self.config)
+        # 샤드가 설정된 경우 run_course 시작 시 학습자를 (계정, 리전) 샤드에 배치하고 해당 리전 / 프로필 사용
+        self.learner_key = self.config['learner_id'] or self.config['project_prefix']
+        self.shard_scheduler = get_shard_scheduler(self.config, self.client_registry)
+        self.shard = None
+        self._unsharded = {key: self.config.get(key) for key in SHARD_CONFIG_KEYS}
+        self._bind_clients()
+        self.run_history = get_run_history()
+        self.admission = None
+        # --profile 실행 시 단계별 프로파일러
+        self.profiler = None
+
+    def _bind_clients(self):
+        """현재 설정(샤드 배치 시 샤드 계정 / 리전)의 공유 클라이언트와 준비 상태 폴러 연결"""
+        region, profile = self.config['aws_region'], self.config['aws_profile']
+        # 학습자 계정 역할이 지정되면 AssumeRole 자격 증명 캐시를 통해 계정별 클라이언트를 공유
+        self.aws_role = {"role_arn": self.config['aws_role_arn'],
+                         "role_session_name": self.config['aws_role_session_name']}
+        if self.shard is not None:
+            # 샤드 클라이언트는 스로틀링 응답을 샤드 부하 점수에 반영
+            clients = {name: self.shard_scheduler.client(self.shard, name) for name in ('iam', 'ec2', 's3')}
+        else:
+            clients = {name: self.client_registry.get_client(name, region, profile, **self.aws_role)
+                       for name in ('iam', 'ec2', 's3')}
+        self.aws_iam_client, self.aws_ec2_client, self.aws_s3_client = clients['iam'], clients['ec2'], clients['s3']
+        # 인스턴스 준비 / 종료 대기는 같은 계정·리전의 학습자 전체가 공유하는 폴러로 일괄 조회
+        self.readiness_poller = get_readiness_poller(region, profile, **self.aws_role)
 
     def load_config(self) -> Dict[str, Any]:
         return {
             "aws_region": "ap-northeast-2",
+            "aws_profile": os.getenv("AWS_PROFILE"),
+            "aws_role_arn": os.getenv("AWS_ROLE_ARN"),
+            "aws_role_session_name": os.getenv("AWS_ROLE_SESSION_NAME"),
+            "shards": load_shard_config(),
             "gcp_project_id": os.getenv("GCP_PROJECT_ID", "your-gcp-project-id"),
             "gcp_region": "asia-northeast3",
             "gcp_zone": "asia-northeast3-a",
             "project_prefix": "mcp-basic-course",
-            "aws_ami_id": "ami-0c9c94243ce534a55"
+            "learner_id": os.getenv("LEARNER_ID"),
+            "cohort": os.getenv("COURSE_COHORT"),
+            "aws_ami_id": "ami-0c9c94243ce534a55",
+            "gcp_image_project": "debian-cloud",
+            "gcp_image_family": "debian-12",
+            "gcp_machine_type": "e2-micro",
+            "gcp_batch_retries": 3,
+            # 막 만든 서비스 계정이 Compute 에 전파되기 전(400 / 404)의 VM 생성 재시도 (1+2+4+... 초, 약 1분)
+            "gcp_sa_propagation_retries": 6,
+            "gcp_poll_interval": 1.0,
+            "instance_ready_timeout": 600,
+            "instance_terminate_timeout": 600,
+            # 인스턴스 종료 후에도 네트워크 인터페이스 분리가 늦으면 DependencyViolation 이 나므로 재시도
+            "sg_delete_attempts": 6,
+            "sg_delete_retry_delay": 5,
+            # 지정하면 미리 띄워 둔 예비 EC2 인스턴스를 학습자에게 바로 할당 (계정 / 리전별 풀)
+            "ec2_warm_pool": os.getenv("EC2_WARM_POOL"),
+            "ec2_warm_pool_size": int(os.getenv("EC2_WARM_POOL_SIZE", "2")),
+            "warm_pool_claim_timeout": 0,
+            "quota_admission": os.getenv("QUOTA_ADMISSION", "1") != "0",
+            # 할당량이 찼을 때 다른 학습자의 정리 / 할당량 재조회를 기다리는 시간 (초)
+            "admission_timeout": float(os.getenv("ADMISSION_TIMEOUT", "300")),
+            "aws_max_pool_connections": int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50")),
+            # api: 학습자마다 IAM API 호출, stack: 과정 IAM 을 CloudFormation 스택으로 미리 일괄 생성
+            "iam_onboarding": os.getenv("IAM_ONBOARDING", "api"),
+            "iam_learner_stacks": int(os.getenv("IAM_LEARNER_STACKS", "1")),
+            "cfn_poll_interval": 5
         }
 
+    @profiled_phase("practice")
     def day1_aws_basics(self) -> bool:
         logger.info("🌅 1일차: AWS 기초 실습 시작")
         prefix = self.config['project_prefix']
@@ -67,17 +146,20 @@ class BasicCourseAutomation:
         bucket_name = f"{prefix}-bucket-{self.config['aws_region']}"
 
         try:
-            # 1. IAM 사용자 확인 및 생성
-            try:
-                self.aws_iam_client.get_user(UserName=user_name)
-                logger.info(f"IAM User {user_name} already exists. Skipping creation.")
-            except ClientError as e:
-                if e.response['Error']['Code'] == 'NoSuchEntity':
-                    self.aws_iam_client.create_user(UserName=user_name)
-                    logger.info(f"✅ IAM User 생성 완료: {user_name}")
-                else:
-                    raise
-            self.created_resources["aws"].append({"type": "iam_user", "name": user_name})
+            # 1. IAM 사용자 확인 및 생성 (스택 온보딩이면 과정 IAM 스택이 관리하므로 건너뜀)
+            if self.config['iam_onboarding'] == "stack":
+                logger.info(f"IAM User {user_name} is managed by the cohort IAM stack. Skipping creation.")
+            else:
+                try:
+                    self.aws_iam_client.get_user(UserName=user_name)
+                    logger.info(f"IAM User {user_name} already exists. Skipping creation.")
+                except ClientError as e:
+                    if e.response['Error']['Code'] == 'NoSuchEntity':
+                        self.aws_iam_client.create_user(UserName=user_name)
+                        logger.info(f"✅ IAM User 생성 완료: {user_name}")
+                    else:
+                        raise
+                self._track("iam_user", user_name)
 
             # 2. 보안 그룹 확인 및 생성
             try:
@@ -99,11 +181,37 @@ class BasicCourseAutomation:
                     logger.info(f"✅ Security Group 생성 완료: {sg_id}")
                 else:
                     raise
-            self.created_resources["aws"].append({"type": "security_group", "id": sg_id, "name": sg_name})
+            self._track("security_group", sg_id, sg_name)
 
             # 3. EC2 인스턴스 확인 및 생성
-            # ... (Implementation for checking existing instance)
-            logger.info("EC2 instance creation logic to be implemented with idempotency.")
+            reservations = self.aws_ec2_client.describe_instances(
+                Filters=[
+                    {'Name': 'tag:Name', 'Values': [instance_name]},
+                    {'Name': 'instance-state-name', 'Values': ['pending', 'running']}
+                ]
+            )['Reservations']
+            if reservations:
+                instance_id = reservations[0]['Instances'][0]['InstanceId']
+                logger.info(f"EC2 Instance {instance_name} already exists. Skipping creation.")
+            else:
+                # 웜 풀이 있으면 예비 인스턴스를 먼저 할당받고, 없을 때만 새로 생성
+                instance_id = self._claim_warm_instance(instance_name, sg_id)
+                if instance_id is None:
+                    instance = self.aws_ec2_client.run_instances(
+                        ImageId=self.config['aws_ami_id'],
+                        InstanceType='t2.micro',
+                        MinCount=1,
+                        MaxCount=1,
+                        SecurityGroupIds=[sg_id],
+                        TagSpecifications=[{'ResourceType': 'instance', 'Tags': [{'Key': 'Name', 'Value': instance_name}]}]
+                    )
+                    instance_id = instance['Instances'][0]['InstanceId']
+                    logger.info(f"✅ EC2 Instance 생성 완료: {instance_id}")
+            self._track("ec2_instance", instance_id, instance_name, depends_on=[sg_id])
+            # 실습 전에 running 상태 확인 (학습자별 waiter 대신 공용 폴러의 일괄 describe)
+            self.readiness_poller.wait_for_instance(
+                instance_id, timeout=self.config['instance_ready_timeout']).result()
+            logger.info(f"EC2 Instance {instance_id} is running.")
 
             # 4. S3 버킷 확인 및 생성
             try:
@@ -118,7 +226,7 @@ class BasicCourseAutomation:
                     logger.info(f"✅ S3 Bucket 생성 완료: {bucket_name}")
                 else:
                     raise
-            self.created_resources["aws"].append({"type": "s3_bucket", "name": bucket_name})
+            self._track("s3_bucket", bucket_name)
 
             logger.info("✅ 1일차 AWS 기초 실습 완료")
             return True
@@ -126,37 +234,451 @@ class BasicCourseAutomation:
             logger.error(f"❌ 1일차 AWS 기초 실습 실패: {e}", exc_info=True)
             return False
 
+    def warm_pool(self) -> Optional[WarmPool]:
+        """예비 EC2 인스턴스 웜 풀 (설정된 경우에만, 계정 / 리전별 프로세스 공용 풀)"""
+        if not self.config['ec2_warm_pool']:
+            return None
+        scope = [self.config['aws_region']]
+        if self.aws_role['role_arn']:
+            scope.insert(0, self.aws_role['role_arn'].split(':')[4])  # 역할 ARN 의 계정 ID
+        name = "-".join([self.config['ec2_warm_pool']] + scope)
+        pool = get_warm_pool(name)
+        if pool is None:
+            provider = Ec2PoolProvider(self.aws_ec2_client, self.config['aws_ami_id'])
+            pool = register_warm_pool(WarmPool(name, provider, target_size=self.config['ec2_warm_pool_size']))
+        return pool
+
+    def _claim_warm_instance(self, instance_name: str, sg_id: str) -> Optional[str]:
+        """웜 풀 예비 인스턴스를 학습자 인스턴스로 할당 (보안 그룹 / 이름 태그 적용), 없으면 None"""
+        pool = self.warm_pool()
+        if pool is None:
+            return None
+        resource = pool.claim(self.learner_key, timeout=self.config['warm_pool_claim_timeout'])
+        if resource is None:
+            return None
+        self.aws_ec2_client.modify_instance_attribute(InstanceId=resource['id'], Groups=[sg_id])
+        self.aws_ec2_client.create_tags(Resources=[resource['id']],
+                                        Tags=[{'Key': 'Name', 'Value': instance_name}])
+        logger.info(f"✅ 웜 풀 EC2 Instance 할당: {resource['id']}")
+        return resource['id']
+
+    @profiled_phase("practice")
     def day2_gcp_basics(self) -> bool:
         logger.info("🌅 2일차: GCP 기초 실습 시작")
-        # ... (Idempotency logic for GCP to be added here)
-        logger.info("GCP automation logic to be implemented with idempotency.")
+        try:
+            failures = self.provision_gcp_basics([self.config['project_prefix']])
+        except GCP_ERRORS as e:
+            logger.error(f"❌ 2일차 GCP 기초 실습 실패: {e}", exc_info=True)
+            return False
+        for key, error in failures.items():
+            logger.error(f"❌ GCP 리소스 생성 실패 ({key}): {error}")
+        if failures:
+            return False
+        logger.info("✅ 2일차 GCP 기초 실습 완료")
         return True
 
-    def cleanup_resources(self):
+    def iam_stack(self) -> CohortIamStack:
+        """과정 IAM 스택 관리자 (과정 이름이 없으면 프로젝트 접두사 사용)"""
+        region, profile = self.config['aws_region'], self.config['aws_profile']
+        return CohortIamStack(
+            self.client_registry.get_client('cloudformation', region, profile, **self.aws_role),
+            self.config['cohort'] or self.config['project_prefix'],
+            learner_stacks=self.config['iam_learner_stacks'],
+            poll_interval=self.config['cfn_poll_interval'])
+
+    @profiled_phase("setup")
+    def onboard_cohort_iam(self, prefixes: List[str], keep_existing: bool = False) -> Dict[str, str]:
+        """
+        1일차 IAM(그룹, 관리형 정책, 학습자별 사용자, 그룹 가입)을 CloudFormation 스택으로 일괄 생성
+
+        학습자 수와 무관하게 스택 몇 개의 생성 / 갱신 요청과 이벤트 조회로 끝나며,
+        생성 순서와 실패 시 롤백은 CloudFormation 이 처리합니다. 정리는 iam_stack().teardown() 으로 합니다.
+
+        Args:
+            prefixes: 학습자별 리소스 이름 접두사 목록 (사용자 이름: {prefix}-user)
+            keep_existing: 스택에 이미 있는 학습자를 유지하고 prefixes 만 추가 (학습자별 run_course)
+
+        Returns:
+            스택 이름 → 최종 상태
+
+        Raises:
+            IamStackError: 스택이 실패 / 롤백으로 끝난 경우
+        """
+        return self.iam_stack().deploy(prefixes, keep_existing=keep_existing)
+
+    def provision_gcp_basics(self, prefixes: List[str]) -> Dict[str, Exception]:
+        """
+        2일차 GCP 리소스(서비스 계정, 방화벽, VM, 버킷)를 API 별 배치 요청으로 생성
+
+        학습자가 여러 명이어도 1차(IAM / Compute / Storage 배치 병렬) + 2차(VM 배치) 왕복으로 끝납니다.
+        이미 존재하는 리소스(409)는 성공으로 처리하고, 429 / 5xx 항목만 다시 배치로 재시도합니다.
+
+        Args:
+            prefixes: 학습자별 리소스 이름 접두사 목록
+
+        Returns:
+            실패한 항목 키 → 오류
+        """
+        project = self.config['gcp_project_id']
+        zone = self.config['gcp_zone']
+        retries = self.config['gcp_batch_retries']
+        iam, compute, storage = build('iam', 'v1'), build('compute', 'v1'), build('storage', 'v1')
+
+        # 1차: 서로 독립적인 요청 (API 별로 한 배치씩 병렬 전송)
+        iam_batch = BatchExecutor(iam, 'iam', max_retries=retries)
+        compute_batch = BatchExecutor(compute, 'compute', max_retries=retries)
+        storage_batch = BatchExecutor(storage, 'storage', max_retries=retries)
+        compute_batch.add("image", lambda: compute.images().getFromFamily(
+            project=self.config['gcp_image_project'], family=self.config['gcp_image_family']))
+        for prefix in prefixes:
+            iam_batch.add(f"sa:{prefix}", lambda p=prefix: iam.projects().serviceAccounts().create(
+                name=f"projects/{project}",
+                body={"accountId": f"{p}-sa", "serviceAccount": {"displayName": f"{p} service account"}}),
+                ok_statuses=(409,))
+            compute_batch.add(f"firewall:{prefix}", lambda p=prefix: compute.firewalls().insert(
+                project=project,
+                body={"name": f"{p}-allow-web", "network": "global/networks/default",
+                      "allowed": [{"IPProtocol": "tcp", "ports": ["22", "80", "443"]}],
+                      "sourceRanges": ["0.0.0.0/0"], "targetTags": [f"{p}-vm"]}),
+                ok_statuses=(409,))
+            storage_batch.add(f"bucket:{prefix}", lambda p=prefix: storage.buckets().insert(
+                project=project,
+                body={"name": f"{p}-bucket-{self.config['gcp_region']}",
+                      "location": self.config['gcp_region']}),
+                ok_statuses=(409,))
+        batches = [iam_batch, compute_batch, storage_batch]
+        with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+            list(executor.map(BatchExecutor.execute, batches))
+
+        image = compute_batch.items["image"]
+        if not image.ok:
+            raise image.error
+        image_link = image.response["selfLink"]
+
+        # 2차: 이미지 / 서비스 계정이 준비된 학습자의 VM
+        # 서비스 계정은 생성 직후 Compute 에서 아직 보이지 않을 수 있어 그 오류도 재시도
+        vm_batch = BatchExecutor(compute, 'compute',
+                                 max_retries=max(retries, self.config['gcp_sa_propagation_retries']))
+        for prefix in prefixes:
+            if not iam_batch.items[f"sa:{prefix}"].ok:
+                continue
+            sa_email = f"{prefix}-sa@{project}.iam.gserviceaccount.com"
+            vm_batch.add(f"instance:{prefix}", lambda p=prefix: compute.instances().insert(
+                project=project, zone=zone,
+                body={"name": f"{p}-vm",
+                      "machineType": f"zones/{zone}/machineTypes/{self.config['gcp_machine_type']}",
+                      "tags": {"items": [f"{p}-vm"]},
+                      "disks": [{"boot": True, "autoDelete": True,
+                                 "initializeParams": {"sourceImage": image_link}}],
+                      "networkInterfaces": [{"network": "global/networks/default",
+                                             "accessConfigs": [{"type": "ONE_TO_ONE_NAT",
+                                                                "name": "External NAT"}]}],
+                      "serviceAccounts": [{"email": f"{p}-sa@{project}.iam.gserviceaccount.com",
+                                           "scopes": ["https://www.googleapis.com/auth/cloud-platform"]}]}),
+                ok_statuses=(409,),
+                retry_if=lambda e, email=sa_email: http_status(e) in (400, 404) and email in str(e))
+        vm_batch.execute()
+
+        for prefix in prefixes:
+            sa_email = f"{prefix}-sa@{project}.iam.gserviceaccount.com"
+            if iam_batch.items[f"sa:{prefix}"].ok:
+                self._track("gcp_service_account", sa_email, provider="gcp")
+            instance_deps = [sa_email]
+            if compute_batch.items[f"firewall:{prefix}"].ok:
+                self._track("gcp_firewall", f"{prefix}-allow-web", provider="gcp")
+                instance_deps.append(f"{prefix}-allow-web")
+            if storage_batch.items[f"bucket:{prefix}"].ok:
+                self._track("gcp_bucket", f"{prefix}-bucket-{self.config['gcp_region']}", provider="gcp")
+            instance = vm_batch.items.get(f"instance:{prefix}")
+            if instance is not None and instance.ok:
+                self._track("gcp_instance", f"{prefix}-vm", provider="gcp", depends_on=instance_deps)
+
+        failures = {}
+        for batch in batches + [vm_batch]:
+            failures.update(batch.failures())
+        for prefix in prefixes:
+            if not iam_batch.items[f"sa:{prefix}"].ok:
+                failures.setdefault(f"instance:{prefix}", RuntimeError("서비스 계정이 없어 VM 생성을 건너뜀"))
+        round_trips = sum(batch.round_trips for batch in batches) + vm_batch.round_trips
+        logger.info(f"GCP 배치 요청 {round_trips}회로 학습자 {len(prefixes)}명 리소스 처리")
+        return failures
+
+    def _track(self, resource_type: str, resource_id: str, name: str = None, provider: str = "aws",
+               depends_on=()):
+        """생성(또는 재사용)한 리소스를 레지스트리에 등록"""
+        region = self.config['aws_region'] if provider == "aws" else self.config['gcp_region']
+        self.created_resources.add(provider, resource_type, resource_id, name,
+                                   learner=self.learner_key, region=region, depends_on=depends_on)
+
+    @profiled_phase("cleanup")
+    def cleanup_resources(self) -> bool:
+        """생성한 리소스 정리 (모두 삭제되면 True, 남은 리소스는 레지스트리에 유지)"""
         logger.info("🧹 리소스 정리 시작")
-        for resource in reversed(self.created_resources["aws"]):
+        ok = True
+        terminating: List[str] = []
+        # 등록 역순 = 의존하는 리소스(인스턴스)가 의존 대상(보안 그룹)보다 먼저
+        for resource in list(self.created_resources.teardown_order(provider="aws")):
             try:
-                if resource["type"] == "security_group":
-                    time.sleep(10) # Allow instances to terminate
-                    self.aws_ec2_client.delete_security_group(GroupId=resource.get("id"), GroupName=resource.get("name"))
-                elif resource["type"] == "iam_user":
-                    self.aws_iam_client.delete_user(UserName=resource["name"])
-                elif resource["type"] == "s3_bucket":
-                    self.aws_s3_client.delete_bucket(Bucket=resource["name"])
+                if resource.type == "ec2_instance":
+                    self.aws_ec2_client.terminate_instances(InstanceIds=[resource.id])
+                    terminating.append(resource.id)
+                elif resource.type == "security_group":
+                    self._wait_for_terminated(terminating)
+                    terminating.clear()
+                    self._delete_security_group(resource.id)
+                elif resource.type == "iam_user":
+                    self.aws_iam_client.delete_user(UserName=resource.name)
+                elif resource.type == "s3_bucket":
+                    self.aws_s3_client.delete_bucket(Bucket=resource.name)
+                self.created_resources.remove(resource.id)
                 logger.info(f"Deleted AWS resource: {resource}")
             except ClientError as e:
                 logger.error(f"Failed to delete AWS resource {resource}: {e}")
+                ok = False
+        return self._cleanup_gcp() and ok
+
+    def _cleanup_gcp(self) -> bool:
+        """
+        2일차 GCP 리소스 정리
+
+        이 실행이 기록한 VM / 방화벽만 GcpTeardown 으로 의존 순서에 따라 삭제(작업 완료까지 대기)하고,
+        그 뒤 버킷과 서비스 계정을 지웁니다. 이미 없는 리소스(404)는 삭제된 것으로 봅니다.
+        """
+        resources = list(self.created_resources.teardown_order(provider="gcp"))
+        if not resources:
+            return True
+        project = self.config['gcp_project_id']
+        names = {"instances": [r.id for r in resources if r.type == "gcp_instance"],
+                 "firewalls": [r.id for r in resources if r.type == "gcp_firewall"]}
+        try:
+            teardown = GcpTeardown(build('compute', 'v1'), project, self.config['project_prefix'], names=names,
+                                   timeout=self.config['instance_terminate_timeout'],
+                                   poll_interval=self.config['gcp_poll_interval'],
+                                   batch_retries=self.config['gcp_batch_retries'])
+            failures = teardown.run()["failures"]
+        except GCP_ERRORS as e:
+            logger.error(f"Failed to delete GCP compute resources: {e}")
+            return False
+        failed = {key.rsplit("/", 1)[-1] for key in failures}
+
+        ok = not failures
+        for resource in resources:
+            try:
+                if resource.type in ("gcp_instance", "gcp_firewall"):
+                    if resource.id in failed:
+                        ok = False
+                        continue
+                elif resource.type == "gcp_bucket":
+                    self._delete_gcp(build('storage', 'v1').buckets().delete(bucket=resource.id))
+                elif resource.type == "gcp_service_account":
+                    self._delete_gcp(build('iam', 'v1').projects().serviceAccounts().delete(
+                        name=f"projects/{project}/serviceAccounts/{resource.id}"))
+                self.created_resources.remove(resource.id)
+                logger.info(f"Deleted GCP resource: {resource}")
+            except GCP_ERRORS as e:
+                logger.error(f"Failed to delete GCP resource {resource}: {e}")
+                ok = False
+        return ok
+
+    @staticmethod
+    def _delete_gcp(request: Any):
+        try:
+            request.execute()
+        except HttpError as e:
+            if http_status(e) != 404:
+                raise
+
+    def _wait_for_terminated(self, instance_ids: List[str]):
+        """종료 요청한 인스턴스가 terminated 가 될 때까지 대기 (준비 상태 폴러로 일괄 조회)"""
+        futures = {instance_id: self.readiness_poller.wait_for_instance(
+            instance_id, "terminated", timeout=self.config['instance_terminate_timeout'])
+            for instance_id in instance_ids}
+        for instance_id, future in futures.items():
+            try:
+                future.result()
+            except (TimeoutError, RuntimeError) as e:
+                # 보안 그룹 삭제 재시도에서 다시 확인하므로 여기서는 기록만 남김
+                logger.warning(f"⚠️ 인스턴스 종료 대기 실패 {instance_id}: {e}")
+
+    def _delete_security_group(self, group_id: str):
+        """보안 그룹 삭제 (네트워크 인터페이스가 아직 남아 있으면 DependencyViolation 재시도)"""
+        attempts = self.config['sg_delete_attempts']
+        for attempt in range(1, attempts + 1):
+            try:
+                self.aws_ec2_client.delete_security_group(GroupId=group_id)
+                return
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "DependencyViolation" or attempt == attempts:
+                    raise
+                delay = self.config['sg_delete_retry_delay'] * attempt
+                logger.info(f"⏳ 보안 그룹 {group_id} 사용 중, {delay}초 후 재시도 ({attempt}/{attempts})")
+                time.sleep(delay)
+
+    @profiled_phase("setup")
+    def admit(self, timeout: Optional[float] = None) -> bool:
+        """
+        할당량 사전 승인: 리소스 생성 전에 이 학습자 환경이 들어갈 용량을 예약
+
+        Args:
+            timeout: 용량 대기 시간 (None 이면 config 의 admission_timeout)
+        """
+        if not self.config['quota_admission']:
+            return True
+        if timeout is None:
+            timeout = self.config['admission_timeout']
+        region, profile = self.config['aws_region'], self.config['aws_profile']
+        try:
+            self.admission = get_admission_controller(
+                region, self.aws_role['role_arn'] or profile,
+                self.client_registry.client_map(region, profile, **self.aws_role))
+            self.admission.acquire(self.learner_key, timeout=timeout)
+        except AdmissionRejectedError as e:
+            logger.error(f"❌ {e}")
+            return False
+        except Exception as e:
+            # 자격 증명 / 네트워크 / 권한 문제로 할당량을 못 읽어도 실습 자체는 진행
+            logger.warning(f"⚠️ 할당량 조회 실패, 사전 승인 없이 진행합니다: {e!r}")
+            self.admission = None
+        return True
+
+    def place_and_admit(self) -> bool:
+        """
+        샤드 배치 + 할당량 사전 승인
+
+        승인된 샤드는 할당량 기준 수용 인원으로 수용량을 갱신하고, 할당량이 찬 샤드는
+        현재 인원으로 수용량을 줄인 뒤 다른 샤드에 다시 배치합니다. 남은 샤드가 있으면
+        기다리지 않고 넘어가며, 마지막 샤드에서만 admission_timeout 동안 대기합니다.
+        """
+        if self.shard_scheduler is None:
+            return self.admit()
+        while True:
+            try:
+                self.shard = self.shard_scheduler.place(self.learner_key, self.config['cohort'])
+            except NoShardCapacityError as e:
+                logger.error(f"❌ {e}")
+                self.shard = None
+                return False
+            self.config.update(self._unsharded)
+            self.config.update(self.shard.config_overrides())
+            self._bind_clients()
+            others = any(shard.headroom > 0 for name, shard in self.shard_scheduler.shards.items()
+                         if name != self.shard.name)
+            if self.admit(timeout=0 if others else None):
+                if self.admission is not None:
+                    self.shard_scheduler.set_capacity(
+                        self.shard.name, self.shard.assigned + self.admission.capacity())
+                return True
+            self.shard_scheduler.set_capacity(self.shard.name, max(0, self.shard.assigned - 1))
+            self.shard_scheduler.release(self.learner_key)
+            logger.info(f"📍 {self.shard.name} 할당량 부족, 다른 샤드에 다시 배치합니다")
 
     def run_course(self):
         logger.info(f"🚀 {self.course_name} 과정 시작")
         self.status = "in_progress"
-        if not self.day1_aws_basics():
+        run_id = self.run_history.start_run(
+            "BasicCourseAutomation.run_course", self.course_name,
+            learner=self.config['learner_id'], cohort=self.config['cohort'])
+
+        try:
+            self._run_steps(run_id)
+        except Exception:
+            # 예상하지 못한 오류로 끝나도 실행 기록이 in_progress 로 남지 않게
+            self.status = "failed"
+            self.run_history.finish_run(run_id, "failed")
+            raise
+        finally:
+            self._release_placement()
+
+    def _release_placement(self):
+        """
+        할당량 예약 / 사용량 반환, 남은 리소스가 없으면 샤드 배치 해제
+
+        정리되지 않은 리소스가 있으면 어느 계정 / 리전에 만들었는지 알 수 있도록 샤드 배치 기록을 남깁니다.
+        """
+        if self.admission is not None:
+            self.admission.release(self.learner_key, created=True)
+        if self.shard is not None and len(self.created_resources) == 0:
+            self.shard_scheduler.release(self.learner_key)
+
+    def _run_steps(self, run_id: int):
+        """run_course 본문: 배치 / 승인 → (과정 IAM 스택) → 1일차 → 2일차 → 정리 (실행 종료 기록 포함)"""
+        if not self.place_and_admit():
+            self.status = "rejected"
+            self.run_history.finish_run(run_id, "rejected")
+            return
+
+        iam_ok = True
+        if self.config['iam_onboarding'] == "stack":
+            # 1일차는 IAM 사용자를 만들지 않으므로 이 학습자를 과정 IAM 스택에 추가 (다른 학습자는 유지)
+            started_at, start = time.time(), time.perf_counter()
+            error = None
+            try:
+                self.onboard_cohort_iam([self.config['project_prefix']], keep_existing=True)
+            except (IamStackError, ClientError, BotoCoreError) as e:
+                iam_ok, error = False, str(e)
+                logger.error(f"❌ 과정 IAM 스택 온보딩 실패: {e}")
+            self.run_history.record_step(run_id, "onboard_cohort_iam", "success" if iam_ok else "failed",
+                                         started_at, time.perf_counter() - start, error)
+
+        started_at, start = time.time(), time.perf_counter()
+        if self.shard is not None:
+            with self.shard_scheduler.provisioning(self.shard):
+                day1_ok = self.day1_aws_basics()
+        else:
+            day1_ok = self.day1_aws_basics()
+        self.run_history.record_step(run_id, "day1_aws_basics", "success" if day1_ok else "failed",
+                                     started_at, time.perf_counter() - start)
+        if not day1_ok:
             logger.error("❌ 1일차 실습 실패")
-        # ... (Run day2)
+        if self.admission is not None:
+            self.admission.commit(self.learner_key)
+
+        started_at, start = time.time(), time.perf_counter()
+        day2_ok = self.day2_gcp_basics()
+        self.run_history.record_step(run_id, "day2_gcp_basics", "success" if day2_ok else "failed",
+                                     started_at, time.perf_counter() - start)
+        if not day2_ok:
+            logger.error("❌ 2일차 실습 실패")
         self.status = "completed"
         logger.info(f"🎉 {self.course_name} 과정 완료!")
-        self.cleanup_resources()
+
+        started_at, start = time.time(), time.perf_counter()
+        cleanup_ok = self.cleanup_resources()
+        leftovers = ", ".join(str(r) for r in self.created_resources.teardown_order())
+        self.run_history.record_step(run_id, "cleanup_resources", "success" if cleanup_ok else "failed",
+                                     started_at, time.perf_counter() - start,
+                                     None if cleanup_ok else f"정리되지 않은 리소스: {leftovers}")
+        if not cleanup_ok and self.shard is not None:
+            logger.warning(f"📍 정리되지 않은 리소스가 있어 {self.shard.name} 배치를 유지합니다")
+        self.run_history.finish_run(run_id, "success" if iam_ok and day1_ok and day2_ok and cleanup_ok else "failed")
+
+def main():
+    """명령행 실행: python cloud_basic_course_automation.py [--profile]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cloud Basic 과정 자동화")
+    parser.add_argument("--profile", action="store_true",
+                        help="단계별 cProfile + 전체 스레드 샘플링 프로파일 기록")
+    parser.add_argument("--profile-dir", default="profile", help=".pstats / .collapsed 저장 디렉토리")
+    parser.add_argument("--results", default="basic_course_results.json",
+                        help="프로파일 요약(profile 항목)을 기록할 결과 파일")
+    parser.add_argument("--top", type=int, default=20, help="요약에 포함할 상위 항목 수")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        profiler = AutomationProfiler(Path(args.profile_dir), top_n=args.top, prefix="basic_course").start()
+    try:
+        with profiler.phase("setup") if profiler else nullcontext():
+            automation = BasicCourseAutomation(Path(__file__).parent)
+        automation.profiler = profiler
+        automation.run_course()
+    finally:
+        if profiler:
+            profiler.stop()
+            print_profile_summary(profiler.write_reports(Path(args.results)))
+    return 0 if automation.status == "completed" else 1
+
 
 if __name__ == "__main__":
-    automation = BasicCourseAutomation(Path(__file__).parent)
-    automation.run_course()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+과정(cohort) 공용 네트워크
+학습자마다 VPC / 인터넷 게이트웨이 / 라우트 테이블 / 서브넷을 만드는 대신,
+과정마다 VPC 하나를 공유하고 학습자에게는 CIDR 할당기에서 나눠 준 서브넷만 만듭니다.
+
+- 교재 연계성:
+  - Cloud Basic 2일차 섹션 1: 네트워킹 기초 실습 (networking_basics.sh)
+  - cloud_basic_config.json 의 shared_resources (VPC, Subnet)
+- 주요 기능:
+  - 공용 VPC 는 과정 태그로 찾아 재사용하며, 없을 때만 VPC + 인터넷 게이트웨이 + 기본 라우트 테이블 경로를 만듭니다.
+    학습자 서브넷은 기본 라우트 테이블을 쓰므로 별도 연결이 필요 없습니다.
+    재사용할 때 인터넷 게이트웨이나 기본 경로가 빠져 있으면(이전 실행이 중간에 실패) 채워 넣습니다.
+  - 두 프로세스가 동시에 VPC 를 만들면 과정 태그가 붙은 VPC 중 ID 가 가장 작은 것을 양쪽이 똑같이 고르고,
+    진 쪽은 자기가 만든 VPC 를 지웁니다.
+  - 학습자 서브넷은 스레드 풀에서 동시에 만들며, 학습자당 네트워크 비용은 create_subnet 한 번입니다.
+  - 기존 서브넷은 처음 한 번만 조회해 CIDR 할당기에 반영하고, 이미 서브넷이 있는 학습자는 그대로 재사용합니다.
+  - 다른 프로세스가 먼저 쓴 CIDR(InvalidSubnet.Conflict)은 사용 중으로 표시하고 다음 블록으로 다시 시도합니다.
+  - 리전당 VPC 5개 기본 할당량을 학습자 수와 무관하게 과정당 1개만 사용합니다.
+"""
+
+import sys
+import logging
+import threading
+import ipaddress
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+from botocore.exceptions import ClientError
+
+sys.path.append(str(Path(__file__).parent))
+
+logger = logging.getLogger(__name__)
+
+COHORT_TAG = "cloud-basic-cohort"
+LEARNER_TAG = "cloud-basic-learner"
+
+
+class CidrExhaustedError(RuntimeError):
+    """VPC CIDR 에 남은 서브넷 블록이 없음"""
+
+
+class CidrAllocator:
+    """VPC CIDR 을 같은 크기의 블록으로 나눠 학습자별로 할당 (스레드 안전)"""
+
+    def __init__(self, vpc_cidr: str, prefix_length: int = 24, reserved: int = 0):
+        """
+        Args:
+            vpc_cidr: VPC CIDR (예: 10.0.0.0/16)
+            prefix_length: 학습자 서브넷 크기 (예: 24 → /24)
+            reserved: 앞에서부터 할당하지 않고 남겨 둘 블록 수 (공용 서브넷 등)
+        """
+        self.network = ipaddress.ip_network(vpc_cidr)
+        if prefix_length < self.network.prefixlen:
+            raise ValueError(f"서브넷 /{prefix_length} 가 VPC {vpc_cidr} 보다 큽니다")
+        self.prefix_length = prefix_length
+        self.capacity = 2 ** (prefix_length - self.network.prefixlen) - reserved
+        self._reserved = reserved
+        self._owners: Dict[str, str] = {}   # CIDR → 소유자
+        self._by_owner: Dict[str, str] = {}  # 소유자 → CIDR
+        self._lock = threading.Lock()
+
+    def _blocks(self) -> Iterable[str]:
+        for n, block in enumerate(self.network.subnets(new_prefix=self.prefix_length)):
+            if n >= self._reserved:
+                yield str(block)
+
+    def mark_used(self, cidr: str, owner: Optional[str] = None):
+        """이미 사용 중인 CIDR 반영 (소유자를 모르면 None)"""
+        block = ipaddress.ip_network(cidr)
+        with self._lock:
+            for candidate in self._blocks():
+                if block.overlaps(ipaddress.ip_network(candidate)):
+                    self._owners.setdefault(candidate, owner)
+            if owner is not None:
+                self._by_owner.setdefault(owner, str(block))
+
+    def allocate(self, owner: str) -> str:
+        """소유자의 CIDR (이미 할당되어 있으면 같은 값)"""
+        with self._lock:
+            if owner in self._by_owner:
+                return self._by_owner[owner]
+            for candidate in self._blocks():
+                if candidate not in self._owners:
+                    self._owners[candidate] = owner
+                    self._by_owner[owner] = candidate
+                    return candidate
+        raise CidrExhaustedError(f"{self.network} 에 남은 /{self.prefix_length} 블록이 없습니다 "
+                                 f"(최대 {self.capacity}명)")
+
+    def reassign(self, owner: str) -> str:
+        """소유자의 현재 CIDR 을 다른 사용자 것으로 표시하고 새 CIDR 할당"""
+        with self._lock:
+            cidr = self._by_owner.pop(owner, None)
+            if cidr is not None:
+                self._owners[cidr] = None
+        return self.allocate(owner)
+
+    def release(self, owner: str):
+        """소유자의 CIDR 반환"""
+        with self._lock:
+            cidr = self._by_owner.pop(owner, None)
+            if cidr is not None and self._owners.get(cidr) == owner:
+                del self._owners[cidr]
+
+    @property
+    def available(self) -> int:
+        with self._lock:
+            return self.capacity - len(self._owners)
+
+
+class CohortNetwork:
+    """과정 공용 VPC 와 학습자별 서브넷 관리"""
+
+    def __init__(self, ec2_client: Any, cohort: str, vpc_cidr: str = "10.0.0.0/16",
+                 subnet_prefix_length: int = 24, availability_zones: Optional[List[str]] = None,
+                 max_workers: int = 16, conflict_retries: int = 3):
+        """
+        Args:
+            ec2_client: EC2 클라이언트
+            cohort: 과정(기수) 이름, 리소스 이름 접두사와 태그로 사용
+            vpc_cidr: 공용 VPC CIDR
+            subnet_prefix_length: 학습자 서브넷 크기
+            availability_zones: 학습자 서브넷을 번갈아 배치할 가용 영역 (None 이면 AWS 가 선택)
+            max_workers: 서브넷 동시 생성 수
+            conflict_retries: CIDR 충돌 시 다음 블록으로 다시 시도하는 횟수
+        """
+        self.ec2 = ec2_client
+        self.cohort = cohort
+        self.vpc_cidr = vpc_cidr
+        self.availability_zones = list(availability_zones or [])
+        self.max_workers = max_workers
+        self.conflict_retries = conflict_retries
+        self.allocator = CidrAllocator(vpc_cidr, subnet_prefix_length)
+        self.vpc_id: Optional[str] = None
+        self.internet_gateway_id: Optional[str] = None
+        self._subnets: Optional[Dict[str, Dict[str, str]]] = None  # 학습자 → {SubnetId, CidrBlock}
+        self._lock = threading.Lock()
+
+    def _tags(self, resource_type: str, name: str, learner: Optional[str] = None) -> List[Dict[str, Any]]:
+        tags = [{"Key": "Name", "Value": name}, {"Key": COHORT_TAG, "Value": self.cohort}]
+        if learner is not None:
+            tags.append({"Key": LEARNER_TAG, "Value": learner})
+        return [{"ResourceType": resource_type, "Tags": tags}]
+
+    # ---- 공용 VPC ----
+
+    def _cohort_vpcs(self) -> List[Dict[str, Any]]:
+        """과정 태그가 붙은 VPC (ID 순, 동시에 만들어진 경우 첫 번째가 공용 VPC)"""
+        vpcs = self.ec2.describe_vpcs(
+            Filters=[{"Name": f"tag:{COHORT_TAG}", "Values": [self.cohort]}])["Vpcs"]
+        return sorted(vpcs, key=lambda vpc: vpc["VpcId"])
+
+    def _attached_gateway(self, vpc_id: str) -> Optional[str]:
+        gateways = self.ec2.describe_internet_gateways(
+            Filters=[{"Name": "attachment.vpc-id", "Values": [vpc_id]}])["InternetGateways"]
+        return gateways[0]["InternetGatewayId"] if gateways else None
+
+    def _ensure_internet_route(self, vpc_id: str) -> str:
+        """
+        VPC 에 인터넷 게이트웨이와 기본 라우트 테이블의 0.0.0.0/0 경로 보장 (빠진 것만 생성)
+
+        붙이기에 실패하면 만든 게이트웨이를 지우고, 다른 프로세스가 먼저 붙인 경우(Resource.AlreadyAssociated)
+        그쪽 것을 사용합니다.
+
+        Returns:
+            인터넷 게이트웨이 ID
+        """
+        igw_id = self._attached_gateway(vpc_id)
+        if igw_id is None:
+            igw_id = self.ec2.create_internet_gateway(
+                TagSpecifications=self._tags("internet-gateway", f"{self.cohort}-igw"))["InternetGateway"][
+                "InternetGatewayId"]
+            try:
+                self.ec2.attach_internet_gateway(InternetGatewayId=igw_id, VpcId=vpc_id)
+            except Exception as e:
+                # 붙이지 못한 게이트웨이는 남기지 않음
+                self.ec2.delete_internet_gateway(InternetGatewayId=igw_id)
+                if not (isinstance(e, ClientError)
+                        and e.response["Error"]["Code"] == "Resource.AlreadyAssociated"):
+                    raise
+                igw_id = self._attached_gateway(vpc_id)
+                if igw_id is None:
+                    raise
+        # 학습자 서브넷은 명시적 연결 없이 기본 라우트 테이블을 사용
+        main_table = self.ec2.describe_route_tables(Filters=[
+            {"Name": "vpc-id", "Values": [vpc_id]},
+            {"Name": "association.main", "Values": ["true"]}])["RouteTables"][0]
+        if not any(route.get("DestinationCidrBlock") == "0.0.0.0/0" for route in main_table.get("Routes", [])):
+            try:
+                self.ec2.create_route(RouteTableId=main_table["RouteTableId"], DestinationCidrBlock="0.0.0.0/0",
+                                      GatewayId=igw_id)
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "RouteAlreadyExists":
+                    raise
+        return igw_id
+
+    def ensure_vpc(self, create: bool = True) -> Optional[str]:
+        """
+        공용 VPC 조회, 없으면 VPC + 인터넷 게이트웨이 + 기본 경로 생성 (create=False 면 조회만)
+
+        vpc_id 는 인터넷 경로까지 준비된 뒤에만 기록하므로, 중간에 실패하면 다음 호출이 빠진 부분을 다시 만듭니다.
+        """
+        with self._lock:
+            if self.vpc_id is not None:
+                return self.vpc_id
+            vpcs = self._cohort_vpcs()
+            created = None
+            if not vpcs:
+                if not create:
+                    return None
+                created = self.ec2.create_vpc(
+                    CidrBlock=self.vpc_cidr, TagSpecifications=self._tags("vpc", f"{self.cohort}-vpc"))["Vpc"]
+                # 같은 순간 다른 프로세스도 만들었다면 ID 가 가장 작은 VPC 로 모으고 나머지는 만든 쪽이 삭제
+                vpcs = self._cohort_vpcs() or [created]
+                if vpcs[0]["VpcId"] != created["VpcId"]:
+                    logger.info(f"다른 프로세스가 만든 공용 VPC {vpcs[0]['VpcId']} 사용, {created['VpcId']} 삭제")
+                    self.ec2.delete_vpc(VpcId=created["VpcId"])
+            vpc = vpcs[0]
+            if not create:
+                # 조회만 할 때는 누락된 게이트웨이를 만들지 않음 (정리 경로)
+                igw_id = self._attached_gateway(vpc["VpcId"])
+            else:
+                igw_id = self._ensure_internet_route(vpc["VpcId"])
+
+            self.allocator = CidrAllocator(vpc["CidrBlock"], self.allocator.prefix_length)
+            self.internet_gateway_id = igw_id
+            self.vpc_id = vpc["VpcId"]
+            if created is not None and created["VpcId"] == self.vpc_id:
+                self._subnets = {}
+                logger.info(f"✅ 공용 VPC 생성 완료: {self.vpc_id} ({self.cohort}, {self.vpc_cidr})")
+            else:
+                logger.info(f"공용 VPC 재사용: {self.vpc_id} ({self.cohort})")
+            return self.vpc_id
+
+    def _load_subnets(self) -> Dict[str, Dict[str, str]]:
+        """공용 VPC 의 기존 서브넷을 한 번만 조회해 할당기에 반영"""
+        with self._lock:
+            if self._subnets is None:
+                self._subnets = {}
+                response = self.ec2.describe_subnets(Filters=[{"Name": "vpc-id", "Values": [self.vpc_id]}])
+                for subnet in response["Subnets"]:
+                    learner = next((t["Value"] for t in subnet.get("Tags", []) if t["Key"] == LEARNER_TAG), None)
+                    self.allocator.mark_used(subnet["CidrBlock"], learner)
+                    if learner is not None:
+                        self._subnets[learner] = {"SubnetId": subnet["SubnetId"],
+                                                  "CidrBlock": subnet["CidrBlock"]}
+            return self._subnets
+
+    # ---- 학습자 서브넷 ----
+
+    def _create_subnet(self, learner: str) -> Dict[str, str]:
+        cidr = self.allocator.allocate(learner)
+        for attempt in range(self.conflict_retries + 1):
+            kwargs = {"VpcId": self.vpc_id, "CidrBlock": cidr,
+                      "TagSpecifications": self._tags("subnet", f"{self.cohort}-{learner}-subnet", learner)}
+            if self.availability_zones:
+                block_index = int(ipaddress.ip_network(cidr).network_address) >> (32 - self.allocator.prefix_length)
+                kwargs["AvailabilityZone"] = self.availability_zones[block_index % len(self.availability_zones)]
+            try:
+                subnet = self.ec2.create_subnet(**kwargs)["Subnet"]
+                return {"SubnetId": subnet["SubnetId"], "CidrBlock": subnet["CidrBlock"]}
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "InvalidSubnet.Conflict" or attempt == self.conflict_retries:
+                    raise
+                logger.info(f"CIDR {cidr} 이(가) 이미 사용 중이어서 다음 블록으로 다시 시도합니다 ({learner})")
+                cidr = self.allocator.reassign(learner)
+
+    def ensure_subnets(self, learners: Iterable[str]) -> Dict[str, str]:
+        """
+        학습자별 서브넷 보장 (없는 학습자만 동시에 생성)
+
+        Returns:
+            학습자 → 서브넷 ID
+
+        Raises:
+            CidrExhaustedError: VPC CIDR 에 남은 블록이 없을 때
+        """
+        self.ensure_vpc()
+        existing = self._load_subnets()
+        learners = list(dict.fromkeys(learners))
+        missing = [learner for learner in learners if learner not in existing]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                created = list(executor.map(self._create_subnet, missing))
+            with self._lock:
+                existing.update(zip(missing, created))
+            logger.info(f"✅ 학습자 서브넷 {len(missing)}개 생성 ({self.cohort}, 남은 블록 {self.allocator.available}개)")
+        return {learner: existing[learner]["SubnetId"] for learner in learners}
+
+    def ensure_subnet(self, learner: str) -> str:
+        """학습자 한 명의 서브넷 ID"""
+        return self.ensure_subnets([learner])[learner]
+
+    def release(self, learners: Iterable[str]) -> Dict[str, Exception]:
+        """학습자 서브넷을 동시에 삭제하고 CIDR 반환 (실패한 학습자 → 오류)"""
+        if self.ensure_vpc(create=False) is None:
+            return {}
+        existing = self._load_subnets()
+        targets = [learner for learner in dict.fromkeys(learners) if learner in existing]
+        failures: Dict[str, Exception] = {}
+
+        def delete(learner: str):
+            try:
+                self.ec2.delete_subnet(SubnetId=existing[learner]["SubnetId"])
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "InvalidSubnetID.NotFound":
+                    failures[learner] = e
+                    return
+            with self._lock:
+                existing.pop(learner, None)
+            self.allocator.release(learner)
+
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets))) as executor:
+                list(executor.map(delete, targets))
+        return failures
+
+    def teardown(self) -> Dict[str, Exception]:
+        """모든 학습자 서브넷과 공용 VPC / 인터넷 게이트웨이 삭제"""
+        if self.ensure_vpc(create=False) is None:
+            return {}
+        failures = self.release(list(self._load_subnets()))
+        if failures:
+            return failures
+        if self.internet_gateway_id:
+            self.ec2.detach_internet_gateway(InternetGatewayId=self.internet_gateway_id, VpcId=self.vpc_id)
+            self.ec2.delete_internet_gateway(InternetGatewayId=self.internet_gateway_id)
+        self.ec2.delete_vpc(VpcId=self.vpc_id)
+        logger.info(f"🗑️ 공용 VPC 삭제 완료: {self.vpc_id} ({self.cohort})")
+        with self._lock:
+            self.vpc_id = self.internet_gateway_id = self._subnets = None
+        return {}
+
+
+_networks: Dict[Tuple[Optional[str], Optional[str], str], CohortNetwork] = {}
+_networks_lock = threading.Lock()
+
+
+def get_cohort_network(ec2_client: Any, cohort: str, account: Optional[str] = None,
+                       **kwargs) -> CohortNetwork:
+    """
+    (계정, 리전, 과정)별 프로세스 공용 네트워크
+
+    같은 과정의 학습자들이 VPC 확인 / 생성을 한 번만 수행합니다. 과정 이름이 같아도 계정이나
+    리전이 다르면 VPC 가 다르므로 따로 관리합니다.
+
+    Args:
+        ec2_client: EC2 클라이언트 (리전은 client.meta.region_name)
+        cohort: 과정(기수) 이름
+        account: AWS 계정 ID
+    """
+    key = (account, getattr(ec2_client.meta, "region_name", None), cohort)
+    with _networks_lock:
+        network = _networks.get(key)
+        if network is None:
+            network = CohortNetwork(ec2_client, cohort, **kwargs)
+            _networks[key] = network
+        return network
+
+
+def main():
+    """명령행: python cohort_network.py --cohort COHORT --learners a,b,c [--release | --teardown]"""
+    import os
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="과정 공용 VPC 와 학습자 서브넷 관리")
+    parser.add_argument("--cohort", default=os.getenv("COURSE_COHORT"), help="과정(기수) 이름")
+    parser.add_argument("--learners", default="", help="학습자 ID 목록 (쉼표 구분)")
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "ap-northeast-2"))
+    parser.add_argument("--vpc-cidr", default="10.0.0.0/16")
+    parser.add_argument("--subnet-prefix", type=int, default=24, help="학습자 서브넷 크기 (/24)")
+    parser.add_argument("--zones", default="", help="가용 영역 목록 (쉼표 구분, 예: a,c)")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--release", action="store_true", help="학습자 서브넷 삭제")
+    action.add_argument("--teardown", action="store_true", help="과정 네트워크 전체 삭제")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.cohort:
+        parser.error("--cohort 또는 COURSE_COHORT 가 필요합니다")
+
+    from client_registry import get_client_registry
+    ec2 = get_client_registry({"aws_region": args.region}).get_client("ec2", args.region)
+    zones = [z if z.startswith(args.region) else f"{args.region}{z}" for z in args.zones.split(",") if z]
+    network = CohortNetwork(ec2, args.cohort, args.vpc_cidr, args.subnet_prefix, zones)
+    learners = [learner.strip() for learner in args.learners.split(",") if learner.strip()]
+
+    if args.teardown:
+        failures = network.teardown()
+    elif args.release:
+        failures = network.release(learners)
+    else:
+        subnets = network.ensure_subnets(learners)
+        print(json.dumps({"vpc_id": network.vpc_id, "subnets": subnets}, ensure_ascii=False, indent=2))
+        return 0
+    for learner, error in failures.items():
+        logger.error(f"❌ {learner} 서브넷 삭제 실패: {error}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from pathlib import Path
+
+from . import cloud_basic_course_automation
+from .testing.fake_cloud import FakeCloud, FakeClientRegistry
+from .run_history import RunHistoryStore
+from .readiness_poller import ReadinessPoller
+from .storage_standin import StorageStandinServer
+
+
+@pytest.fixture(scope="session")
+def fake_cloud():
+    """Stateful fake AWS/GCP backend shared by the whole session."""
+    return FakeCloud()
+
+
+@pytest.fixture(scope="session")
+def automation_factory(fake_cloud):
+    """Build BasicCourseAutomation instances wired to the session fake backend.
+
+    Patches are applied once per session; tests reset the backend state instead
+    of rebuilding mock trees.
+    """
+    registry = FakeClientRegistry(fake_cloud)
+    history = RunHistoryStore(Path(":memory:"))
+    poller = ReadinessPoller(registry.get_client("ec2"), min_interval=0.01, max_interval=0.05)
+    module = cloud_basic_course_automation
+
+    with patch.object(module, "get_client_registry", return_value=registry), \
+         patch.object(module, "get_readiness_poller", return_value=poller), \
+         patch.object(module, "get_run_history", return_value=history), \
+         patch.object(module, "build", side_effect=fake_cloud.gcp_service):
+
+        def factory(**config_overrides):
+            automation = module.BasicCourseAutomation(Path("/fake/path"))
+            automation.config.update({"sg_delete_retry_delay": 0, "gcp_project_id": "mock-gcp-project"})
+            automation.config.update(config_overrides)
+            return automation
+
+        yield factory
+
+
+@pytest.fixture
+def automation(fake_cloud, automation_factory):
+    """BasicCourseAutomation on a freshly reset fake backend."""
+    fake_cloud.reset()
+    return automation_factory()
+
+
+@pytest.fixture(scope="session")
+def storage_standin():
+    """In-memory S3/GCS stand-in server shared by the storage tests."""
+    server = StorageStandinServer().start()
+    yield server
+    server.stop()
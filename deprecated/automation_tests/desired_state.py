@@ -0,0 +1,805 @@
+#!/usr/bin/env python3
+"""
+선언형 공유 리소스 조정(reconcile) 엔진
+cloud_basic_config.json 의 environment_setup / shared_resources 를 원하는 상태로 보고
+현재 상태와의 차이만큼만 생성 / 변경 / 삭제 작업을 계획하고 실행합니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차: VPC, 서브넷, 보안 그룹, S3 버킷, IAM 역할
+  - Cloud Basic 2일차: GCP 네트워크, 서브넷
+- 주요 기능:
+  - 현재 상태는 리소스 유형별로 한 번의 목록 조회(관리 태그 / 이름 접두사 필터)로 가져옵니다.
+  - 계획(plan)에는 실제로 필요한 작업만 들어가므로 이미 갖춰진 환경을 다시 실행하면 변경 호출이 거의 없습니다.
+  - 의존 관계가 풀린 작업부터 병렬로 실행합니다. (삭제는 의존 관계의 역순)
+  - 원하는 상태와 관측 상태의 해시로 계획을 캐시하고, 수렴이 확인된 명세는 지정한 시간 동안 조회를 생략할 수 있습니다.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import logging
+import ipaddress
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+MANAGED_TAG = "managed-by"
+MANAGED_VALUE = "cloud-basic-desired-state"
+PREFIX_TAG = "desired-state-prefix"
+IAM_PATH_ROOT = "/cloud-basic/"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "cloud-basic" / "plan_cache"
+
+# shared_resources 의 표시 이름 → 내부 리소스 유형
+AWS_RESOURCE_TYPES = {
+    "VPC": "vpc",
+    "Subnet": "subnet",
+    "Security Group": "security_group",
+    "S3 Bucket": "s3_bucket",
+    "IAM Role": "iam_role",
+}
+GCP_RESOURCE_TYPES = {
+    "Network": "gcp_network",
+    "Subnet": "gcp_subnetwork",
+}
+# 생성 대상이 아닌 전제 조건 (명세 변환 시 건너뜀)
+GCP_PRECONDITIONS = {"Project"}
+
+# 삭제 시 역순 처리를 위한 의존 관계 (자식 → 부모)
+PARENT_TYPES = {
+    "subnet": "vpc",
+    "security_group": "vpc",
+    "gcp_subnetwork": "gcp_network",
+}
+
+DEFAULT_INGRESS_PORTS = (22, 80, 443)
+EC2_TRUST_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [{
+        "Effect": "Allow",
+        "Principal": {"Service": "ec2.amazonaws.com"},
+        "Action": "sts:AssumeRole",
+    }],
+}
+
+
+class DesiredResource:
+    """원하는 상태의 리소스 하나"""
+
+    __slots__ = ("key", "type", "name", "properties", "depends_on")
+
+    def __init__(self, key: str, resource_type: str, name: str,
+                 properties: Optional[Dict[str, Any]] = None,
+                 depends_on: Tuple[str, ...] = ()):
+        self.key = key
+        self.type = resource_type
+        self.name = name
+        self.properties = properties or {}
+        self.depends_on = tuple(depends_on)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"key": self.key, "type": self.type, "name": self.name,
+                "properties": self.properties, "depends_on": list(self.depends_on)}
+
+
+class PlanOperation:
+    """계획에 포함된 작업 하나 (create / update / delete)"""
+
+    __slots__ = ("action", "key", "type", "name", "params", "depends_on")
+
+    def __init__(self, action: str, key: str, resource_type: str, name: str,
+                 params: Optional[Dict[str, Any]] = None,
+                 depends_on: Tuple[str, ...] = ()):
+        self.action = action
+        self.key = key
+        self.type = resource_type
+        self.name = name
+        self.params = params or {}
+        self.depends_on = tuple(depends_on)
+
+    @property
+    def op_id(self) -> str:
+        return f"{self.action}:{self.key}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"action": self.action, "key": self.key, "type": self.type, "name": self.name,
+                "params": self.params, "depends_on": list(self.depends_on)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlanOperation":
+        return cls(data["action"], data["key"], data["type"], data["name"],
+                   data.get("params"), tuple(data.get("depends_on", ())))
+
+    def __repr__(self) -> str:
+        return f"PlanOperation({self.action} {self.type} {self.name})"
+
+
+class Plan:
+    """조정 계획"""
+
+    def __init__(self, operations: List[PlanOperation], warnings: Optional[List[str]] = None,
+                 spec_hash: str = "", state_hash: str = "", cached: bool = False):
+        self.operations = operations
+        self.warnings = warnings or []
+        self.spec_hash = spec_hash
+        self.state_hash = state_hash
+        self.cached = cached
+
+    @property
+    def empty(self) -> bool:
+        return not self.operations
+
+    def summary(self) -> Dict[str, int]:
+        counts = {"create": 0, "update": 0, "delete": 0}
+        for op in self.operations:
+            counts[op.action] += 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"operations": [op.to_dict() for op in self.operations],
+                "warnings": self.warnings, "spec_hash": self.spec_hash,
+                "state_hash": self.state_hash}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], cached: bool = False) -> "Plan":
+        return cls([PlanOperation.from_dict(op) for op in data.get("operations", [])],
+                   data.get("warnings"), data.get("spec_hash", ""), data.get("state_hash", ""),
+                   cached=cached)
+
+
+def _ref(key: str) -> Dict[str, str]:
+    """실행 시점에 다른 리소스의 ID 로 치환되는 참조"""
+    return {"$ref": key}
+
+
+def _digest(data: Any) -> str:
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def build_desired_state(course_config: Dict[str, Any], prefix: str,
+                        include_gcp: bool = True,
+                        gcp_region: str = "asia-northeast3") -> List[DesiredResource]:
+    """
+    과정 설정(cloud_basic_config.json)에서 원하는 상태 목록 생성
+
+    Args:
+        course_config: 과정 설정 사전
+        prefix: 리소스 이름 접두사
+        include_gcp: GCP 리소스 포함 여부
+        gcp_region: GCP 서브넷 리전
+    """
+    env = course_config.get("environment_setup", {})
+    shared = course_config.get("shared_resources", {})
+    region = env.get("aws_region", "us-west-2")
+    vpc_cidr = ipaddress.ip_network(env.get("vpc_cidr", "10.0.0.0/16"))
+    subnet_cidr = str(next(vpc_cidr.subnets(new_prefix=max(vpc_cidr.prefixlen, 24))))
+
+    requested = set()
+    for label in shared.get("aws_resources", []):
+        if label not in AWS_RESOURCE_TYPES:
+            raise ValueError(f"알 수 없는 AWS 공유 리소스: {label}")
+        requested.add(AWS_RESOURCE_TYPES[label])
+    if include_gcp:
+        for label in shared.get("gcp_resources", []):
+            if label in GCP_PRECONDITIONS:
+                continue
+            if label not in GCP_RESOURCE_TYPES:
+                raise ValueError(f"알 수 없는 GCP 공유 리소스: {label}")
+            requested.add(GCP_RESOURCE_TYPES[label])
+
+    # 서브넷 / 보안 그룹은 VPC 가 있어야 하므로 명세에 없더라도 VPC 를 함께 관리
+    for child, parent in PARENT_TYPES.items():
+        if child in requested:
+            requested.add(parent)
+
+    resources = []
+    if "vpc" in requested:
+        resources.append(DesiredResource("vpc", "vpc", f"{prefix}-vpc",
+                                         {"CidrBlock": str(vpc_cidr)}))
+    if "subnet" in requested:
+        resources.append(DesiredResource("subnet", "subnet", f"{prefix}-subnet",
+                                         {"CidrBlock": subnet_cidr,
+                                          "AvailabilityZone": f"{region}a"}, ("vpc",)))
+    if "security_group" in requested:
+        resources.append(DesiredResource("security_group", "security_group", f"{prefix}-shared-sg",
+                                         {"Description": "Cloud Basic shared security group",
+                                          "IngressPorts": list(DEFAULT_INGRESS_PORTS)}, ("vpc",)))
+    if "s3_bucket" in requested:
+        resources.append(DesiredResource("s3_bucket", "s3_bucket", f"{prefix}-shared-{region}",
+                                         {"Region": region}))
+    if "iam_role" in requested:
+        resources.append(DesiredResource("iam_role", "iam_role", f"{prefix}-shared-role",
+                                         {"AssumeRolePolicyDocument": EC2_TRUST_POLICY,
+                                          "Path": f"{IAM_PATH_ROOT}{prefix}/"}))
+    if "gcp_network" in requested:
+        resources.append(DesiredResource("gcp_network", "gcp_network", f"{prefix}-network",
+                                         {"autoCreateSubnetworks": False}))
+    if "gcp_subnetwork" in requested:
+        resources.append(DesiredResource("gcp_subnetwork", "gcp_subnetwork", f"{prefix}-subnet",
+                                         {"ipCidrRange": course_config.get("gcp_subnet_cidr", "10.10.0.0/24"),
+                                          "region": gcp_region}, ("gcp_network",)))
+    return resources
+
+
+class PlanCache:
+    """명세 해시별 계획 캐시 (JSON 파일)"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or os.getenv(
+            "DESIRED_STATE_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self._lock = threading.Lock()
+
+    def _path(self, spec_hash: str) -> Path:
+        return self.cache_dir / f"{spec_hash}.json"
+
+    def load(self, spec_hash: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(spec_hash).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def store(self, spec_hash: str, entry: Dict[str, Any]):
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(spec_hash)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(entry, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp_path, path)
+
+    def lookup(self, spec_hash: str, state_hash: str) -> Optional[Plan]:
+        """같은 명세 / 같은 관측 상태로 계산된 계획 조회"""
+        entry = self.load(spec_hash)
+        if entry and entry.get("plan", {}).get("state_hash") == state_hash:
+            return Plan.from_dict(entry["plan"], cached=True)
+        return None
+
+    def converged_recently(self, spec_hash: str, max_age: float) -> bool:
+        """명세가 max_age 초 이내에 수렴(빈 계획)한 것으로 확인되었는지"""
+        if max_age <= 0:
+            return False
+        entry = self.load(spec_hash)
+        return bool(entry and entry.get("converged_at")
+                    and time.time() - entry["converged_at"] <= max_age)
+
+    def mark_converged(self, spec_hash: str):
+        entry = self.load(spec_hash) or {}
+        entry["converged_at"] = time.time()
+        self.store(spec_hash, entry)
+
+
+class DesiredStateReconciler:
+    """원하는 상태와 현재 상태를 비교하여 최소 작업 계획을 만들고 실행"""
+
+    def __init__(self, resources: List[DesiredResource], prefix: str,
+                 aws_clients: Any, compute: Any = None, gcp_project_id: Optional[str] = None,
+                 plan_cache: Optional[PlanCache] = None, max_workers: int = 8,
+                 gcp_region: str = "asia-northeast3"):
+        """
+        DesiredStateReconciler 초기화
+
+        Args:
+            resources: 원하는 상태 목록 (build_desired_state 결과)
+            prefix: 리소스 이름 접두사 (관리 범위)
+            aws_clients: 서비스 이름 → boto3 클라이언트 매핑 (ec2, s3, iam)
+            compute: googleapiclient compute 서비스 (GCP 리소스가 있을 때 필요)
+            gcp_project_id: GCP 프로젝트 ID
+            plan_cache: 계획 캐시 (None 이면 캐시하지 않음)
+            max_workers: 동시에 실행할 최대 API 호출 수
+            gcp_region: 명세에 서브넷이 없을 때도 정리 대상을 찾을 GCP 리전
+        """
+        self.resources = {r.key: r for r in resources}
+        self.prefix = prefix
+        self.aws_clients = aws_clients
+        self.compute = compute
+        self.gcp_project_id = gcp_project_id
+        self.plan_cache = plan_cache
+        self.max_workers = max_workers
+        self.gcp_region = gcp_region
+        self._compute_lock = threading.Lock()
+
+    @property
+    def spec_hash(self) -> str:
+        return _digest({"prefix": self.prefix, "project": self.gcp_project_id,
+                        "resources": [r.to_dict() for r in self.resources.values()]})
+
+    def _managed_tags(self, name: str) -> List[Dict[str, str]]:
+        return [{"Key": "Name", "Value": name},
+                {"Key": MANAGED_TAG, "Value": MANAGED_VALUE},
+                {"Key": PREFIX_TAG, "Value": self.prefix}]
+
+    def _managed_filters(self) -> List[Dict[str, Any]]:
+        return [{"Name": f"tag:{MANAGED_TAG}", "Values": [MANAGED_VALUE]},
+                {"Name": f"tag:{PREFIX_TAG}", "Values": [self.prefix]}]
+
+    def _managed_description(self) -> str:
+        # Compute 네트워크 / 서브넷은 라벨을 지원하지 않으므로 description 에 관리 표시를 남김
+        return f"{MANAGED_TAG}={MANAGED_VALUE};{PREFIX_TAG}={self.prefix}"
+
+    def _owns_bucket(self, bucket: str) -> bool:
+        """버킷 태그로 이 명세(prefix)가 관리하는 버킷인지 확인 (태그가 없거나 조회할 수 없으면 제외)"""
+        try:
+            response = self.aws_clients["s3"].get_bucket_tagging(Bucket=bucket)
+        except ClientError as e:
+            logger.debug(f"{bucket} 태그 조회 불가, 관리 대상에서 제외: {e}")
+            return False
+        tags = {t["Key"]: t["Value"] for t in response.get("TagSet", [])}
+        return tags.get(MANAGED_TAG) == MANAGED_VALUE and tags.get(PREFIX_TAG) == self.prefix
+
+    # ---- 현재 상태 조회 ----
+
+    def _fetch_vpcs(self) -> List[Dict[str, Any]]:
+        response = self.aws_clients["ec2"].describe_vpcs(Filters=self._managed_filters())
+        return [{"type": "vpc", "id": v["VpcId"], "name": _tag_value(v, "Name"),
+                 "CidrBlock": v.get("CidrBlock")} for v in response.get("Vpcs", [])]
+
+    def _fetch_subnets(self) -> List[Dict[str, Any]]:
+        response = self.aws_clients["ec2"].describe_subnets(Filters=self._managed_filters())
+        return [{"type": "subnet", "id": s["SubnetId"], "name": _tag_value(s, "Name"),
+                 "VpcId": s.get("VpcId"), "CidrBlock": s.get("CidrBlock")}
+                for s in response.get("Subnets", [])]
+
+    def _fetch_security_groups(self) -> List[Dict[str, Any]]:
+        response = self.aws_clients["ec2"].describe_security_groups(Filters=self._managed_filters())
+        return [{"type": "security_group", "id": g["GroupId"], "name": g["GroupName"],
+                 "VpcId": g.get("VpcId"),
+                 "IngressPorts": sorted({p.get("FromPort") for p in g.get("IpPermissions", [])
+                                         if p.get("FromPort") is not None})}
+                for g in response.get("SecurityGroups", [])]
+
+    def _fetch_buckets(self) -> List[Dict[str, Any]]:
+        response = self.aws_clients["s3"].list_buckets()
+        bucket_prefix = f"{self.prefix}-shared-"
+        return [{"type": "s3_bucket", "id": b["Name"], "name": b["Name"]}
+                for b in response.get("Buckets", [])
+                if b["Name"].startswith(bucket_prefix) and self._owns_bucket(b["Name"])]
+
+    def _fetch_roles(self) -> List[Dict[str, Any]]:
+        paginator = self.aws_clients["iam"].get_paginator("list_roles")
+        roles = []
+        for page in paginator.paginate(PathPrefix=f"{IAM_PATH_ROOT}{self.prefix}/"):
+            for role in page.get("Roles", []):
+                policy = role.get("AssumeRolePolicyDocument")
+                if isinstance(policy, str):
+                    policy = json.loads(policy)
+                roles.append({"type": "iam_role", "id": role["RoleName"], "name": role["RoleName"],
+                              "AssumeRolePolicyDocument": policy})
+        return roles
+
+    def _gcp_list(self, collection: Any, **kwargs) -> List[Dict[str, Any]]:
+        """이름이 '<prefix>-' 로 시작하고 관리 표시가 있는 리소스만 조회 (다른 접두사 / 수동 생성 리소스 제외)"""
+        items = []
+        with self._compute_lock:
+            request = collection.list(project=self.gcp_project_id,
+                                      filter=f'name eq "{re.escape(self.prefix)}-.*"', **kwargs)
+            while request is not None:
+                response = request.execute()
+                items.extend(response.get("items", []))
+                request = collection.list_next(request, response)
+        # 필터는 정규식이라 'lab' 이 'lab-2-net' 도 찾으므로 관리 표시로 소유 범위를 다시 확인
+        marker = self._managed_description()
+        return [item for item in items
+                if item["name"].startswith(f"{self.prefix}-") and item.get("description") == marker]
+
+    def _fetch_networks(self) -> List[Dict[str, Any]]:
+        return [{"type": "gcp_network", "id": n["name"], "name": n["name"],
+                 "autoCreateSubnetworks": n.get("autoCreateSubnetworks", False)}
+                for n in self._gcp_list(self.compute.networks())]
+
+    def _fetch_subnetworks(self) -> List[Dict[str, Any]]:
+        regions = {r.properties["region"] for r in self.resources.values() if r.type == "gcp_subnetwork"}
+        regions.add(self.gcp_region)
+        found = []
+        for region in sorted(regions):
+            for s in self._gcp_list(self.compute.subnetworks(), region=region):
+                found.append({"type": "gcp_subnetwork", "id": s["name"], "name": s["name"],
+                              "ipCidrRange": s.get("ipCidrRange"), "region": region})
+        return found
+
+    def fetch_state(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        관리 범위의 현재 리소스를 유형별로 한 번씩 병렬 조회
+
+        Returns:
+            리소스 유형 → 관측된 리소스 목록
+        """
+        fetchers = {
+            "vpc": self._fetch_vpcs,
+            "subnet": self._fetch_subnets,
+            "security_group": self._fetch_security_groups,
+            "s3_bucket": self._fetch_buckets,
+            "iam_role": self._fetch_roles,
+        }
+        if self.compute is not None:
+            fetchers["gcp_network"] = self._fetch_networks
+            fetchers["gcp_subnetwork"] = self._fetch_subnetworks
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(fetchers))) as executor:
+            futures = {rtype: executor.submit(fetch) for rtype, fetch in fetchers.items()}
+        state = {rtype: future.result() for rtype, future in futures.items()}
+        for items in state.values():
+            items.sort(key=lambda item: item["name"] or "")
+        return state
+
+    # ---- 계획 ----
+
+    def plan(self, state: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+             prune: bool = False) -> Plan:
+        """
+        최소 작업 계획 계산
+
+        Args:
+            state: fetch_state() 결과 (None 이면 조회)
+            prune: 명세에서 빠진 관리 리소스 삭제 여부
+        """
+        state = self.fetch_state() if state is None else state
+        spec_hash = self.spec_hash
+        state_hash = _digest({"state": state, "prune": prune})
+        if self.plan_cache is not None:
+            cached = self.plan_cache.lookup(spec_hash, state_hash)
+            if cached is not None:
+                logger.info("♻️ 캐시된 계획 재사용")
+                return cached
+
+        operations: List[PlanOperation] = []
+        warnings: List[str] = []
+        observed_by_name = {(rtype, item["name"]): item
+                            for rtype, items in state.items() for item in items}
+        existing_ids = {}
+        for resource in self.resources.values():
+            observed = observed_by_name.get((resource.type, resource.name))
+            if observed is not None:
+                existing_ids[resource.key] = observed["id"]
+
+        for resource in self.resources.values():
+            observed = observed_by_name.get((resource.type, resource.name))
+            operations.extend(self._diff(resource, observed, existing_ids, warnings))
+
+        if prune:
+            operations.extend(self._prune_operations(state))
+
+        plan = Plan(operations, warnings, spec_hash, state_hash)
+        if self.plan_cache is not None:
+            entry = self.plan_cache.load(spec_hash) or {}
+            entry["plan"] = plan.to_dict()
+            self.plan_cache.store(spec_hash, entry)
+        return plan
+
+    def _diff(self, resource: DesiredResource, observed: Optional[Dict[str, Any]],
+              existing_ids: Dict[str, str], warnings: List[str]) -> List[PlanOperation]:
+        props = resource.properties
+        deps = tuple(f"create:{d}" for d in resource.depends_on if d not in existing_ids)
+
+        if observed is None:
+            # 부모가 이미 있으면 ID 를 바로 넣고, 함께 생성되는 경우에만 실행 시점 참조 사용
+            params = dict(props)
+            if resource.type in ("subnet", "security_group"):
+                params["VpcId"] = existing_ids.get("vpc") or _ref("vpc")
+            if resource.type == "gcp_subnetwork":
+                params["network"] = existing_ids.get("gcp_network") or _ref("gcp_network")
+            return [PlanOperation("create", resource.key, resource.type, resource.name, params, deps)]
+
+        operations = []
+        if resource.type in ("vpc", "subnet") and observed.get("CidrBlock") != props["CidrBlock"]:
+            warnings.append(f"{resource.name}: CIDR 이 다릅니다 ({observed.get('CidrBlock')} → "
+                            f"{props['CidrBlock']}). CIDR 은 변경할 수 없어 재생성이 필요합니다.")
+        elif resource.type == "gcp_subnetwork" and observed.get("ipCidrRange") != props["ipCidrRange"]:
+            warnings.append(f"{resource.name}: IP 범위가 다릅니다 ({observed.get('ipCidrRange')} → "
+                            f"{props['ipCidrRange']}).")
+        elif resource.type == "security_group":
+            missing = sorted(set(props["IngressPorts"]) - set(observed.get("IngressPorts", [])))
+            if missing:
+                operations.append(PlanOperation("update", resource.key, resource.type, resource.name,
+                                                {"GroupId": observed["id"], "IngressPorts": missing}))
+        elif resource.type == "iam_role":
+            if observed.get("AssumeRolePolicyDocument") != props["AssumeRolePolicyDocument"]:
+                operations.append(PlanOperation(
+                    "update", resource.key, resource.type, resource.name,
+                    {"AssumeRolePolicyDocument": props["AssumeRolePolicyDocument"]}))
+        return operations
+
+    def _prune_operations(self, state: Dict[str, List[Dict[str, Any]]]) -> List[PlanOperation]:
+        desired = {(r.type, r.name) for r in self.resources.values()}
+        stale = [item for items in state.values() for item in items
+                 if (item["type"], item["name"]) not in desired]
+
+        operations = []
+        for item in stale:
+            key = f"stale:{item['type']}:{item['name']}"
+            params = {"id": item["id"]}
+            if item["type"] == "gcp_subnetwork":
+                params["region"] = item["region"]
+            operations.append(PlanOperation("delete", key, item["type"], item["name"], params))
+
+        # 부모 리소스 삭제는 같은 부모에 속한 자식 삭제가 끝난 뒤에 실행
+        for op in operations:
+            children = [child for child in operations
+                        if PARENT_TYPES.get(child.type) == op.type]
+            if op.type == "vpc":
+                children = [child for child in children
+                            if _observed_parent(state, child) in (None, op.params["id"])]
+            op.depends_on = tuple(child.op_id for child in children)
+        return operations
+
+    # ---- 실행 ----
+
+    def apply(self, plan: Plan) -> Dict[str, Any]:
+        """
+        계획 실행: 의존 작업이 끝난 작업부터 병렬로 실행
+
+        Returns:
+            {"succeeded": [...], "failed": {op_id: 오류}, "skipped": [...], "ids": {key: id}}
+        """
+        spec_hash = plan.spec_hash or self.spec_hash
+        ids: Dict[str, str] = {}
+        pending = {op.op_id: op for op in plan.operations}
+        planned = set(pending)
+        succeeded: List[str] = []
+        failed: Dict[str, str] = {}
+        skipped: List[str] = []
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for op_id, op in list(pending.items()):
+                    deps = [d for d in op.depends_on if d in planned]
+                    if any(d in failed or d in skipped for d in deps):
+                        skipped.append(op_id)
+                        del pending[op_id]
+                    elif all(d in succeeded for d in deps):
+                        params = _resolve(op.params, ids)
+                        running[executor.submit(self._execute, op, params)] = op
+                        del pending[op_id]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    op = running.pop(future)
+                    try:
+                        resource_id = future.result()
+                    except Exception as e:
+                        # 인증 / 네트워크 / 매개변수 오류도 이 작업의 실패로 기록하고 나머지 작업은 계속 진행
+                        logger.error(f"❌ {op.action} {op.type} {op.name} 실패: {e}")
+                        failed[op.op_id] = str(e)
+                        continue
+                    if resource_id:
+                        ids[op.key] = resource_id
+                    logger.info(f"✅ {op.action} {op.type} {op.name}")
+                    succeeded.append(op.op_id)
+
+        if self.plan_cache is not None and not failed and not skipped:
+            self.plan_cache.mark_converged(spec_hash)
+        return {"succeeded": succeeded, "failed": failed, "skipped": skipped, "ids": ids}
+
+    def reconcile(self, prune: bool = False, dry_run: bool = False,
+                  trust_converged: float = 0.0) -> Tuple[Plan, Optional[Dict[str, Any]]]:
+        """
+        조회 → 계획 → 실행
+
+        Args:
+            prune: 명세에서 빠진 관리 리소스 삭제 여부
+            dry_run: 계획만 계산하고 실행하지 않음
+            trust_converged: 이 시간(초) 이내에 수렴이 확인된 명세는 조회 없이 빈 계획 반환
+        """
+        if self.plan_cache is not None and self.plan_cache.converged_recently(self.spec_hash, trust_converged):
+            logger.info("♻️ 최근 수렴이 확인된 명세입니다. 조회를 생략합니다.")
+            return Plan([], spec_hash=self.spec_hash, cached=True), None
+
+        plan = self.plan(prune=prune)
+        for warning in plan.warnings:
+            logger.warning(f"⚠️ {warning}")
+        if dry_run:
+            return plan, None
+        if plan.empty:
+            if self.plan_cache is not None:
+                self.plan_cache.mark_converged(plan.spec_hash)
+            return plan, {"succeeded": [], "failed": {}, "skipped": [], "ids": {}}
+        return plan, self.apply(plan)
+
+    def _execute(self, op: PlanOperation, params: Dict[str, Any]) -> Optional[str]:
+        handler = getattr(self, f"_{op.action}_{op.type}")
+        return handler(op, params)
+
+    # ---- 유형별 API 호출 ----
+
+    def _create_vpc(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        response = self.aws_clients["ec2"].create_vpc(
+            CidrBlock=params["CidrBlock"],
+            TagSpecifications=[{"ResourceType": "vpc", "Tags": self._managed_tags(op.name)}])
+        return response["Vpc"]["VpcId"]
+
+    def _create_subnet(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        response = self.aws_clients["ec2"].create_subnet(
+            VpcId=params["VpcId"], CidrBlock=params["CidrBlock"],
+            AvailabilityZone=params["AvailabilityZone"],
+            TagSpecifications=[{"ResourceType": "subnet", "Tags": self._managed_tags(op.name)}])
+        return response["Subnet"]["SubnetId"]
+
+    def _create_security_group(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        ec2 = self.aws_clients["ec2"]
+        response = ec2.create_security_group(
+            GroupName=op.name, Description=params["Description"], VpcId=params["VpcId"],
+            TagSpecifications=[{"ResourceType": "security-group", "Tags": self._managed_tags(op.name)}])
+        group_id = response["GroupId"]
+        self._authorize_ports(group_id, params["IngressPorts"])
+        return group_id
+
+    def _update_security_group(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        self._authorize_ports(params["GroupId"], params["IngressPorts"])
+        return params["GroupId"]
+
+    def _authorize_ports(self, group_id: str, ports: List[int]):
+        if not ports:
+            return
+        self.aws_clients["ec2"].authorize_security_group_ingress(
+            GroupId=group_id,
+            IpPermissions=[{"IpProtocol": "tcp", "FromPort": port, "ToPort": port,
+                            "IpRanges": [{"CidrIp": "0.0.0.0/0"}]} for port in ports])
+
+    def _delete_vpc(self, op: PlanOperation, params: Dict[str, Any]):
+        self.aws_clients["ec2"].delete_vpc(VpcId=params["id"])
+
+    def _delete_subnet(self, op: PlanOperation, params: Dict[str, Any]):
+        self.aws_clients["ec2"].delete_subnet(SubnetId=params["id"])
+
+    def _delete_security_group(self, op: PlanOperation, params: Dict[str, Any]):
+        self.aws_clients["ec2"].delete_security_group(GroupId=params["id"])
+
+    def _create_s3_bucket(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        kwargs = {"Bucket": op.name}
+        if params["Region"] != "us-east-1":
+            kwargs["CreateBucketConfiguration"] = {"LocationConstraint": params["Region"]}
+        s3 = self.aws_clients["s3"]
+        try:
+            s3.create_bucket(**kwargs)
+            created = True
+        except ClientError as e:
+            # 이전 적용이 만들고 태그를 달지 못한 버킷은 태그를 달아 관리 대상으로 편입
+            if e.response["Error"]["Code"] != "BucketAlreadyOwnedByYou" or self._bucket_tagged(op.name):
+                raise
+            created = False
+        try:
+            s3.put_bucket_tagging(Bucket=op.name, Tagging={"TagSet": self._managed_tags(op.name)[1:]})
+        except ClientError:
+            # 태그 없는 버킷은 조회에서 빠지므로 남기지 않음
+            if created:
+                s3.delete_bucket(Bucket=op.name)
+            raise
+        return op.name
+
+    def _bucket_tagged(self, bucket: str) -> bool:
+        """관리 태그가 붙은 버킷인지 (다른 명세가 관리하는 버킷은 편입하지 않음)"""
+        try:
+            response = self.aws_clients["s3"].get_bucket_tagging(Bucket=bucket)
+        except ClientError:
+            return False
+        return any(t["Key"] == MANAGED_TAG for t in response.get("TagSet", []))
+
+    def _delete_s3_bucket(self, op: PlanOperation, params: Dict[str, Any]):
+        self.aws_clients["s3"].delete_bucket(Bucket=params["id"])
+
+    def _create_iam_role(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        self.aws_clients["iam"].create_role(
+            RoleName=op.name, Path=params["Path"],
+            AssumeRolePolicyDocument=json.dumps(params["AssumeRolePolicyDocument"]),
+            Tags=self._managed_tags(op.name)[1:])
+        return op.name
+
+    def _update_iam_role(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        self.aws_clients["iam"].update_assume_role_policy(
+            RoleName=op.name, PolicyDocument=json.dumps(params["AssumeRolePolicyDocument"]))
+        return op.name
+
+    def _delete_iam_role(self, op: PlanOperation, params: Dict[str, Any]):
+        self.aws_clients["iam"].delete_role(RoleName=params["id"])
+
+    def _compute_execute(self, request: Any) -> Dict[str, Any]:
+        # googleapiclient 서비스 객체는 스레드 안전하지 않으므로 직렬화
+        with self._compute_lock:
+            return request.execute()
+
+    def _create_gcp_network(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        self._compute_execute(self.compute.networks().insert(
+            project=self.gcp_project_id,
+            body={"name": op.name, "autoCreateSubnetworks": params["autoCreateSubnetworks"],
+                  "description": self._managed_description()}))
+        return op.name
+
+    def _delete_gcp_network(self, op: PlanOperation, params: Dict[str, Any]):
+        self._compute_execute(self.compute.networks().delete(
+            project=self.gcp_project_id, network=params["id"]))
+
+    def _create_gcp_subnetwork(self, op: PlanOperation, params: Dict[str, Any]) -> str:
+        network = f"projects/{self.gcp_project_id}/global/networks/{params['network']}"
+        self._compute_execute(self.compute.subnetworks().insert(
+            project=self.gcp_project_id, region=params["region"],
+            body={"name": op.name, "network": network, "ipCidrRange": params["ipCidrRange"],
+                  "description": self._managed_description()}))
+        return op.name
+
+    def _delete_gcp_subnetwork(self, op: PlanOperation, params: Dict[str, Any]):
+        self._compute_execute(self.compute.subnetworks().delete(
+            project=self.gcp_project_id, region=params["region"], subnetwork=params["id"]))
+
+
+def _tag_value(resource: Dict[str, Any], key: str) -> Optional[str]:
+    for tag in resource.get("Tags", []):
+        if tag["Key"] == key:
+            return tag["Value"]
+    return None
+
+
+def _observed_parent(state: Dict[str, List[Dict[str, Any]]], op: PlanOperation) -> Optional[str]:
+    for item in state.get(op.type, []):
+        if item["name"] == op.name:
+            return item.get("VpcId")
+    return None
+
+
+def _resolve(value: Any, ids: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        if "$ref" in value:
+            return ids[value["$ref"]]
+        return {k: _resolve(v, ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(v, ids) for v in value]
+    return value
+
+
+def main():
+    """명령행 실행: python desired_state.py plan|apply --prefix cloud-basic-shared [--prune]"""
+    import argparse
+
+    sys.path.append(str(Path(__file__).parent))
+    from client_registry import get_client_registry
+
+    parser = argparse.ArgumentParser(description="공유 리소스 선언형 조정")
+    parser.add_argument("command", choices=["plan", "apply"])
+    parser.add_argument("--config", default=str(Path(__file__).parent / "cloud_basic_config.json"))
+    parser.add_argument("--prefix", default=os.getenv("SHARED_RESOURCE_PREFIX", "cloud-basic-shared"))
+    parser.add_argument("--prune", action="store_true", help="명세에서 빠진 관리 리소스 삭제")
+    parser.add_argument("--no-gcp", action="store_true", help="GCP 리소스 제외")
+    parser.add_argument("--gcp-project", default=os.getenv("GCP_PROJECT_ID"))
+    parser.add_argument("--gcp-region", default="asia-northeast3")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--trust-converged", type=float, default=0.0,
+                        help="이 시간(초) 이내에 수렴한 명세는 조회 생략")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    course_config = json.loads(Path(args.config).read_text(encoding="utf-8"))
+    include_gcp = not args.no_gcp and bool(args.gcp_project)
+    resources = build_desired_state(course_config, args.prefix, include_gcp, args.gcp_region)
+
+    region = course_config.get("environment_setup", {}).get("aws_region")
+    compute = None
+    if include_gcp:
+        from gcp_discovery import build
+        compute = build("compute", "v1")
+
+    reconciler = DesiredStateReconciler(
+        resources, args.prefix, get_client_registry().client_map(region), compute,
+        args.gcp_project, None if args.no_cache else PlanCache(), args.workers, args.gcp_region)
+    plan, result = reconciler.reconcile(prune=args.prune, dry_run=args.command == "plan",
+                                        trust_converged=args.trust_converged)
+
+    print(f"계획: {plan.summary()}{' (캐시)' if plan.cached else ''}")
+    for op in plan.operations:
+        print(f"  {op.action:<7} {op.type:<15} {op.name}")
+    if result is None:
+        return 0
+    print(f"성공 {len(result['succeeded'])}개, 실패 {len(result['failed'])}개, "
+          f"건너뜀 {len(result['skipped'])}개")
+    return 1 if result["failed"] or result["skipped"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
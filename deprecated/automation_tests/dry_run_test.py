@@ -1,315 +1,383 @@
-#!/usr/bin/env python3
-"""
-Cloud Basic 과정 자동화 스크립트 Dry-Run 테스트
-실제 리소스를 생성하지 않고 스크립트의 로직을 테스트합니다.
-"""
-
-import os
-import sys
-import json
-import logging
-from pathlib import Path
-from typing import Dict, Any
-from unittest.mock import Mock, patch, MagicMock
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('dry_run_test.log', mode='w'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
-
-class DryRunTest:
-    """Dry-Run 테스트 클래스"""
-    
-    def __init__(self):
-        self.test_results = {
-            "bash_scripts": {},
-            "python_scripts": {},
-            "overall_status": "not_started"
-        }
-    
-    def test_bash_script_syntax(self, script_path: str) -> Dict[str, Any]:
-        """Bash 스크립트 구문 검사"""
-        result = {
-            "script": script_path,
-            "syntax_valid": False,
-            "errors": [],
-            "warnings": []
-        }
-        
-        try:
-            # 실제로는 bash -n 명령어를 실행하지만, 여기서는 파일 존재 여부만 확인
-            if os.path.exists(script_path):
-                result["syntax_valid"] = True
-                logger.info(f"✅ {script_path}: 파일 존재 확인")
-            else:
-                result["errors"].append("파일이 존재하지 않습니다")
-                logger.error(f"❌ {script_path}: 파일이 존재하지 않습니다")
-        except Exception as e:
-            result["errors"].append(str(e))
-            logger.error(f"❌ {script_path}: 오류 발생 - {e}")
-        
-        return result
-    
-    def test_python_script_syntax(self, script_path: str) -> Dict[str, Any]:
-        """Python 스크립트 구문 검사"""
-        result = {
-            "script": script_path,
-            "syntax_valid": False,
-            "errors": [],
-            "warnings": []
-        }
-        
-        try:
-            with open(script_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            
-            compile(code, script_path, 'exec')
-            result["syntax_valid"] = True
-            logger.info(f"✅ {script_path}: Python 구문 검사 통과")
-        except SyntaxError as e:
-            result["errors"].append(f"구문 오류: {e}")
-            logger.error(f"❌ {script_path}: 구문 오류 - {e}")
-        except Exception as e:
-            result["errors"].append(str(e))
-            logger.error(f"❌ {script_path}: 오류 발생 - {e}")
-        
-        return result
-    
-    def test_aws_cli_commands(self) -> Dict[str, Any]:
-        """AWS CLI 명령어 테스트 (Mock)"""
-        result = {
-            "aws_commands": [],
-            "status": "success",
-            "errors": []
-        }
-        
-        # Mock AWS CLI 명령어들
-        aws_commands = [
-            "aws sts get-caller-identity",
-            "aws ec2 describe-regions",
-            "aws iam list-users",
-            "aws s3 ls",
-            "aws ec2 run-instances",
-            "aws s3 mb s3://test-bucket"
-        ]
-        
-        for cmd in aws_commands:
-            try:
-                # 실제로는 명령어를 실행하지 않고 Mock으로 테스트
-                mock_result = Mock()
-                mock_result.returncode = 0
-                result["aws_commands"].append({
-                    "command": cmd,
-                    "status": "success",
-                    "mock_result": "명령어가 정상적으로 실행될 것으로 예상됩니다"
-                })
-                logger.info(f"✅ AWS 명령어 테스트: {cmd}")
-            except Exception as e:
-                result["aws_commands"].append({
-                    "command": cmd,
-                    "status": "error",
-                    "error": str(e)
-                })
-                result["errors"].append(f"{cmd}: {e}")
-                logger.error(f"❌ AWS 명령어 테스트 실패: {cmd} - {e}")
-        
-        return result
-    
-    def test_gcp_cli_commands(self) -> Dict[str, Any]:
-        """GCP CLI 명령어 테스트 (Mock)"""
-        result = {
-            "gcp_commands": [],
-            "status": "success",
-            "errors": []
-        }
-        
-        # Mock GCP CLI 명령어들
-        gcp_commands = [
-            "gcloud auth list",
-            "gcloud config list",
-            "gcloud compute instances list",
-            "gcloud iam service-accounts list",
-            "gcloud compute instances create",
-            "gsutil ls"
-        ]
-        
-        for cmd in gcp_commands:
-            try:
-                # 실제로는 명령어를 실행하지 않고 Mock으로 테스트
-                mock_result = Mock()
-                mock_result.returncode = 0
-                result["gcp_commands"].append({
-                    "command": cmd,
-                    "status": "success",
-                    "mock_result": "명령어가 정상적으로 실행될 것으로 예상됩니다"
-                })
-                logger.info(f"✅ GCP 명령어 테스트: {cmd}")
-            except Exception as e:
-                result["gcp_commands"].append({
-                    "command": cmd,
-                    "status": "error",
-                    "error": str(e)
-                })
-                result["errors"].append(f"{cmd}: {e}")
-                logger.error(f"❌ GCP 명령어 테스트 실패: {cmd} - {e}")
-        
-        return result
-    
-    def test_script_dependencies(self) -> Dict[str, Any]:
-        """스크립트 의존성 테스트"""
-        result = {
-            "dependencies": [],
-            "status": "success",
-            "errors": []
-        }
-        
-        # 필요한 의존성들
-        dependencies = [
-            {"name": "aws", "type": "cli", "required": True},
-            {"name": "gcloud", "type": "cli", "required": True},
-            {"name": "gsutil", "type": "cli", "required": True},
-            {"name": "boto3", "type": "python_package", "required": True},
-            {"name": "google-auth", "type": "python_package", "required": True},
-            {"name": "google-api-python-client", "type": "python_package", "required": True}
-        ]
-        
-        for dep in dependencies:
-            try:
-                if dep["type"] == "python_package":
-                    # Python 패키지 import 테스트
-                    if dep["name"] == "boto3":
-                        import boto3
-                    elif dep["name"] == "google-auth":
-                        import google.auth
-                    elif dep["name"] == "google-api-python-client":
-                        import googleapiclient
-                
-                result["dependencies"].append({
-                    "name": dep["name"],
-                    "type": dep["type"],
-                    "status": "available",
-                    "required": dep["required"]
-                })
-                logger.info(f"✅ 의존성 확인: {dep['name']}")
-            except ImportError:
-                if dep["required"]:
-                    result["dependencies"].append({
-                        "name": dep["name"],
-                        "type": dep["type"],
-                        "status": "missing",
-                        "required": dep["required"]
-                    })
-                    result["errors"].append(f"필수 의존성 누락: {dep['name']}")
-                    logger.error(f"❌ 필수 의존성 누락: {dep['name']}")
-                else:
-                    result["dependencies"].append({
-                        "name": dep["name"],
-                        "type": dep["type"],
-                        "status": "missing",
-                        "required": dep["required"]
-                    })
-                    logger.warning(f"⚠️ 선택적 의존성 누락: {dep['name']}")
-        
-        return result
-    
-    def run_all_tests(self) -> Dict[str, Any]:
-        """모든 테스트 실행"""
-        logger.info("🚀 Cloud Basic 자동화 스크립트 Dry-Run 테스트 시작")
-        
-        # 1. Bash 스크립트 구문 검사
-        logger.info("\n📋 1. Bash 스크립트 구문 검사")
-        bash_scripts = [
-            "day1/cloud_basics.sh",
-            "day1/iam_basics.sh", 
-            "day1/vm_services.sh",
-            "day1/storage_services.sh",
-            "day2/comprehensive_practice.sh",
-            "day2/database_services.sh",
-            "day2/networking_basics.sh",
-            "day2/security_basics.sh"
-        ]
-        
-        for script in bash_scripts:
-            script_path = f"../automation/{script}"
-            self.test_results["bash_scripts"][script] = self.test_bash_script_syntax(script_path)
-        
-        # 2. Python 스크립트 구문 검사
-        logger.info("\n📋 2. Python 스크립트 구문 검사")
-        python_scripts = [
-            "cloud_basic_course_automation.py",
-            "improved_basic_automation.py",
-            "test_basic_course_automation.py"
-        ]
-        
-        for script in python_scripts:
-            self.test_results["python_scripts"][script] = self.test_python_script_syntax(script)
-        
-        # 3. AWS CLI 명령어 테스트
-        logger.info("\n📋 3. AWS CLI 명령어 테스트")
-        self.test_results["aws_commands"] = self.test_aws_cli_commands()
-        
-        # 4. GCP CLI 명령어 테스트
-        logger.info("\n📋 4. GCP CLI 명령어 테스트")
-        self.test_results["gcp_commands"] = self.test_gcp_cli_commands()
-        
-        # 5. 의존성 테스트
-        logger.info("\n📋 5. 의존성 테스트")
-        self.test_results["dependencies"] = self.test_script_dependencies()
-        
-        # 6. 전체 결과 요약
-        self.test_results["overall_status"] = "completed"
-        
-        # 결과 저장
-        with open('dry_run_test_results.json', 'w', encoding='utf-8') as f:
-            json.dump(self.test_results, f, ensure_ascii=False, indent=2)
-        
-        logger.info("\n🎉 Dry-Run 테스트 완료!")
-        logger.info("결과가 dry_run_test_results.json에 저장되었습니다.")
-        
-        return self.test_results
-
-def main():
-    """메인 함수"""
-    test = DryRunTest()
-    results = test.run_all_tests()
-    
-    # 결과 요약 출력
-    print("\n" + "="*50)
-    print("DRY-RUN 테스트 결과 요약")
-    print("="*50)
-    
-    # Bash 스크립트 결과
-    bash_success = sum(1 for r in results["bash_scripts"].values() if r["syntax_valid"])
-    bash_total = len(results["bash_scripts"])
-    print(f"Bash 스크립트: {bash_success}/{bash_total} 통과")
-    
-    # Python 스크립트 결과
-    python_success = sum(1 for r in results["python_scripts"].values() if r["syntax_valid"])
-    python_total = len(results["python_scripts"])
-    print(f"Python 스크립트: {python_success}/{python_total} 통과")
-    
-    # AWS 명령어 결과
-    aws_success = len([c for c in results["aws_commands"]["aws_commands"] if c["status"] == "success"])
-    aws_total = len(results["aws_commands"]["aws_commands"])
-    print(f"AWS 명령어: {aws_success}/{aws_total} 통과")
-    
-    # GCP 명령어 결과
-    gcp_success = len([c for c in results["gcp_commands"]["gcp_commands"] if c["status"] == "success"])
-    gcp_total = len(results["gcp_commands"]["gcp_commands"])
-    print(f"GCP 명령어: {gcp_success}/{gcp_total} 통과")
-    
-    # 의존성 결과
-    deps_available = len([d for d in results["dependencies"]["dependencies"] if d["status"] == "available"])
-    deps_total = len(results["dependencies"]["dependencies"])
-    print(f"의존성: {deps_available}/{deps_total} 사용 가능")
-    
-    print("="*50)
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Cloud Basic 과정 자동화 스크립트 Dry-Run 테스트
+실제 리소스를 생성하지 않고 스크립트의 로직을 테스트합니다.
+
+CLOUD_CASSETTE 가 지정되면 조회 명령어는 카세트로 녹화(record)하거나 녹화된 실제 응답을 재생(replay)하여 확인합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Any, Callable
+from unittest.mock import Mock, patch, MagicMock
+
+from run_history import get_run_history
+from cassette import get_cassette
+from client_registry import get_client_registry
+from gcp_discovery import build
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('dry_run_test.log', mode='w'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# 카세트로 실제 응답을 확인할 조회 명령어
+AWS_API_CALLS = {
+    "aws sts get-caller-identity": ("sts", "get_caller_identity"),
+    "aws ec2 describe-regions": ("ec2", "describe_regions"),
+    "aws iam list-users": ("iam", "list_users"),
+    "aws s3 ls": ("s3", "list_buckets"),
+}
+GCP_API_CALLS = {
+    "gcloud compute instances list": ("compute", lambda s, p: s.instances().aggregatedList(project=p)),
+    "gcloud iam service-accounts list": ("iam", lambda s, p: s.projects().serviceAccounts().list(name=f"projects/{p}")),
+    "gsutil ls": ("storage", lambda s, p: s.buckets().list(project=p)),
+}
+
+
+def _summarize(response: Dict[str, Any]) -> Dict[str, Any]:
+    """API 응답 요약 (목록은 개수만)"""
+    return {key: len(value) if isinstance(value, (list, dict)) else str(value)
+            for key, value in response.items() if key not in ("ResponseMetadata", "nextPageToken")}
+
+class DryRunTest:
+    """Dry-Run 테스트 클래스"""
+    
+    def __init__(self):
+        self.test_results = {
+            "bash_scripts": {},
+            "python_scripts": {},
+            "overall_status": "not_started"
+        }
+        self.run_history = get_run_history()
+        self._run_id = None
+        self.cassette = get_cassette()
+    
+    def test_bash_script_syntax(self, script_path: str) -> Dict[str, Any]:
+        """Bash 스크립트 구문 검사"""
+        result = {
+            "script": script_path,
+            "syntax_valid": False,
+            "errors": [],
+            "warnings": []
+        }
+        
+        try:
+            # 실제로는 bash -n 명령어를 실행하지만, 여기서는 파일 존재 여부만 확인
+            if os.path.exists(script_path):
+                result["syntax_valid"] = True
+                logger.info(f"✅ {script_path}: 파일 존재 확인")
+            else:
+                result["errors"].append("파일이 존재하지 않습니다")
+                logger.error(f"❌ {script_path}: 파일이 존재하지 않습니다")
+        except Exception as e:
+            result["errors"].append(str(e))
+            logger.error(f"❌ {script_path}: 오류 발생 - {e}")
+        
+        return result
+    
+    def test_python_script_syntax(self, script_path: str) -> Dict[str, Any]:
+        """Python 스크립트 구문 검사"""
+        result = {
+            "script": script_path,
+            "syntax_valid": False,
+            "errors": [],
+            "warnings": []
+        }
+        
+        try:
+            with open(script_path, 'r', encoding='utf-8') as f:
+                code = f.read()
+            
+            compile(code, script_path, 'exec')
+            result["syntax_valid"] = True
+            logger.info(f"✅ {script_path}: Python 구문 검사 통과")
+        except SyntaxError as e:
+            result["errors"].append(f"구문 오류: {e}")
+            logger.error(f"❌ {script_path}: 구문 오류 - {e}")
+        except Exception as e:
+            result["errors"].append(str(e))
+            logger.error(f"❌ {script_path}: 오류 발생 - {e}")
+        
+        return result
+    
+    def test_aws_cli_commands(self) -> Dict[str, Any]:
+        """AWS CLI 명령어 테스트 (Mock)"""
+        result = {
+            "aws_commands": [],
+            "status": "success",
+            "errors": []
+        }
+        
+        # Mock AWS CLI 명령어들
+        aws_commands = [
+            "aws sts get-caller-identity",
+            "aws ec2 describe-regions",
+            "aws iam list-users",
+            "aws s3 ls",
+            "aws ec2 run-instances",
+            "aws s3 mb s3://test-bucket"
+        ]
+        
+        for cmd in aws_commands:
+            try:
+                if self.cassette is not None and cmd in AWS_API_CALLS:
+                    service_name, operation = AWS_API_CALLS[cmd]
+                    client = get_client_registry().get_client(
+                        service_name, os.getenv("AWS_DEFAULT_REGION", "ap-northeast-2"))
+                    result["aws_commands"].append({
+                        "command": cmd,
+                        "status": "success",
+                        f"{self.cassette.mode}_result": _summarize(getattr(client, operation)())
+                    })
+                    logger.info(f"✅ AWS 명령어 테스트 ({self.cassette.mode}): {cmd}")
+                    continue
+                # 실제로는 명령어를 실행하지 않고 Mock으로 테스트
+                mock_result = Mock()
+                mock_result.returncode = 0
+                result["aws_commands"].append({
+                    "command": cmd,
+                    "status": "success",
+                    "mock_result": "명령어가 정상적으로 실행될 것으로 예상됩니다"
+                })
+                logger.info(f"✅ AWS 명령어 테스트: {cmd}")
+            except Exception as e:
+                result["aws_commands"].append({
+                    "command": cmd,
+                    "status": "error",
+                    "error": str(e)
+                })
+                result["errors"].append(f"{cmd}: {e}")
+                logger.error(f"❌ AWS 명령어 테스트 실패: {cmd} - {e}")
+        
+        return result
+    
+    def test_gcp_cli_commands(self) -> Dict[str, Any]:
+        """GCP CLI 명령어 테스트 (Mock)"""
+        result = {
+            "gcp_commands": [],
+            "status": "success",
+            "errors": []
+        }
+        
+        # Mock GCP CLI 명령어들
+        gcp_commands = [
+            "gcloud auth list",
+            "gcloud config list",
+            "gcloud compute instances list",
+            "gcloud iam service-accounts list",
+            "gcloud compute instances create",
+            "gsutil ls"
+        ]
+        
+        gcp_project = os.getenv("GCP_PROJECT_ID")
+        for cmd in gcp_commands:
+            try:
+                if self.cassette is not None and gcp_project and cmd in GCP_API_CALLS:
+                    service_name, make_request = GCP_API_CALLS[cmd]
+                    response = make_request(build(service_name, "v1"), gcp_project).execute()
+                    result["gcp_commands"].append({
+                        "command": cmd,
+                        "status": "success",
+                        f"{self.cassette.mode}_result": _summarize(response)
+                    })
+                    logger.info(f"✅ GCP 명령어 테스트 ({self.cassette.mode}): {cmd}")
+                    continue
+                # 실제로는 명령어를 실행하지 않고 Mock으로 테스트
+                mock_result = Mock()
+                mock_result.returncode = 0
+                result["gcp_commands"].append({
+                    "command": cmd,
+                    "status": "success",
+                    "mock_result": "명령어가 정상적으로 실행될 것으로 예상됩니다"
+                })
+                logger.info(f"✅ GCP 명령어 테스트: {cmd}")
+            except Exception as e:
+                result["gcp_commands"].append({
+                    "command": cmd,
+                    "status": "error",
+                    "error": str(e)
+                })
+                result["errors"].append(f"{cmd}: {e}")
+                logger.error(f"❌ GCP 명령어 테스트 실패: {cmd} - {e}")
+        
+        return result
+    
+    def test_script_dependencies(self) -> Dict[str, Any]:
+        """스크립트 의존성 테스트"""
+        result = {
+            "dependencies": [],
+            "status": "success",
+            "errors": []
+        }
+        
+        # 필요한 의존성들
+        dependencies = [
+            {"name": "aws", "type": "cli", "required": True},
+            {"name": "gcloud", "type": "cli", "required": True},
+            {"name": "gsutil", "type": "cli", "required": True},
+            {"name": "boto3", "type": "python_package", "required": True},
+            {"name": "google-auth", "type": "python_package", "required": True},
+            {"name": "google-api-python-client", "type": "python_package", "required": True}
+        ]
+        
+        for dep in dependencies:
+            try:
+                if dep["type"] == "python_package":
+                    # Python 패키지 import 테스트
+                    if dep["name"] == "boto3":
+                        import boto3
+                    elif dep["name"] == "google-auth":
+                        import google.auth
+                    elif dep["name"] == "google-api-python-client":
+                        import googleapiclient
+                
+                result["dependencies"].append({
+                    "name": dep["name"],
+                    "type": dep["type"],
+                    "status": "available",
+                    "required": dep["required"]
+                })
+                logger.info(f"✅ 의존성 확인: {dep['name']}")
+            except ImportError:
+                if dep["required"]:
+                    result["dependencies"].append({
+                        "name": dep["name"],
+                        "type": dep["type"],
+                        "status": "missing",
+                        "required": dep["required"]
+                    })
+                    result["errors"].append(f"필수 의존성 누락: {dep['name']}")
+                    logger.error(f"❌ 필수 의존성 누락: {dep['name']}")
+                else:
+                    result["dependencies"].append({
+                        "name": dep["name"],
+                        "type": dep["type"],
+                        "status": "missing",
+                        "required": dep["required"]
+                    })
+                    logger.warning(f"⚠️ 선택적 의존성 누락: {dep['name']}")
+        
+        return result
+    
+    def _run_recorded(self, step: str, test_func: Callable[..., Dict[str, Any]], *args) -> Dict[str, Any]:
+        """테스트 실행 후 소요 시간과 결과를 실행 이력에 기록"""
+        started_at, start = time.time(), time.perf_counter()
+        result = test_func(*args)
+        errors = result.get("errors", [])
+        failed = bool(errors) or result.get("syntax_valid") is False
+        self.run_history.record_step(self._run_id, step, "failed" if failed else "success",
+                                     started_at, time.perf_counter() - start,
+                                     "; ".join(errors) if errors else None)
+        return result
+    
+    def run_all_tests(self) -> Dict[str, Any]:
+        """모든 테스트 실행"""
+        logger.info("🚀 Cloud Basic 자동화 스크립트 Dry-Run 테스트 시작")
+        self._run_id = self.run_history.start_run(
+            "DryRunTest.run_all_tests", "cloud_basic", cohort=os.getenv("COURSE_COHORT"))
+        
+        # 1. Bash 스크립트 구문 검사
+        logger.info("\n📋 1. Bash 스크립트 구문 검사")
+        bash_scripts = [
+            "day1/cloud_basics.sh",
+            "day1/iam_basics.sh", 
+            "day1/vm_services.sh",
+            "day1/storage_services.sh",
+            "day2/comprehensive_practice.sh",
+            "day2/database_services.sh",
+            "day2/networking_basics.sh",
+            "day2/security_basics.sh"
+        ]
+        
+        for script in bash_scripts:
+            script_path = f"../automation/{script}"
+            self.test_results["bash_scripts"][script] = self._run_recorded(
+                f"bash:{script}", self.test_bash_script_syntax, script_path)
+        
+        # 2. Python 스크립트 구문 검사
+        logger.info("\n📋 2. Python 스크립트 구문 검사")
+        python_scripts = [
+            "cloud_basic_course_automation.py",
+            "improved_basic_automation.py",
+            "test_basic_course_automation.py"
+        ]
+        
+        for script in python_scripts:
+            self.test_results["python_scripts"][script] = self._run_recorded(
+                f"python:{script}", self.test_python_script_syntax, script)
+        
+        # 3. AWS CLI 명령어 테스트
+        logger.info("\n📋 3. AWS CLI 명령어 테스트")
+        self.test_results["aws_commands"] = self._run_recorded("aws_commands", self.test_aws_cli_commands)
+        
+        # 4. GCP CLI 명령어 테스트
+        logger.info("\n📋 4. GCP CLI 명령어 테스트")
+        self.test_results["gcp_commands"] = self._run_recorded("gcp_commands", self.test_gcp_cli_commands)
+        
+        # 5. 의존성 테스트
+        logger.info("\n📋 5. 의존성 테스트")
+        self.test_results["dependencies"] = self._run_recorded("dependencies", self.test_script_dependencies)
+        
+        # 6. 전체 결과 요약
+        self.test_results["overall_status"] = "completed"
+        self.run_history.finish_run(self._run_id, "completed")
+        
+        # 결과 저장
+        with open('dry_run_test_results.json', 'w', encoding='utf-8') as f:
+            json.dump(self.test_results, f, ensure_ascii=False, indent=2)
+        
+        logger.info("\n🎉 Dry-Run 테스트 완료!")
+        logger.info("결과가 dry_run_test_results.json에 저장되었습니다.")
+        
+        return self.test_results
+
+def main():
+    """메인 함수"""
+    test = DryRunTest()
+    results = test.run_all_tests()
+    
+    # 결과 요약 출력
+    print("\n" + "="*50)
+    print("DRY-RUN 테스트 결과 요약")
+    print("="*50)
+    
+    # Bash 스크립트 결과
+    bash_success = sum(1 for r in results["bash_scripts"].values() if r["syntax_valid"])
+    bash_total = len(results["bash_scripts"])
+    print(f"Bash 스크립트: {bash_success}/{bash_total} 통과")
+    
+    # Python 스크립트 결과
+    python_success = sum(1 for r in results["python_scripts"].values() if r["syntax_valid"])
+    python_total = len(results["python_scripts"])
+    print(f"Python 스크립트: {python_success}/{python_total} 통과")
+    
+    # AWS 명령어 결과
+    aws_success = len([c for c in results["aws_commands"]["aws_commands"] if c["status"] == "success"])
+    aws_total = len(results["aws_commands"]["aws_commands"])
+    print(f"AWS 명령어: {aws_success}/{aws_total} 통과")
+    
+    # GCP 명령어 결과
+    gcp_success = len([c for c in results["gcp_commands"]["gcp_commands"] if c["status"] == "success"])
+    gcp_total = len(results["gcp_commands"]["gcp_commands"])
+    print(f"GCP 명령어: {gcp_success}/{gcp_total} 통과")
+    
+    # 의존성 결과
+    deps_available = len([d for d in results["dependencies"]["dependencies"] if d["status"] == "available"])
+    deps_total = len(results["dependencies"]["dependencies"])
+    print(f"의존성: {deps_available}/{deps_total} 사용 가능")
+    
+    print("="*50)
+
+if __name__ == "__main__":
+    main()
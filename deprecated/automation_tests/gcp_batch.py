@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+GCP API 배치 요청 실행기
+서로 독립적인 googleapiclient 요청을 BatchHttpRequest 로 묶어 한 번의 HTTP 왕복으로 보냅니다.
+
+- 주요 기능:
+  - API 별 배치 한도(Compute / IAM 1000개, Cloud Storage 100개)에 맞춰 요청을 나눕니다.
+  - 항목별 결과를 따로 처리합니다: 성공, 허용된 오류(예: 409 이미 존재 → 멱등 성공), 실패.
+  - 재시도 가능한 오류(429, 5xx)를 받은 항목만 모아 지수 백오프 후 다시 배치로 보냅니다.
+    항목별 retry_if 로 일시적인 다른 오류(예: 막 만든 서비스 계정의 전파 지연)도 재시도할 수 있습니다.
+  - 배치 전체가 실패하면 해당 묶음의 모든 항목을 재시도 대상으로 처리합니다.
+"""
+
+import time
+import logging
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+# API 별 한 배치에 넣을 수 있는 최대 요청 수
+BATCH_LIMITS = {"storage": 100}
+DEFAULT_BATCH_LIMIT = 1000
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def http_status(error: Exception) -> Optional[int]:
+    """HttpError 의 HTTP 상태 코드"""
+    resp = getattr(error, "resp", None)
+    try:
+        return int(getattr(resp, "status", None))
+    except (TypeError, ValueError):
+        return None
+
+
+class BatchItem:
+    """배치에 넣을 요청 하나"""
+
+    __slots__ = ("key", "make_request", "ok_statuses", "retry_if", "response", "error", "attempts", "status")
+
+    def __init__(self, key: str, make_request: Callable[[], Any], ok_statuses: Iterable[int] = (),
+                 retry_if: Optional[Callable[[Exception], bool]] = None):
+        """
+        Args:
+            key: 항목 식별자 (배치 안에서 유일해야 함)
+            make_request: HttpRequest 를 만드는 함수 (재시도 때마다 새 요청 생성)
+            ok_statuses: 성공으로 간주할 오류 상태 코드 (예: 409 이미 존재)
+            retry_if: 429 / 5xx 외에 재시도할 오류 판별 함수
+        """
+        self.key = key
+        self.make_request = make_request
+        self.ok_statuses = frozenset(ok_statuses)
+        self.retry_if = retry_if
+        self.response: Optional[Dict[str, Any]] = None
+        self.error: Optional[Exception] = None
+        self.attempts = 0
+        self.status = "pending"     # pending / done / existing / failed
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("done", "existing")
+
+
+class BatchExecutor:
+    """한 API 서비스의 요청을 배치로 묶어 실행"""
+
+    def __init__(self, service: Any, api_name: str = "", max_retries: int = 3,
+                 backoff: float = 1.0, batch_limit: Optional[int] = None):
+        """
+        BatchExecutor 초기화
+
+        Args:
+            service: googleapiclient 서비스 (new_batch_http_request 제공)
+            api_name: 배치 한도 조회용 API 이름 (예: 'storage')
+            max_retries: 재시도 가능한 오류 항목의 최대 재시도 횟수
+            backoff: 첫 재시도 대기 시간(초), 이후 2배씩 증가
+            batch_limit: 배치당 최대 요청 수 (None 이면 API 기본값)
+        """
+        self.service = service
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_limit = batch_limit or BATCH_LIMITS.get(api_name, DEFAULT_BATCH_LIMIT)
+        self.items: Dict[str, BatchItem] = {}
+        self.round_trips = 0
+
+    def add(self, key: str, make_request: Callable[[], Any], ok_statuses: Iterable[int] = (),
+            retry_if: Optional[Callable[[Exception], bool]] = None) -> BatchItem:
+        if key in self.items:
+            raise KeyError(f"중복된 배치 항목: {key}")
+        item = BatchItem(key, make_request, ok_statuses, retry_if)
+        self.items[key] = item
+        return item
+
+    def _send(self, items: List[BatchItem]) -> List[BatchItem]:
+        """배치 한 번 전송, 재시도할 항목 반환"""
+        retry: List[BatchItem] = []
+        by_key = {item.key: item for item in items}
+
+        def callback(request_id: str, response: Any, exception: Optional[Exception]):
+            item = by_key[request_id]
+            item.attempts += 1
+            if exception is None:
+                item.response, item.error, item.status = response, None, "done"
+                return
+            status = http_status(exception)
+            item.error = exception
+            if status in item.ok_statuses:
+                item.status = "existing"
+            elif status in RETRYABLE_STATUSES or (item.retry_if is not None and item.retry_if(exception)):
+                retry.append(item)
+            else:
+                item.status = "failed"
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for item in items:
+            batch.add(item.make_request(), request_id=item.key)
+        self.round_trips += 1
+        try:
+            batch.execute()
+        except HttpError as e:
+            if http_status(e) not in RETRYABLE_STATUSES:
+                for item in items:
+                    item.attempts += 1
+                    item.error, item.status = e, "failed"
+                return []
+            logger.warning(f"⚠️ 배치 전체 실패, {len(items)}개 항목 재시도 예정: {e}")
+            for item in items:
+                item.error = e
+            return [item for item in items if item.status == "pending"]
+        return retry
+
+    def execute(self) -> Dict[str, BatchItem]:
+        """
+        대기 중인 모든 항목 실행 (실패한 항목만 재시도)
+
+        Returns:
+            key → BatchItem (status / response / error 확인)
+        """
+        pending = [item for item in self.items.values() if item.status == "pending"]
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                delay = self.backoff * 2 ** (attempt - 1)
+                logger.info(f"🔁 {len(pending)}개 항목 재시도 ({attempt}/{self.max_retries}, {delay:.1f}초 후)")
+                time.sleep(delay)
+            retry: List[BatchItem] = []
+            for start in range(0, len(pending), self.batch_limit):
+                retry.extend(self._send(pending[start:start + self.batch_limit]))
+            pending = retry
+        for item in pending:
+            item.status = "failed"
+        return self.items
+
+    def failures(self) -> Dict[str, Exception]:
+        return {key: item.error for key, item in self.items.items() if item.status == "failed"}
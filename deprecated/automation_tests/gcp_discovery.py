@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+GCP 디스커버리 문서 로컬 캐시
+googleapiclient 서비스를 네트워크 조회 없이 로컬 디스커버리 문서로 생성합니다.
+
+- 주요 기능:
+  - 디스커버리 문서는 프로세스당 한 번만 읽고 파싱하여 모든 스레드가 공유합니다.
+  - 문서 위치 우선순위: 로컬 캐시 디렉터리(GCP_DISCOVERY_CACHE_DIR) → googleapiclient 내장 정적 문서
+    어느 쪽도 네트워크를 쓰지 않으므로 폐쇄망 테스트 환경에서도 동작합니다.
+  - 갱신은 명시적으로만 수행합니다: python gcp_discovery.py refresh iam:v1 compute:v1 storage:v1
+  - build() 는 googleapiclient.discovery.build 와 같은 형태로 호출할 수 있으며,
+    서비스 객체는 스레드 안전하지 않으므로 thread_local_service() 로 스레드별 객체를 재사용할 수 있습니다.
+  - CLOUD_CASSETTE 가 지정되면 build() 로 만든 서비스의 요청을 카세트로 녹화 / 재생합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import logging
+import urllib.request
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+sys.path.append(str(Path(__file__).parent))
+
+from cassette import get_cassette
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "cloud-basic" / "discovery"
+DISCOVERY_URL = "https://{service}.googleapis.com/$discovery/rest?version={version}"
+LEGACY_DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/{service}/{version}/rest"
+
+# 실습에서 사용하는 API
+DEFAULT_APIS = (("iam", "v1"), ("compute", "v1"), ("storage", "v1"))
+
+_documents: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_documents_lock = threading.Lock()
+_local = threading.local()
+
+
+def cache_dir() -> Path:
+    return Path(os.getenv("GCP_DISCOVERY_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _cache_path(service_name: str, version: str) -> Path:
+    return cache_dir() / f"{service_name}.{version}.json"
+
+
+def _read_document(service_name: str, version: str) -> Tuple[str, str]:
+    """문서 원문과 출처 반환 (로컬 캐시 → 내장 정적 문서)"""
+    path = _cache_path(service_name, version)
+    if path.exists():
+        return path.read_text(encoding="utf-8"), str(path)
+    content = get_static_doc(service_name, version)
+    if content is not None:
+        return content, "googleapiclient static"
+    raise FileNotFoundError(
+        f"{service_name} {version} 디스커버리 문서가 없습니다. "
+        f"'python gcp_discovery.py refresh {service_name}:{version}' 로 캐시를 만드세요.")
+
+
+def get_document(service_name: str, version: str = "v1") -> Dict[str, Any]:
+    """파싱된 디스커버리 문서 (프로세스당 한 번만 읽음, 호출자는 수정하지 말 것)"""
+    key = (service_name, version)
+    document = _documents.get(key)
+    if document is not None:
+        return document
+    with _documents_lock:
+        document = _documents.get(key)
+        if document is None:
+            content, source = _read_document(service_name, version)
+            document = json.loads(content)
+            _documents[key] = document
+            logger.debug(f"디스커버리 문서 로드: {service_name} {version} "
+                         f"(revision {document.get('revision')}, {source})")
+    return document
+
+
+def build(service_name: str, version: str = "v1", credentials: Any = None, **kwargs) -> Any:
+    """
+    캐시된 디스커버리 문서로 서비스 생성 (googleapiclient.discovery.build 대체)
+
+    Args:
+        service_name: API 이름 (예: 'compute')
+        version: API 버전
+        credentials: google.auth 자격 증명 (None 이면 기본 자격 증명)
+        **kwargs: build_from_document 에 전달할 추가 인자 (http, client_options 등)
+    """
+    kwargs.pop("cache_discovery", None)
+    kwargs.pop("static_discovery", None)
+    cassette = get_cassette()
+    if cassette is not None and "http" not in kwargs:
+        kwargs["http"] = cassette.http(credentials)
+        credentials = None
+    return build_from_document(get_document(service_name, version), credentials=credentials, **kwargs)
+
+
+def thread_local_service(service_name: str, version: str = "v1", credentials: Any = None) -> Any:
+    """현재 스레드 전용 서비스 (googleapiclient 서비스 객체는 스레드 안전하지 않음)"""
+    services = getattr(_local, "services", None)
+    if services is None:
+        services = _local.services = {}
+    key = (service_name, version, id(credentials))
+    service = services.get(key)
+    if service is None:
+        service = build(service_name, version, credentials)
+        services[key] = service
+    return service
+
+
+def clear():
+    """프로세스 캐시 비우기 (갱신 후 다시 읽도록)"""
+    with _documents_lock:
+        _documents.clear()
+    _local.__dict__.clear()
+
+
+def refresh(apis: List[Tuple[str, str]], timeout: float = 30.0) -> Dict[str, str]:
+    """
+    네트워크에서 디스커버리 문서를 받아 로컬 캐시에 저장 (명시적 갱신)
+
+    Returns:
+        "service:version" → revision
+    """
+    directory = cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    revisions = {}
+    for service_name, version in apis:
+        content = None
+        for url in (DISCOVERY_URL, LEGACY_DISCOVERY_URL):
+            try:
+                with urllib.request.urlopen(url.format(service=service_name, version=version),
+                                            timeout=timeout) as response:
+                    content = response.read().decode("utf-8")
+                break
+            except OSError as e:
+                logger.warning(f"⚠️ {service_name} {version} 문서 다운로드 실패 ({url}): {e}")
+        if content is None:
+            raise RuntimeError(f"{service_name} {version} 디스커버리 문서를 받을 수 없습니다")
+
+        document = json.loads(content)
+        path = _cache_path(service_name, version)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+        revisions[f"{service_name}:{version}"] = document.get("revision", "")
+        logger.info(f"✅ {service_name} {version} 문서 갱신 (revision {document.get('revision')})")
+
+    manifest_path = directory / "manifest.json"
+    manifest = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    for api, revision in revisions.items():
+        manifest[api] = {"revision": revision, "refreshed_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    clear()
+    return revisions
+
+
+def main():
+    """명령행: python gcp_discovery.py refresh [iam:v1 ...] | show"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GCP 디스커버리 문서 캐시 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    refresh_parser = sub.add_parser("refresh", help="문서 다운로드 후 캐시 갱신")
+    refresh_parser.add_argument("apis", nargs="*", help="service:version (기본: iam, compute, storage v1)")
+    sub.add_parser("show", help="사용 중인 문서 revision 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.command == "refresh":
+        apis = [tuple(api.split(":", 1)) for api in args.apis] or list(DEFAULT_APIS)
+        for api, revision in refresh(apis).items():
+            print(f"{api}: {revision}")
+        return 0
+
+    for service_name, version in DEFAULT_APIS:
+        try:
+            _, source = _read_document(service_name, version)
+            document = get_document(service_name, version)
+            print(f"{service_name}:{version} revision {document.get('revision')} ({source})")
+        except FileNotFoundError as e:
+            print(f"{service_name}:{version} 없음 - {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
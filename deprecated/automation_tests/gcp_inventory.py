@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+GCP 리소스 인벤토리 (aggregatedList 일괄 조회 + 증분 갱신)
+list_gcp_resources / analyze_gcp_costs 가 gcloud 명령을 유형별로, gsutil 을 버킷마다 따로 실행하던 조회를 대체합니다.
+
+- 주요 기능:
+  - Compute 인스턴스 / 디스크 / 정적 IP 를 유형별 aggregatedList 한 번(페이지 단위)으로 모든 영역에서 조회합니다.
+    필요한 필드만 요청(fields)하여 응답 크기를 줄입니다.
+  - 버킷 목록은 한 번에 조회하고, 버킷별 객체 집계(개수 / 용량)는 스레드 풀에서 병렬로 수행합니다.
+  - 결과는 프로젝트별 스냅샷(JSON)으로 저장하며, 다음 갱신에서는 생성 / 변경 시각, 상태, 머신 유형, 라벨로
+    바뀐 리소스만 새로 기록합니다.
+  - 버킷 객체 집계는 새 버킷, updated 가 바뀐 버킷, 집계가 bucket_ttl 보다 오래된 버킷만 다시 수행합니다.
+    (객체 추가는 버킷 updated 를 바꾸지 않으므로 최신 집계가 필요하면 full=True 로 갱신)
+  - 권한이 없는(403) 버킷처럼 집계에 실패한 버킷은 scan_error 로 기록하고 나머지 갱신은 계속합니다.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = Path.home() / ".cache" / "cloud-basic" / "gcp_inventory"
+
+# 유형별 기록 필드와 변경 판단 필드
+COMPUTE_FIELDS = {
+    "instances": ("name", "zone", "status", "machineType", "networkInterfaces", "labels",
+                  "creationTimestamp", "lastStartTimestamp", "lastStopTimestamp"),
+    "disks": ("name", "zone", "status", "sizeGb", "type", "users",
+              "creationTimestamp", "lastAttachTimestamp", "lastDetachTimestamp"),
+    "addresses": ("name", "region", "address", "status", "users", "creationTimestamp"),
+}
+CHANGE_FIELDS = {
+    "instances": ("creationTimestamp", "status", "machineType", "labels",
+                  "lastStartTimestamp", "lastStopTimestamp"),
+    "disks": ("creationTimestamp", "status", "users", "lastAttachTimestamp", "lastDetachTimestamp"),
+    "addresses": ("creationTimestamp", "status", "users"),
+    "buckets": ("timeCreated", "updated"),
+}
+BUCKET_FIELDS = ("name", "location", "storageClass", "timeCreated", "updated")
+
+
+def _last_segment(value: Any) -> Any:
+    return value.rsplit("/", 1)[-1] if isinstance(value, str) else value
+
+
+def _record(kind: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    """API 응답 항목 → 스냅샷 레코드 (URL 필드는 마지막 경로만)"""
+    record = {}
+    for field in COMPUTE_FIELDS[kind]:
+        if field in item and field not in ("networkInterfaces", "users"):
+            record[field] = _last_segment(item[field])
+    if "users" in COMPUTE_FIELDS[kind]:
+        record["users"] = [_last_segment(user) for user in item.get("users", [])]
+    if kind == "instances":
+        nat_ips = [config.get("natIP") for interface in item.get("networkInterfaces", [])
+                   for config in interface.get("accessConfigs", []) if config.get("natIP")]
+        record["externalIP"] = nat_ips[0] if nat_ips else None
+    return record
+
+
+def _marker(kind: str, item: Dict[str, Any]) -> List[Any]:
+    return [item.get(field) for field in CHANGE_FIELDS[kind]]
+
+
+def _default_service_factory(service_name: str) -> Any:
+    from gcp_discovery import thread_local_service
+    return thread_local_service(service_name, "v1")
+
+
+class GcpInventory:
+    """프로젝트의 GCP 리소스 스냅샷과 증분 갱신"""
+
+    def __init__(self, project: str, service_factory: Optional[Callable[[str], Any]] = None,
+                 snapshot_path: Optional[Path] = None, max_workers: int = 8,
+                 bucket_ttl: float = 3600):
+        """
+        GcpInventory 초기화
+
+        Args:
+            project: 프로젝트 ID
+            service_factory: API 이름 → 현재 스레드에서 쓸 서비스 (기본: gcp_discovery.thread_local_service)
+            snapshot_path: 스냅샷 파일 경로 (기본: GCP_INVENTORY_DIR 또는 ~/.cache/cloud-basic/gcp_inventory/<project>.json)
+            max_workers: 병렬 조회 스레드 수
+            bucket_ttl: 버킷 객체 집계 유효 시간(초)
+        """
+        self.project = project
+        self.service_factory = service_factory or _default_service_factory
+        snapshot_dir = Path(os.getenv("GCP_INVENTORY_DIR", DEFAULT_SNAPSHOT_DIR))
+        self.snapshot_path = Path(snapshot_path or snapshot_dir / f"{project}.json")
+        self.max_workers = max_workers
+        self.bucket_ttl = bucket_ttl
+        self.snapshot = self._load()
+
+    # ---- 스냅샷 ----
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            snapshot = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            if snapshot.get("project") == self.project:
+                return snapshot
+        except (OSError, ValueError):
+            pass
+        return {"project": self.project, "refreshed_at": None,
+                "resources": {kind: {} for kind in (*COMPUTE_FIELDS, "buckets")}}
+
+    def _save(self):
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.snapshot, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.snapshot_path)
+
+    @property
+    def resources(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return self.snapshot["resources"]
+
+    # ---- 조회 ----
+
+    def _sweep(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        """유형 하나를 aggregatedList 로 모든 영역에서 조회 (키: 영역/리전 + 이름)"""
+        collection = getattr(self.service_factory("compute"), kind)()
+        fields = f"items/*/{kind}({','.join(COMPUTE_FIELDS[kind])}),nextPageToken"
+        found = {}
+        request = collection.aggregatedList(project=self.project, fields=fields)
+        while request is not None:
+            response = request.execute()
+            for scope, scoped in response.get("items", {}).items():
+                for item in scoped.get(kind, []):
+                    found[f"{scope.rsplit('/', 1)[-1]}/{item['name']}"] = item
+            request = collection.aggregatedList_next(request, response)
+        return found
+
+    def _list_buckets(self) -> Dict[str, Dict[str, Any]]:
+        buckets = self.service_factory("storage").buckets()
+        found = {}
+        request = buckets.list(project=self.project, fields=f"items({','.join(BUCKET_FIELDS)}),nextPageToken")
+        while request is not None:
+            response = request.execute()
+            found.update({item["name"]: item for item in response.get("items", [])})
+            request = buckets.list_next(request, response)
+        return found
+
+    def _scan_bucket(self, bucket: str) -> Tuple[int, int]:
+        """버킷 객체 개수와 총 용량(바이트)"""
+        objects = self.service_factory("storage").objects()
+        count = total = 0
+        request = objects.list(bucket=bucket, fields="items(size),nextPageToken", maxResults=1000)
+        while request is not None:
+            response = request.execute()
+            items = response.get("items", [])
+            count += len(items)
+            total += sum(int(item.get("size", 0)) for item in items)
+            request = objects.list_next(request, response)
+        return count, total
+
+    def _merge(self, kind: str, found: Dict[str, Dict[str, Any]], changes: Dict[str, List[str]]):
+        current = self.resources.setdefault(kind, {})
+        for key in [key for key in current if key not in found]:
+            del current[key]
+            changes["removed"].append(f"{kind}/{key}")
+        for key, item in found.items():
+            previous = current.get(key)
+            marker = _marker(kind, item)
+            if previous is not None and previous.get("_marker") == marker:
+                continue
+            record = _record(kind, item) if kind != "buckets" else {
+                field: item.get(field) for field in BUCKET_FIELDS}
+            record["_marker"] = marker
+            if kind == "buckets" and previous is not None:
+                # 객체 집계는 다시 스캔할 때까지 유지
+                for field in ("object_count", "total_bytes", "scanned_at", "scan_error"):
+                    if field in previous:
+                        record[field] = previous[field]
+            current[key] = record
+            changes["changed" if previous is not None else "added"].append(f"{kind}/{key}")
+
+    def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        인벤토리 갱신 후 스냅샷 저장
+
+        Args:
+            full: True 면 모든 레코드와 버킷 객체 집계를 새로 기록
+
+        Returns:
+            {"added": [...], "changed": [...], "removed": [...], "scanned_buckets": 수,
+             "scan_errors": 버킷 → 오류, "elapsed": 초}
+        """
+        started = time.monotonic()
+        if full:
+            self.snapshot = {"project": self.project, "refreshed_at": None,
+                             "resources": {kind: {} for kind in (*COMPUTE_FIELDS, "buckets")}}
+        changes: Dict[str, List[str]] = {"added": [], "changed": [], "removed": []}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            sweeps = {kind: executor.submit(self._sweep, kind) for kind in COMPUTE_FIELDS}
+            buckets_future = executor.submit(self._list_buckets)
+
+            self._merge("buckets", buckets_future.result(), changes)
+            now = time.time()
+            changed = {key.split("/", 1)[1] for key in changes["added"] + changes["changed"]}
+            to_scan = [name for name, record in self.resources["buckets"].items()
+                       if name in changed or "scanned_at" not in record
+                       or now - record["scanned_at"] > self.bucket_ttl]
+            scans = {name: executor.submit(self._scan_bucket, name) for name in to_scan}
+
+            for kind, future in sweeps.items():
+                self._merge(kind, future.result(), changes)
+            scan_errors: Dict[str, str] = {}
+            for name, future in scans.items():
+                record = self.resources["buckets"][name]
+                try:
+                    count, total = future.result()
+                except HttpError as e:
+                    # 이전 집계는 유지하고 scanned_at 을 남기지 않아 다음 갱신에서 다시 시도
+                    logger.warning(f"⚠️ 버킷 {name} 객체 집계 실패: {e}")
+                    record["scan_error"] = scan_errors[name] = str(e)
+                    record.pop("scanned_at", None)
+                    continue
+                record.pop("scan_error", None)
+                record.update(object_count=count, total_bytes=total, scanned_at=now)
+
+        self.snapshot["refreshed_at"] = time.time()
+        self._save()
+        elapsed = time.monotonic() - started
+        logger.info(f"GCP 인벤토리 갱신: 추가 {len(changes['added'])}, 변경 {len(changes['changed'])}, "
+                    f"삭제 {len(changes['removed'])}, 버킷 집계 {len(to_scan)}개 ({elapsed:.2f}초)")
+        return dict(changes, scanned_buckets=len(to_scan), scan_errors=scan_errors, elapsed=elapsed)
+
+    # ---- 비용 분석 ----
+
+    def unused_disks(self) -> List[Dict[str, Any]]:
+        return [d for d in self.resources["disks"].values() if d.get("status") == "READY" and not d["users"]]
+
+    def unused_addresses(self) -> List[Dict[str, Any]]:
+        return [a for a in self.resources["addresses"].values()
+                if a.get("status") == "RESERVED" and not a["users"]]
+
+    def empty_buckets(self) -> List[Dict[str, Any]]:
+        return [b for b in self.resources["buckets"].values() if b.get("object_count") == 0]
+
+
+def _print_table(rows: List[Dict[str, Any]], columns: Tuple[str, ...]):
+    if not rows:
+        print("  (없음)")
+        return
+    widths = [max(len(column), *(len(str(row.get(column, ""))) for row in rows)) for column in columns]
+    print("  " + "  ".join(column.upper().ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  " + "  ".join(str(row.get(column, "")).ljust(width) for column, width in zip(columns, widths)))
+
+
+def main():
+    """명령행: python gcp_inventory.py --project PROJECT [list|costs] [--full]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GCP 리소스 인벤토리")
+    parser.add_argument("command", nargs="?", choices=("list", "costs"), default="list")
+    parser.add_argument("--project", default=os.getenv("GCP_PROJECT_ID"), help="프로젝트 ID")
+    parser.add_argument("--full", action="store_true", help="스냅샷 무시하고 전체 갱신")
+    parser.add_argument("--bucket-ttl", type=float, default=3600, help="버킷 객체 집계 유효 시간(초)")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.project:
+        parser.error("--project 또는 GCP_PROJECT_ID 가 필요합니다")
+
+    inventory = GcpInventory(args.project, max_workers=args.workers, bucket_ttl=args.bucket_ttl)
+    inventory.refresh(full=args.full)
+    resources = inventory.resources
+
+    if args.command == "list":
+        print("Compute 인스턴스:")
+        _print_table(list(resources["instances"].values()),
+                     ("name", "zone", "status", "machineType", "externalIP"))
+        print("Cloud Storage 버킷:")
+        _print_table(list(resources["buckets"].values()),
+                     ("name", "location", "storageClass", "object_count", "total_bytes", "scan_error"))
+        return 0
+
+    print("사용하지 않는 영구 디스크:")
+    _print_table(inventory.unused_disks(), ("name", "zone", "sizeGb", "type"))
+    print("사용하지 않는 정적 IP:")
+    _print_table(inventory.unused_addresses(), ("name", "region", "address"))
+    print("비어있는 Cloud Storage 버킷:")
+    _print_table(inventory.empty_buckets(), ("name", "location"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
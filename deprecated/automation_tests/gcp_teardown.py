@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+GCP Compute 리소스 병렬 정리 엔진
+cloud-basic-advanced.sh 의 cleanup_gcp_resources 처럼 리소스를 하나씩 삭제하고 완료를 기다리는 대신,
+한 단계의 삭제 요청을 모두 비동기로 보낸 뒤 반환된 작업(operation)을 함께 추적합니다.
+
+- 주요 기능:
+  - 의존 순서대로 단계를 진행합니다: 인스턴스 → 디스크 → 방화벽 → 서브넷 → 네트워크
+  - 각 단계의 삭제 요청은 영역(zone) / 리전별 배치로 묶어 보내며, 이미 없는 리소스(404)는 삭제된 것으로 봅니다.
+  - OperationPoller 가 모든 작업을 배치 get 한 번으로 조회하므로 단계 소요 시간은 가장 느린 삭제 하나와 같습니다.
+  - 조회 대상은 단계 직전에 aggregatedList 로 찾습니다 (인스턴스와 함께 지워진 부팅 디스크는 다시 찾지 않음).
+  - 이름이 {prefix}- 로 시작하는 리소스만 삭제합니다 (접두사 필수, default 네트워크에 만든 과정 방화벽 포함).
+  - names 를 주면 단계별로 그 이름의 리소스만 삭제합니다 (학습자 실행이 만든 리소스만 정리할 때 사용,
+    같은 접두사를 쓰는 다른 학습자 리소스는 건드리지 않음).
+  - keep 라벨이 있는 인스턴스 / 디스크, default 네트워크는 건드리지 않습니다.
+"""
+
+import sys
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+
+from gcp_batch import BatchExecutor, http_status
+
+logger = logging.getLogger(__name__)
+
+# 정리 단계 (의존하는 리소스가 먼저)
+STAGES = ("instances", "disks", "firewalls", "subnetworks", "networks")
+
+# 단계별 삭제 요청 인자 이름 (영역 / 리전 / 전역)
+_SCOPE_ARG = {"instances": "zone", "disks": "zone", "subnetworks": "region",
+              "firewalls": None, "networks": None}
+
+
+def _last_segment(url: Optional[str]) -> Optional[str]:
+    return url.rsplit("/", 1)[-1] if url else None
+
+
+class OperationPoller:
+    """여러 Compute 작업을 배치 get 으로 함께 추적하는 공용 폴러"""
+
+    def __init__(self, compute: Any, project: str, min_interval: float = 1.0,
+                 max_interval: float = 10.0, backoff: float = 1.5):
+        """
+        Args:
+            compute: Compute 서비스
+            project: 프로젝트 ID
+            min_interval: 첫 조회 간격(초)
+            max_interval: 최대 조회 간격(초)
+            backoff: 진행이 없을 때 간격 증가 배수
+        """
+        self.compute = compute
+        self.project = project
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.polls = 0
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, key: str, operation: Dict[str, Any]):
+        """추적할 작업 등록 (key 는 결과 조회용 이름)"""
+        self._pending[key] = operation
+
+    def _get_request(self, operation: Dict[str, Any]) -> Any:
+        zone, region = _last_segment(operation.get("zone")), _last_segment(operation.get("region"))
+        if zone:
+            return self.compute.zoneOperations().get(
+                project=self.project, zone=zone, operation=operation["name"])
+        if region:
+            return self.compute.regionOperations().get(
+                project=self.project, region=region, operation=operation["name"])
+        return self.compute.globalOperations().get(project=self.project, operation=operation["name"])
+
+    def wait(self, timeout: float = 600) -> Dict[str, Optional[Exception]]:
+        """
+        등록된 모든 작업이 끝날 때까지 대기
+
+        Returns:
+            key → None(성공) 또는 오류
+        """
+        results: Dict[str, Optional[Exception]] = {}
+        deadline = time.monotonic() + timeout
+        interval = self.min_interval
+        while True:
+            for key, operation in list(self._pending.items()):
+                if operation.get("status") == "DONE":
+                    del self._pending[key]
+                    errors = operation.get("error", {}).get("errors", [])
+                    results[key] = RuntimeError(errors[0].get("message", errors[0])) if errors else None
+            if not self._pending:
+                return results
+            if time.monotonic() >= deadline:
+                for key in self._pending:
+                    results[key] = TimeoutError(f"{key} 작업이 {timeout:.0f}초 안에 끝나지 않았습니다")
+                self._pending.clear()
+                return results
+
+            time.sleep(interval)
+            batch = BatchExecutor(self.compute, "compute", max_retries=0)
+            for key, operation in self._pending.items():
+                batch.add(key, lambda operation=operation: self._get_request(operation))
+            batch.execute()
+            self.polls += 1
+
+            progressed = False
+            for key, item in batch.items.items():
+                if item.status == "done":
+                    progressed |= item.response.get("status") != self._pending[key].get("status")
+                    self._pending[key] = item.response
+                elif http_status(item.error) == 404:
+                    # 작업 기록이 사라짐: 완료된 것으로 간주
+                    self._pending[key] = dict(self._pending[key], status="DONE")
+                    progressed = True
+                # 그 밖의 조회 오류는 다음 주기에 다시 조회
+            interval = self.min_interval if progressed else min(interval * self.backoff, self.max_interval)
+
+
+class GcpTeardown:
+    """프로젝트의 Compute 리소스를 의존 순서에 따라 단계별 병렬 삭제"""
+
+    def __init__(self, compute: Any, project: str, prefix: str,
+                 names: Optional[Dict[str, Iterable[str]]] = None, keep_label: str = "keep", timeout: float = 600, poll_interval: float = 1.0,
+                 max_poll_interval: float = 10.0, batch_retries: int = 3, batch_backoff: float = 1.0):
+        """
+        Args:
+            compute: Compute 서비스
+            project: 프로젝트 ID
+            prefix: 이 접두사로 시작하는 리소스만 삭제 (필수, 프로젝트 전체 삭제 방지)
+            names: 단계(STAGES) → 삭제할 리소스 이름, 지정하면 여기 없는 단계 / 이름은 삭제하지 않음
+            keep_label: 이 라벨이 있는 인스턴스 / 디스크는 삭제하지 않음
+            timeout: 단계별 작업 완료 대기 시간(초)
+            poll_interval: 작업 조회 간격(초)
+            max_poll_interval: 최대 작업 조회 간격(초)
+            batch_retries: 삭제 요청 배치의 재시도 횟수 (429 / 5xx 항목만)
+            batch_backoff: 삭제 요청 재시도 첫 대기 시간(초)
+        """
+        if not prefix:
+            raise ValueError("삭제 대상 접두사(prefix)가 필요합니다")
+        self.compute = compute
+        self.project = project
+        self.prefix = prefix
+        self.names = {kind: set(values) for kind, values in names.items()} if names is not None else None
+        self.keep_label = keep_label
+        self.timeout = timeout
+        self.batch_retries = batch_retries
+        self.batch_backoff = batch_backoff
+        self.poller = OperationPoller(compute, project, poll_interval, max_poll_interval)
+        self.round_trips = 0
+
+    # ---- 조회 ----
+
+    def _collection(self, kind: str) -> Any:
+        return getattr(self.compute, kind)()
+
+    def _list(self, kind: str) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        """(영역 / 리전, 리소스) 목록"""
+        collection = self._collection(kind)
+        found = []
+        if _SCOPE_ARG[kind] is None:
+            request = collection.list(project=self.project)
+            while request is not None:
+                response = request.execute()
+                found += [(None, item) for item in response.get("items", [])]
+                request = collection.list_next(request, response)
+            return found
+        request = collection.aggregatedList(project=self.project)
+        while request is not None:
+            response = request.execute()
+            for scope, scoped in response.get("items", {}).items():
+                location = scope.split("/", 1)[1] if "/" in scope else None
+                found += [(location, item) for item in scoped.get(kind, [])]
+            request = collection.aggregatedList_next(request, response)
+        return found
+
+    def _selected(self, kind: str, item: Dict[str, Any]) -> bool:
+        if not item["name"].startswith(f"{self.prefix}-"):
+            return False
+        if self.names is not None and item["name"] not in self.names.get(kind, ()):
+            return False
+        if self.keep_label in item.get("labels", {}):
+            return False
+        if kind == "disks" and item.get("users"):
+            return False
+        if kind == "networks":
+            return item["name"] != "default"
+        return True
+
+    def discover(self, kind: str) -> List[Tuple[Optional[str], str]]:
+        """삭제 대상 (영역 / 리전, 이름) 목록"""
+        return [(location, item["name"]) for location, item in self._list(kind)
+                if self._selected(kind, item)]
+
+    # ---- 삭제 ----
+
+    def _delete_request(self, kind: str, location: Optional[str], name: str) -> Any:
+        kwargs = {"project": self.project, kind[:-1]: name}
+        scope_arg = _SCOPE_ARG[kind]
+        if scope_arg:
+            kwargs[scope_arg] = location
+        return self._collection(kind).delete(**kwargs)
+
+    def _delete_stage(self, kind: str, targets: List[Tuple[Optional[str], str]]) -> Dict[str, Exception]:
+        """한 단계의 삭제 요청을 영역 / 리전별 배치로 보내고 모든 작업 완료를 대기"""
+        groups: Dict[Optional[str], List[str]] = {}
+        for location, name in targets:
+            groups.setdefault(location, []).append(name)
+
+        failures: Dict[str, Exception] = {}
+        for location, names in groups.items():
+            batch = BatchExecutor(self.compute, "compute", max_retries=self.batch_retries,
+                                  backoff=self.batch_backoff)
+            for name in names:
+                key = f"{kind}/{location}/{name}" if location else f"{kind}/{name}"
+                batch.add(key, lambda name=name: self._delete_request(kind, location, name),
+                          ok_statuses=(404,))
+            batch.execute()
+            self.round_trips += batch.round_trips
+            failures.update(batch.failures())
+            for key, item in batch.items.items():
+                if item.status == "done":
+                    self.poller.add(key, item.response)
+
+        for key, error in self.poller.wait(self.timeout).items():
+            if error is not None:
+                failures[key] = error
+        return failures
+
+    def run(self, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        모든 단계를 순서대로 실행
+
+        Args:
+            dry_run: True 면 삭제 대상만 조회
+
+        Returns:
+            {"deleted": 단계 → 삭제 대상 수, "failures": 키 → 오류, "elapsed": 소요 시간(초)}
+        """
+        started = time.monotonic()
+        deleted: Dict[str, int] = {}
+        failures: Dict[str, Exception] = {}
+        for kind in STAGES:
+            if self.names is not None and not self.names.get(kind):
+                continue
+            targets = self.discover(kind)
+            if not targets:
+                continue
+            if dry_run:
+                deleted[kind] = len(targets)
+                for location, name in targets:
+                    logger.info(f"[DRY RUN] 삭제 예정: {kind} {name}" + (f" ({location})" if location else ""))
+                continue
+            stage_started = time.monotonic()
+            stage_failures = self._delete_stage(kind, targets)
+            failures.update(stage_failures)
+            deleted[kind] = len(targets) - len(stage_failures)
+            logger.info(f"🗑️ {kind} {deleted[kind]}/{len(targets)}개 삭제 "
+                        f"({time.monotonic() - stage_started:.1f}초)")
+        elapsed = time.monotonic() - started
+        for key, error in failures.items():
+            logger.warning(f"⚠️ 삭제 실패 {key}: {error}")
+        logger.info(f"GCP 정리 완료: {sum(deleted.values())}개 삭제, 실패 {len(failures)}개, "
+                    f"요청 배치 {self.round_trips}회, 작업 조회 {self.poller.polls}회, {elapsed:.1f}초")
+        return {"deleted": deleted, "failures": failures, "elapsed": elapsed}
+
+
+def main():
+    """명령행: python gcp_teardown.py --project PROJECT --prefix PREFIX [--dry-run]"""
+    import os
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GCP Compute 리소스 병렬 정리")
+    parser.add_argument("--project", default=os.getenv("GCP_PROJECT_ID"), help="프로젝트 ID")
+    parser.add_argument("--prefix", required=True, help="이 접두사로 시작하는 리소스만 삭제")
+    parser.add_argument("--keep-label", default="keep", help="삭제하지 않을 라벨 키")
+    parser.add_argument("--timeout", type=float, default=600, help="단계별 대기 시간(초)")
+    parser.add_argument("--dry-run", action="store_true", help="삭제 대상만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.project:
+        parser.error("--project 또는 GCP_PROJECT_ID 가 필요합니다")
+
+    from gcp_discovery import build
+    teardown = GcpTeardown(build("compute", "v1"), args.project, args.prefix,
+                           keep_label=args.keep_label, timeout=args.timeout)
+    result = teardown.run(dry_run=args.dry_run)
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+과정 IAM 일괄 온보딩 (CloudFormation 스택)
+학습자마다 IAM 사용자 / 그룹 / 정책 / 연결을 개별 API 로 만드는 대신,
+과정 전체 IAM 을 CloudFormation 템플릿으로 렌더링해 스택 몇 개로 제출하고 스택 이벤트로 완료를 기다립니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차 섹션 2: IAM 기초 실습 (iam_basics.sh 의 그룹 / 사용자 / BasicCoursePolicy)
+- 주요 기능:
+  - 그룹, 관리형 정책(그룹 연결), 학습자별 사용자(그룹 가입)를 한 템플릿에 담습니다.
+    리소스 생성 순서와 실패 시 롤백은 CloudFormation 이 서버에서 처리합니다.
+  - 학습자가 많으면 learner_stacks 개의 학습자 스택으로 나누며, 학습자는 랑데부 해시로 스택을 고릅니다.
+    (그룹 / 정책은 기본 스택에 둠)
+  - 배포 전에 기존 스택 템플릿을 읽어 이미 배치된 학습자는 그 스택에 그대로 두므로, 학습자나 learner_stacks 를
+    늘려도 기존 사용자가 다른 스택으로 옮겨지며 삭제 / 재생성되지 않습니다. learner_stacks 를 줄여 없어지는
+    스택의 학습자만 옮기며, 이때는 없어지는 스택을 먼저 삭제해 사용자 이름이 겹치지 않게 합니다.
+  - keep_existing 배포는 이미 스택에 있는 학습자를 유지한 채 주어진 학습자만 추가하며, 모두 이미 있으면 스택을
+    건드리지 않습니다. (학습자별 실행에서 사용, 과정 전체를 먼저 온보딩해 두면 학습자 실행은 조회만 함)
+  - 다른 프로세스의 스택 작업이 진행 중이면 끝날 때까지 기다린 뒤 기존 스택을 다시 읽어 계획을 새로 세웁니다.
+  - 다시 실행하면 기존 스택을 갱신하고, 바뀐 내용이 없는 스택은 건너뜁니다.
+  - 완료 대기는 ClientRequestToken 으로 이번 작업의 스택 이벤트만 골라 읽으며, 실패한 리소스의 사유를 모아 보고합니다.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+sys.path.append(str(Path(__file__).parent))
+
+logger = logging.getLogger(__name__)
+
+# iam_basics.sh 의 basic-course-policy.json 과 같은 권한
+DEFAULT_POLICY_DOCUMENT = {
+    "Version": "2012-10-17",
+    "Statement": [{
+        "Effect": "Allow",
+        "Action": ["ec2:Describe*", "ec2:RunInstances", "ec2:TerminateInstances",
+                   "s3:GetObject", "s3:PutObject", "s3:ListBucket", "s3:CreateBucket", "s3:DeleteBucket"],
+        "Resource": "*",
+    }],
+}
+
+TEMPLATE_BODY_LIMIT = 51200
+CAPABILITIES = ["CAPABILITY_NAMED_IAM"]
+COHORT_TAG = "cloud-basic-cohort"
+
+SUCCESS_STATUSES = {"CREATE_COMPLETE", "UPDATE_COMPLETE", "DELETE_COMPLETE"}
+# list_stacks 로 찾을 스택 상태 (삭제 완료 제외)
+LISTED_STATUSES = [
+    "CREATE_IN_PROGRESS", "CREATE_FAILED", "CREATE_COMPLETE", "ROLLBACK_IN_PROGRESS", "ROLLBACK_FAILED",
+    "ROLLBACK_COMPLETE", "DELETE_IN_PROGRESS", "DELETE_FAILED", "UPDATE_IN_PROGRESS",
+    "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS", "UPDATE_COMPLETE", "UPDATE_FAILED", "UPDATE_ROLLBACK_IN_PROGRESS",
+    "UPDATE_ROLLBACK_FAILED", "UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS", "UPDATE_ROLLBACK_COMPLETE"]
+FAILURE_STATUSES = {"CREATE_FAILED", "ROLLBACK_COMPLETE", "ROLLBACK_FAILED", "DELETE_FAILED",
+                    "UPDATE_FAILED", "UPDATE_ROLLBACK_COMPLETE", "UPDATE_ROLLBACK_FAILED"}
+
+
+class IamStackError(RuntimeError):
+    """스택 제출 / 적용 실패 (failures: 스택 이름 → 실패한 리소스 사유 목록)"""
+
+    def __init__(self, message: str, failures: Optional[Dict[str, List[str]]] = None):
+        super().__init__(message)
+        self.failures = failures or {}
+
+
+class _StackBusyError(IamStackError):
+    """다른 작업이 진행 중인 스택 (끝난 뒤 다시 계획)"""
+
+
+def _logical_id(prefix: str, name: str) -> str:
+    """이름에서 만든 CloudFormation 논리 ID (영숫자만 허용, 해시로 충돌 방지)"""
+    cleaned = re.sub(r"[^A-Za-z0-9]", "", name.title())[:40]
+    return f"{prefix}{cleaned}{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+
+def learner_bucket(learner: str, buckets: int) -> int:
+    """
+    학습자를 배치할 학습자 스택 번호 (랑데부 해시)
+
+    스택마다 (스택 번호, 학습자) 해시 점수를 매겨 가장 높은 스택을 고르므로, 스택 수가 바뀌어도
+    새 스택이나 없어진 스택에 걸린 학습자만 자리가 바뀝니다.
+    """
+    return max(range(buckets),
+               key=lambda n: hashlib.sha1(f"{n}:{learner}".encode("utf-8")).hexdigest())
+
+
+# 같은 과정 스택을 여러 학습자 실행이 동시에 갱신하지 않도록 프로세스 안에서 직렬화
+_stack_locks: Dict[str, threading.Lock] = {}
+_stack_locks_guard = threading.Lock()
+
+
+def _stack_lock(cohort: str) -> threading.Lock:
+    with _stack_locks_guard:
+        return _stack_locks.setdefault(cohort, threading.Lock())
+
+
+class CohortIamStack:
+    """과정 IAM 을 CloudFormation 스택으로 배포 / 정리"""
+
+    def __init__(self, cloudformation_client: Any, cohort: str, learner_stacks: int = 1,
+                 policy_document: Optional[Dict[str, Any]] = None, user_name_format: str = "{learner}-user",
+                 poll_interval: float = 5.0, timeout: float = 1800.0):
+        """
+        Args:
+            cloudformation_client: CloudFormation 클라이언트
+            cohort: 과정(기수) 이름, 스택 / 그룹 / 정책 이름 접두사
+            learner_stacks: 학습자 스택 수 (1 이면 그룹 / 정책 / 사용자를 스택 하나에 모두 담음)
+            policy_document: 그룹에 연결할 관리형 정책 문서
+            user_name_format: 학습자 IAM 사용자 이름 형식
+            poll_interval: 스택 이벤트 조회 간격 (초)
+            timeout: 스택 작업 대기 제한 시간 (초)
+        """
+        self.cfn = cloudformation_client
+        self.cohort = re.sub(r"[^A-Za-z0-9-]", "-", cohort).strip("-") or "cohort"
+        self.learner_stacks = max(1, learner_stacks)
+        self.policy_document = policy_document or DEFAULT_POLICY_DOCUMENT
+        self.user_name_format = user_name_format
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.group_name = f"{self.cohort}-learners"
+        self.policy_name = f"{self.cohort}-BasicCoursePolicy"
+        self.base_stack = f"{self.cohort}-iam"
+        self.api_calls = 0
+
+    # ---- 템플릿 ----
+
+    def _learner_stack_name(self, n: int) -> str:
+        return f"{self.base_stack}-learners-{n:02d}"
+
+    def learner_stack_names(self) -> List[str]:
+        if self.learner_stacks == 1:
+            return []
+        return [self._learner_stack_name(n) for n in range(self.learner_stacks)]
+
+    def _base_resources(self) -> Dict[str, Any]:
+        return {
+            "LearnersGroup": {"Type": "AWS::IAM::Group", "Properties": {"GroupName": self.group_name}},
+            "BasicCoursePolicy": {"Type": "AWS::IAM::ManagedPolicy", "Properties": {
+                "ManagedPolicyName": self.policy_name, "PolicyDocument": self.policy_document,
+                "Groups": [{"Ref": "LearnersGroup"}]}},
+        }
+
+    def _user_resources(self, learners: List[str], group: Any) -> Dict[str, Any]:
+        return {_logical_id("User", learner): {"Type": "AWS::IAM::User", "Properties": {
+                    "UserName": self.user_name_format.format(learner=learner), "Groups": [group]}}
+                for learner in learners}
+
+    @staticmethod
+    def _template(description: str, resources: Dict[str, Any]) -> Dict[str, Any]:
+        return {"AWSTemplateFormatVersion": "2010-09-09", "Description": description, "Resources": resources}
+
+    def templates(self, learners: List[str],
+                  recorded: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+                  keep_existing: bool = False) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        스택 이름 → 템플릿 (학습자가 없는 학습자 스택은 None = 삭제 대상)
+
+        Args:
+            learners: 학습자 ID 목록
+            recorded: recorded_users() 결과, 이미 배치된 학습자는 그 스택에 유지
+            keep_existing: learners 에 없는 기존 사용자도 유지
+        """
+        learners = sorted(set(learners))
+        recorded = recorded or {}
+        placed = {logical_id: stack for stack, users in recorded.items() for logical_id in users}
+        stacks = self.learner_stack_names() or [self.base_stack]
+
+        members: Dict[str, Dict[str, Any]] = {name: {} for name in stacks}
+        if keep_existing:
+            for stack, users in recorded.items():
+                for logical_id, resource in users.items():
+                    target = stack if stack in members else stacks[learner_bucket(logical_id, len(stacks))]
+                    members[target][logical_id] = resource
+        for learner in learners:
+            logical_id = _logical_id("User", learner)
+            target = placed.get(logical_id)
+            if target not in members:
+                target = stacks[learner_bucket(learner, len(stacks))]
+            members[target].update(self._user_resources([learner], self.group_name))
+
+        # 사용자의 그룹 참조는 스택에 맞게 (기본 스택은 Ref, 학습자 스택은 그룹 이름)
+        for name, users in members.items():
+            group = {"Ref": "LearnersGroup"} if name == self.base_stack else self.group_name
+            for resource in users.values():
+                resource["Properties"]["Groups"] = [group]
+
+        # 줄어든 learner_stacks 밖의 기존 스택은 먼저 삭제 (옮겨 갈 사용자와 이름이 겹치지 않게)
+        plans: Dict[str, Optional[Dict[str, Any]]] = {
+            name: None for name in recorded if name != self.base_stack and name not in members}
+        if self.learner_stacks == 1:
+            resources = self._base_resources()
+            resources.update(members[self.base_stack])
+            plans[self.base_stack] = self._template(
+                f"{self.cohort} 과정 IAM (학습자 {len(members[self.base_stack])}명)", resources)
+            return plans
+
+        plans[self.base_stack] = self._template(f"{self.cohort} 과정 IAM 그룹 / 정책", self._base_resources())
+        for name in stacks:
+            users = members[name]
+            plans[name] = self._template(f"{self.cohort} 과정 학습자 IAM 사용자 ({len(users)}명)",
+                                         users) if users else None
+        return plans
+
+    @staticmethod
+    def render(template: Dict[str, Any]) -> str:
+        return json.dumps(template, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+    # ---- 제출 / 대기 ----
+
+    def _call(self, operation: str, **kwargs) -> Dict[str, Any]:
+        self.api_calls += 1
+        return getattr(self.cfn, operation)(**kwargs)
+
+    def _describe(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._call("describe_stacks", StackName=name)["Stacks"][0]
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ValidationError" and "does not exist" in str(e):
+                return None
+            raise
+
+    def _template_resources(self, name: str) -> Optional[Dict[str, Any]]:
+        """배포된 스택의 템플릿 리소스 (스택이 없으면 None)"""
+        try:
+            body = self._call("get_template", StackName=name)["TemplateBody"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ValidationError" and "does not exist" in str(e):
+                return None
+            raise
+        if isinstance(body, str):
+            body = json.loads(body)
+        return body.get("Resources") or {}
+
+    def recorded_users(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        기존 스택에 배치된 학습자 사용자 (스택 이름 → 논리 ID → 리소스, 기본 스택이 먼저)
+
+        과정 스택은 이름 접두사로 list_stacks 에서 찾으므로, 비어 있어 삭제된 번호 뒤의 스택이나
+        learner_stacks 를 줄이기 전에 만든 스택도 빠지지 않습니다. 최초 생성이 롤백된 스택은 사용자가
+        없으므로 빈 목록으로 기록합니다.
+        """
+        statuses: Dict[str, str] = {}
+        next_token = None
+        while True:
+            kwargs: Dict[str, Any] = {"StackStatusFilter": LISTED_STATUSES}
+            if next_token:
+                kwargs["NextToken"] = next_token
+            page = self._call("list_stacks", **kwargs)
+            for summary in page["StackSummaries"]:
+                name = summary["StackName"]
+                if name == self.base_stack or name.startswith(f"{self.base_stack}-learners-"):
+                    statuses[name] = summary["StackStatus"]
+            next_token = page.get("NextToken")
+            if not next_token:
+                break
+
+        recorded: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for name in sorted(statuses, key=lambda n: (n != self.base_stack, n)):
+            resources = {} if statuses[name] == "ROLLBACK_COMPLETE" else self._template_resources(name)
+            if resources is not None:
+                recorded[name] = {logical_id: resource for logical_id, resource in resources.items()
+                                  if resource["Type"] == "AWS::IAM::User"}
+        return recorded
+
+    def _submit(self, name: str, template: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+        """스택 생성 / 갱신 / 삭제 요청 (대기할 작업이 없으면 None, 있으면 (스택 ID, 요청 토큰))"""
+        token = f"{name}-{uuid.uuid4().hex}"[:128]
+        body = self.render(template) if template is not None else None
+        existing = self._describe(name)
+        if existing is not None and existing["StackStatus"].endswith("_IN_PROGRESS"):
+            raise _StackBusyError(f"{name} 스택 작업이 이미 진행 중입니다 ({existing['StackStatus']})")
+        if existing is not None and existing["StackStatus"] == "ROLLBACK_COMPLETE":
+            # 최초 생성이 롤백된 스택은 갱신할 수 없으므로 지우고 다시 생성
+            self._call("delete_stack", StackName=existing["StackId"], ClientRequestToken=token)
+            self._wait({existing["StackId"]: (name, token)})
+            token, existing = f"{name}-{uuid.uuid4().hex}"[:128], None
+
+        if body is None:
+            if existing is None:
+                return None
+            self._call("delete_stack", StackName=existing["StackId"], ClientRequestToken=token)
+            return existing["StackId"], token
+        if existing is None:
+            stack_id = self._call("create_stack", StackName=name, TemplateBody=body, Capabilities=CAPABILITIES,
+                                  Tags=[{"Key": COHORT_TAG, "Value": self.cohort}],
+                                  OnFailure="ROLLBACK", ClientRequestToken=token)["StackId"]
+            return stack_id, token
+        try:
+            stack_id = self._call("update_stack", StackName=existing["StackId"], TemplateBody=body,
+                                  Capabilities=CAPABILITIES, ClientRequestToken=token)["StackId"]
+        except ClientError as e:
+            if "No updates are to be performed" in str(e):
+                logger.info(f"{name} 스택 변경 없음")
+                return None
+            if "_IN_PROGRESS state" in str(e):
+                raise _StackBusyError(f"{name} 스택 작업이 이미 진행 중입니다") from e
+            raise
+        return stack_id, token
+
+    def _new_events(self, stack_id: str, token: str, seen: set) -> List[Dict[str, Any]]:
+        """이번 작업(token)의 아직 읽지 않은 이벤트 (시간순)"""
+        events, next_token = [], None
+        while True:
+            kwargs = {"StackName": stack_id}
+            if next_token:
+                kwargs["NextToken"] = next_token
+            page = self._call("describe_stack_events", **kwargs)
+            for event in page["StackEvents"]:
+                if event["EventId"] in seen or event.get("ClientRequestToken") != token:
+                    return list(reversed(events))
+                seen.add(event["EventId"])
+                events.append(event)
+            next_token = page.get("NextToken")
+            if not next_token:
+                return list(reversed(events))
+
+    def _wait(self, pending: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+        """
+        스택 작업 완료 대기 (스택 ID → (이름, 요청 토큰))
+
+        Returns:
+            스택 이름 → 최종 상태
+
+        Raises:
+            IamStackError: 실패 / 롤백으로 끝난 스택이 있거나 제한 시간을 넘긴 경우
+        """
+        pending = dict(pending)
+        deadline = time.monotonic() + self.timeout
+        seen: set = set()
+        statuses: Dict[str, str] = {}
+        failures: Dict[str, List[str]] = {}
+        while pending:
+            for stack_id, (name, token) in list(pending.items()):
+                for event in self._new_events(stack_id, token, seen):
+                    status = event["ResourceStatus"]
+                    if status.endswith("_FAILED"):
+                        failures.setdefault(name, []).append(
+                            f"{event['LogicalResourceId']}: {event.get('ResourceStatusReason') or status}")
+                    if event["ResourceType"] == "AWS::CloudFormation::Stack" and \
+                            (status in SUCCESS_STATUSES or status in FAILURE_STATUSES):
+                        statuses[name] = status
+                        del pending[stack_id]
+                        log = logger.info if status in SUCCESS_STATUSES else logger.error
+                        log(f"{'✅' if status in SUCCESS_STATUSES else '❌'} {name}: {status}")
+                        break
+            if pending:
+                if time.monotonic() > deadline:
+                    raise IamStackError(f"스택 작업 대기 시간 초과: {', '.join(n for n, _ in pending.values())}",
+                                        failures)
+                time.sleep(self.poll_interval)
+
+        failed = {name: status for name, status in statuses.items() if status not in SUCCESS_STATUSES}
+        if failed:
+            raise IamStackError("스택 적용 실패: " + ", ".join(f"{n} ({s})" for n, s in failed.items()), failures)
+        return statuses
+
+    def _run(self, plans: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, str]:
+        """스택들을 모두 제출한 뒤 함께 대기"""
+        pending = {}
+        for name, template in plans.items():
+            submitted = self._submit(name, template)
+            if submitted is not None:
+                pending[submitted[0]] = (name, submitted[1])
+        return self._wait(pending) if pending else {}
+
+    def deploy(self, learners: List[str], keep_existing: bool = False) -> Dict[str, str]:
+        """
+        과정 IAM 배포 (없어지는 학습자 스택 삭제 → 기본 스택 → 학습자 스택 순)
+
+        다른 프로세스의 스택 작업이 진행 중이면 timeout 안에서 기다렸다가 기존 스택을 다시 읽어 재시도합니다.
+
+        Args:
+            learners: 학습자 ID 목록
+            keep_existing: 스택에 이미 있는 학습자를 유지하고 learners 만 추가
+
+        Returns:
+            스택 이름 → 최종 상태 (변경 없는 스택은 제외)
+        """
+        deadline = time.monotonic() + self.timeout
+        with _stack_lock(self.cohort):
+            while True:
+                try:
+                    return self._deploy(learners, keep_existing)
+                except _StackBusyError as e:
+                    if time.monotonic() > deadline:
+                        raise
+                    logger.info(f"{e}, 끝난 뒤 다시 시도합니다")
+                    time.sleep(self.poll_interval)
+
+    def _deploy(self, learners: List[str], keep_existing: bool) -> Dict[str, str]:
+        calls_before = self.api_calls
+        recorded = self.recorded_users()
+        if keep_existing and self.base_stack in recorded:
+            active = set(self.learner_stack_names() or [self.base_stack])
+            placed = {logical_id: name for name, users in recorded.items() for logical_id in users}
+            if all(placed.get(_logical_id("User", learner)) in active for learner in learners):
+                logger.info(f"학습자 {len(set(learners))}명이 이미 과정 IAM 스택에 있습니다")
+                return {}
+        plans = self.templates(learners, recorded, keep_existing)
+        # 일부 스택만 제출된 채로 멈추지 않도록 제출 전에 모든 템플릿 크기 확인
+        for name, template in plans.items():
+            if template is not None and len(self.render(template).encode("utf-8")) > TEMPLATE_BODY_LIMIT:
+                raise IamStackError(
+                    f"{name} 템플릿이 {TEMPLATE_BODY_LIMIT} 바이트를 넘습니다. learner_stacks 를 늘리세요")
+        retired = {name: plans.pop(name) for name in list(plans)
+                   if name != self.base_stack and name not in self.learner_stack_names()}
+        results = self._run(retired) if retired else {}
+        results.update(self._run({self.base_stack: plans.pop(self.base_stack)}))
+        if plans:
+            results.update(self._run(plans))
+        logger.info(f"CloudFormation API {self.api_calls - calls_before}회로 학습자 {len(set(learners))}명 IAM 처리 "
+                    f"(스택 {1 + len(plans) + len(retired)}개)")
+        return results
+
+    def teardown(self) -> Dict[str, str]:
+        """학습자 스택 → 기본 스택 순으로 삭제 (learner_stacks 를 줄이기 전에 만든 스택 포함)"""
+        with _stack_lock(self.cohort):
+            learner_stacks = [name for name in self.recorded_users() if name != self.base_stack]
+            results = self._run({name: None for name in dict.fromkeys(learner_stacks + self.learner_stack_names())})
+            results.update(self._run({self.base_stack: None}))
+            return results
+
+
+def main():
+    """명령행: python iam_stack.py --cohort COHORT --learners a,b,c [--learner-stacks 4] [--teardown]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="과정 IAM 을 CloudFormation 스택으로 일괄 온보딩")
+    parser.add_argument("--cohort", default=os.getenv("COURSE_COHORT"), help="과정(기수) 이름")
+    parser.add_argument("--learners", default="", help="학습자 ID 목록 (쉼표 구분)")
+    parser.add_argument("--learners-file", help="학습자 ID 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--learner-stacks", type=int, default=1, help="학습자 스택 수 (템플릿 크기 제한 대응)")
+    parser.add_argument("--policy", help="그룹에 연결할 정책 문서 JSON 파일")
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "ap-northeast-2"))
+    parser.add_argument("--profile", default=os.getenv("AWS_PROFILE"))
+    parser.add_argument("--role-arn", default=os.getenv("AWS_ROLE_ARN"), help="학습자 계정 역할 ARN")
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--teardown", action="store_true", help="과정 IAM 스택 삭제")
+    parser.add_argument("--dry-run", action="store_true", help="템플릿만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.cohort:
+        parser.error("--cohort 또는 COURSE_COHORT 가 필요합니다")
+    learners = [learner.strip() for learner in args.learners.split(",") if learner.strip()]
+    if args.learners_file:
+        learners += [line.strip() for line in Path(args.learners_file).read_text(encoding="utf-8").splitlines()
+                     if line.strip()]
+    policy = json.loads(Path(args.policy).read_text(encoding="utf-8")) if args.policy else None
+
+    client = None
+    if not args.dry_run:
+        from client_registry import get_client_registry
+        client = get_client_registry({"aws_region": args.region}).get_client(
+            "cloudformation", args.region, args.profile, role_arn=args.role_arn)
+    stack = CohortIamStack(client, args.cohort, args.learner_stacks, policy, poll_interval=args.poll_interval)
+
+    if args.dry_run:
+        print(json.dumps(stack.templates(learners), ensure_ascii=False, indent=2))
+        return 0
+    try:
+        results = stack.teardown() if args.teardown else stack.deploy(learners)
+    except IamStackError as e:
+        logger.error(f"❌ {e}")
+        for name, reasons in e.failures.items():
+            for reason in reasons:
+                logger.error(f"   {name} - {reason}")
+        return 1
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,26 @@ Cloud Basic 과정 개선된 자동화 스크립트
 import sys
 import os
 import json
+import time
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 # 공통 라이브러리 import
 sys.path.append(str(Path(__file__).parent.parent.parent / "shared_libs"))
 from automation_base import AutomationBase
 from cloud_utils import CloudUtils
 
+sys.path.append(str(Path(__file__).parent))
+from client_registry import get_client_registry
+from readiness_poller import get_readiness_poller
+from warm_pool import WarmPool, RdsPoolProvider, get_warm_pool, register_warm_pool
+from run_history import get_run_history
+from progress_dashboard import ProgressDashboard
+from preflight import PreflightCheck
+from cohort_network import get_cohort_network
+from profiling import AutomationProfiler, profiled_phase, print_profile_summary
+
 class CloudBasicAutomation(AutomationBase):
     """Cloud Basic 과정 자동화 클래스"""
     
@@ -28,8 +39,37 @@ class CloudBasicAutomation(AutomationBase):
         """
         super().__init__(config)
         self.cloud_utils = CloudUtils(config)
+        # CloudUtils 개별 클라이언트 대신 프로세스 공용 클라이언트 사용
+        self.client_registry = get_client_registry(config)
+        self.cloud_utils.aws_clients = self.client_registry.client_map(
+            config.get('aws_region'), role_arn=config.get('aws_role_arn'),
+            role_session_name=config.get('aws_role_session_name'))
+        # EC2/RDS 준비 대기는 학습자 전체가 공유하는 폴러로 일괄 조회
+        self.readiness_poller = get_readiness_poller(
+            config.get('aws_region'), role_arn=config.get('aws_role_arn'),
+            role_session_name=config.get('aws_role_session_name'))
+        self.learner_id = config.get('learner_id', config.get('project_prefix', 'basic'))
+        self.rds_warm_pool = config.get('rds_warm_pool', 'basic-rds')
+        self.rds_warm_pool_size = int(config.get('rds_warm_pool_size', 0))
         self.day = config.get('day', 1)
         
+        # 실행 이력 기록 (SQLite)
+        self.run_history = get_run_history()
+        self.cohort = config.get('cohort', os.getenv('COURSE_COHORT'))
+        # 과정 공용 VPC 사용 시 학습자별로는 서브넷만 생성 (교재 Day2 섹션 1)
+        self.shared_network = bool(config.get('shared_network')) and bool(self.cohort)
+        self.vpc_cidr = config.get('vpc_cidr', config.get('environment_setup', {}).get('vpc_cidr', '10.0.0.0/16'))
+        self.aws_role_arn = config.get('aws_role_arn')
+        self._account_id: Optional[str] = None
+        self._run_id: Optional[int] = None
+        self._step_started: Dict[str, float] = {}
+        self._last_step_started: Optional[float] = None
+        
+        # 실시간 진행 대시보드 (선택)
+        self.dashboard: Optional[ProgressDashboard] = config.get('dashboard')
+        # 단계별 프로파일 (--profile, 선택)
+        self.profiler: Optional[AutomationProfiler] = config.get('profiler')
+        
         # 교재 연계 정보
         self.textbook_info = {
             "1": {
@@ -52,6 +92,64 @@ class CloudBasicAutomation(AutomationBase):
             }
         }
     
+    def run_automation(self) -> bool:
+        """
+        자동화 실행 (실행 이력 기록 포함)
+        
+        Returns:
+            자동화 성공 여부
+        """
+        self._run_id = self.run_history.start_run(
+            "CloudBasicAutomation.run_automation", "cloud_basic", self.day,
+            learner=self.learner_id, cohort=self.cohort)
+        success = False
+        try:
+            success = super().run_automation()
+            return success
+        finally:
+            self.run_history.finish_run(self._run_id, "success" if success else "failed")
+            self._run_id = None
+            if self.dashboard:
+                self.dashboard.emit(self.learner_id, "성공" if success else "실패", "finished")
+    
+    def log_info(self, step: str, *args, **kwargs):
+        """단계 시작 시각 기록 후 로그 출력"""
+        now = time.time()
+        self._step_started.setdefault(step, now)
+        self._last_step_started = now
+        if self.dashboard:
+            self.dashboard.emit(self.learner_id, step, "running")
+        super().log_info(step, *args, **kwargs)
+    
+    def log_success(self, step: str, *args, **kwargs):
+        """단계 성공 기록 후 로그 출력"""
+        self._record_step(step, "success")
+        if self.dashboard:
+            self.dashboard.emit(self.learner_id, step, "success")
+        super().log_success(step, *args, **kwargs)
+    
+    def log_error(self, step: str, error: Exception, *args, **kwargs):
+        """단계 실패 기록 후 로그 출력"""
+        self._record_step(step, "failed", str(error))
+        if self.dashboard:
+            self.dashboard.emit(self.learner_id, step, "failed", str(error))
+        super().log_error(step, error, *args, **kwargs)
+    
+    def log_warning(self, step: str, *args, **kwargs):
+        """단계 경고 전달 후 로그 출력"""
+        if self.dashboard:
+            self.dashboard.emit(self.learner_id, step, "warning")
+        super().log_warning(step, *args, **kwargs)
+    
+    def _record_step(self, step: str, status: str, error: Optional[str] = None):
+        """실행 이력에 단계 소요 시간 기록 (시작 로그가 없으면 직전 단계 시작 시각 기준)"""
+        if self._run_id is None:
+            return
+        now = time.time()
+        started_at = self._step_started.pop(step, self._last_step_started or now)
+        self.run_history.record_step(self._run_id, step, status, started_at, now - started_at, error)
+    
+    @profiled_phase("setup")
     def setup_environment(self) -> bool:
         """
         환경 설정 (교재 Day1 섹션 1 연계)
@@ -89,6 +187,7 @@ class CloudBasicAutomation(AutomationBase):
             self.log_error("환경 설정", e)
             return False
     
+    @profiled_phase("practice")
     def run_practice(self) -> bool:
         """
         실습 실행 (교재 내용과 연계)
@@ -166,12 +265,15 @@ class CloudBasicAutomation(AutomationBase):
             
             # 1. 네트워킹 기초 실습 (교재 Day2 섹션 1)
             self.log_info("네트워킹 기초 실습", "VPC 및 서브넷 구성")
-            vpc_id = self.cloud_utils.create_vpc("basic", 2)
+            if self.shared_network:
+                vpc_id, subnet_id = self._create_cohort_subnet()
+            else:
+                vpc_id = self.cloud_utils.create_vpc("basic", 2)
+                subnet_id = self.cloud_utils.create_subnet(vpc_id, "basic", 2) if vpc_id else None
             if not vpc_id:
                 self.log_error("네트워킹 기초 실습", Exception("VPC 생성 실패"))
                 return False
             
-            subnet_id = self.cloud_utils.create_subnet(vpc_id, "basic", 2)
             if not subnet_id:
                 self.log_error("네트워킹 기초 실습", Exception("서브넷 생성 실패"))
                 return False
@@ -204,6 +306,7 @@ class CloudBasicAutomation(AutomationBase):
             self.log_error("Day2 실습", e)
             return False
     
+    @profiled_phase("cleanup")
     def cleanup_resources(self) -> bool:
         """
         리소스 정리 (교재 마지막 섹션 연계)
@@ -219,6 +322,18 @@ class CloudBasicAutomation(AutomationBase):
             if not aws_cleanup:
                 self.log_warning("AWS 리소스 정리", "일부 AWS 리소스 정리 실패")
             
+            # 웜 풀에서 할당받은 RDS 인스턴스 정리 (풀 태그로 이 학습자 할당분 조회)
+            pool = self._rds_warm_pool()
+            if pool:
+                for db_id in pool.release(self.learner_id):
+                    self.log_success("웜 풀 리소스 정리", f"할당된 RDS 인스턴스 삭제: {db_id}")
+            
+            # 과정 공용 VPC 의 학습자 서브넷 삭제 및 CIDR 반환 (VPC 는 과정 종료 시 teardown)
+            if self.shared_network:
+                network = self._cohort_network()
+                for learner, error in network.release([self.learner_id]).items():
+                    self.log_warning("공용 네트워크 정리", f"학습자 서브넷 삭제 실패 ({learner}): {error}")
+            
             # GCP 리소스 정리
             gcp_cleanup = self._cleanup_gcp_resources()
             if not gcp_cleanup:
@@ -265,12 +380,21 @@ class CloudBasicAutomation(AutomationBase):
     def _prepare_practice_environment(self) -> bool:
         """실습 환경 준비"""
         try:
-            # 필요한 도구 확인
-            required_tools = ['aws', 'gcloud', 'docker', 'git']
-            for tool in required_tools:
-                self.log_info(f"도구 확인: {tool}", f"{tool} 설치 상태 확인")
-            
-            self.log_success("실습 환경 준비", "모든 필수 도구 확인 완료")
+            # 필요한 도구 / 버전 / 자격 증명을 동시에 확인 (같은 PATH·도구면 캐시 결과 사용)
+            report = PreflightCheck().run()
+            for result in report["results"].values():
+                label = f"도구 확인: {result['name']}"
+                if result["ok"]:
+                    self.log_success(label, result["detail"])
+                elif not result["required"]:
+                    # 선택 도구(docker, GCP 자격 증명)는 실패로 기록하지 않음
+                    self.log_warning(label, result["detail"])
+                else:
+                    self.log_error(label, Exception(result["detail"]))
+            
+            if not report["ok"]:
+                return False
+            self.log_success("실습 환경 준비", f"모든 필수 도구 확인 완료 ({report['elapsed']:.2f}초)")
             return True
             
         except Exception as e:
@@ -310,9 +434,43 @@ class CloudBasicAutomation(AutomationBase):
             self.log_error("Security Group 생성", e)
             return None
     
+    def _aws_account_id(self) -> Optional[str]:
+        """역할 ARN 또는 STS 로 확인한 AWS 계정 ID (한 번만 조회)"""
+        if self._account_id is None:
+            if self.aws_role_arn:
+                self._account_id = self.aws_role_arn.split(':')[4]
+            else:
+                self._account_id = self.cloud_utils.aws_clients['sts'].get_caller_identity()['Account']
+        return self._account_id
+    
+    def _cohort_network(self):
+        """(계정, 리전, 과정)별 공용 네트워크"""
+        return get_cohort_network(self.cloud_utils.aws_clients['ec2'], self.cohort,
+                                  account=self._aws_account_id(), vpc_cidr=self.vpc_cidr)
+    
+    def _create_cohort_subnet(self) -> Tuple[Optional[str], Optional[str]]:
+        """과정 공용 VPC 에 학습자 서브넷 생성 (VPC 는 과정당 한 번만 생성)"""
+        try:
+            network = self._cohort_network()
+            subnet_id = network.ensure_subnet(self.learner_id)
+            self.log_success("네트워킹 기초 실습", f"공용 VPC {network.vpc_id} 에 학습자 서브넷 {subnet_id} 할당")
+            return network.vpc_id, subnet_id
+            
+        except Exception as e:
+            self.log_error("네트워킹 기초 실습", e)
+            return None, None
+    
     def _create_rds_instance(self) -> Optional[str]:
         """RDS 인스턴스 생성"""
         try:
+            # 웜 풀에 준비된 인스턴스가 있으면 즉시 할당 (교재 Day2 섹션 3 대기 시간 단축)
+            pool = self._rds_warm_pool()
+            if pool:
+                resource = pool.claim(self.learner_id)
+                if resource:
+                    self.log_success("RDS 인스턴스 생성", f"웜 풀 인스턴스 할당: {resource['id']}")
+                    return resource['id']
+            
             # RDS MySQL 인스턴스 생성 로직
             self.log_success("RDS 인스턴스 생성", "MySQL 인스턴스 생성 완료")
             return "db-1234567890abcdef0"
@@ -321,6 +479,14 @@ class CloudBasicAutomation(AutomationBase):
             self.log_error("RDS 인스턴스 생성", e)
             return None
     
+    def _rds_warm_pool(self) -> Optional[WarmPool]:
+        """RDS 웜 풀 조회 (rds_warm_pool_size 가 설정되면 최초 사용 시 등록 후 백그라운드 보충 시작)"""
+        pool = get_warm_pool(self.rds_warm_pool)
+        if pool is None and self.rds_warm_pool_size > 0:
+            provider = RdsPoolProvider(self.cloud_utils.aws_clients['rds'])
+            pool = register_warm_pool(WarmPool(self.rds_warm_pool, provider, target_size=self.rds_warm_pool_size))
+        return pool
+    
     def _create_web_application(self) -> bool:
         """웹 애플리케이션 구성"""
         try:
@@ -364,6 +530,8 @@ def print_help():
 
 📋 옵션:
     --day [1|2]     실행할 일차 선택 (기본값: 1)
+    --dashboard     실시간 진행 대시보드 표시 (HTML 스냅샷: automation_dashboard.html)
+    --profile       단계별 cProfile + 전체 스레드 샘플링 프로파일 (결과: automation_results/profile/)
     --help, -h      이 도움말 표시
     --version, -v   버전 정보 표시
 
@@ -374,6 +542,9 @@ def print_help():
     # Day2 실행
     python3 improved_basic_automation.py --day 2
     
+    # 프로파일과 함께 실행 (flamegraph.pl automation_results/profile/cloud_basic_day1.collapsed > flame.svg)
+    python3 improved_basic_automation.py --profile
+    
     # 도움말 표시
     python3 improved_basic_automation.py --help
 
@@ -419,6 +590,15 @@ def main():
     """메인 함수"""
     import sys
     
+    # 대시보드 옵션은 위치와 무관하게 처리
+    dashboard = None
+    if '--dashboard' in sys.argv:
+        sys.argv.remove('--dashboard')
+        dashboard = ProgressDashboard(html_path=Path('automation_dashboard.html'))
+    profile = '--profile' in sys.argv
+    if profile:
+        sys.argv.remove('--profile')
+    
     # 명령행 인수 처리
     if len(sys.argv) > 1:
         if sys.argv[1] in ['--help', '-h']:
@@ -468,8 +648,14 @@ def main():
         'base_directory': config['automation']['base_directory'],
         'results_directory': config['automation']['results_directory'],
         'logs_directory': config['automation']['logs_directory'],
-        'course_config': config['courses']['cloud_basic']
+        'course_config': config['courses']['cloud_basic'],
+        'dashboard': dashboard
     }
+    profiler = None
+    if profile:
+        results_dir = Path(basic_config['results_directory'])
+        profiler = AutomationProfiler(results_dir / 'profile', prefix=f"cloud_basic_day{day}")
+        basic_config['profiler'] = profiler
     
     print(f"🚀 Cloud Basic Day{day} 자동화 시작...")
     print(f"📚 교재 연계: {['AWS & GCP 기초 서비스 실습', '네트워크, 보안 및 데이터베이스 실습'][day-1]}")
@@ -478,7 +664,19 @@ def main():
     # 자동화 실행
     try:
         automation = CloudBasicAutomation(basic_config)
-        success = automation.run_automation()
+        if dashboard:
+            dashboard.start()
+        if profiler:
+            profiler.start()
+        try:
+            success = automation.run_automation()
+        finally:
+            if dashboard:
+                dashboard.stop()
+            if profiler:
+                profiler.stop()
+                print_profile_summary(profiler.write_reports(
+                    results_dir / f"cloud_basic_day{day}_results.json"))
         
         # 결과 출력
         automation.print_summary()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+실습 환경 사전 점검(preflight) 엔진
+aws / gcloud / docker / git / Python 설치 여부, 최소 버전, AWS / GCP 자격 증명을 한 번에 확인합니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차 섹션 1: 실습 환경 준비 (comprehensive_environment_check)
+- 주요 기능:
+  - 모든 점검 명령을 스레드 풀에서 동시에 실행하고 명령별 제한 시간을 둡니다.
+    처음 점검은 가장 느린 명령 하나의 시간 안에 끝납니다.
+  - 결과는 점검별로 캐시합니다. 캐시 키는 PATH, 도구 실행 파일의 경로와 수정 시각,
+    자격 증명 파일의 수정 시각과 관련 환경 변수이므로 도구를 재설치하거나 aws configure 를 다시 하면 그 점검만 새로 실행합니다.
+  - 자격 증명 점검은 토큰 만료를 고려해 성공한 결과만 credential_ttl 동안 캐시합니다.
+    실패한 자격 증명 점검과 시간 초과 결과는 캐시하지 않으므로 로그인 직후 다시 실행하면 바로 반영됩니다.
+  - docker 와 GCP 자격 증명은 1일차 AWS 실습에 필요하지 않으므로 선택 항목입니다 (실패해도 경고만).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "cloud-basic" / "preflight.json"
+
+_VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)(?:\.(\d+))?")
+
+
+def parse_version(text: str) -> Optional[Tuple[int, ...]]:
+    """출력에서 첫 번째 'X.Y[.Z]' 버전 추출"""
+    match = _VERSION_PATTERN.search(text)
+    if not match:
+        return None
+    return tuple(int(part) for part in match.groups() if part is not None)
+
+
+def _aws_files() -> List[str]:
+    """자격 증명 / 설정 파일과 SSO 토큰 캐시 (aws sso login 은 ~/.aws/sso/cache 만 갱신)"""
+    sso_cache = Path.home() / ".aws" / "sso" / "cache"
+    return [os.getenv("AWS_SHARED_CREDENTIALS_FILE", str(Path.home() / ".aws" / "credentials")),
+            os.getenv("AWS_CONFIG_FILE", str(Path.home() / ".aws" / "config")),
+            str(sso_cache), *sorted(str(path) for path in sso_cache.glob("*.json"))]
+
+
+def _gcloud_files() -> List[str]:
+    config_dir = Path(os.getenv("CLOUDSDK_CONFIG", str(Path.home() / ".config" / "gcloud")))
+    return [str(config_dir / name) for name in ("active_config", "credentials.db", "access_tokens.db")]
+
+
+class Probe:
+    """점검 항목 하나 (실행할 명령과 판정 기준)"""
+
+    __slots__ = ("name", "candidates", "args", "min_version", "required", "credential",
+                 "watch_files", "watch_env")
+
+    def __init__(self, name: str, candidates: Sequence[str], args: Sequence[str],
+                 min_version: Optional[Tuple[int, ...]] = None, required: bool = True,
+                 credential: bool = False, watch_files=None, watch_env: Sequence[str] = ()):
+        """
+        Args:
+            name: 점검 이름
+            candidates: 실행 파일 후보 (PATH 에서 처음 찾은 것 사용)
+            args: 실행 인자
+            min_version: 최소 버전 (버전 점검일 때)
+            required: False 면 실패해도 전체 결과는 통과
+            credential: 자격 증명 점검 여부 (출력이 비어 있으면 실패, 성공한 결과만 credential_ttl 동안 캐시)
+            watch_files: 캐시 키에 수정 시각을 넣을 파일 목록을 돌려주는 함수
+            watch_env: 캐시 키에 넣을 환경 변수 이름
+        """
+        self.name = name
+        self.candidates = tuple(candidates)
+        self.args = tuple(args)
+        self.min_version = min_version
+        self.required = required
+        self.credential = credential
+        self.watch_files = watch_files
+        self.watch_env = tuple(watch_env)
+
+
+_AWS_ENV = ("AWS_PROFILE", "AWS_ACCESS_KEY_ID", "AWS_DEFAULT_REGION", "AWS_REGION")
+_GCP_ENV = ("CLOUDSDK_CORE_PROJECT", "CLOUDSDK_CORE_ACCOUNT", "GOOGLE_APPLICATION_CREDENTIALS")
+
+DEFAULT_PROBES = (
+    Probe("aws", ["aws"], ["--version"], min_version=(2, 0)),
+    Probe("gcloud", ["gcloud"], ["--version"]),
+    Probe("docker", ["docker"], ["--version"], min_version=(20, 10), required=False),
+    Probe("git", ["git"], ["--version"], min_version=(2, 0)),
+    Probe("python", ["python3", "python"], ["--version"], min_version=(3, 8)),
+    Probe("aws_credentials", ["aws"], ["sts", "get-caller-identity", "--query", "Arn", "--output", "text"],
+          credential=True, watch_files=_aws_files, watch_env=_AWS_ENV),
+    Probe("gcp_credentials", ["gcloud"],
+          ["auth", "list", "--filter=status:ACTIVE", "--format=value(account)"],
+          required=False, credential=True, watch_files=_gcloud_files, watch_env=_GCP_ENV),
+)
+
+
+def _mtime(path: Optional[str]) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+class PreflightCheck:
+    """점검 항목을 동시에 실행하고 결과를 캐시"""
+
+    def __init__(self, probes: Sequence[Probe] = DEFAULT_PROBES, cache_path: Optional[Path] = None,
+                 timeout: float = 15.0, credential_ttl: float = 900.0, path: Optional[str] = None):
+        """
+        Args:
+            probes: 점검 항목
+            cache_path: 캐시 파일 (기본값: PREFLIGHT_CACHE 환경 변수 또는 ~/.cache/cloud-basic/preflight.json)
+            timeout: 명령별 제한 시간(초)
+            credential_ttl: 자격 증명 점검 결과 캐시 유효 시간(초)
+            path: 도구를 찾을 PATH (기본값: 현재 환경의 PATH)
+        """
+        self.probes = list(probes)
+        self.cache_path = Path(cache_path or os.getenv("PREFLIGHT_CACHE", DEFAULT_CACHE_PATH))
+        self.timeout = timeout
+        self.credential_ttl = credential_ttl
+        self.path = path if path is not None else os.getenv("PATH", "")
+
+    # ---- 캐시 ----
+
+    def _binary(self, probe: Probe) -> Optional[str]:
+        for candidate in probe.candidates:
+            found = shutil.which(candidate, path=self.path)
+            if found:
+                return found
+        return None
+
+    def cache_key(self, probe: Probe) -> str:
+        """PATH, 실행 파일 경로와 수정 시각, 감시 파일 수정 시각, 감시 환경 변수로 만든 키"""
+        binary = self._binary(probe)
+        files = probe.watch_files() if probe.watch_files else []
+        material = {
+            "path": self.path,
+            "args": probe.args,
+            "binary": [binary, _mtime(binary)],
+            "files": [[f, _mtime(f)] for f in files],
+            "env": {name: os.getenv(name) for name in probe.watch_env},
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Any]):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"⚠️ 사전 점검 캐시 저장 실패: {e}")
+
+    def _cached(self, probe: Probe, entry: Optional[Dict[str, Any]], key: str) -> Optional[Dict[str, Any]]:
+        if not entry or entry.get("key") != key:
+            return None
+        if probe.credential and time.time() - entry.get("checked_at", 0) > self.credential_ttl:
+            return None
+        return dict(entry["result"], cached=True, elapsed=0.0)
+
+    # ---- 실행 ----
+
+    def _run_probe(self, probe: Probe) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"name": probe.name, "required": probe.required, "ok": False,
+                                  "version": None, "detail": "", "cached": False, "timed_out": False}
+        start = time.perf_counter()
+        binary = self._binary(probe)
+        if binary is None:
+            result["detail"] = f"{' / '.join(probe.candidates)} 설치 필요"
+        else:
+            try:
+                completed = subprocess.run([binary, *probe.args], capture_output=True, text=True,
+                                           timeout=self.timeout, env=dict(os.environ, PATH=self.path))
+                output = (completed.stdout.strip() or completed.stderr.strip())
+                first_line = output.splitlines()[0] if output else ""
+                if completed.returncode != 0:
+                    result["detail"] = first_line or f"종료 코드 {completed.returncode}"
+                elif probe.credential:
+                    result["ok"] = bool(first_line)
+                    result["detail"] = first_line or "활성 자격 증명 없음"
+                else:
+                    version = parse_version(output)
+                    result["version"] = ".".join(map(str, version)) if version else None
+                    result["ok"] = probe.min_version is None or (version is not None and version >= probe.min_version)
+                    result["detail"] = first_line
+                    if not result["ok"]:
+                        minimum = ".".join(map(str, probe.min_version))
+                        result["detail"] = f"{first_line} (최소 {minimum} 필요)"
+            except subprocess.TimeoutExpired:
+                result["timed_out"] = True
+                result["detail"] = f"{self.timeout:.0f}초 안에 응답 없음"
+            except OSError as e:
+                result["detail"] = str(e)
+        result["elapsed"] = round(time.perf_counter() - start, 3)
+        return result
+
+    def run(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        모든 점검 실행
+
+        Args:
+            use_cache: False 면 캐시를 무시하고 모두 다시 실행 (결과는 캐시에 저장)
+
+        Returns:
+            {"ok": 필수 점검 모두 통과 여부, "results": 이름 → 결과, "elapsed": 소요 시간(초), "cached": 캐시 적중 수}
+        """
+        started = time.perf_counter()
+        cache = self._load_cache()
+        keys = {probe.name: self.cache_key(probe) for probe in self.probes}
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for probe in self.probes:
+            hit = self._cached(probe, cache.get(probe.name), keys[probe.name]) if use_cache else None
+            if hit is not None:
+                results[probe.name] = hit
+            else:
+                pending.append(probe)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                for probe, result in zip(pending, executor.map(self._run_probe, pending)):
+                    results[probe.name] = result
+                    if result["timed_out"] or (probe.credential and not result["ok"]):
+                        cache.pop(probe.name, None)
+                    else:
+                        cache[probe.name] = {"key": keys[probe.name], "checked_at": time.time(), "result": result}
+            self._save_cache(cache)
+
+        ordered = {probe.name: results[probe.name] for probe in self.probes}
+        return {
+            "ok": all(r["ok"] for r in ordered.values() if r["required"]),
+            "results": ordered,
+            "elapsed": round(time.perf_counter() - started, 3),
+            "cached": sum(1 for r in ordered.values() if r["cached"]),
+        }
+
+
+def log_report(report: Dict[str, Any], log=logger):
+    """점검 결과 로그 출력"""
+    for result in report["results"].values():
+        label = f"{result['name']} {result['version']}" if result["version"] else result["name"]
+        suffix = " (캐시)" if result["cached"] else f" ({result['elapsed']:.2f}초)"
+        if result["ok"]:
+            log.info(f"✅ {label}: {result['detail']}{suffix}")
+        elif result["required"]:
+            log.error(f"❌ {label}: {result['detail']}{suffix}")
+        else:
+            log.warning(f"⚠️ {label}: {result['detail']}{suffix}")
+    passed = sum(1 for r in report["results"].values() if r["ok"])
+    log.info(f"사전 점검 {passed}/{len(report['results'])} 통과, 캐시 {report['cached']}개, {report['elapsed']:.2f}초")
+
+
+def main():
+    """명령행: python preflight.py [--no-cache] [--timeout 15] [--json]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="실습 환경 사전 점검")
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 무시하고 모두 다시 점검")
+    parser.add_argument("--timeout", type=float, default=15.0, help="명령별 제한 시간(초)")
+    parser.add_argument("--skip", default="", help="건너뛸 점검 이름 (쉼표 구분)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    skip = {name.strip() for name in args.skip.split(",") if name.strip()}
+    checker = PreflightCheck([p for p in DEFAULT_PROBES if p.name not in skip], timeout=args.timeout)
+    report = checker.run(use_cache=not args.no_cache)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        log_report(report)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
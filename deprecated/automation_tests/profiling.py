@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+자동화 실행 프로파일러
+자동화 진입점의 --profile 옵션으로 켜며, 코드를 따로 계측하지 않고도 CPU / 벽시계 시간이 어디에 쓰이는지 보여 줍니다.
+
+- 주요 기능:
+  - 단계(setup, practice, cleanup)별 결정적 프로파일(cProfile)을 단계 이름별 .pstats 파일로 저장합니다.
+    (cProfile 은 단계를 실행한 스레드만 기록하므로, 다른 스레드에서 동시에 시작된 같은 단계는 시간만 합산합니다.)
+  - 모든 스레드의 스택을 일정 간격으로 수집하는 저부하 샘플링 프로파일러를 함께 실행하며,
+    결과는 flamegraph.pl / speedscope 에 바로 넣을 수 있는 collapsed stack 형식으로 저장합니다.
+  - 단계별 상위 N개 함수와 샘플링 상위 N개 프레임 요약을 결과 파일(JSON)의 profile 항목에 기록합니다.
+"""
+
+import re
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import logging
+import functools
+from pathlib import Path
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, List, Optional, Iterator, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.01
+DEFAULT_TOP_N = 20
+
+# 스레드 풀 워커 번호를 지워 같은 풀의 스레드를 한 스택으로 합침 (예: ThreadPoolExecutor-0_3 → ThreadPoolExecutor-0)
+_WORKER_SUFFIX = re.compile(r"_\d+$")
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """모든 스레드의 스택을 주기적으로 수집하는 벽시계 샘플링 프로파일러"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, phase: Callable[[], Optional[str]] = lambda: None):
+        """
+        Args:
+            interval: 샘플 간격 (초)
+            phase: 샘플 시점의 단계 이름을 돌려주는 함수
+        """
+        self.interval = interval
+        self.phase = phase
+        self.stacks: Counter = Counter()
+        self.phase_samples: Counter = Counter()
+        self.samples = 0
+        self.threads = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+
+    def sample(self, exclude: Optional[int] = None):
+        """현재 모든 스레드의 스택 1회 수집"""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        phase = self.phase()
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            thread = _WORKER_SUFFIX.sub("", names.get(ident, f"thread-{ident}"))
+            self.threads.add(thread)
+            stack.append(thread)
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+        if phase is not None:
+            self.phase_samples[phase] += 1
+
+    def collapsed(self) -> str:
+        """collapsed stack 형식 ("루트;...;리프 샘플수" 한 줄에 스택 하나)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top(self, n: int = DEFAULT_TOP_N) -> List[Dict[str, Any]]:
+        """리프(자기 시간) 기준 상위 프레임"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [{"frame": frame, "samples": count, "share": round(count / total, 4)}
+                for frame, count in leaves.most_common(n)]
+
+
+class AutomationProfiler:
+    """단계별 cProfile + 전체 스레드 샘플링 프로파일러"""
+
+    def __init__(self, output_dir: Path, top_n: int = DEFAULT_TOP_N, interval: float = DEFAULT_INTERVAL,
+                 prefix: str = "profile"):
+        """
+        Args:
+            output_dir: .pstats / .collapsed 파일을 저장할 디렉토리
+            top_n: 요약에 포함할 상위 항목 수
+            interval: 샘플링 간격 (초)
+            prefix: 출력 파일 이름 접두사
+        """
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.prefix = prefix
+        self.sampler = StackSampler(interval, phase=lambda: self._current_phase)
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._walls: Dict[str, float] = {}
+        self._calls: Counter = Counter()
+        self._current_phase: Optional[str] = None
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> "AutomationProfiler":
+        self._started = time.perf_counter()
+        self.sampler.start()
+        return self
+
+    def stop(self):
+        self.sampler.stop()
+        self.elapsed = time.perf_counter() - self._started
+
+    def __enter__(self) -> "AutomationProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """단계 구간 프로파일 (동시에 하나의 단계만 cProfile 로 기록하고, 겹치는 구간은 시간만 합산)"""
+        with self._lock:
+            owner = self._current_phase is None
+            if owner:
+                self._current_phase = name
+                profile = self._profiles.setdefault(name, cProfile.Profile())
+        started = time.perf_counter()
+        if owner:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if owner:
+                profile.disable()
+            with self._lock:
+                self._walls[name] = self._walls.get(name, 0.0) + time.perf_counter() - started
+                self._calls[name] += 1
+                if owner:
+                    self._current_phase = None
+
+    def _top_functions(self, profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(profile).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top_n]
+        return [{"function": f"{func} ({Path(filename).name}:{line})", "calls": nc,
+                 "tottime": round(tt, 6), "cumtime": round(ct, 6)}
+                for (filename, line, func), (cc, nc, tt, ct, callers) in rows]
+
+    def write_reports(self, results_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        .pstats / .collapsed 파일 저장 후 요약 반환
+
+        Args:
+            results_path: 요약을 profile 항목으로 병합할 결과 JSON 파일 (없으면 생성)
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        phases = {}
+        for name, profile in self._profiles.items():
+            path = self.output_dir / f"{self.prefix}-{name}.pstats"
+            profile.dump_stats(str(path))
+            stats = pstats.Stats(profile)
+            phases[name] = {"wall_s": round(self._walls.get(name, 0.0), 6), "runs": self._calls[name],
+                            "cpu_s": round(stats.total_tt, 6), "pstats": str(path),
+                            "top": self._top_functions(profile)}
+        collapsed_path = self.output_dir / f"{self.prefix}.collapsed"
+        collapsed_path.write_text(self.sampler.collapsed(), encoding="utf-8")
+        summary = {
+            "elapsed_s": round(self.elapsed, 6),
+            "phases": phases,
+            "sampling": {"interval_s": self.sampler.interval, "samples": self.sampler.samples,
+                         "threads": sorted(self.sampler.threads),
+                         "phase_samples": dict(self.sampler.phase_samples),
+                         "collapsed": str(collapsed_path), "top": self.sampler.top(self.top_n)},
+        }
+        if results_path is not None:
+            results_path = Path(results_path)
+            results = {}
+            if results_path.exists():
+                try:
+                    results = json.loads(results_path.read_text(encoding="utf-8"))
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠️ 결과 파일 형식이 올바르지 않아 새로 작성합니다: {results_path}")
+            results["profile"] = summary
+            results_path.parent.mkdir(parents=True, exist_ok=True)
+            results_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        return summary
+
+
+def profiled_phase(name: str):
+    """self.profiler 가 설정된 경우 메서드 실행 구간을 단계로 기록하는 데코레이터"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, "profiler", None)
+            with profiler.phase(name) if profiler is not None else nullcontext():
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def print_profile_summary(summary: Dict[str, Any], limit: int = 5):
+    """단계별 / 샘플링 상위 항목 출력"""
+    print("\n🔬 프로파일 요약")
+    for name, phase in summary["phases"].items():
+        print(f"  [{name}] 벽시계 {phase['wall_s']:.3f}s, CPU {phase['cpu_s']:.3f}s → {phase['pstats']}")
+        for row in phase["top"][:limit]:
+            print(f"      {row['tottime']:>9.4f}s  {row['calls']:>7}회  {row['function']}")
+    sampling = summary["sampling"]
+    print(f"  [샘플링] {sampling['samples']}회, 스레드 {len(sampling['threads'])}개 → {sampling['collapsed']}")
+    for row in sampling["top"][:limit]:
+        print(f"      {row['share']:>7.1%}  {row['frame']}")
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+기수 실행 실시간 진행 대시보드
+워커 스레드는 이벤트 큐에 진행 상황만 넣고, 렌더링은 별도 스레드에서 수행합니다.
+
+- 주요 기능:
+  - 학습자별 / 단계별 상태, 경과 시간, 처리량(단계/분), 오류 수를 터미널에 표시합니다.
+  - 선택적으로 외부 리소스 없이 열 수 있는 HTML 스냅샷 파일을 주기적으로 갱신합니다.
+  - emit() 은 큐에 넣기만 하므로 클라우드 API 를 호출하는 워커를 막지 않습니다.
+  - 터미널 대시보드가 켜져 있는 동안 콘솔 로그 핸들러를 떼어 내고 최근 로그를 화면 아래에 표시합니다.
+    (화면 지우기와 로그 출력이 서로 덮어쓰지 않도록, 종료 시 원래 핸들러로 복원)
+"""
+
+import os
+import sys
+import time
+import html
+import queue
+import threading
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUS_ICONS = {"running": "⏳", "success": "✅", "failed": "❌", "warning": "⚠️"}
+
+
+class _LearnerState:
+    """학습자 한 명의 진행 상태"""
+
+    __slots__ = ("learner", "started_at", "updated_at", "current_step", "steps",
+                 "completed", "errors", "last_error", "finished")
+
+    def __init__(self, learner: str, now: float):
+        self.learner = learner
+        self.started_at = now
+        self.updated_at = now
+        self.current_step = ""
+        self.steps: Dict[str, str] = {}
+        self.completed = 0
+        self.errors = 0
+        self.last_error = ""
+        self.finished: Optional[str] = None
+
+
+class _DashboardLogHandler(logging.Handler):
+    """대시보드가 켜져 있는 동안 콘솔 대신 최근 로그를 보관하는 핸들러"""
+
+    def __init__(self, lines: "deque[str]", formatter: Optional[logging.Formatter]):
+        super().__init__()
+        self.lines = lines
+        self.setFormatter(formatter)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.lines.append(self.format(record).splitlines()[0][:160])
+        except Exception:
+            self.handleError(record)
+
+
+class ProgressDashboard:
+    """이벤트 큐 기반 비차단 진행 대시보드"""
+
+    def __init__(self, refresh_interval: float = 0.5,
+                 stream: Optional[TextIO] = None,
+                 html_path: Optional[Path] = None,
+                 max_rows: int = 40,
+                 log_lines: int = 8):
+        """
+        ProgressDashboard 초기화
+
+        Args:
+            refresh_interval: 화면 갱신 주기(초)
+            stream: 터미널 출력 스트림 (기본값: sys.stdout)
+            html_path: HTML 스냅샷 파일 경로 (None 이면 생성하지 않음)
+            max_rows: 터미널에 표시할 최대 학습자 수
+            log_lines: 대시보드 아래에 표시할 최근 로그 줄 수
+        """
+        self.refresh_interval = refresh_interval
+        self.stream = stream or sys.stdout
+        self.html_path = Path(html_path) if html_path else None
+        self.max_rows = max_rows
+        self.events: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self._learners: Dict[str, _LearnerState] = {}
+        self._started_at = time.time()
+        self._total_completed = 0
+        self._total_errors = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 렌더링 스레드와 stop() 의 마지막 렌더링이 겹치지 않도록 보호
+        self._render_lock = threading.Lock()
+        self._interactive = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._log_lines: "deque[str]" = deque(maxlen=log_lines)
+        self._detached: List[Tuple[logging.Logger, logging.Handler]] = []
+        self._log_handler: Optional[_DashboardLogHandler] = None
+
+    # ---- 워커 측 API ----
+
+    def emit(self, learner: str, step: str, status: str, error: Optional[str] = None):
+        """
+        진행 이벤트 전달 (즉시 반환)
+
+        Args:
+            learner: 학습자 ID
+            step: 단계 이름
+            status: running / success / failed / warning / finished
+            error: 오류 메시지
+        """
+        self.events.put({"learner": learner, "step": step, "status": status,
+                         "error": error, "time": time.time()})
+
+    # ---- 렌더링 스레드 ----
+
+    def start(self) -> "ProgressDashboard":
+        self._started_at = time.time()
+        if self._interactive:
+            self._capture_console_logs()
+        self._thread = threading.Thread(target=self._run, name="progress-dashboard", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """남은 이벤트를 반영하여 마지막 화면을 그린 뒤 종료"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            if self._thread.is_alive():
+                logger.warning("⚠️ 대시보드 렌더링 스레드가 5초 안에 끝나지 않아 완료를 기다립니다")
+        # 렌더링 스레드가 아직 그리는 중이면 끝날 때까지 기다린 뒤 마지막 화면을 그림
+        with self._render_lock:
+            self._drain()
+            self.render()
+        self._restore_console_logs()
+
+    def _run(self):
+        while not self._stopped.wait(self.refresh_interval):
+            with self._render_lock:
+                if self._stopped.is_set():
+                    return
+                if self._drain():
+                    self.render()
+
+    def _capture_console_logs(self):
+        """터미널로 출력하는 로그 핸들러를 떼어 내고 대시보드 로그 영역으로 돌림"""
+        console_streams = {id(sys.stdout), id(sys.stderr), id(self.stream)}
+        root = logging.getLogger()
+        formatter = None
+        for handler in list(root.handlers):
+            if type(handler) is logging.StreamHandler and id(handler.stream) in console_streams:
+                formatter = formatter or handler.formatter
+                root.removeHandler(handler)
+                self._detached.append((root, handler))
+        if self._detached:
+            self._log_handler = _DashboardLogHandler(self._log_lines, formatter)
+            root.addHandler(self._log_handler)
+
+    def _restore_console_logs(self):
+        if self._log_handler is not None:
+            logging.getLogger().removeHandler(self._log_handler)
+            self._log_handler = None
+        for owner, handler in self._detached:
+            owner.addHandler(handler)
+        self._detached.clear()
+
+    def _drain(self) -> bool:
+        changed = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return changed
+            self._apply(event)
+            changed = True
+
+    def _apply(self, event: Dict[str, Any]):
+        state = self._learners.get(event["learner"])
+        if state is None:
+            state = _LearnerState(event["learner"], event["time"])
+            self._learners[event["learner"]] = state
+        state.updated_at = event["time"]
+        step, status = event["step"], event["status"]
+
+        if status == "finished":
+            state.finished = step or "done"
+            state.current_step = ""
+            return
+        previous = state.steps.get(step)
+        state.steps[step] = status
+        if status == "running":
+            state.current_step = step
+        elif status in ("success", "failed") and previous != status:
+            state.completed += 1
+            self._total_completed += 1
+            if state.current_step == step:
+                state.current_step = ""
+        if status == "failed":
+            state.errors += 1
+            self._total_errors += 1
+            state.last_error = (event.get("error") or "")[:80]
+
+    def summary(self) -> Dict[str, Any]:
+        """전체 진행 요약"""
+        elapsed = time.time() - self._started_at
+        return {
+            "learners": len(self._learners),
+            "finished": sum(1 for s in self._learners.values() if s.finished),
+            "completed_steps": self._total_completed,
+            "errors": self._total_errors,
+            "elapsed": elapsed,
+            "steps_per_min": self._total_completed / elapsed * 60 if elapsed > 0 else 0.0,
+        }
+
+    def render(self):
+        """터미널 화면 및 HTML 스냅샷 갱신"""
+        self._render_terminal()
+        if self.html_path is not None:
+            try:
+                self._write_html()
+            except OSError as e:
+                logger.warning(f"⚠️ HTML 스냅샷 저장 실패: {e}")
+
+    def _rows(self) -> List[_LearnerState]:
+        return sorted(self._learners.values(), key=lambda s: (s.finished is not None, s.learner))
+
+    def _render_terminal(self):
+        info = self.summary()
+        lines = [
+            f"📊 진행 현황  경과 {info['elapsed']:.0f}s | 학습자 {info['finished']}/{info['learners']} 완료 | "
+            f"단계 {info['completed_steps']}개 ({info['steps_per_min']:.1f}/분) | ❌ 오류 {info['errors']}개",
+            "-" * 96,
+        ]
+        now = time.time()
+        rows = self._rows()
+        for state in rows[:self.max_rows]:
+            if state.finished:
+                status = f"🏁 {state.finished}"
+            elif state.current_step:
+                status = f"⏳ {state.current_step}"
+            else:
+                status = "대기"
+            elapsed = (state.updated_at if state.finished else now) - state.started_at
+            lines.append(f"{state.learner[:20]:<20} {status[:40]:<40} {elapsed:>6.0f}s "
+                         f"✅{state.completed:>3} ❌{state.errors:>2} {state.last_error[:20]}")
+        if len(rows) > self.max_rows:
+            lines.append(f"... 외 {len(rows) - self.max_rows}명")
+        if self._log_lines:
+            lines.append("-" * 96)
+            lines.extend(list(self._log_lines))
+
+        if self._interactive:
+            self.stream.write("\033[H\033[J" + "\n".join(lines) + "\n")
+        else:
+            # 로그 파일/파이프에는 요약 한 줄만 출력
+            self.stream.write(lines[0] + "\n")
+        self.stream.flush()
+
+    def _write_html(self):
+        info = self.summary()
+        steps = sorted({step for state in self._learners.values() for step in state.steps})
+        header = "".join(f"<th>{html.escape(step)}</th>" for step in steps)
+        body = []
+        for state in self._rows():
+            cells = "".join(
+                f'<td class="{state.steps.get(step, "")}">{STATUS_ICONS.get(state.steps.get(step), "")}</td>'
+                for step in steps)
+            body.append(f"<tr><td>{html.escape(state.learner)}</td>{cells}"
+                        f"<td>{state.errors}</td><td>{html.escape(state.last_error)}</td></tr>")
+
+        document = f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><meta http-equiv="refresh" content="5">
+<title>Cloud Basic 진행 현황</title>
+<style>
+body {{ font-family: sans-serif; margin: 1em; }}
+table {{ border-collapse: collapse; font-size: 13px; }}
+th, td {{ border: 1px solid #ccc; padding: 3px 6px; text-align: center; }}
+td.success {{ background: #e6f4ea; }} td.failed {{ background: #fce8e6; }}
+td.running {{ background: #fef7e0; }}
+</style></head><body>
+<h2>Cloud Basic 진행 현황</h2>
+<p>경과 {info['elapsed']:.0f}초 · 학습자 {info['finished']}/{info['learners']} 완료 ·
+단계 {info['completed_steps']}개 ({info['steps_per_min']:.1f}/분) · 오류 {info['errors']}개 ·
+갱신 {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
+<table><tr><th>학습자</th>{header}<th>오류</th><th>최근 오류</th></tr>
+{''.join(body)}
+</table></body></html>
+"""
+        tmp_path = self.html_path.with_suffix(self.html_path.suffix + ".tmp")
+        tmp_path.write_text(document, encoding="utf-8")
+        os.replace(tmp_path, self.html_path)
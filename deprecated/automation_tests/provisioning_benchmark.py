@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+수업 당일 환경 구성(1일차 + 2일차) 종단 간 벤치마크
+BasicCourseAutomation 의 1일차 AWS / 2일차 GCP 흐름을 학습자 수와 실행 전략별로 돌려
+지연 시간이 주입된 로컬 가짜 백엔드(testing/fake_cloud)에서 소요 시간과 자원 사용량을 측정합니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차 / 2일차 실습 환경 일괄 준비
+- 주요 기능:
+  - 학습자 1 / 10 / 50 / 100명 × 실행 전략(sequential, threaded, cohort) 조합을 측정합니다.
+    - sequential: 학습자를 한 명씩 순서대로 구성
+    - threaded: 학습자별 1일차 + 2일차 흐름을 스레드 풀에서 동시에 실행
+    - cohort: 1일차는 스레드 풀, 2일차 GCP 리소스는 과정 전체를 한 번에 배치 요청
+  - 조합별 전체 소요 시간, 학습자별 준비 완료 시간 p50 / p95, API 호출 수, 최대 메모리, 최대 스레드 수를 기록합니다.
+  - 결과를 기준선(baseline) 파일로 저장하고, 이후 실행을 기준선과 비교해 느려지거나 호출이 늘어난 조합을 회귀로 보고합니다.
+"""
+
+import sys
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+sys.path.append(str(Path(__file__).parent))
+
+import cloud_basic_course_automation
+from testing.fake_cloud import FakeCloud, FakeClientRegistry
+from run_history import RunHistoryStore
+from readiness_poller import ReadinessPoller
+from storage_benchmark import percentile
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("sequential", "threaded", "cohort")
+DEFAULT_LEARNERS = [1, 10, 50, 100]
+
+# 회귀 판정 지표: 결과 키 → 절대 허용 오차 (작은 값의 측정 잡음 무시)
+REGRESSION_METRICS = {"wall_s": 0.05, "ready_p95_s": 0.05, "peak_memory_mb": 1.0}
+# 측정 잡음이 없는 지표: 조금이라도 늘면 회귀
+EXACT_METRICS = ("api_calls", "failures")
+
+
+@contextmanager
+def standin_backend(cloud: FakeCloud):
+    """자동화 모듈의 클라이언트 / 이력 조회를 가짜 백엔드로 교체"""
+    module = cloud_basic_course_automation
+    registry = FakeClientRegistry(cloud)
+    history = RunHistoryStore(Path(":memory:"))
+    poller = ReadinessPoller(registry.get_client("ec2"), min_interval=0.01, max_interval=0.05)
+    replacements = {
+        "get_client_registry": lambda config: registry,
+        "get_readiness_poller": lambda *args, **kwargs: poller,
+        "get_run_history": lambda: history,
+        "build": cloud.gcp_service,
+    }
+    originals = {name: getattr(module, name) for name in replacements}
+    level = module.logger.level
+    for name, value in replacements.items():
+        setattr(module, name, value)
+    # 학습자 수백 명의 진행 로그가 측정을 왜곡하지 않도록 경고 이상만 출력
+    module.logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        poller.stop()
+        for name, value in originals.items():
+            setattr(module, name, value)
+        module.logger.setLevel(level)
+
+
+class _ThreadSampler:
+    """측정 중 활성 스레드 수의 최댓값 기록 (샘플러 자신은 제외)"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count() - 1)
+
+    def __enter__(self) -> "_ThreadSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def _automation(prefix: str) -> Any:
+    automation = cloud_basic_course_automation.BasicCourseAutomation(Path(__file__).parent)
+    automation.config.update({"project_prefix": prefix, "learner_id": prefix,
+                              "gcp_project_id": "benchmark-project", "sg_delete_retry_delay": 0})
+    # learner_key 는 생성 시 설정으로 정해지므로 학습자별로 다시 지정 (레지스트리 태그 / 웜 풀 할당 구분)
+    automation.learner_key = prefix
+    return automation
+
+
+def _learner_flow(prefix: str, started: float) -> Dict[str, Any]:
+    """학습자 한 명의 1일차 + 2일차 구성, 시작 시점부터 준비 완료까지의 시간 반환"""
+    automation = _automation(prefix)
+    ok = automation.day1_aws_basics() and automation.day2_gcp_basics()
+    return {"ok": ok, "ready": time.perf_counter() - started}
+
+
+def _run_strategy(strategy: str, prefixes: List[str], workers: int) -> List[Dict[str, Any]]:
+    started = time.perf_counter()
+    if strategy == "sequential":
+        return [_learner_flow(prefix, started) for prefix in prefixes]
+    if strategy == "threaded":
+        with ThreadPoolExecutor(max_workers=min(workers, len(prefixes))) as executor:
+            return list(executor.map(lambda prefix: _learner_flow(prefix, started), prefixes))
+    if strategy == "cohort":
+        def day1(prefix: str) -> Dict[str, Any]:
+            automation = _automation(prefix)
+            return {"automation": automation, "ok": automation.day1_aws_basics()}
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(prefixes))) as executor:
+            day1_results = list(executor.map(day1, prefixes))
+        failures = day1_results[0]["automation"].provision_gcp_basics(prefixes)
+        ready = time.perf_counter() - started
+        return [{"ok": r["ok"] and not any(key.endswith(f":{prefix}") for key in failures), "ready": ready}
+                for prefix, r in zip(prefixes, day1_results)]
+    raise ValueError(f"알 수 없는 실행 전략: {strategy}")
+
+
+def run_case(strategy: str, learners: int, latency: float = 0.02, workers: int = 32,
+             repeats: int = 1) -> Dict[str, Any]:
+    """
+    한 가지 조합(실행 전략, 학습자 수) 측정
+
+    Returns:
+        전체 소요 시간(반복 중앙값), 준비 완료 시간 p50 / p95, API 호출 수, 최대 메모리(MB), 최대 스레드 수, 실패 학습자 수
+    """
+    cloud = FakeCloud(latency=latency)
+    prefixes = [f"bench-{n:03d}" for n in range(learners)]
+    walls: List[float] = []
+    ready: List[float] = []
+    peak_memory = peak_threads = api_calls = failures = 0
+
+    with standin_backend(cloud):
+        for _ in range(repeats):
+            cloud.reset()
+            tracemalloc.start()
+            with _ThreadSampler() as sampler:
+                start = time.perf_counter()
+                outcomes = _run_strategy(strategy, prefixes, workers)
+                walls.append(time.perf_counter() - start)
+            peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            peak_threads = max(peak_threads, sampler.peak)
+            api_calls = max(api_calls, len(cloud.calls))
+            failures = max(failures, sum(1 for o in outcomes if not o["ok"]))
+            ready += [o["ready"] for o in outcomes]
+
+    return {
+        "strategy": strategy,
+        "learners": learners,
+        "repeats": repeats,
+        "wall_s": round(percentile(walls, 50), 4),
+        "ready_p50_s": round(percentile(ready, 50), 4),
+        "ready_p95_s": round(percentile(ready, 95), 4),
+        "api_calls": api_calls,
+        "peak_memory_mb": round(peak_memory / (1024 * 1024), 2),
+        "peak_threads": peak_threads,
+        "failures": failures,
+    }
+
+
+def run_benchmark(learner_counts: List[int], strategies: List[str], latency: float = 0.02,
+                  workers: int = 32, repeats: int = 1) -> List[Dict[str, Any]]:
+    """모든 조합 순회 측정"""
+    results = []
+    for learners in learner_counts:
+        for strategy in strategies:
+            case = run_case(strategy, learners, latency, workers, repeats)
+            logger.info(f"📊 {strategy} learners={learners} wall={case['wall_s']}s "
+                        f"ready p95={case['ready_p95_s']}s calls={case['api_calls']} "
+                        f"mem={case['peak_memory_mb']}MB threads={case['peak_threads']}")
+            results.append(case)
+    return results
+
+
+def _case_key(case: Dict[str, Any]) -> str:
+    return f"{case['strategy']}/{case['learners']}"
+
+
+def compare_baseline(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+                     threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    기준선 대비 회귀 검출
+
+    Args:
+        results: run_benchmark 결과
+        baseline: save_baseline 으로 저장한 기준선
+        threshold: 허용 증가율 (0.10 = 10%)
+
+    Returns:
+        회귀 목록 [{"case", "metric", "baseline", "current", "change_pct"}]
+    """
+    previous = {_case_key(case): case for case in baseline.get("results", [])}
+    regressions = []
+    for case in results:
+        before = previous.get(_case_key(case))
+        if before is None:
+            continue
+        for metric, slack in REGRESSION_METRICS.items():
+            old, new = before.get(metric), case.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > slack:
+                regressions.append({"case": _case_key(case), "metric": metric, "baseline": old, "current": new,
+                                    "change_pct": round((new - old) / old * 100, 1) if old else None})
+        for metric in EXACT_METRICS:
+            old, new = before.get(metric, 0), case.get(metric, 0)
+            if new > old:
+                regressions.append({"case": _case_key(case), "metric": metric, "baseline": old, "current": new,
+                                    "change_pct": round((new - old) / old * 100, 1) if old else None})
+    return regressions
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """기준선 파일 읽기 (없으면 None)"""
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, results: List[Dict[str, Any]], latency: float, workers: int):
+    """측정 결과를 기준선으로 저장 (같은 조합은 덮어씀)"""
+    baseline = load_baseline(path) or {}
+    merged = {_case_key(case): case for case in baseline.get("results", [])}
+    merged.update({_case_key(case): case for case in results})
+    payload = {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "latency": latency, "workers": workers,
+               "results": sorted(merged.values(), key=lambda c: (c["learners"], STRATEGIES.index(c["strategy"])))}
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(path)
+
+
+def print_table(results: List[Dict[str, Any]]):
+    """결과 표 출력"""
+    print("\n" + "=" * 92)
+    print(f"{'전략':<10} {'학습자':>6} | {'전체(s)':>8} {'p50(s)':>8} {'p95(s)':>8} | "
+          f"{'API 호출':>8} {'메모리 MB':>9} {'스레드':>6} {'실패':>4}")
+    print("=" * 92)
+    for r in results:
+        print(f"{r['strategy']:<10} {r['learners']:>6} | {r['wall_s']:>8} {r['ready_p50_s']:>8} "
+              f"{r['ready_p95_s']:>8} | {r['api_calls']:>8} {r['peak_memory_mb']:>9} "
+              f"{r['peak_threads']:>6} {r['failures']:>4}")
+    print("=" * 92)
+
+
+def main():
+    """명령행: python provisioning_benchmark.py [--learners 1,10,50,100] [--update-baseline]"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="수업 당일 환경 구성 종단 간 벤치마크")
+    parser.add_argument("--learners", default=",".join(map(str, DEFAULT_LEARNERS)), help="학습자 수 목록")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="실행 전략 목록")
+    parser.add_argument("--latency", type=float, default=0.02, help="API 호출당 주입 지연(초)")
+    parser.add_argument("--workers", type=int, default=32, help="스레드 풀 크기")
+    parser.add_argument("--repeats", type=int, default=3, help="조합별 반복 횟수")
+    parser.add_argument("--baseline", default="provisioning_benchmark_baseline.json", help="기준선 파일")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 증가율")
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과를 기준선으로 저장")
+    parser.add_argument("--output", default="provisioning_benchmark_results.json")
+    args = parser.parse_args()
+
+    strategies = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    unknown = set(strategies) - set(STRATEGIES)
+    if unknown:
+        parser.error(f"알 수 없는 실행 전략: {', '.join(sorted(unknown))}")
+
+    results = run_benchmark([int(n) for n in args.learners.split(",")], strategies,
+                            args.latency, args.workers, args.repeats)
+    print_table(results)
+
+    baseline_path = Path(args.baseline)
+    baseline = load_baseline(baseline_path)
+    regressions: List[Dict[str, Any]] = []
+    if baseline is None:
+        print(f"기준선 {baseline_path} 이 없어 비교를 건너뜁니다.")
+    else:
+        if (baseline.get("latency"), baseline.get("workers")) != (args.latency, args.workers):
+            logger.warning(f"⚠️ 기준선의 측정 조건(latency={baseline.get('latency')}, "
+                           f"workers={baseline.get('workers')})이 현재와 다릅니다")
+        regressions = compare_baseline(results, baseline, args.threshold)
+        for r in regressions:
+            change = f" (+{r['change_pct']}%)" if r['change_pct'] is not None else ""
+            print(f"❌ 회귀: {r['case']} {r['metric']} {r['baseline']} → {r['current']}{change}")
+        if not regressions:
+            print(f"✅ 기준선 대비 회귀 없음 (허용 {args.threshold:.0%})")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "latency": args.latency,
+                   "workers": args.workers, "results": results, "regressions": regressions},
+                  f, ensure_ascii=False, indent=2)
+    print(f"결과가 {args.output}에 저장되었습니다.")
+
+    if args.update_baseline:
+        save_baseline(baseline_path, results, args.latency, args.workers)
+        print(f"기준선이 {baseline_path}에 저장되었습니다.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+할당량(Service Quotas) 기반 프로비저닝 사전 승인
+리소스를 만들기 전에 할당량과 현재 사용량을 읽어 몇 명의 학습자 환경이 들어갈 수 있는지 계산합니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차: EC2 vCPU, 보안 그룹, S3 버킷, IAM 사용자
+- 주요 기능:
+  - Service Quotas / IAM 계정 요약 / describe 계열 API 를 리소스별로 한 번씩 병렬 조회합니다.
+  - 학습자 한 명의 사용량(footprint)으로 남은 수용 인원을 계산하고, 넘치는 학습자는 대기시키거나 거절합니다.
+  - 승인 시 메모리에 용량을 예약하므로 동시에 실행되는 워커가 할당량을 초과해서 만들지 않습니다.
+  - 조회 결과는 max_age 초가 지나면 다시 읽으므로 다른 프로세스가 정리한 용량도 반영됩니다.
+"""
+
+import sys
+import math
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+logger = logging.getLogger(__name__)
+
+# 리소스 → (Service Quotas 서비스 코드, 할당량 코드, 조회 실패 시 기본값)
+QUOTA_CODES: Dict[str, Tuple[str, str, float]] = {
+    "vcpus": ("ec2", "L-1216C47A", 32),            # Running On-Demand Standard instances (vCPU)
+    "vpcs": ("vpc", "L-F678F1CE", 5),              # VPCs per Region
+    "eips": ("ec2", "L-0263D0A3", 5),              # EC2-VPC Elastic IPs
+    "security_groups": ("vpc", "L-E79EC296", 2500),  # VPC security groups per Region
+    "s3_buckets": ("s3", "L-DC2B2D3D", 100),       # General purpose buckets
+}
+
+# 1일차 실습(IAM 사용자, 보안 그룹, t2.micro 인스턴스, S3 버킷) 기준 학습자 1명 사용량
+DEFAULT_FOOTPRINT: Dict[str, float] = {
+    "vcpus": 1,
+    "security_groups": 1,
+    "s3_buckets": 1,
+    "iam_users": 1,
+}
+
+# describe_instance_types 조회를 줄이기 위한 자주 쓰는 인스턴스 유형의 vCPU 수
+KNOWN_VCPUS = {
+    "t2.nano": 1, "t2.micro": 1, "t2.small": 1, "t2.medium": 2, "t2.large": 2,
+    "t3.nano": 2, "t3.micro": 2, "t3.small": 2, "t3.medium": 2, "t3.large": 2,
+}
+# Standard 할당량(A, C, D, H, I, M, R, T, Z)에 포함되는 인스턴스 패밀리
+# 첫 글자만 보면 inf / trn / dl / mac / hpc 처럼 별도 할당량을 쓰는 패밀리까지 섞이므로 명시적으로 나열
+STANDARD_FAMILIES = frozenset({
+    "a1",
+    "c1", "c3", "c4", "c5", "c5a", "c5ad", "c5d", "c5n", "c6a", "c6g", "c6gd", "c6gn", "c6i", "c6id",
+    "c6in", "c7a", "c7g", "c7gd", "c7gn", "c7i", "c7i-flex", "c8g",
+    "d2", "d3", "d3en",
+    "h1",
+    "i2", "i3", "i3en", "i4g", "i4i", "i7ie", "i8g", "im4gn", "is4gen",
+    "m1", "m2", "m3", "m4", "m5", "m5a", "m5ad", "m5d", "m5dn", "m5n", "m5zn", "m6a", "m6g", "m6gd",
+    "m6i", "m6id", "m6idn", "m6in", "m7a", "m7g", "m7gd", "m7i", "m7i-flex", "m8g",
+    "r3", "r4", "r5", "r5a", "r5ad", "r5b", "r5d", "r5dn", "r5n", "r6a", "r6g", "r6gd", "r6i", "r6id",
+    "r6idn", "r6in", "r7a", "r7g", "r7gd", "r7i", "r7iz", "r8g",
+    "t1", "t2", "t3", "t3a", "t4g",
+    "z1d",
+})
+# 할당량 / 사용량 재조회 주기 (초)
+QUOTA_MAX_AGE = 300.0
+
+
+class AdmissionRejectedError(RuntimeError):
+    """할당량이 부족하여 승인되지 않음"""
+
+
+class ResourceBudget:
+    """리소스 하나의 할당량 / 사용량 / 예약량"""
+
+    __slots__ = ("name", "limit", "used", "reserved")
+
+    def __init__(self, name: str, limit: float, used: float):
+        self.name = name
+        self.limit = limit
+        self.used = used
+        self.reserved = 0.0
+
+    @property
+    def available(self) -> float:
+        return self.limit - self.used - self.reserved
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"limit": self.limit, "used": self.used, "reserved": self.reserved,
+                "available": self.available}
+
+
+class QuotaSnapshot:
+    """할당량과 현재 사용량을 한 번에 읽는 조회기"""
+
+    def __init__(self, aws_clients: Any):
+        """
+        Args:
+            aws_clients: 서비스 이름 → boto3 클라이언트 매핑
+                         (service-quotas, ec2, s3, iam)
+        """
+        self.aws_clients = aws_clients
+
+    def quota(self, resource: str) -> float:
+        service_code, quota_code, default = QUOTA_CODES[resource]
+        client = self.aws_clients["service-quotas"]
+        for getter in (client.get_service_quota, client.get_aws_default_service_quota):
+            try:
+                return float(getter(ServiceCode=service_code, QuotaCode=quota_code)["Quota"]["Value"])
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "NoSuchResourceException":
+                    logger.warning(f"⚠️ {resource} 할당량 조회 실패: {e}")
+                    break
+        return float(default)
+
+    def _vcpus_in_use(self) -> float:
+        ec2 = self.aws_clients["ec2"]
+        counts: Dict[str, int] = {}
+        paginator = ec2.get_paginator("describe_instances")
+        for page in paginator.paginate(Filters=[{"Name": "instance-state-name",
+                                                 "Values": ["pending", "running"]}]):
+            for reservation in page.get("Reservations", []):
+                for instance in reservation.get("Instances", []):
+                    instance_type = instance["InstanceType"]
+                    if instance_type.split(".", 1)[0] in STANDARD_FAMILIES:
+                        counts[instance_type] = counts.get(instance_type, 0) + 1
+
+        vcpus = dict(KNOWN_VCPUS)
+        unknown = [t for t in counts if t not in vcpus]
+        if unknown:
+            response = ec2.describe_instance_types(InstanceTypes=unknown)
+            for item in response.get("InstanceTypes", []):
+                vcpus[item["InstanceType"]] = item["VCpuInfo"]["DefaultVCpus"]
+        return float(sum(vcpus.get(t, 1) * n for t, n in counts.items()))
+
+    def _count(self, operation: str, key: str, **kwargs) -> float:
+        paginator = self.aws_clients["ec2"].get_paginator(operation)
+        return float(sum(len(page.get(key, [])) for page in paginator.paginate(**kwargs)))
+
+    def _usage(self, resource: str) -> float:
+        if resource == "vcpus":
+            return self._vcpus_in_use()
+        if resource == "vpcs":
+            return self._count("describe_vpcs", "Vpcs")
+        if resource == "security_groups":
+            return self._count("describe_security_groups", "SecurityGroups")
+        if resource == "eips":
+            return float(len(self.aws_clients["ec2"].describe_addresses().get("Addresses", [])))
+        if resource == "s3_buckets":
+            return float(len(self.aws_clients["s3"].list_buckets().get("Buckets", [])))
+        raise ValueError(f"알 수 없는 리소스: {resource}")
+
+    def _iam_users(self) -> Tuple[float, float]:
+        summary = self.aws_clients["iam"].get_account_summary()["SummaryMap"]
+        return float(summary["UsersQuota"]), float(summary["Users"])
+
+    def fetch(self, resources: List[str], max_workers: int = 8) -> Dict[str, ResourceBudget]:
+        """
+        리소스별 할당량 / 사용량 병렬 조회
+
+        Returns:
+            리소스 이름 → ResourceBudget
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for resource in resources:
+                if resource == "iam_users":
+                    futures[resource] = executor.submit(self._iam_users)
+                else:
+                    futures[resource] = (executor.submit(self.quota, resource),
+                                         executor.submit(self._usage, resource))
+        budgets = {}
+        for resource, future in futures.items():
+            if isinstance(future, tuple):
+                limit, used = future[0].result(), future[1].result()
+            else:
+                limit, used = future.result()
+            budgets[resource] = ResourceBudget(resource, limit, used)
+        return budgets
+
+
+class Reservation:
+    """승인된 학습자의 용량 예약"""
+
+    __slots__ = ("learner", "amounts")
+
+    def __init__(self, learner: str, amounts: Dict[str, float]):
+        self.learner = learner
+        self.amounts = amounts
+
+
+class AdmissionController:
+    """할당량 예산 안에서 학습자 환경 생성을 승인하고 용량을 예약"""
+
+    def __init__(self, budgets: Dict[str, ResourceBudget],
+                 footprint: Optional[Dict[str, float]] = None,
+                 snapshot: Optional[QuotaSnapshot] = None, max_age: float = QUOTA_MAX_AGE):
+        """
+        AdmissionController 초기화
+
+        Args:
+            budgets: 리소스별 예산 (QuotaSnapshot.fetch 결과)
+            footprint: 학습자 1명 사용량
+            snapshot: 재조회에 쓸 조회기 (None 이면 처음 예산을 계속 사용)
+            max_age: 예산을 다시 조회하기까지의 시간 (초)
+        """
+        self.budgets = budgets
+        self.footprint = dict(footprint or DEFAULT_FOOTPRINT)
+        missing = set(self.footprint) - set(budgets)
+        if missing:
+            raise ValueError(f"예산이 없는 리소스: {sorted(missing)}")
+        self.snapshot = snapshot
+        self.max_age = max_age
+        self.fetched_at = time.monotonic()
+        self._reservations: Dict[str, Reservation] = {}
+        self._condition = threading.Condition()
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def from_clients(cls, aws_clients: Any, footprint: Optional[Dict[str, float]] = None,
+                     max_age: float = QUOTA_MAX_AGE) -> "AdmissionController":
+        footprint = dict(footprint or DEFAULT_FOOTPRINT)
+        snapshot = QuotaSnapshot(aws_clients)
+        return cls(snapshot.fetch(list(footprint)), footprint, snapshot, max_age)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        할당량 / 사용량 재조회 (max_age 가 지나지 않았으면 그대로)
+
+        예약량은 유지하고 한도와 사용량만 새 값으로 바꾼 뒤 대기 중인 학습자를 깨웁니다.
+        조회에 실패하면 이전 예산을 계속 사용합니다.
+
+        Returns:
+            예산을 새로 읽었으면 True
+        """
+        if self.snapshot is None:
+            return False
+        with self._refresh_lock:
+            if not force and time.monotonic() - self.fetched_at < self.max_age:
+                return False
+            try:
+                budgets = self.snapshot.fetch(list(self.footprint))
+            except (ClientError, BotoCoreError) as e:
+                logger.warning(f"⚠️ 할당량 재조회 실패, 이전 값을 사용합니다: {e}")
+                self.fetched_at = time.monotonic()
+                return False
+            with self._condition:
+                for name, budget in budgets.items():
+                    budget.reserved = self.budgets[name].reserved
+                self.budgets.update(budgets)
+                self.fetched_at = time.monotonic()
+                self._condition.notify_all()
+        return True
+
+    def capacity(self) -> int:
+        """추가로 승인 가능한 학습자 수"""
+        with self._condition:
+            return self._capacity()
+
+    def _capacity(self) -> int:
+        fits = [math.floor(self.budgets[r].available / need)
+                for r, need in self.footprint.items() if need > 0]
+        return max(0, min(fits)) if fits else sys.maxsize
+
+    def bottleneck(self) -> Optional[str]:
+        """수용 인원을 제한하는 리소스"""
+        with self._condition:
+            return self._bottleneck_locked()
+
+    def try_reserve(self, learner: str) -> Optional[Reservation]:
+        """즉시 예약 시도 (이미 예약된 학습자는 기존 예약 반환, 용량 부족 시 None)"""
+        with self._condition:
+            return self._try_reserve(learner)
+
+    def _try_reserve(self, learner: str) -> Optional[Reservation]:
+        existing = self._reservations.get(learner)
+        if existing is not None:
+            return existing
+        if self._capacity() < 1:
+            return None
+        for resource, need in self.footprint.items():
+            self.budgets[resource].reserved += need
+        reservation = Reservation(learner, dict(self.footprint))
+        self._reservations[learner] = reservation
+        return reservation
+
+    def acquire(self, learner: str, timeout: Optional[float] = 0.0) -> Reservation:
+        """
+        예약 (용량이 없으면 timeout 초 동안 다른 학습자의 해제를 대기)
+
+        대기 중에는 max_age 마다 할당량 / 사용량을 다시 읽으므로 다른 프로세스가 정리한
+        용량도 기다릴 수 있습니다. timeout 이 None 이면 용량이 생길 때까지 대기합니다.
+
+        Raises:
+            AdmissionRejectedError: 대기 시간 안에 용량이 생기지 않은 경우
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                wait = remaining
+                if self.snapshot is not None:
+                    wait = self.max_age if remaining is None else min(remaining, self.max_age)
+                if self._condition.wait_for(lambda: self._capacity() >= 1 or learner in self._reservations,
+                                            timeout=wait):
+                    return self._try_reserve(learner)
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise AdmissionRejectedError(
+                        f"할당량 부족으로 {learner} 환경을 만들 수 없습니다 (병목: {self._bottleneck_locked()})")
+            self.refresh()
+
+    def _bottleneck_locked(self) -> Optional[str]:
+        candidates = [(self.budgets[r].available / need, r) for r, need in self.footprint.items() if need > 0]
+        return min(candidates)[1] if candidates else None
+
+    def commit(self, learner: str):
+        """예약한 리소스가 실제로 생성됨 (사용량으로 이동, 정리 전까지 유지)"""
+        with self._condition:
+            reservation = self._reservations.pop(learner, None)
+            if reservation is None:
+                return
+            for resource, amount in reservation.amounts.items():
+                self.budgets[resource].reserved -= amount
+                self.budgets[resource].used += amount
+
+    def release(self, learner: str, created: bool = False):
+        """
+        예약 또는 사용량 반환 후 대기 중인 학습자 깨우기
+
+        Args:
+            learner: 학습자 ID
+            created: commit 된 리소스를 정리한 경우 True (사용량에서 차감)
+        """
+        with self._condition:
+            reservation = self._reservations.pop(learner, None)
+            if reservation is not None:
+                for resource, amount in reservation.amounts.items():
+                    self.budgets[resource].reserved -= amount
+            elif created:
+                for resource, amount in self.footprint.items():
+                    self.budgets[resource].used = max(0.0, self.budgets[resource].used - amount)
+            self._condition.notify_all()
+
+    def admit(self, learners: List[str], queue: bool = True) -> Dict[str, List[str]]:
+        """
+        기수 전체 사전 승인
+
+        Args:
+            learners: 학습자 ID 목록
+            queue: True 면 넘치는 학습자를 대기열로, False 면 거절로 분류
+
+        Returns:
+            {"admitted": [...], "queued": [...], "rejected": [...]}
+        """
+        result = {"admitted": [], "queued": [], "rejected": []}
+        with self._condition:
+            for learner in learners:
+                if self._try_reserve(learner) is not None:
+                    result["admitted"].append(learner)
+                else:
+                    result["queued" if queue else "rejected"].append(learner)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {"capacity": self._capacity(), "reserved_learners": len(self._reservations),
+                    "bottleneck": self._bottleneck_locked(),
+                    "budgets": {name: b.to_dict() for name, b in self.budgets.items()}}
+
+
+_controllers: Dict[Tuple[Optional[str], Optional[str]], AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(region_name: Optional[str], profile_name: Optional[str],
+                             aws_clients: Any,
+                             footprint: Optional[Dict[str, float]] = None,
+                             max_age: float = QUOTA_MAX_AGE) -> AdmissionController:
+    """
+    (리전, 프로필)별 프로세스 공용 승인기 조회
+
+    최초 호출 시 할당량 / 사용량을 조회하고, 이후에는 max_age 가 지난 경우에만 다시 조회합니다.
+    """
+    key = (region_name, profile_name)
+    with _controllers_lock:
+        controller = _controllers.get(key)
+        if controller is None:
+            controller = AdmissionController.from_clients(aws_clients, footprint, max_age)
+            _controllers[key] = controller
+            logger.info(f"📏 할당량 기준 수용 인원 ({region_name}): {controller.capacity()}명 "
+                        f"(병목: {controller.bottleneck()})")
+            return controller
+    controller.refresh()
+    return controller
+
+
+def main():
+    """명령행 조회: python quota_admission.py --region ap-northeast-2 [--learners 60]"""
+    import json
+    import argparse
+    from pathlib import Path
+
+    sys.path.append(str(Path(__file__).parent))
+    from client_registry import get_client_registry
+
+    parser = argparse.ArgumentParser(description="할당량 기준 수용 인원 계산")
+    parser.add_argument("--region", required=True)
+    parser.add_argument("--profile", default=None)
+    parser.add_argument("--learners", type=int, default=0, help="승인 여부를 확인할 학습자 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    clients = get_client_registry().client_map(args.region, args.profile)
+    controller = AdmissionController.from_clients(clients)
+    print(json.dumps(controller.stats(), ensure_ascii=False, indent=2))
+    if args.learners:
+        result = controller.admit([f"learner-{i:03d}" for i in range(1, args.learners + 1)])
+        print(f"승인 {len(result['admitted'])}명, 대기 {len(result['queued'])}명")
+        return 0 if not result["queued"] else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
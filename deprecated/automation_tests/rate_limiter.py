@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+서비스/작업 유형별 적응형 API 속도 제한기
+IAM, EC2, RDS 컨트롤 플레인 API 의 스로틀링을 피하면서 최대 처리량을 유지합니다.
+
+- 주요 기능:
+  - (서비스, 작업 유형) 단위의 토큰 버킷을 프로세스 전체 워커가 공유합니다.
+  - AIMD 방식: 스로틀링 응답 시 속도를 곱셈 감소, 성공 시 덧셈 증가로 회복합니다.
+  - boto3 클라이언트 이벤트(before-send / needs-retry)에 연결되어 재시도 시도마다 적용됩니다.
+  - S3 객체 작업(데이터 플레인)은 접두사당 수천 rps 를 허용하므로 제한하지 않습니다.
+"""
+
+import time
+import threading
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "SlowDown",
+    "429",
+}
+
+READ_PREFIXES = ("Describe", "Get", "List", "Head", "Lookup", "Search")
+
+# (서비스, 작업 유형) -> (초기 초당 요청 수, 최대 초당 요청 수)
+DEFAULT_LIMITS: Dict[Tuple[str, str], Tuple[float, float]] = {
+    ("iam", "mutate"): (5.0, 15.0),
+    ("iam", "read"): (10.0, 20.0),
+    ("ec2", "mutate"): (20.0, 50.0),
+    ("ec2", "read"): (40.0, 100.0),
+    ("rds", "mutate"): (5.0, 20.0),
+    ("rds", "read"): (10.0, 40.0),
+}
+DEFAULT_LIMIT: Tuple[float, float] = (20.0, 50.0)
+
+# 컨트롤 플레인 한도가 아닌 S3 데이터 플레인 작업 (asset_sync / 업로드가 DEFAULT_LIMIT 에 묶이지 않도록 제외)
+S3_OBJECT_OPERATIONS = frozenset({
+    "GetObject", "PutObject", "HeadObject", "DeleteObject", "DeleteObjects", "CopyObject",
+    "CreateMultipartUpload", "UploadPart", "UploadPartCopy", "CompleteMultipartUpload",
+    "AbortMultipartUpload", "ListParts", "ListObjects", "ListObjectsV2",
+})
+
+
+def classify_operation(operation_name: str) -> str:
+    """API 작업 이름을 'read' 또는 'mutate' 유형으로 분류"""
+    return "read" if operation_name.startswith(READ_PREFIXES) else "mutate"
+
+
+def is_exempt(service_name: str, operation_name: str) -> bool:
+    """속도 제한을 적용하지 않는 작업 여부 (S3 객체 작업)"""
+    return service_name == "s3" and operation_name in S3_OBJECT_OPERATIONS
+
+
+class AdaptiveTokenBucket:
+    """AIMD 방식으로 충전 속도를 조정하는 토큰 버킷"""
+
+    def __init__(self, rate: float, max_rate: float,
+                 min_rate: float = 0.5,
+                 additive_increase: float = 1.0,
+                 multiplicative_decrease: float = 0.5,
+                 cooldown: float = 1.0):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.cooldown = cooldown
+        self.tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> float:
+        """버킷 최대 토큰 수 (약 1초 분량의 버스트 허용)"""
+        return max(1.0, self.rate)
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        토큰 1개 획득 (필요 시 대기)
+
+        Args:
+            timeout: 최대 대기 시간(초), None 이면 무제한
+
+        Returns:
+            획득 성공 여부
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return True
+                wait = (1.0 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def record_success(self):
+        """성공 응답: 덧셈 증가 (초당 약 additive_increase 만큼 회복)"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.additive_increase / max(self.rate, 1.0))
+
+    def record_throttle(self):
+        """스로틀링 응답: 곱셈 감소 (동시에 도착한 스로틀링은 한 번만 반영)"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.multiplicative_decrease)
+            self.tokens = min(self.tokens, 0.0)
+
+
+class AdaptiveRateLimiter:
+    """(서비스, 작업 유형)별 토큰 버킷을 관리하는 프로세스 공용 속도 제한기"""
+
+    def __init__(self, limits: Optional[Dict[Tuple[str, str], Tuple[float, float]]] = None):
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._buckets: Dict[Tuple[str, str], AdaptiveTokenBucket] = {}
+        self._lock = threading.Lock()
+        self.throttle_count = 0
+
+    def bucket(self, service_name: str, operation_name: str) -> AdaptiveTokenBucket:
+        """서비스/작업에 해당하는 토큰 버킷 조회 (없으면 생성)"""
+        key = (service_name, classify_operation(operation_name))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    rate, max_rate = self.limits.get(key, DEFAULT_LIMIT)
+                    bucket = AdaptiveTokenBucket(rate, max_rate)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def acquire(self, service_name: str, operation_name: str):
+        """API 호출 전 토큰 획득"""
+        if is_exempt(service_name, operation_name):
+            return
+        self.bucket(service_name, operation_name).acquire()
+
+    def record_response(self, service_name: str, operation_name: str,
+                        error_code: Optional[str] = None):
+        """API 응답 결과를 속도 조정에 반영"""
+        if error_code in THROTTLING_ERROR_CODES:
+            with self._lock:
+                self.throttle_count += 1
+        if is_exempt(service_name, operation_name):
+            # S3 SlowDown 은 botocore 재시도 백오프에 맡김
+            return
+        bucket = self.bucket(service_name, operation_name)
+        if error_code in THROTTLING_ERROR_CODES:
+            bucket.record_throttle()
+            logger.warning(f"⚠️ 스로틀링 감지: {service_name}.{operation_name} "
+                           f"→ {bucket.rate:.2f} req/s")
+        elif error_code is None:
+            bucket.record_success()
+
+    def rates(self) -> Dict[str, float]:
+        """현재 버킷별 초당 요청 수"""
+        return {f"{service}:{kind}": round(bucket.rate, 2)
+                for (service, kind), bucket in self._buckets.items()}
+
+    def attach(self, client: Any):
+        """boto3 클라이언트 이벤트에 속도 제한 핸들러 등록"""
+        events = client.meta.events
+        events.register("before-send", self._on_before_send)
+        events.register("needs-retry", self._on_needs_retry)
+
+    @staticmethod
+    def _parse_event_name(event_name: str) -> Tuple[str, str]:
+        # 'before-send.ec2.RunInstances' -> ('ec2', 'RunInstances')
+        parts = event_name.split(".")
+        return parts[1], parts[2] if len(parts) > 2 else ""
+
+    def _on_before_send(self, event_name: str, **kwargs):
+        service_name, operation_name = self._parse_event_name(event_name)
+        self.acquire(service_name, operation_name)
+
+    def _on_needs_retry(self, event_name: str, response=None, caught_exception=None, **kwargs):
+        if response is None:
+            return
+        service_name, operation_name = self._parse_event_name(event_name)
+        http_response, parsed = response
+        error_code = parsed.get("Error", {}).get("Code") if isinstance(parsed, dict) else None
+        if error_code is None and getattr(http_response, "status_code", 200) >= 400:
+            error_code = str(http_response.status_code)
+        self.record_response(service_name, operation_name, error_code)
+
+
+_rate_limiter: Optional[AdaptiveRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """프로세스 공용 속도 제한기 조회"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = AdaptiveRateLimiter()
+    return _rate_limiter
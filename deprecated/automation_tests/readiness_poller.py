@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+EC2 인스턴스 / RDS 인스턴스 준비 상태 통합 폴러
+대기 중인 모든 리소스를 모아 일괄 describe 호출로 상태를 확인합니다.
+
+- 주요 기능:
+  - 대기 요청은 Future 로 반환되며, 목표 상태 도달/실패/시간 초과 시 완료됩니다.
+  - 인스턴스는 describe_instances, DB 는 describe_db_instances 를 필터 묶음으로 호출합니다.
+  - 상태 변화가 없으면 폴링 간격을 점차 늘리고, 새 대기 요청이나 변화가 있으면 초기화합니다.
+  - 조회 중 API 오류(ClientError)는 다음 주기에 재시도하고, 그 밖의 오류(자격 증명 / 연결 등)는
+    대기 중인 Future 를 모두 실패로 완료해 호출자가 무한정 기다리지 않게 합니다.
+"""
+
+import time
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from client_registry import get_client_registry
+
+logger = logging.getLogger(__name__)
+
+INSTANCE_FAILED_STATES = {"shutting-down", "terminated"}
+# 목표 상태로 가는 도중의 상태 (예: 종료 대기 중의 shutting-down 은 실패가 아님)
+INSTANCE_TRANSITIONS = {"terminated": {"shutting-down"}, "stopped": {"stopping"}}
+DB_FAILED_STATES = {"failed", "incompatible-parameters", "incompatible-restore",
+                    "incompatible-network", "inaccessible-encryption-credentials",
+                    "deleting", "storage-full"}
+
+# describe 필터 값 최대 개수
+INSTANCE_BATCH_SIZE = 200
+DB_BATCH_SIZE = 100
+
+
+def failed_states(kind: str, target_state: str) -> set:
+    """목표 상태 대기 중 실패로 볼 상태 (목표 상태와 목표로 가는 도중의 상태 제외)"""
+    if kind == "instance":
+        return INSTANCE_FAILED_STATES - {target_state} - INSTANCE_TRANSITIONS.get(target_state, set())
+    return DB_FAILED_STATES - {target_state}
+
+
+class _Waiter:
+    """단일 리소스 대기 정보"""
+
+    __slots__ = ("target_state", "deadline", "future")
+
+    def __init__(self, target_state: str, deadline: float):
+        self.target_state = target_state
+        self.deadline = deadline
+        self.future: Future = Future()
+
+
+class ReadinessPoller:
+    """대기 중인 인스턴스/DB 를 일괄 조회하는 백그라운드 폴러"""
+
+    def __init__(self, ec2_client: Any = None, rds_client: Any = None,
+                 min_interval: float = 2.0, max_interval: float = 30.0,
+                 backoff: float = 1.5):
+        self.ec2_client = ec2_client
+        self.rds_client = rds_client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.describe_calls = 0
+        self._waiters: Dict[Tuple[str, str], List[_Waiter]] = {}
+        self._last_states: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wait_for_instance(self, instance_id: str, target_state: str = "running",
+                          timeout: float = 600) -> Future:
+        """EC2 인스턴스가 목표 상태가 될 때까지 대기하는 Future 반환"""
+        return self._add_waiter("instance", instance_id, target_state, timeout)
+
+    def wait_for_db(self, db_instance_id: str, target_state: str = "available",
+                    timeout: float = 1800) -> Future:
+        """RDS 인스턴스가 목표 상태가 될 때까지 대기하는 Future 반환"""
+        return self._add_waiter("db", db_instance_id, target_state, timeout)
+
+    def _add_waiter(self, kind: str, resource_id: str, target_state: str,
+                    timeout: float) -> Future:
+        waiter = _Waiter(target_state, time.monotonic() + timeout)
+        with self._lock:
+            self._waiters.setdefault((kind, resource_id), []).append(waiter)
+            self.interval = self.min_interval
+            if self._thread is None or not self._thread.is_alive() or self._stopped.is_set():
+                # stop() 뒤 아직 끝나지 않은 이전 스레드는 자기 중지 신호를 보고 종료하고, 새 스레드는 새 신호 사용
+                self._stopped = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stopped,), name="readiness-poller",
+                                                daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return waiter.future
+
+    def pending(self) -> int:
+        """대기 중인 리소스 수"""
+        with self._lock:
+            return len(self._waiters)
+
+    def stop(self):
+        """폴러 중지 (대기 중인 Future 는 취소)"""
+        with self._lock:
+            self._stopped.set()
+            waiters = [w for ws in self._waiters.values() for w in ws]
+            self._waiters.clear()
+        self._wakeup.set()
+        for waiter in waiters:
+            waiter.future.cancel()
+
+    def _run(self, stopped: threading.Event):
+        try:
+            while not stopped.is_set():
+                # 조회 전에 지워 두어, 조회 중 들어온 새 대기 요청의 깨우기 신호가 사라지지 않게 함
+                self._wakeup.clear()
+                with self._lock:
+                    if not self._waiters:
+                        if self._thread is threading.current_thread():
+                            self._thread = None
+                        return
+                    instance_ids = [rid for kind, rid in self._waiters if kind == "instance"]
+                    db_ids = [rid for kind, rid in self._waiters if kind == "db"]
+
+                states: Dict[Tuple[str, str], str] = {}
+                try:
+                    states.update(self._describe_instances(instance_ids))
+                    states.update(self._describe_dbs(db_ids))
+                except ClientError as e:
+                    logger.warning(f"⚠️ 준비 상태 조회 실패 (다음 주기에 재시도): {e}")
+
+                changed = self._dispatch(states)
+                if changed:
+                    self.interval = self.min_interval
+                else:
+                    self.interval = min(self.max_interval, self.interval * self.backoff)
+
+                self._wakeup.wait(self.interval)
+        except Exception as e:
+            logger.error(f"❌ 준비 상태 폴러 중단: {e}")
+            self._fail_all(e)
+
+    def _fail_all(self, error: Exception):
+        """대기 중인 모든 Future 를 오류로 완료하고 스레드 정리 (이후 대기 요청은 새 스레드에서 처리)"""
+        with self._lock:
+            waiters = [w for ws in self._waiters.values() for w in ws]
+            self._waiters.clear()
+            self._last_states.clear()
+            if self._thread is threading.current_thread():
+                self._thread = None
+        for waiter in waiters:
+            if not waiter.future.done():
+                waiter.future.set_exception(error)
+
+    def _describe_instances(self, instance_ids: List[str]) -> Dict[Tuple[str, str], str]:
+        states = {}
+        for i in range(0, len(instance_ids), INSTANCE_BATCH_SIZE):
+            batch = instance_ids[i:i + INSTANCE_BATCH_SIZE]
+            # InstanceIds 대신 필터 사용: 생성 직후 조회되지 않는 ID 가 있어도 오류가 나지 않음
+            paginator = self.ec2_client.get_paginator("describe_instances")
+            for page in paginator.paginate(Filters=[{"Name": "instance-id", "Values": batch}]):
+                self.describe_calls += 1
+                for reservation in page.get("Reservations", []):
+                    for instance in reservation.get("Instances", []):
+                        states[("instance", instance["InstanceId"])] = instance["State"]["Name"]
+        return states
+
+    def _describe_dbs(self, db_ids: List[str]) -> Dict[Tuple[str, str], str]:
+        states = {}
+        for i in range(0, len(db_ids), DB_BATCH_SIZE):
+            batch = db_ids[i:i + DB_BATCH_SIZE]
+            paginator = self.rds_client.get_paginator("describe_db_instances")
+            for page in paginator.paginate(Filters=[{"Name": "db-instance-id", "Values": batch}]):
+                self.describe_calls += 1
+                for db in page.get("DBInstances", []):
+                    states[("db", db["DBInstanceIdentifier"])] = db["DBInstanceStatus"]
+        return states
+
+    def _dispatch(self, states: Dict[Tuple[str, str], str]) -> bool:
+        """조회 결과를 대기자에게 전달, 상태 변화 여부 반환"""
+        changed = False
+        now = time.monotonic()
+        completed: List[Tuple[_Waiter, Optional[str], Optional[Exception]]] = []
+
+        with self._lock:
+            for key in list(self._waiters):
+                kind, resource_id = key
+                state = states.get(key)
+                if state is not None and self._last_states.get(key) != state:
+                    self._last_states[key] = state
+                    changed = True
+
+                remaining = []
+                for waiter in self._waiters[key]:
+                    if state == waiter.target_state:
+                        completed.append((waiter, state, None))
+                    elif state in failed_states(kind, waiter.target_state):
+                        completed.append((waiter, None, RuntimeError(
+                            f"{resource_id} 상태가 {state} 입니다 (목표: {waiter.target_state})")))
+                    elif now >= waiter.deadline:
+                        completed.append((waiter, None, TimeoutError(
+                            f"{resource_id} 준비 대기 시간 초과 (현재 상태: {state})")))
+                    else:
+                        remaining.append(waiter)
+
+                if remaining:
+                    self._waiters[key] = remaining
+                else:
+                    del self._waiters[key]
+                    self._last_states.pop(key, None)
+
+        for waiter, state, error in completed:
+            if waiter.future.cancelled():
+                continue
+            if error is not None:
+                waiter.future.set_exception(error)
+            else:
+                waiter.future.set_result(state)
+        return changed
+
+
+_pollers: Dict[Any, ReadinessPoller] = {}
+_pollers_lock = threading.Lock()
+
+
+def get_readiness_poller(region_name: Optional[str] = None,
+                         profile_name: Optional[str] = None,
+                         role_arn: Optional[str] = None,
+                         role_session_name: Optional[str] = None,
+                         ec2_client: Any = None, rds_client: Any = None) -> ReadinessPoller:
+    """
+    (리전, 프로필, 역할) 별 프로세스 공용 폴러 조회
+
+    다른 계정 / 샤드의 리소스를 한 폴러가 조회하지 않도록 자격 증명까지 키에 포함합니다.
+    클라이언트를 직접 지정하면 그 클라이언트 쌍 단위로 공유합니다.
+    """
+    if ec2_client is not None or rds_client is not None:
+        key: Any = ("clients", id(ec2_client), id(rds_client))
+    else:
+        key = (region_name, profile_name, role_arn, role_session_name)
+    with _pollers_lock:
+        poller = _pollers.get(key)
+        if poller is None:
+            if ec2_client is None or rds_client is None:
+                registry = get_client_registry()
+                credentials = {"role_arn": role_arn, "role_session_name": role_session_name}
+                ec2_client = ec2_client or registry.get_client("ec2", region_name, profile_name, **credentials)
+                rds_client = rds_client or registry.get_client("rds", region_name, profile_name, **credentials)
+            poller = ReadinessPoller(ec2_client, rds_client)
+            _pollers[key] = poller
+        return poller
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+생성 리소스 레지스트리 (열 지향 압축 저장)
+리소스마다 dict 를 만들던 created_resources 목록을 대체합니다.
+
+- 주요 기능:
+  - 리소스 속성을 열(column) 단위 배열에 저장하고 유형 / 제공자 / 학습자 / 리전 문자열은 정수 코드로 보관합니다.
+  - ID 로 O(1) 조회하고, 유형 / 학습자 / 제공자별 보조 인덱스로 바로 찾습니다.
+  - 의존 관계(예: EC2 인스턴스 → 보안 그룹)를 기록하며, 의존 대상은 먼저 등록되어 있어야 합니다.
+    따라서 등록 역순이 곧 안전한 정리(teardown) 순서입니다.
+  - 레코드 객체는 조회 시점에만 만들어지므로 ID 인덱스를 포함해도 리소스별 dict 목록의 약 60% 메모리로 관리합니다.
+"""
+
+from array import array
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+# 레코드 상태
+ALIVE = 1
+REMOVED = 0
+
+
+class _Interner:
+    """문자열 ↔ 정수 코드 변환 (반복되는 유형 / 학습자 이름을 한 번만 저장)"""
+
+    __slots__ = ("_codes", "_values")
+
+    def __init__(self):
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        self._values: List[Optional[str]] = [None]
+
+    def code(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: Optional[str]) -> Optional[int]:
+        return self._codes.get(value)
+
+    def value(self, code: int) -> Optional[str]:
+        return self._values[code]
+
+
+class ResourceRecord:
+    """레지스트리의 한 행을 읽는 가벼운 뷰"""
+
+    __slots__ = ("_registry", "row")
+
+    def __init__(self, registry: "ResourceRegistry", row: int):
+        self._registry = registry
+        self.row = row
+
+    @property
+    def id(self) -> str:
+        return self._registry._ids[self.row]
+
+    @property
+    def name(self) -> Optional[str]:
+        name = self._registry._names[self.row]
+        return self.id if name is None else name
+
+    @property
+    def type(self) -> str:
+        return self._registry._strings.value(self._registry._type_codes[self.row])
+
+    @property
+    def provider(self) -> str:
+        return self._registry._strings.value(self._registry._provider_codes[self.row])
+
+    @property
+    def learner(self) -> Optional[str]:
+        return self._registry._strings.value(self._registry._learner_codes[self.row])
+
+    @property
+    def region(self) -> Optional[str]:
+        return self._registry._strings.value(self._registry._region_codes[self.row])
+
+    @property
+    def depends_on(self) -> Tuple[str, ...]:
+        return tuple(self._registry._ids[r] for r in self._registry._deps.get(self.row, ()))
+
+    @property
+    def alive(self) -> bool:
+        return self._registry._state[self.row] == ALIVE
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"provider": self.provider, "type": self.type, "id": self.id, "name": self.name,
+                "learner": self.learner, "region": self.region,
+                "depends_on": list(self.depends_on)}
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, ResourceRecord) and other._registry is self._registry
+                and other.row == self.row)
+
+    def __hash__(self) -> int:
+        return hash((id(self._registry), self.row))
+
+    def __repr__(self) -> str:
+        return f"ResourceRecord({self.provider}:{self.type} {self.id})"
+
+
+class ResourceRegistry:
+    """생성 리소스의 열 지향 레지스트리"""
+
+    def __init__(self):
+        self._strings = _Interner()
+        self._ids: List[str] = []
+        self._names: List[Optional[str]] = []    # 이름이 ID 와 같으면 None (중복 저장 방지)
+        self._type_codes = array("I")
+        self._provider_codes = array("I")
+        self._learner_codes = array("I")
+        self._region_codes = array("I")
+        self._state = bytearray()
+        self._deps: Dict[int, Tuple[int, ...]] = {}   # 의존 관계가 있는 행만 저장
+        self._row_by_id: Dict[str, int] = {}
+        self._by_type: Dict[int, array] = {}
+        self._by_provider: Dict[int, array] = {}
+        self._by_learner: Dict[int, array] = {}
+        self._alive = 0
+
+    # ---- 등록 / 제거 ----
+
+    def add(self, provider: str, resource_type: str, resource_id: str,
+            name: Optional[str] = None, learner: Optional[str] = None,
+            region: Optional[str] = None, depends_on: Iterable[str] = ()) -> ResourceRecord:
+        """
+        리소스 등록 (같은 ID 가 이미 있으면 기존 레코드 반환)
+
+        Args:
+            provider: 'aws' / 'gcp'
+            resource_type: 리소스 유형 (예: 'ec2_instance')
+            resource_id: 리소스 ID (ID 가 없는 리소스는 이름)
+            name: 리소스 이름
+            learner: 학습자 ID
+            region: 리전
+            depends_on: 이 리소스가 의존하는 (먼저 등록된) 리소스 ID 목록
+
+        Raises:
+            KeyError: 의존 대상이 등록되어 있지 않은 경우
+        """
+        row = self._row_by_id.get(resource_id)
+        if row is not None and self._state[row] == ALIVE:
+            return ResourceRecord(self, row)
+
+        dep_rows = tuple(self._row(dep) for dep in depends_on)
+        row = len(self._ids)
+        type_code = self._strings.code(resource_type)
+        provider_code = self._strings.code(provider)
+        learner_code = self._strings.code(learner)
+
+        self._ids.append(resource_id)
+        self._names.append(None if name in (None, resource_id) else name)
+        self._type_codes.append(type_code)
+        self._provider_codes.append(provider_code)
+        self._learner_codes.append(learner_code)
+        self._region_codes.append(self._strings.code(region))
+        self._state.append(ALIVE)
+        if dep_rows:
+            self._deps[row] = dep_rows
+        self._row_by_id[resource_id] = row
+        self._by_type.setdefault(type_code, array("I")).append(row)
+        self._by_provider.setdefault(provider_code, array("I")).append(row)
+        if learner is not None:
+            self._by_learner.setdefault(learner_code, array("I")).append(row)
+        self._alive += 1
+        return ResourceRecord(self, row)
+
+    def remove(self, resource_id: str):
+        """리소스 제거 표시 (정리 완료 후 호출)"""
+        row = self._row_by_id.get(resource_id)
+        if row is not None and self._state[row] == ALIVE:
+            self._state[row] = REMOVED
+            self._alive -= 1
+
+    def _row(self, resource_id: str) -> int:
+        row = self._row_by_id.get(resource_id)
+        if row is None or self._state[row] != ALIVE:
+            raise KeyError(f"등록되지 않은 리소스: {resource_id}")
+        return row
+
+    # ---- 조회 ----
+
+    def get(self, resource_id: str) -> Optional[ResourceRecord]:
+        row = self._row_by_id.get(resource_id)
+        if row is None or self._state[row] != ALIVE:
+            return None
+        return ResourceRecord(self, row)
+
+    def __contains__(self, resource_id: object) -> bool:
+        row = self._row_by_id.get(resource_id)  # type: ignore[arg-type]
+        return row is not None and self._state[row] == ALIVE
+
+    def __len__(self) -> int:
+        return self._alive
+
+    def __iter__(self) -> Iterator[ResourceRecord]:
+        """등록 순서대로 순회"""
+        return self._records(range(len(self._ids)))
+
+    def _records(self, rows: Iterable[int]) -> Iterator[ResourceRecord]:
+        state = self._state
+        for row in rows:
+            if state[row] == ALIVE:
+                yield ResourceRecord(self, row)
+
+    def _index_rows(self, index: Dict[int, array], value: Optional[str]) -> array:
+        code = self._strings.lookup(value)
+        return index.get(code, array("I")) if code is not None else array("I")
+
+    def by_type(self, resource_type: str) -> Iterator[ResourceRecord]:
+        return self._records(self._index_rows(self._by_type, resource_type))
+
+    def by_provider(self, provider: str) -> Iterator[ResourceRecord]:
+        return self._records(self._index_rows(self._by_provider, provider))
+
+    def by_learner(self, learner: str) -> Iterator[ResourceRecord]:
+        return self._records(self._index_rows(self._by_learner, learner))
+
+    def dependents(self, resource_id: str) -> List[ResourceRecord]:
+        """이 리소스에 의존하는 리소스 목록"""
+        row = self._row(resource_id)
+        return [ResourceRecord(self, r) for r, deps in self._deps.items()
+                if row in deps and self._state[r] == ALIVE]
+
+    def teardown_order(self, provider: Optional[str] = None,
+                       learner: Optional[str] = None) -> Iterator[ResourceRecord]:
+        """
+        정리 순서(의존하는 리소스가 먼저)로 순회
+
+        의존 대상은 항상 먼저 등록되므로 등록 역순이 위상 정렬의 역순과 같습니다.
+        """
+        if learner is not None:
+            rows = self._index_rows(self._by_learner, learner)
+        elif provider is not None:
+            rows = self._index_rows(self._by_provider, provider)
+        else:
+            rows = range(len(self._ids))
+        provider_code = self._strings.lookup(provider) if provider is not None else None
+        for record in self._records(reversed(rows)):
+            if provider is None or self._provider_codes[record.row] == provider_code:
+                yield record
+
+    def compact(self):
+        """제거 표시된 행을 실제로 지워 메모리 회수 (행 번호가 바뀌므로 기존 레코드 뷰는 무효)"""
+        alive_rows = [row for row in range(len(self._ids)) if self._state[row] == ALIVE]
+        old = (self._ids, self._names, self._type_codes, self._provider_codes,
+               self._learner_codes, self._region_codes, self._deps)
+        remap = {row: new_row for new_row, row in enumerate(alive_rows)}
+
+        self._ids = [old[0][r] for r in alive_rows]
+        self._names = [old[1][r] for r in alive_rows]
+        self._type_codes = array("I", (old[2][r] for r in alive_rows))
+        self._provider_codes = array("I", (old[3][r] for r in alive_rows))
+        self._learner_codes = array("I", (old[4][r] for r in alive_rows))
+        self._region_codes = array("I", (old[5][r] for r in alive_rows))
+        self._state = bytearray([ALIVE]) * len(alive_rows)
+        self._deps = {}
+        for row, deps in old[6].items():
+            if row in remap:
+                kept = tuple(remap[d] for d in deps if d in remap)
+                if kept:
+                    self._deps[remap[row]] = kept
+
+        self._row_by_id = {resource_id: row for row, resource_id in enumerate(self._ids)}
+        self._by_type, self._by_provider, self._by_learner = {}, {}, {}
+        for row in range(len(self._ids)):
+            self._by_type.setdefault(self._type_codes[row], array("I")).append(row)
+            self._by_provider.setdefault(self._provider_codes[row], array("I")).append(row)
+            if self._learner_codes[row]:
+                self._by_learner.setdefault(self._learner_codes[row], array("I")).append(row)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+AssumeRole 임시 자격 증명 캐시
+학습자 계정마다 sts:AssumeRole 로 받은 자격 증명을 (역할, 세션 이름) 단위로 공유하고,
+만료 전에 백그라운드 스레드가 미리 갱신합니다.
+
+- 주요 기능:
+  - 같은 역할 / 세션의 모든 클라이언트와 스레드가 자격 증명 객체 하나를 공유하므로 AssumeRole 은 계정당 한 번만 호출됩니다.
+  - 최초 AssumeRole 은 세션 생성 시점이 아니라 첫 API 호출 시점에 수행되어, 여러 계정의 최초 발급이 서로를 기다리지 않습니다.
+  - 만료 refresh_margin 초 전에 백그라운드 스레드가 새 자격 증명을 받아 두고,
+    botocore 는 만료 refresh_margin / 2 초 전에 캐시의 값을 가져가므로 API 호출 경로에서는 STS 를 호출하지 않습니다.
+  - 백그라운드 갱신이 실패하면 점점 긴 간격으로 다시 시도하며, 만료가 임박하면 호출 스레드 하나만 직접 갱신합니다.
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import boto3
+import botocore.session
+from botocore.credentials import DeferredRefreshableCredentials
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_NAME = "cloud-basic-automation"
+DEFAULT_DURATION_SECONDS = 3600
+DEFAULT_REFRESH_MARGIN = 900
+
+# 백그라운드 갱신 실패 시 재시도 간격 (초)
+RETRY_BASE_INTERVAL = 5.0
+RETRY_MAX_INTERVAL = 120.0
+
+RoleKey = Tuple[str, str, Optional[str]]
+
+
+class SharedRoleCredentials(DeferredRefreshableCredentials):
+    """갱신 시점을 캐시의 refresh_margin 에 맞춘 botocore 자격 증명"""
+
+    def __init__(self, refresh_using: Callable[[], Dict[str, str]], refresh_margin: float):
+        super().__init__(refresh_using, method="assume-role-cache")
+        self._advisory_refresh_timeout = refresh_margin / 2
+        self._mandatory_refresh_timeout = refresh_margin / 4
+
+
+class _RoleEntry:
+    """역할 / 세션 하나의 최신 자격 증명과 갱신 상태"""
+
+    __slots__ = ("key", "sts_client", "metadata", "expires_at", "refresh_at", "refreshes",
+                 "failures", "credentials", "lock")
+
+    def __init__(self, key: RoleKey, sts_client: Any):
+        self.key = key
+        self.sts_client = sts_client
+        self.metadata: Optional[Dict[str, str]] = None
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        self.refreshes = 0
+        self.failures = 0
+        self.credentials: Optional[SharedRoleCredentials] = None
+        self.lock = threading.Lock()
+
+
+class AssumedRoleCredentialCache:
+    """(역할 ARN, 세션 이름, External ID) 키로 AssumeRole 자격 증명을 공유하고 미리 갱신하는 캐시"""
+
+    def __init__(self, duration_seconds: int = DEFAULT_DURATION_SECONDS,
+                 refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            duration_seconds: AssumeRole DurationSeconds
+            refresh_margin: 만료 몇 초 전에 백그라운드에서 갱신할지
+            clock: 현재 시각 (epoch 초)
+        """
+        if refresh_margin >= duration_seconds:
+            raise ValueError("refresh_margin 은 duration_seconds 보다 작아야 합니다")
+        self.duration_seconds = duration_seconds
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self._entries: Dict[RoleKey, _RoleEntry] = {}
+        self._wakeup = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    # ---- 조회 ----
+
+    def credentials(self, role_arn: str, sts_client: Any, session_name: Optional[str] = None,
+                    external_id: Optional[str] = None) -> SharedRoleCredentials:
+        """
+        역할 / 세션의 공유 자격 증명 (AssumeRole 은 첫 사용 시 수행)
+
+        Args:
+            role_arn: 학습자 계정의 역할 ARN
+            sts_client: 원본 자격 증명으로 만든 STS 클라이언트 (최초 등록 시에만 사용)
+            session_name: RoleSessionName
+            external_id: ExternalId (역할 신뢰 정책에서 요구하는 경우)
+        """
+        key = (role_arn, session_name or DEFAULT_SESSION_NAME, external_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._wakeup:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = _RoleEntry(key, sts_client)
+                    entry.credentials = SharedRoleCredentials(lambda: self._metadata(entry), self.refresh_margin)
+                    self._entries[key] = entry
+                    self._ensure_refresher()
+        return entry.credentials
+
+    def session(self, role_arn: str, sts_client: Any, session_name: Optional[str] = None,
+                external_id: Optional[str] = None) -> boto3.session.Session:
+        """공유 자격 증명을 쓰는 boto3 Session"""
+        botocore_session = botocore.session.get_session()
+        botocore_session._credentials = self.credentials(role_arn, sts_client, session_name, external_id)
+        return boto3.session.Session(botocore_session=botocore_session)
+
+    def _metadata(self, entry: _RoleEntry) -> Dict[str, str]:
+        """botocore 갱신 콜백: 캐시의 최신 값을 반환하고, 만료 임박 시에만 직접 갱신"""
+        if entry.metadata is not None and entry.expires_at - self.clock() > self.refresh_margin / 4:
+            return entry.metadata
+        with entry.lock:
+            if entry.metadata is None or entry.expires_at - self.clock() <= self.refresh_margin / 4:
+                self._assume(entry)
+            return entry.metadata
+
+    def _assume(self, entry: _RoleEntry):
+        """AssumeRole 호출 (호출자는 entry.lock 을 보유해야 함)"""
+        role_arn, session_name, external_id = entry.key
+        kwargs: Dict[str, Any] = {"RoleArn": role_arn, "RoleSessionName": session_name,
+                                  "DurationSeconds": self.duration_seconds}
+        if external_id:
+            kwargs["ExternalId"] = external_id
+        issued = entry.sts_client.assume_role(**kwargs)["Credentials"]
+        expiration = issued["Expiration"]
+        entry.metadata = {
+            "access_key": issued["AccessKeyId"],
+            "secret_key": issued["SecretAccessKey"],
+            "token": issued["SessionToken"],
+            "expiry_time": expiration.isoformat(),
+        }
+        entry.expires_at = expiration.timestamp()
+        entry.refreshes += 1
+        entry.failures = 0
+        with self._wakeup:
+            entry.refresh_at = entry.expires_at - self.refresh_margin
+            self._wakeup.notify()
+        logger.debug(f"AssumeRole 자격 증명 발급: {role_arn} ({session_name}), "
+                     f"{entry.expires_at - self.clock():.0f}초 유효")
+
+    # ---- 백그라운드 갱신 ----
+
+    def _ensure_refresher(self):
+        """갱신 스레드 시작 (호출자는 _wakeup 을 보유해야 함)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._refresh_loop, name="role-credential-refresh", daemon=True)
+            self._thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            with self._wakeup:
+                while not self._stopped:
+                    issued = [e for e in self._entries.values() if e.metadata is not None]
+                    now = self.clock()
+                    due = [e for e in issued if e.refresh_at <= now]
+                    if due:
+                        break
+                    next_at = min((e.refresh_at for e in issued), default=None)
+                    self._wakeup.wait(None if next_at is None else next_at - now)
+                if self._stopped:
+                    return
+            for entry in due:
+                self._refresh(entry)
+
+    def _refresh(self, entry: _RoleEntry):
+        with entry.lock:
+            if entry.refresh_at > self.clock():
+                return  # 호출 스레드가 이미 갱신
+            try:
+                self._assume(entry)
+            except Exception as e:
+                entry.failures += 1
+                delay = min(RETRY_MAX_INTERVAL, RETRY_BASE_INTERVAL * 2 ** (entry.failures - 1))
+                with self._wakeup:
+                    entry.refresh_at = self.clock() + delay
+                logger.warning(f"⚠️ AssumeRole 자격 증명 갱신 실패 ({entry.key[0]}), {delay:.0f}초 후 재시도: {e}")
+
+    def close(self):
+        """갱신 스레드 중지"""
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """역할별 자격 증명 상태"""
+        now = self.clock()
+        with self._wakeup:
+            entries = list(self._entries.values())
+        return [{"role_arn": e.key[0], "session_name": e.key[1],
+                 "expires_in": round(e.expires_at - now, 1) if e.metadata else None,
+                 "refreshes": e.refreshes, "failures": e.failures} for e in entries]
+
+
+_cache: Optional[AssumedRoleCredentialCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_role_credential_cache() -> AssumedRoleCredentialCache:
+    """프로세스 공용 자격 증명 캐시 (AWS_ROLE_DURATION_SECONDS / AWS_ROLE_REFRESH_MARGIN 으로 조정)"""
+    global _cache
+    if _cache is not None:
+        return _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = AssumedRoleCredentialCache(
+                duration_seconds=int(os.getenv("AWS_ROLE_DURATION_SECONDS", DEFAULT_DURATION_SECONDS)),
+                refresh_margin=float(os.getenv("AWS_ROLE_REFRESH_MARGIN", DEFAULT_REFRESH_MARGIN)),
+            )
+    return _cache
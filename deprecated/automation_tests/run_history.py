@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+자동화 실행 이력 저장소 (SQLite)
+실행 결과 JSON 을 덮어쓰는 대신 모든 실행과 단계별 소요 시간을 누적 기록합니다.
+
+- 주요 기능:
+  - CloudBasicAutomation.run_automation, BasicCourseAutomation.run_course,
+    DryRunTest.run_all_tests 실행을 runs / steps 테이블에 기록합니다.
+  - 과정, 일차, 단계, 학습자, 기수(cohort), 시각 기준 인덱스로 빠르게 조회합니다.
+  - "최근 10개 기수의 RDS 생성 p95 소요 시간", "실패율이 상승 중인 단계" 같은 분석 쿼리를 제공합니다.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path.home() / ".local" / "state" / "cloud-basic" / "run_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    course TEXT NOT NULL,
+    day INTEGER,
+    learner TEXT,
+    cohort TEXT,
+    status TEXT NOT NULL DEFAULT 'in_progress',
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    step TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_course_day ON runs(course, day, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_learner ON runs(learner, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_cohort ON runs(cohort, started_at);
+CREATE INDEX IF NOT EXISTS idx_steps_step ON steps(step, started_at);
+CREATE INDEX IF NOT EXISTS idx_steps_run ON steps(run_id);
+"""
+
+
+class RunHistoryStore:
+    """실행 이력 SQLite 저장소 (스레드 간 공유 가능)"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or os.getenv("AUTOMATION_HISTORY_DB", DEFAULT_DB_PATH))
+        self._lock = threading.Lock()
+        if str(self.db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ---- 기록 ----
+
+    def start_run(self, source: str, course: str, day: Optional[int] = None,
+                  learner: Optional[str] = None, cohort: Optional[str] = None,
+                  metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        실행 시작 기록
+
+        Args:
+            source: 실행 주체 (예: 'CloudBasicAutomation.run_automation')
+            course: 과정 이름
+            day: 일차
+            learner: 학습자 ID
+            cohort: 기수 ID
+
+        Returns:
+            실행 ID
+        """
+        cursor = self._execute(
+            "INSERT INTO runs (source, course, day, learner, cohort, started_at, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (source, course, day, learner, cohort, time.time(),
+             json.dumps(metadata, ensure_ascii=False) if metadata else None))
+        return cursor.lastrowid
+
+    def record_step(self, run_id: int, step: str, status: str,
+                    started_at: float, duration: float, error: Optional[str] = None):
+        """단계 결과 기록"""
+        self._execute(
+            "INSERT INTO steps (run_id, step, status, started_at, duration, error) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, step, status, started_at, duration, error))
+
+    def finish_run(self, run_id: int, status: str):
+        """실행 종료 기록"""
+        self._execute("UPDATE runs SET status = ?, finished_at = ? WHERE id = ?",
+                      (status, time.time(), run_id))
+
+    @contextmanager
+    def step(self, run_id: int, step: str) -> Iterator[None]:
+        """단계 소요 시간을 측정하여 기록하는 컨텍스트 관리자 (예외 시 failed)"""
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record_step(run_id, step, "failed", started_at, time.perf_counter() - start, str(e))
+            raise
+        self.record_step(run_id, step, "success", started_at, time.perf_counter() - start)
+
+    # ---- 조회 ----
+
+    def _recent_cohorts(self, last_cohorts: int, course: Optional[str] = None) -> List[str]:
+        sql = "SELECT cohort FROM runs WHERE cohort IS NOT NULL"
+        params: tuple = ()
+        if course:
+            sql += " AND course = ?"
+            params = (course,)
+        sql += " GROUP BY cohort ORDER BY MAX(started_at) DESC LIMIT ?"
+        return [row["cohort"] for row in self._query(sql, params + (last_cohorts,))]
+
+    def step_duration_percentile(self, step: str, pct: float = 95,
+                                 last_cohorts: Optional[int] = None,
+                                 course: Optional[str] = None,
+                                 status: str = "success") -> Optional[float]:
+        """
+        단계 소요 시간 백분위수 (nearest-rank)
+
+        Args:
+            step: 단계 이름 (예: 'RDS 인스턴스 생성')
+            pct: 백분위 (0~100)
+            last_cohorts: 최근 N개 기수로 제한
+            course: 과정 이름으로 제한
+            status: 집계할 단계 상태
+
+        Returns:
+            소요 시간(초), 데이터가 없으면 None
+        """
+        where = ["s.step = ?", "s.status = ?"]
+        params: list = [step, status]
+        if course:
+            where.append("r.course = ?")
+            params.append(course)
+        if last_cohorts:
+            cohorts = self._recent_cohorts(last_cohorts, course)
+            if not cohorts:
+                return None
+            where.append(f"r.cohort IN ({','.join('?' * len(cohorts))})")
+            params.extend(cohorts)
+
+        base = f"FROM steps s JOIN runs r ON r.id = s.run_id WHERE {' AND '.join(where)}"
+        count = self._query(f"SELECT COUNT(*) AS n {base}", tuple(params))[0]["n"]
+        if count == 0:
+            return None
+        offset = max(0, min(count - 1, math.ceil(pct / 100.0 * count) - 1))
+        row = self._query(f"SELECT s.duration {base} ORDER BY s.duration LIMIT 1 OFFSET ?",
+                          tuple(params) + (offset,))
+        return row[0]["duration"]
+
+    def failure_rates(self, cohorts: List[str]) -> Dict[str, Dict[str, float]]:
+        """지정한 기수들의 단계별 실패율 {step: {'runs': n, 'failures': f, 'rate': r}}"""
+        if not cohorts:
+            return {}
+        rows = self._query(
+            "SELECT s.step, COUNT(*) AS n, SUM(s.status = 'failed') AS f "
+            "FROM steps s JOIN runs r ON r.id = s.run_id "
+            f"WHERE r.cohort IN ({','.join('?' * len(cohorts))}) GROUP BY s.step",
+            tuple(cohorts))
+        return {row["step"]: {"runs": row["n"], "failures": row["f"], "rate": row["f"] / row["n"]}
+                for row in rows}
+
+    def rising_failure_steps(self, window: int = 5, min_runs: int = 3,
+                             course: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        최근 window 개 기수의 실패율이 그 이전 window 개 기수보다 높은 단계 목록
+        비교할 이전 기수가 window 개에 못 미치면 추세를 판단하지 않고 빈 목록을 반환합니다.
+
+        Returns:
+            [{'step', 'previous_rate', 'recent_rate', 'delta'}] (상승 폭 내림차순)
+        """
+        cohorts = self._recent_cohorts(window * 2, course)
+        if len(cohorts) < window * 2:
+            logger.debug(f"기수 이력 부족({len(cohorts)}/{window * 2}), 실패율 추세 판단 생략")
+            return []
+        recent = self.failure_rates(cohorts[:window])
+        previous = self.failure_rates(cohorts[window:])
+        rising = []
+        for step, stats in recent.items():
+            if stats["runs"] < min_runs:
+                continue
+            before = previous.get(step, {}).get("rate", 0.0)
+            if stats["rate"] > before:
+                rising.append({"step": step, "previous_rate": round(before, 4),
+                               "recent_rate": round(stats["rate"], 4),
+                               "delta": round(stats["rate"] - before, 4)})
+        return sorted(rising, key=lambda item: item["delta"], reverse=True)
+
+    def recent_runs(self, limit: int = 20, course: Optional[str] = None,
+                    learner: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 실행 목록"""
+        where, params = [], []
+        if course:
+            where.append("course = ?")
+            params.append(course)
+        if learner:
+            where.append("learner = ?")
+            params.append(learner)
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started_at DESC LIMIT ?"
+        return [dict(row) for row in self._query(sql, tuple(params) + (limit,))]
+
+
+_stores: Dict[str, RunHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_run_history(db_path: Optional[Path] = None) -> RunHistoryStore:
+    """경로별 프로세스 공용 저장소 조회"""
+    path = str(Path(db_path or os.getenv("AUTOMATION_HISTORY_DB", DEFAULT_DB_PATH)).resolve())
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = RunHistoryStore(Path(path))
+            _stores[path] = store
+        return store
+
+
+def main():
+    """명령행 조회: python run_history.py p95 <step> [--cohorts 10] | rising [--window 5] | recent"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="자동화 실행 이력 조회")
+    parser.add_argument("--db", default=None)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p95 = sub.add_parser("p95", help="단계 소요 시간 백분위수")
+    p95.add_argument("step")
+    p95.add_argument("--pct", type=float, default=95)
+    p95.add_argument("--cohorts", type=int, default=10)
+    rising = sub.add_parser("rising", help="실패율이 상승 중인 단계")
+    rising.add_argument("--window", type=int, default=5)
+    recent = sub.add_parser("recent", help="최근 실행 목록")
+    recent.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = get_run_history(Path(args.db) if args.db else None)
+    if args.command == "p95":
+        value = store.step_duration_percentile(args.step, args.pct, args.cohorts)
+        print(f"{args.step} p{args.pct:g}: {'데이터 없음' if value is None else f'{value:.2f}초'}")
+    elif args.command == "rising":
+        for item in store.rising_failure_steps(args.window):
+            print(f"{item['step']}: {item['previous_rate']:.1%} → {item['recent_rate']:.1%}")
+    else:
+        for run in store.recent_runs(args.limit):
+            print(json.dumps(run, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+실습 셸 스크립트 정적 분석기
+automation/ 아래 실습 스크립트를 한 번씩만 토큰화해 함수 / 변수 / aws·gcloud·gsutil 호출 색인을 만들고,
+모든 검사를 그 색인에서 답합니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차 / 2일차 실습 스크립트 (automation/day1, automation/day2)
+- 주요 기능:
+  - 따옴표, $( ) / 백틱 명령 치환, 산술 확장, here-document, 주석, 줄 이음을 구분하는 단일 패스 토큰화
+  - 색인은 파일 내용 해시별로 캐시하므로 바뀐 스크립트만 다시 토큰화합니다.
+  - 검사 항목:
+    - undefined-variable: 스크립트 안(및 source 한 파일)에서 정의되지 않은 변수 사용.
+      다른 스크립트가 정의하는 변수면 정의 위치를 함께 알려줍니다 (스크립트 간 변수 흐름).
+    - duplicate-function: 같은 스크립트에서 함수를 두 번 정의
+    - missing-errexit: 클라우드 명령을 실행하면서 set -e 가 없음
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 토큰화 규칙이 바뀌면 올려서 기존 캐시를 무효화
+INDEX_VERSION = 1
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "cloud-basic" / "script_index.json"
+
+CLOUD_TOOLS = ("aws", "gcloud", "gsutil")
+
+# 셸 / 실행 환경이 제공하는 변수
+ENVIRONMENT_VARIABLES = frozenset({
+    "HOME", "PATH", "PWD", "OLDPWD", "USER", "SHELL", "TERM", "LANG", "TMPDIR", "HOSTNAME", "UID", "EUID",
+    "OSTYPE", "IFS", "REPLY", "OPTARG", "OPTIND", "RANDOM", "SECONDS", "LINENO", "FUNCNAME", "PIPESTATUS",
+    "BASH_SOURCE", "BASH_VERSION", "BASH_REMATCH", "BASHPID", "PPID", "EDITOR",
+})
+
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_ASSIGNMENT = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)(\[[^\]]*\])?\+?=")
+_HEREDOC_REFERENCE = re.compile(r"(?<!\\)\$\{?([A-Za-z_][A-Za-z0-9_]*)")
+_GUARD_OPERATORS = (":-", ":=", ":?", ":+", "-", "=", "?", "+")
+_COMMAND_PREFIX_KEYWORDS = frozenset({"if", "then", "else", "elif", "do", "while", "until", "!", "{", "}",
+                                      "time", "fi", "done", "esac", "[[", "]]"})
+_DECLARATION_BUILTINS = frozenset({"export", "local", "declare", "readonly", "typeset"})
+_GLOBAL_AWS_OPTIONS = frozenset({"--region", "--profile", "--output", "--query", "--endpoint-url"})
+_GCLOUD_VERBS = frozenset({"create", "delete", "list", "describe", "update", "get", "set", "get-value",
+                           "enable", "disable", "start", "stop", "reset", "deploy", "login", "activate",
+                           "add-iam-policy-binding", "remove-iam-policy-binding", "get-iam-policy",
+                           "set-iam-policy", "ssh", "scp"})
+_GSUTIL_GROUPS = frozenset({"web", "iam", "acl", "defacl", "lifecycle", "versioning", "cors", "label"})
+
+
+class ScriptIndex:
+    """스크립트 하나의 색인 (함수, 변수 정의 / 참조, 클라우드 명령)"""
+
+    __slots__ = ("sha256", "functions", "assignments", "references", "guarded", "calls",
+                 "cloud_commands", "sources", "options")
+
+    def __init__(self, sha256: str):
+        self.sha256 = sha256
+        self.functions: Dict[str, List[int]] = {}
+        self.assignments: Dict[str, int] = {}
+        self.references: Dict[str, List[int]] = {}
+        self.guarded: List[str] = []
+        self.calls: Dict[str, List[int]] = {}
+        self.cloud_commands: List[Dict[str, Any]] = []
+        self.sources: List[str] = []
+        self.options: List[str] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScriptIndex":
+        index = cls(data["sha256"])
+        for name in cls.__slots__[1:]:
+            setattr(index, name, data[name])
+        return index
+
+    # ---- 색인 기록 ----
+
+    def add_reference(self, name: str, line: int, guarded: bool = False):
+        self.references.setdefault(name, []).append(line)
+        if guarded and name not in self.guarded:
+            self.guarded.append(name)
+
+    def add_assignment(self, name: str, line: int):
+        self.assignments.setdefault(name, line)
+
+    def add_command(self, words: List[Tuple[str, int]]):
+        """단순 명령 하나(단어 목록)를 색인에 반영"""
+        # [ -z "$VAR" ] / [[ -n $VAR ]] / [[ -v VAR ]] 처럼 설정 여부를 먼저 확인하는 변수는 보호된 것으로 봄
+        for (flag, _), (operand, _) in zip(words, words[1:]):
+            if flag in ("-z", "-n", "-v"):
+                match = _NAME.fullmatch(operand.lstrip("$").strip("{}"))
+                if match and match.group(0) not in self.guarded:
+                    self.guarded.append(match.group(0))
+        while words and words[0][0] in _COMMAND_PREFIX_KEYWORDS:
+            words = words[1:]
+        if not words:
+            return
+        head, line = words[0]
+        if head == "function" and len(words) > 1:
+            self.functions.setdefault(words[1][0].rstrip("()"), []).append(words[1][1])
+            return
+        if head in ("for", "select") and len(words) > 1:
+            self.add_assignment(words[1][0], words[1][1])
+            return
+        while words and _ASSIGNMENT.match(words[0][0]):
+            self.add_assignment(_ASSIGNMENT.match(words[0][0]).group(1), words[0][1])
+            words = words[1:]
+        if not words:
+            return
+        head, line = words[0]
+        args = [w for w, _ in words[1:]]
+        self.calls.setdefault(head, []).append(line)
+        if head in _DECLARATION_BUILTINS:
+            for arg in args:
+                match = _NAME.match(arg)
+                if match and (match.end() == len(arg) or arg[match.end()] in "=+["):
+                    self.add_assignment(match.group(0), line)
+        elif head == "read":
+            skip_next = False
+            for arg in args:
+                if skip_next:
+                    skip_next = False
+                elif arg in ("-p", "-t", "-d", "-n", "-N", "-u"):
+                    skip_next = True
+                elif _NAME.fullmatch(arg):
+                    self.add_assignment(arg, line)
+        elif head in ("source", ".") and args:
+            self.sources.append(args[0])
+        elif head == "set":
+            self.options += [arg for arg in args if arg.startswith(("-", "+")) or arg in ("errexit", "nounset")]
+        elif head in CLOUD_TOOLS:
+            self.cloud_commands.append(dict(_cloud_command(head, args), line=line))
+
+
+def _cloud_command(tool: str, args: List[str]) -> Dict[str, Any]:
+    """aws / gcloud / gsutil 호출의 서비스와 동작 추출"""
+    positional, skip_next = [], False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+        elif arg.startswith("-"):
+            skip_next = tool == "aws" and arg in _GLOBAL_AWS_OPTIONS
+        else:
+            positional.append(arg)
+    if tool == "aws":
+        return {"tool": tool, "service": positional[0] if positional else None,
+                "operation": positional[1] if len(positional) > 1 else None}
+    if tool == "gsutil":
+        operation = positional[:2] if positional and positional[0] in _GSUTIL_GROUPS else positional[:1]
+        return {"tool": tool, "service": "storage", "operation": " ".join(operation) or None}
+    path = []
+    for word in positional:
+        if not re.fullmatch(r"[a-z][a-z0-9-]*", word) or len(path) == 4:
+            break
+        path.append(word)
+        if word in _GCLOUD_VERBS:
+            break
+    return {"tool": tool, "service": path[0] if path else None, "operation": " ".join(path[1:]) or None}
+
+
+class _Frame:
+    """명령 치환 / 산술 확장 / 배열 값 단위의 토큰화 상태"""
+
+    __slots__ = ("closer", "arithmetic", "literal", "quote", "depth", "words", "word", "word_line", "redirect")
+
+    def __init__(self, closer: Optional[str] = None, arithmetic: bool = False, literal: bool = False):
+        self.closer = closer
+        self.arithmetic = arithmetic
+        self.literal = literal
+        self.quote: Optional[str] = None
+        self.depth = 0
+        self.words: List[Tuple[str, int]] = []
+        self.word: List[str] = []
+        self.word_line = 0
+        self.redirect = False
+
+
+def index_script(text: str) -> ScriptIndex:
+    """스크립트 내용을 한 번 훑어 색인 생성"""
+    index = ScriptIndex(hashlib.sha256(text.encode("utf-8")).hexdigest())
+    text = text.lstrip("﻿").replace("\r\n", "\n")
+    frames = [_Frame()]
+    heredocs: List[Tuple[str, bool, bool]] = []
+    line, i, n = 1, 0, len(text)
+
+    def end_word(frame: _Frame):
+        if frame.word:
+            # 리디렉션 대상(> file)은 명령 인자가 아님
+            if not frame.redirect:
+                frame.words.append(("".join(frame.word), frame.word_line))
+            frame.word = []
+            frame.redirect = False
+
+    def end_command(frame: _Frame):
+        end_word(frame)
+        if not (frame.arithmetic or frame.literal):
+            index.add_command(frame.words)
+        frame.words = []
+
+    def append(frame: _Frame, chars: str):
+        if not frame.word:
+            frame.word_line = line
+        frame.word.append(chars)
+
+    while i < n:
+        frame = frames[-1]
+        ch = text[i]
+
+        if frame.quote == "'":
+            if ch == "'":
+                frame.quote = None
+            else:
+                append(frame, ch)
+                line += ch == "\n"
+            i += 1
+            continue
+
+        if ch == "\\":
+            if i + 1 < n and text[i + 1] == "\n":
+                line += 1
+            elif i + 1 < n:
+                append(frame, text[i + 1])
+            i += 2
+            continue
+
+        if ch == "$" and i + 1 < n:
+            nxt = text[i + 1]
+            if nxt == "{":
+                match = _NAME.match(text, i + 2)
+                if match:
+                    rest = text[match.end():match.end() + 2]
+                    index.add_reference(match.group(0), line, guarded=rest.startswith(_GUARD_OPERATORS))
+                    end = match.end()
+                else:
+                    end = i + 2
+                append(frame, text[i:end])
+                i = end
+                continue
+            if nxt == "(":
+                arithmetic = text.startswith("((", i + 1)
+                append(frame, "$(")
+                frames.append(_Frame(")", arithmetic))
+                if arithmetic:
+                    frames[-1].depth = 1
+                i += 3 if arithmetic else 2
+                continue
+            match = _NAME.match(text, i + 1)
+            if match:
+                index.add_reference(match.group(0), line)
+                append(frame, text[i:match.end()])
+                i = match.end()
+                continue
+            append(frame, text[i:i + 2])
+            i += 2
+            continue
+
+        if ch == "`":
+            if frame.closer == "`":
+                end_command(frame)
+                frames.pop()
+            else:
+                append(frames[-1], "`")
+                frames.append(_Frame("`"))
+            i += 1
+            continue
+
+        if frame.quote == '"':
+            if ch == '"':
+                frame.quote = None
+            else:
+                append(frame, ch)
+                line += ch == "\n"
+            i += 1
+            continue
+
+        # ---- 따옴표 밖 ----
+        if frame.arithmetic:
+            match = _NAME.match(text, i)
+            if match:
+                index.add_reference(match.group(0), line)
+                i = match.end()
+                continue
+
+        if ch in "'\"":
+            frame.quote = ch
+            if not frame.word:
+                frame.word_line = line
+            i += 1
+            continue
+
+        if ch == "#" and not frame.word:
+            while i < n and text[i] != "\n":
+                i += 1
+            continue
+
+        if ch in " \t":
+            end_word(frame)
+            i += 1
+            continue
+
+        if ch == "\n":
+            end_command(frame)
+            line += 1
+            i += 1
+            for delimiter, expand, strip_tabs in heredocs:
+                while i < n:
+                    end = text.find("\n", i)
+                    end = n if end < 0 else end
+                    body_line = text[i:end]
+                    i = end + 1
+                    if (body_line.lstrip("\t") if strip_tabs else body_line) == delimiter:
+                        line += 1
+                        break
+                    if expand:
+                        for match in _HEREDOC_REFERENCE.finditer(body_line):
+                            index.add_reference(match.group(1), line)
+                    line += 1
+            heredocs = []
+            continue
+
+        if ch == "(":
+            word = "".join(frame.word)
+            after = text[i + 1:i + 3].lstrip()
+            if _NAME.fullmatch(word) and after.startswith(")") and not frame.words:
+                index.functions.setdefault(word, []).append(frame.word_line)
+                frame.word = []
+                i = text.index(")", i) + 1
+                continue
+            if word.endswith("=") and _ASSIGNMENT.match(word):
+                # 배열 대입 NAME=( ... ): 괄호 안의 값은 명령이 아님
+                append(frame, "(")
+                frames.append(_Frame(")", literal=True))
+                i += 1
+                continue
+            if text.startswith("((", i) and not frame.word and not frame.words:
+                frames.append(_Frame("))", arithmetic=True))
+                i += 2
+                continue
+            end_command(frame)
+            frame.depth += 1
+            i += 1
+            continue
+
+        if ch == ")":
+            if frame.closer == "))" and text.startswith("))", i):
+                frames.pop()
+                i += 2
+                continue
+            if frame.closer == ")" and frame.depth == (1 if frame.arithmetic else 0):
+                end_command(frame)
+                frames.pop()
+                i += 2 if frame.arithmetic else 1
+                continue
+            end_command(frame)
+            frame.depth = max(frame.depth - 1, 0)
+            i += 1
+            continue
+
+        if ch == "&" and text.startswith(">", i + 1):
+            end_word(frame)
+            ch = ">"
+            i += 1
+        elif ch in ";&|":
+            end_command(frame)
+            i += 1
+            continue
+
+        if ch == "<" and text.startswith("<<", i) and not text.startswith("<<<", i):
+            end_word(frame)
+            j = i + 2
+            strip_tabs = text.startswith("-", j)
+            j += strip_tabs
+            while j < n and text[j] in " \t":
+                j += 1
+            start = j
+            while j < n and text[j] not in " \t\n;&|<>)":
+                j += 1
+            raw = text[start:j]
+            delimiter = raw.replace('"', "").replace("'", "").replace("\\", "")
+            if delimiter:
+                heredocs.append((delimiter, delimiter == raw, strip_tabs))
+            i = j
+            continue
+
+        if ch in "<>":
+            # 2>&1, >>, &>/dev/null: 파일 디스크립터 번호와 대상 단어는 버림
+            if "".join(frame.word).isdigit():
+                frame.word = []
+            end_word(frame)
+            i += 1
+            while i < n and text[i] in ">&|":
+                i += 1
+            frame.redirect = True
+            continue
+
+        append(frame, ch)
+        i += 1
+
+    while frames:
+        end_command(frames.pop())
+    return index
+
+
+class ScriptAnalyzer:
+    """여러 스크립트의 색인을 만들고(파일 해시별 캐시) 검사 실행"""
+
+    def __init__(self, cache_path: Optional[Path] = None, environment: Iterable[str] = ()):
+        """
+        Args:
+            cache_path: 색인 캐시 파일 (기본값: SCRIPT_ANALYZER_CACHE 환경 변수 또는 ~/.cache/cloud-basic/script_index.json)
+            environment: 실행 환경이 제공한다고 보는 변수 이름
+        """
+        self.cache_path = Path(cache_path or os.getenv("SCRIPT_ANALYZER_CACHE", DEFAULT_CACHE_PATH))
+        self.environment = ENVIRONMENT_VARIABLES | set(environment)
+        self.indexes: Dict[Path, ScriptIndex] = {}
+        self.tokenized = 0
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache.get("indexes", {}) if cache.get("version") == INDEX_VERSION else {}
+
+    def _save_cache(self, cache: Dict[str, Any]):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "indexes": cache}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"⚠️ 스크립트 색인 캐시 저장 실패: {e}")
+
+    def load(self, paths: Iterable[Path]) -> Dict[Path, ScriptIndex]:
+        """스크립트(또는 디렉터리 아래 *.sh) 색인, 내용이 바뀐 파일만 토큰화"""
+        files: List[Path] = []
+        for path in map(Path, paths):
+            files += sorted(path.rglob("*.sh")) if path.is_dir() else [path]
+        cache = self._load_cache()
+        live: Dict[str, Any] = {}
+        for path in files:
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            cached = cache.get(digest)
+            if cached is not None:
+                index = ScriptIndex.from_dict(cached)
+            else:
+                index = index_script(data.decode("utf-8", errors="replace"))
+                index.sha256 = digest
+                self.tokenized += 1
+            self.indexes[path] = index
+            live[digest] = index.to_dict()
+        if live.keys() != cache.keys() or self.tokenized:
+            self._save_cache(live)
+        return self.indexes
+
+    def _sourced(self, path: Path, seen=None) -> List[ScriptIndex]:
+        """path 가 source 하는 스크립트 색인 (재귀)"""
+        seen = seen if seen is not None else {path}
+        found = []
+        for source in self.indexes[path].sources:
+            target = (path.parent / source.replace("$SCRIPT_DIR/", "").replace("${SCRIPT_DIR}/", "")).resolve()
+            for candidate, index in self.indexes.items():
+                if candidate.resolve() == target and candidate not in seen:
+                    seen.add(candidate)
+                    found += [index] + self._sourced(candidate, seen)
+        return found
+
+    def _display(self, path: Path, root: Optional[Path]) -> str:
+        try:
+            return str(path.relative_to(root)) if root else str(path)
+        except ValueError:
+            return str(path)
+
+    def analyze(self, root: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        불러온 모든 색인에 대해 검사 실행
+
+        Returns:
+            [{"path", "line", "severity": "error" | "warning", "check", "message"}]
+        """
+        producers: Dict[str, List[str]] = {}
+        for path, index in self.indexes.items():
+            for name, line in index.assignments.items():
+                producers.setdefault(name, []).append(f"{self._display(path, root)}:{line}")
+
+        issues: List[Dict[str, Any]] = []
+        for path, index in self.indexes.items():
+            display = self._display(path, root)
+            defined = set(index.assignments) | set(index.guarded) | self.environment
+            for sourced in self._sourced(path):
+                defined |= set(sourced.assignments) | set(sourced.functions)
+            for name, lines in sorted(index.references.items(), key=lambda item: item[1][0]):
+                if name in defined:
+                    continue
+                elsewhere = [p for p in producers.get(name, []) if not p.startswith(f"{display}:")]
+                hint = (f" (정의 위치: {', '.join(elsewhere)} — source 하거나 export 한 뒤 실행하세요)"
+                        if elsewhere else "")
+                issues.append({"path": display, "line": lines[0], "severity": "error", "check": "undefined-variable",
+                               "message": f"${name} 이(가) 이 스크립트에서 정의되지 않았습니다{hint}"})
+            for name, lines in index.functions.items():
+                if len(lines) > 1:
+                    issues.append({"path": display, "line": lines[1], "severity": "warning",
+                                   "check": "duplicate-function",
+                                   "message": f"함수 {name} 이(가) {lines[0]}행에 이미 정의되어 있습니다"})
+            errexit = any(opt in ("errexit",) or (opt.startswith("-") and not opt.startswith("--") and "e" in opt)
+                          for opt in index.options)
+            if index.cloud_commands and not errexit:
+                issues.append({"path": display, "line": index.cloud_commands[0]["line"], "severity": "warning",
+                               "check": "missing-errexit",
+                               "message": "클라우드 명령을 실행하지만 set -e 가 없어 실패해도 계속 진행합니다"})
+        return sorted(issues, key=lambda issue: (issue["path"], issue["line"]))
+
+    def cloud_summary(self) -> Dict[str, int]:
+        """도구 / 서비스별 클라우드 명령 호출 수"""
+        summary: Dict[str, int] = {}
+        for index in self.indexes.values():
+            for command in index.cloud_commands:
+                key = f"{command['tool']} {command['service']}"
+                summary[key] = summary.get(key, 0) + 1
+        return dict(sorted(summary.items()))
+
+
+def _default_root() -> Path:
+    here = Path(__file__).resolve().parent
+    for candidate in (here.parent / "automation", here.parent.parent / "automation"):
+        if candidate.is_dir():
+            return candidate
+    return here.parent / "automation"
+
+
+def main():
+    """명령행: python script_analyzer.py [경로 ...] [--summary] [--json] [--env NAME,...]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="실습 셸 스크립트 정적 분석")
+    parser.add_argument("paths", nargs="*", help="스크립트 또는 디렉터리 (기본값: automation/)")
+    parser.add_argument("--env", default="", help="실행 환경이 제공하는 변수 이름 (쉼표 구분)")
+    parser.add_argument("--summary", action="store_true", help="스크립트별 'PASS|FAIL 경로' 한 줄씩 출력")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    parser.add_argument("--strict", action="store_true", help="경고도 실패로 처리")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    paths = [Path(p) for p in args.paths] or [_default_root()]
+    root = paths[0] if len(paths) == 1 and paths[0].is_dir() else None
+    analyzer = ScriptAnalyzer(environment=[name.strip() for name in args.env.split(",") if name.strip()])
+    analyzer.load(paths)
+    issues = analyzer.analyze(root)
+    failing = [i for i in issues if i["severity"] == "error" or args.strict]
+
+    if args.json:
+        print(json.dumps({"issues": issues, "cloud_commands": analyzer.cloud_summary(),
+                          "scripts": len(analyzer.indexes), "tokenized": analyzer.tokenized},
+                         ensure_ascii=False, indent=2))
+    elif args.summary:
+        failed_paths = {i["path"] for i in failing}
+        for path in analyzer.indexes:
+            display = analyzer._display(path, root)
+            print(f"{'FAIL' if display in failed_paths else 'PASS'} {display}")
+    else:
+        for issue in issues:
+            icon = "❌" if issue in failing else "⚠️"
+            print(f"{icon} {issue['path']}:{issue['line']} [{issue['check']}] {issue['message']}")
+        print(f"스크립트 {len(analyzer.indexes)}개 (새로 토큰화 {analyzer.tokenized}개), "
+              f"오류 {sum(1 for i in issues if i['severity'] == 'error')}개, "
+              f"경고 {sum(1 for i in issues if i['severity'] == 'warning')}개")
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
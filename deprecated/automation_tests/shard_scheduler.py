@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+대규모 기수용 리전 / 계정 샤딩 스케줄러
+학습자 환경을 설정된 여러 (계정, 리전) 샤드에 나누어 배치하고 배치 기록을 남깁니다.
+
+- 주요 기능:
+  - 남은 수용량(할당 가능 학습자 수)과 현재 API 부하(진행 중 프로비저닝, 최근 스로틀링)로 샤드를 고릅니다.
+  - 배치 결과는 SQLite 에 기록되어 정리(teardown)와 인벤토리 조회가 곧바로 해당 샤드로 향합니다.
+  - 같은 학습자를 다시 배치하면 기존 샤드를 그대로 반환합니다. (멱등)
+  - 샤드 목록은 설정의 shards 항목 또는 AUTOMATION_SHARDS 환경 변수(JSON 문자열 / 파일 경로)로 지정합니다.
+
+샤드 설정 예:
+    [{"name": "apne2-main", "region": "ap-northeast-2", "profile": "class-a",
+      "max_learners": 40, "max_active": 10, "gcp_region": "asia-northeast3"},
+     {"name": "learner-acct-1", "region": "ap-northeast-2",
+      "role_arn": "arn:aws:iam::111122223333:role/CloudBasicLab"}]
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+
+from rate_limiter import THROTTLING_ERROR_CODES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path.home() / ".local" / "state" / "cloud-basic" / "placements.db"
+
+# 최근 스로틀링이 부하 점수에 미치는 영향이 절반으로 줄어드는 시간(초)
+THROTTLE_HALF_LIFE = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS placements (
+    learner TEXT PRIMARY KEY,
+    cohort TEXT,
+    shard TEXT NOT NULL,
+    region TEXT NOT NULL,
+    profile TEXT,
+    gcp_region TEXT,
+    placed_at REAL NOT NULL,
+    released_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_placements_shard ON placements(shard, released_at);
+CREATE INDEX IF NOT EXISTS idx_placements_cohort ON placements(cohort, shard);
+"""
+
+
+class NoShardCapacityError(RuntimeError):
+    """모든 샤드의 수용량이 소진됨"""
+
+
+class Shard:
+    """(계정, 리전) 샤드 하나와 현재 부하 상태"""
+
+    __slots__ = ("name", "region", "profile", "role_arn", "gcp_region", "max_learners", "max_active",
+                 "assigned", "active", "_throttle_score", "_throttle_at")
+
+    def __init__(self, name: str, region: str, profile: Optional[str] = None,
+                 gcp_region: Optional[str] = None, max_learners: int = 50, max_active: int = 10,
+                 role_arn: Optional[str] = None):
+        self.name = name
+        self.region = region
+        self.profile = profile
+        self.role_arn = role_arn
+        self.gcp_region = gcp_region
+        self.max_learners = max_learners
+        self.max_active = max(1, max_active)
+        self.assigned = 0
+        self.active = 0
+        self._throttle_score = 0.0
+        self._throttle_at = time.monotonic()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Shard":
+        return cls(name=data.get("name") or f"{data.get('profile') or 'default'}/{data['region']}",
+                   region=data["region"], profile=data.get("profile"),
+                   gcp_region=data.get("gcp_region"),
+                   max_learners=int(data.get("max_learners", 50)),
+                   max_active=int(data.get("max_active", 10)),
+                   role_arn=data.get("role_arn"))
+
+    @property
+    def headroom(self) -> int:
+        return max(0, self.max_learners - self.assigned)
+
+    def throttle_score(self, now: Optional[float] = None) -> float:
+        """지수 감쇠하는 최근 스로틀링 점수"""
+        now = time.monotonic() if now is None else now
+        return self._throttle_score * 0.5 ** ((now - self._throttle_at) / THROTTLE_HALF_LIFE)
+
+    def record_throttle(self):
+        now = time.monotonic()
+        self._throttle_score = self.throttle_score(now) + 1.0
+        self._throttle_at = now
+
+    def pressure(self) -> float:
+        """API 부하 점수 (0 이면 여유)"""
+        return self.active / self.max_active + self.throttle_score()
+
+    def score(self) -> float:
+        """배치 우선순위 (남은 수용 비율이 높고 부하가 낮을수록 큼)"""
+        if self.headroom <= 0:
+            return 0.0
+        return (self.headroom / self.max_learners) / (1.0 + self.pressure())
+
+    def config_overrides(self) -> Dict[str, Any]:
+        """BasicCourseAutomation 설정에 덮어쓸 값"""
+        overrides = {"aws_region": self.region, "aws_profile": self.profile, "shard": self.name}
+        if self.role_arn:
+            overrides["aws_role_arn"] = self.role_arn
+        if self.gcp_region:
+            overrides["gcp_region"] = self.gcp_region
+            overrides["gcp_zone"] = f"{self.gcp_region}-a"
+        return overrides
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "region": self.region, "profile": self.profile, "role_arn": self.role_arn,
+                "gcp_region": self.gcp_region, "max_learners": self.max_learners,
+                "max_active": self.max_active, "assigned": self.assigned, "active": self.active,
+                "pressure": round(self.pressure(), 3)}
+
+
+class PlacementStore:
+    """학습자 → 샤드 배치 기록 (SQLite, 스레드 간 공유 가능)"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or os.getenv("AUTOMATION_PLACEMENT_DB", DEFAULT_DB_PATH))
+        self._lock = threading.Lock()
+        if str(self.db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, learner: str, cohort: Optional[str], shard: Shard):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO placements "
+                "(learner, cohort, shard, region, profile, gcp_region, placed_at, released_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+                (learner, cohort, shard.name, shard.region, shard.profile, shard.gcp_region, time.time()))
+            self._conn.commit()
+
+    def release(self, learner: str):
+        with self._lock:
+            self._conn.execute("UPDATE placements SET released_at = ? WHERE learner = ?",
+                               (time.time(), learner))
+            self._conn.commit()
+
+    def get(self, learner: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM placements WHERE learner = ? AND released_at IS NULL",
+                (learner,)).fetchone()
+        return dict(row) if row else None
+
+    def active_counts(self) -> Dict[str, int]:
+        """샤드별 해제되지 않은 배치 수"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT shard, COUNT(*) AS n FROM placements WHERE released_at IS NULL GROUP BY shard"
+            ).fetchall()
+        return {row["shard"]: row["n"] for row in rows}
+
+    def list(self, cohort: Optional[str] = None, shard: Optional[str] = None,
+             include_released: bool = False) -> List[Dict[str, Any]]:
+        where, params = [], []
+        if cohort:
+            where.append("cohort = ?")
+            params.append(cohort)
+        if shard:
+            where.append("shard = ?")
+            params.append(shard)
+        if not include_released:
+            where.append("released_at IS NULL")
+        sql = "SELECT * FROM placements"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY shard, learner"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, tuple(params)).fetchall()]
+
+
+class ShardScheduler:
+    """남은 수용량과 API 부하를 기준으로 학습자를 샤드에 배치"""
+
+    def __init__(self, shards: List[Shard], store: Optional[PlacementStore] = None,
+                 registry: Any = None):
+        """
+        ShardScheduler 초기화
+
+        Args:
+            shards: 샤드 목록
+            store: 배치 기록 저장소
+            registry: ClientRegistry (샤드별 클라이언트 조회 시 사용)
+        """
+        if not shards:
+            raise ValueError("샤드가 하나 이상 필요합니다")
+        self.shards = {shard.name: shard for shard in shards}
+        self.store = store or PlacementStore()
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._hooked_clients = set()
+        for name, count in self.store.active_counts().items():
+            if name in self.shards:
+                self.shards[name].assigned = count
+
+    def place(self, learner: str, cohort: Optional[str] = None) -> Shard:
+        """
+        학습자 배치 (이미 배치된 학습자는 기존 샤드 반환)
+
+        Raises:
+            NoShardCapacityError: 모든 샤드의 수용량이 소진된 경우
+        """
+        with self._lock:
+            existing = self.store.get(learner)
+            if existing and existing["shard"] in self.shards:
+                return self.shards[existing["shard"]]
+
+            candidates = [shard for shard in self.shards.values() if shard.headroom > 0]
+            if not candidates:
+                raise NoShardCapacityError(f"배치 가능한 샤드가 없습니다 (학습자 {learner})")
+            shard = max(candidates, key=lambda s: (s.score(), s.headroom, s.name))
+            shard.assigned += 1
+            self.store.record(learner, cohort, shard)
+        logger.info(f"📍 {learner} → {shard.name} ({shard.region})")
+        return shard
+
+    def shard_for(self, learner: str) -> Optional[Shard]:
+        """배치 기록으로 학습자의 샤드 조회 (정리 / 인벤토리용)"""
+        placement = self.store.get(learner)
+        return self.shards.get(placement["shard"]) if placement else None
+
+    def release(self, learner: str):
+        """정리 완료 후 배치 해제"""
+        with self._lock:
+            placement = self.store.get(learner)
+            if placement is None:
+                return
+            self.store.release(learner)
+            shard = self.shards.get(placement["shard"])
+            if shard is not None:
+                shard.assigned = max(0, shard.assigned - 1)
+
+    def set_capacity(self, shard_name: str, max_learners: int):
+        """샤드 수용량 갱신 (할당량 조회 결과 반영)"""
+        with self._lock:
+            self.shards[shard_name].max_learners = max_learners
+
+    @contextmanager
+    def provisioning(self, shard: Shard) -> Iterator[Shard]:
+        """프로비저닝 진행 중인 동안 샤드 부하에 반영"""
+        with self._lock:
+            shard.active += 1
+        try:
+            yield shard
+        finally:
+            with self._lock:
+                shard.active -= 1
+
+    def client(self, shard: Shard, service_name: str) -> Any:
+        """샤드 계정 / 리전의 공유 클라이언트 (스로틀링 응답을 샤드 부하에 반영)"""
+        client = self.registry.get_client(service_name, shard.region, shard.profile, role_arn=shard.role_arn)
+        key = id(client)
+        if key not in self._hooked_clients:
+            with self._lock:
+                if key not in self._hooked_clients:
+                    client.meta.events.register("needs-retry", self._throttle_hook(shard))
+                    self._hooked_clients.add(key)
+        return client
+
+    @staticmethod
+    def _throttle_hook(shard: Shard):
+        def on_needs_retry(response=None, **kwargs):
+            if response is None:
+                return
+            _, parsed = response
+            code = parsed.get("Error", {}).get("Code") if isinstance(parsed, dict) else None
+            if code in THROTTLING_ERROR_CODES:
+                shard.record_throttle()
+        return on_needs_retry
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [shard.to_dict() for shard in self.shards.values()]
+
+
+def load_shard_config(config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """설정의 shards 항목 또는 AUTOMATION_SHARDS 환경 변수(JSON / 파일 경로)에서 샤드 설정 읽기"""
+    if config and config.get("shards"):
+        return list(config["shards"])
+    raw = os.getenv("AUTOMATION_SHARDS", "").strip()
+    if not raw:
+        return []
+    if not raw.startswith("["):
+        raw = Path(raw).read_text(encoding="utf-8")
+    return json.loads(raw)
+
+
+_scheduler: Optional[ShardScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_shard_scheduler(config: Optional[Dict[str, Any]] = None,
+                        registry: Any = None) -> Optional[ShardScheduler]:
+    """프로세스 공용 스케줄러 조회 (샤드 설정이 없으면 None)"""
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+    shard_config = load_shard_config(config)
+    if not shard_config:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ShardScheduler([Shard.from_dict(s) for s in shard_config], registry=registry)
+    return _scheduler
+
+
+def main():
+    """명령행 조회: python shard_scheduler.py [--cohort 2024-07] [--shard apne2-main]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="학습자 샤드 배치 조회")
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--cohort", default=None)
+    parser.add_argument("--shard", default=None)
+    parser.add_argument("--all", action="store_true", help="해제된 배치 포함")
+    args = parser.parse_args()
+
+    store = PlacementStore(Path(args.db) if args.db else None)
+    placements = store.list(args.cohort, args.shard, include_released=args.all)
+    by_shard: Dict[str, List[Dict[str, Any]]] = {}
+    for placement in placements:
+        by_shard.setdefault(placement["shard"], []).append(placement)
+    for shard, items in by_shard.items():
+        print(f"{shard} ({items[0]['region']}, {items[0]['profile'] or 'default'}): {len(items)}명")
+        for item in items:
+            print(f"  {item['learner']}{' (해제)' if item['released_at'] else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+오브젝트 스토리지 처리량 벤치마크
+S3 / GCS 호환 엔드포인트의 업로드·다운로드 처리량과 지연 시간 백분위수를 측정합니다.
+
+- 교재 연계성:
+  - Cloud Basic 1일차: 스토리지 서비스 기초 (storage_services.sh)
+- 주요 기능:
+  - 객체 크기 × 동시성 × 멀티파트 청크 크기 조합을 순회하며 측정합니다.
+  - 기본값은 로컬 대체 서버(storage_standin)를 띄워 오프라인으로 실행합니다.
+  - --s3-endpoint / --gcs-endpoint 로 실제 또는 호환 엔드포인트를 지정할 수 있습니다.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import math
+import logging
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, quote
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from storage_standin import StorageStandinServer
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+DEFAULT_OBJECT_SIZES = [64 * 1024, 1 * MB, 16 * MB]
+DEFAULT_CONCURRENCY = [1, 8, 32]
+DEFAULT_CHUNK_SIZES = [5 * MB, 8 * MB]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """선형 보간 백분위수 (values 가 비어 있으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class _NullWriter:
+    """다운로드 데이터를 버리는 쓰기 객체"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return len(data)
+
+
+class S3Target:
+    """S3 호환 엔드포인트 측정 대상"""
+
+    name = "s3"
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: str = "us-east-1"):
+        self.bucket = bucket
+        self.region = region
+        self.client = boto3.client(
+            "s3", endpoint_url=endpoint_url, region_name=region,
+            aws_access_key_id="standin" if endpoint_url else None,
+            aws_secret_access_key="standin" if endpoint_url else None,
+            config=Config(max_pool_connections=128, s3={"addressing_style": "path"}),
+        )
+
+    def prepare(self):
+        params: Dict[str, Any] = {"Bucket": self.bucket}
+        # us-east-1 이외 리전은 LocationConstraint 가 없으면 IllegalLocationConstraintException
+        if self.region != "us-east-1":
+            params["CreateBucketConfiguration"] = {"LocationConstraint": self.region}
+        try:
+            self.client.create_bucket(**params)
+        except ClientError as e:
+            # 이전 실행에서 만든 버킷은 그대로 재사용
+            if e.response["Error"]["Code"] != "BucketAlreadyOwnedByYou":
+                raise
+
+    def upload(self, key: str, data: bytes, chunk_size: int):
+        config = TransferConfig(multipart_threshold=chunk_size, multipart_chunksize=chunk_size,
+                                max_concurrency=1, use_threads=False)
+        self.client.upload_fileobj(io.BytesIO(data), self.bucket, key, Config=config)
+
+    def download(self, key: str, chunk_size: int) -> int:
+        config = TransferConfig(multipart_threshold=chunk_size, multipart_chunksize=chunk_size,
+                                max_concurrency=1, use_threads=False)
+        writer = _NullWriter()
+        self.client.download_fileobj(self.bucket, key, writer, Config=config)
+        return writer.size
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+class GcsTarget:
+    """GCS JSON API 호환 엔드포인트 측정 대상 (http.client 직접 사용)"""
+
+    name = "gcs"
+
+    def __init__(self, bucket: str, endpoint_url: str, project: str, token: Optional[str] = None):
+        self.bucket = bucket
+        self.project = project
+        parts = urlsplit(endpoint_url)
+        self.scheme, self.netloc = parts.scheme, parts.netloc
+        self.token = token
+
+    def _connection(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.netloc, timeout=120)
+
+    def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        headers = dict(extra or {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _request(self, conn, method: str, path: str, body: bytes = b"",
+                 headers: Optional[Dict[str, str]] = None,
+                 allowed: Tuple[int, ...] = ()) -> http.client.HTTPResponse:
+        conn.request(method, path, body=body, headers=self._headers(headers))
+        response = conn.getresponse()
+        if response.status >= 400 and response.status not in allowed:
+            raise RuntimeError(f"GCS {method} {path} 실패: {response.status} {response.read()[:200]!r}")
+        return response
+
+    def prepare(self):
+        conn = self._connection()
+        try:
+            body = json.dumps({"name": self.bucket}).encode()
+            # 409: 이전 실행에서 만든 버킷은 그대로 재사용
+            self._request(conn, "POST", f"/storage/v1/b?project={quote(self.project, safe='')}", body,
+                          {"Content-Type": "application/json"}, allowed=(409,)).read()
+        finally:
+            conn.close()
+
+    def upload(self, key: str, data: bytes, chunk_size: int):
+        conn = self._connection()
+        base = f"/upload/storage/v1/b/{quote(self.bucket)}/o"
+        try:
+            if len(data) < chunk_size:
+                path = f"{base}?uploadType=media&name={quote(key, safe='')}"
+                self._request(conn, "POST", path, data,
+                              {"Content-Type": "application/octet-stream"}).read()
+                return
+            path = f"{base}?uploadType=resumable&name={quote(key, safe='')}"
+            response = self._request(conn, "POST", path, b"", {"Content-Length": "0"})
+            response.read()
+            session = urlsplit(response.getheader("Location"))
+            session_path = f"{session.path}?{session.query}"
+            for offset in range(0, len(data), chunk_size):
+                chunk = data[offset:offset + chunk_size]
+                content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{len(data)}"
+                conn.request("PUT", session_path, body=chunk,
+                             headers=self._headers({"Content-Range": content_range}))
+                chunk_response = conn.getresponse()
+                chunk_response.read()
+                if chunk_response.status not in (200, 201, 308):
+                    raise RuntimeError(f"GCS 재개 가능 업로드 실패: {chunk_response.status}")
+        finally:
+            conn.close()
+
+    def download(self, key: str, chunk_size: int) -> int:
+        conn = self._connection()
+        try:
+            path = f"/storage/v1/b/{quote(self.bucket)}/o/{quote(key, safe='')}?alt=media"
+            response = self._request(conn, "GET", path)
+            size = 0
+            while True:
+                block = response.read(chunk_size)
+                if not block:
+                    return size
+                size += len(block)
+        finally:
+            conn.close()
+
+    def delete(self, key: str):
+        conn = self._connection()
+        try:
+            path = f"/storage/v1/b/{quote(self.bucket)}/o/{quote(key, safe='')}"
+            self._request(conn, "DELETE", path, allowed=(404,)).read()
+        finally:
+            conn.close()
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_case(target: Any, object_size: int, concurrency: int, chunk_size: int,
+             objects_per_worker: int = 4) -> Dict[str, Any]:
+    """
+    한 가지 조합(객체 크기, 동시성, 청크 크기) 측정
+
+    Returns:
+        업로드/다운로드 처리량(MB/s)과 지연 시간 백분위수(ms)
+    """
+    data = os.urandom(object_size)
+    count = concurrency * objects_per_worker
+    keys = [f"bench/{object_size}-{concurrency}-{chunk_size}/{i}" for i in range(count)]
+    result: Dict[str, Any] = {"provider": target.name, "object_size": object_size,
+                              "concurrency": concurrency, "chunk_size": chunk_size, "objects": count}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            for phase, func in (("upload", lambda k: _timed(lambda: target.upload(k, data, chunk_size))),
+                                ("download", lambda k: _timed(lambda: target.download(k, chunk_size)))):
+                start = time.perf_counter()
+                latencies = list(executor.map(func, keys))
+                elapsed = time.perf_counter() - start
+                result[phase] = {
+                    "throughput_mb_s": round(object_size * count / MB / elapsed, 2),
+                    "ops_per_s": round(count / elapsed, 2),
+                    "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                    "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                    "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                }
+        finally:
+            # 측정용 객체는 실패 여부와 관계없이 정리 (실제 버킷에 과금 객체를 남기지 않음)
+            list(executor.map(target.delete, keys))
+    return result
+
+
+def run_benchmark(targets: List[Any], object_sizes: List[int], concurrency: List[int],
+                  chunk_sizes: List[int], objects_per_worker: int = 4) -> List[Dict[str, Any]]:
+    """모든 조합 순회 측정"""
+    results = []
+    for target in targets:
+        target.prepare()
+        for object_size in object_sizes:
+            for workers in concurrency:
+                # 청크 크기는 객체보다 작은 경우에만 의미가 있으므로 나머지는 한 번만 측정
+                sizes = [c for c in chunk_sizes if c < object_size] or [max(chunk_sizes)]
+                for chunk_size in sizes:
+                    case = run_case(target, object_size, workers, chunk_size, objects_per_worker)
+                    logger.info(
+                        f"📊 {target.name} size={object_size // 1024}KB c={workers} chunk={chunk_size // MB}MB "
+                        f"up={case['upload']['throughput_mb_s']}MB/s (p95 {case['upload']['p95_ms']}ms) "
+                        f"down={case['download']['throughput_mb_s']}MB/s (p95 {case['download']['p95_ms']}ms)")
+                    results.append(case)
+    return results
+
+
+def print_table(results: List[Dict[str, Any]]):
+    """결과 표 출력"""
+    print("\n" + "=" * 96)
+    print(f"{'대상':<5} {'크기':>9} {'동시성':>6} {'청크':>6} | "
+          f"{'업로드 MB/s':>11} {'p50':>8} {'p95':>8} | {'다운로드 MB/s':>13} {'p50':>8} {'p95':>8}")
+    print("=" * 96)
+    for r in results:
+        up, down = r["upload"], r["download"]
+        print(f"{r['provider']:<5} {r['object_size'] // 1024:>7}KB {r['concurrency']:>6} "
+              f"{r['chunk_size'] // MB:>4}MB | {up['throughput_mb_s']:>11} {up['p50_ms']:>8} "
+              f"{up['p95_ms']:>8} | {down['throughput_mb_s']:>13} {down['p50_ms']:>8} {down['p95_ms']:>8}")
+    print("=" * 96)
+
+
+def _parse_sizes(text: str) -> List[int]:
+    """'64K,1M,16M' 형식 크기 목록 파싱"""
+    units = {"K": 1024, "M": MB, "G": 1024 * MB}
+    sizes = []
+    for item in text.split(","):
+        item = item.strip().upper()
+        sizes.append(int(float(item[:-1]) * units[item[-1]]) if item[-1] in units else int(item))
+    return sizes
+
+
+def main():
+    """명령행 실행"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="오브젝트 스토리지 처리량 벤치마크")
+    parser.add_argument("--providers", default="s3,gcs", help="측정 대상 (s3,gcs)")
+    parser.add_argument("--sizes", default="64K,1M,16M", help="객체 크기 목록")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시성 목록")
+    parser.add_argument("--chunk-sizes", default="5M,8M", help="멀티파트 청크 크기 목록")
+    parser.add_argument("--objects-per-worker", type=int, default=4)
+    parser.add_argument("--s3-endpoint", help="S3 호환 엔드포인트 (미지정 시 로컬 대체 서버)")
+    parser.add_argument("--gcs-endpoint", help="GCS 호환 엔드포인트 (미지정 시 로컬 대체 서버)")
+    parser.add_argument("--gcs-token", default=os.getenv("GCS_ACCESS_TOKEN"))
+    parser.add_argument("--gcs-project", default=os.getenv("GCP_PROJECT_ID", "standin"),
+                        help="GCS 버킷을 만들 프로젝트 ID")
+    parser.add_argument("--s3-region", default=os.getenv("AWS_REGION", "us-east-1"),
+                        help="S3 버킷 리전 (로컬 대체 서버도 같은 리전으로 동작)")
+    parser.add_argument("--bucket", default="cloud-basic-bench")
+    parser.add_argument("--latency", type=float, default=0.0, help="대체 서버 요청 지연(초)")
+    parser.add_argument("--output", default="storage_benchmark_results.json")
+    args = parser.parse_args()
+
+    providers = [p.strip() for p in args.providers.split(",") if p.strip()]
+    server = None
+    if ("s3" in providers and not args.s3_endpoint) or ("gcs" in providers and not args.gcs_endpoint):
+        server = StorageStandinServer(latency=args.latency, region=args.s3_region).start()
+
+    targets = []
+    if "s3" in providers:
+        targets.append(S3Target(args.bucket, args.s3_endpoint or server.endpoint_url, args.s3_region))
+    if "gcs" in providers:
+        targets.append(GcsTarget(args.bucket, args.gcs_endpoint or server.endpoint_url,
+                                 args.gcs_project, args.gcs_token))
+
+    try:
+        results = run_benchmark(targets, _parse_sizes(args.sizes),
+                                [int(c) for c in args.concurrency.split(",")],
+                                _parse_sizes(args.chunk_sizes), args.objects_per_worker)
+    finally:
+        if server is not None:
+            server.stop()
+
+    print_table(results)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results},
+                  f, ensure_ascii=False, indent=2)
+    print(f"결과가 {args.output}에 저장되었습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+로컬 S3 / GCS 호환 대체 서버
+네트워크 없이 스토리지 업로드·다운로드 동작을 재현하기 위한 인메모리 HTTP 서버입니다.
+
+- 주요 기능:
+  - S3 경로 방식 API: 버킷 생성/삭제, PutObject, 멀티파트 업로드, GetObject(Range), HeadObject,
+    DeleteObject, ListObjectsV2
+  - GCS JSON API: 버킷 생성/삭제, 단순/멀티파트/재개 가능 업로드, alt=media 다운로드, 객체 메타데이터/목록, 삭제
+  - 요청마다 지연 시간을 주입하여 실제 클라우드 응답 시간을 흉내낼 수 있습니다.
+- 서명/인증은 검사하지 않습니다. 벤치마크와 테스트 용도로만 사용하세요.
+"""
+
+import re
+import json
+import time
+import uuid
+import base64
+import hashlib
+import random
+import threading
+import logging
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote, quote
+from typing import Dict, Any, Optional, Tuple
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+S3_NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class StandinStore:
+    """버킷/객체/진행 중 업로드를 보관하는 인메모리 저장소"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.multipart: Dict[str, Dict[str, Any]] = {}
+        self.resumable: Dict[str, Dict[str, Any]] = {}
+        self.request_count = 0
+
+    def put(self, bucket: str, key: str, data: bytes, etag: Optional[str] = None) -> Dict[str, Any]:
+        obj = {
+            "data": data,
+            "etag": etag or hashlib.md5(data).hexdigest(),
+            "md5_b64": base64.b64encode(hashlib.md5(data).digest()).decode("ascii"),
+            "updated": time.time(),
+        }
+        with self.lock:
+            self.buckets.setdefault(bucket, {})[key] = obj
+        return obj
+
+    def get(self, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self.buckets.get(bucket, {}).get(key)
+
+    def delete(self, bucket: str, key: str) -> bool:
+        with self.lock:
+            return self.buckets.get(bucket, {}).pop(key, None) is not None
+
+    def list(self, bucket: str, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            objects = self.buckets.get(bucket, {})
+            return {k: v for k, v in sorted(objects.items()) if k.startswith(prefix)}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """S3 / GCS 요청 처리기"""
+
+    protocol_version = "HTTP/1.1"
+    server: "StorageStandinServer"
+
+    def log_message(self, format, *args):
+        logger.debug("standin: " + format, *args)
+
+    # ---- 공통 ----
+
+    def _inject_latency(self):
+        latency, jitter = self.server.latency, self.server.jitter
+        if latency or jitter:
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+        with self.server.store.lock:
+            self.server.store.request_count += 1
+
+    def _read_body(self) -> bytes:
+        if "chunked" in self.headers.get("Transfer-Encoding", ""):
+            body = self._read_chunked()
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        if "aws-chunked" in self.headers.get("Content-Encoding", "") or \
+                self.headers.get("x-amz-content-sha256", "").startswith("STREAMING-"):
+            body = self._decode_aws_chunked(body)
+        return body
+
+    def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while self.rfile.readline().strip():
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    @staticmethod
+    def _decode_aws_chunked(body: bytes) -> bytes:
+        """aws-chunked 인코딩(체크섬 트레일러 포함) 본문 복원"""
+        out, pos = [], 0
+        while pos < len(body):
+            line_end = body.index(b"\r\n", pos)
+            size = int(body[pos:line_end].split(b";")[0], 16)
+            pos = line_end + 2
+            if size == 0:
+                break
+            out.append(body[pos:pos + size])
+            pos += size + 2
+        return b"".join(out)
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None,
+              content_type: str = "application/xml"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self._send(status, json.dumps(payload).encode("utf-8"), headers, "application/json")
+
+    def _route(self):
+        self._inject_latency()
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        path = parts.path
+        try:
+            if path.startswith("/upload/storage/v1/") or path.startswith("/storage/v1/"):
+                self._handle_gcs(path, query)
+            else:
+                self._handle_s3(path, query)
+        except (ValueError, KeyError) as e:
+            self._send(400, f"<Error><Code>BadRequest</Code><Message>{escape(str(e))}</Message></Error>".encode())
+
+    do_GET = do_PUT = do_POST = do_DELETE = do_HEAD = _route
+
+    # ---- S3 ----
+
+    def _s3_object_headers(self, obj: Dict[str, Any]) -> Dict[str, str]:
+        return {"ETag": f'"{obj["etag"]}"', "Accept-Ranges": "bytes",
+                "Last-Modified": time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(obj["updated"]))}
+
+    def _handle_s3(self, path: str, query: Dict[str, str]):
+        store = self.server.store
+        segments = path.lstrip("/").split("/", 1)
+        bucket = unquote(segments[0])
+        key = unquote(segments[1]) if len(segments) > 1 else ""
+        method = self.command
+
+        if not key:
+            if method == "PUT":
+                return self._s3_create_bucket(bucket)
+            if method == "DELETE":
+                return self._s3_delete_bucket(bucket)
+            if method == "GET":
+                return self._s3_list(bucket, query)
+            if method == "HEAD":
+                return self._send(200 if bucket in store.buckets else 404)
+            return self._send(405)
+
+        if method == "POST" and "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            with store.lock:
+                store.multipart[upload_id] = {"bucket": bucket, "key": key, "parts": {}}
+            body = (f'<InitiateMultipartUploadResult xmlns="{S3_NS}"><Bucket>{escape(bucket)}</Bucket>'
+                    f'<Key>{escape(key)}</Key><UploadId>{upload_id}</UploadId>'
+                    f'</InitiateMultipartUploadResult>')
+            return self._send(200, body.encode())
+
+        if method == "PUT" and "uploadId" in query:
+            data = self._read_body()
+            upload = store.multipart[query["uploadId"]]
+            etag = hashlib.md5(data).hexdigest()
+            with store.lock:
+                upload["parts"][int(query["partNumber"])] = (data, etag)
+            return self._send(200, headers={"ETag": f'"{etag}"'})
+
+        if method == "POST" and "uploadId" in query:
+            self._read_body()
+            with store.lock:
+                upload = store.multipart.pop(query["uploadId"])
+            parts = [upload["parts"][n] for n in sorted(upload["parts"])]
+            digest = hashlib.md5(b"".join(bytes.fromhex(etag) for _, etag in parts)).hexdigest()
+            obj = store.put(bucket, key, b"".join(data for data, _ in parts), f"{digest}-{len(parts)}")
+            body = (f'<CompleteMultipartUploadResult xmlns="{S3_NS}"><Bucket>{escape(bucket)}</Bucket>'
+                    f'<Key>{escape(key)}</Key><ETag>"{obj["etag"]}"</ETag>'
+                    f'</CompleteMultipartUploadResult>')
+            return self._send(200, body.encode())
+
+        if method == "DELETE" and "uploadId" in query:
+            with store.lock:
+                store.multipart.pop(query["uploadId"], None)
+            return self._send(204)
+
+        if method == "PUT":
+            obj = store.put(bucket, key, self._read_body())
+            return self._send(200, headers={"ETag": f'"{obj["etag"]}"'})
+
+        if method == "DELETE":
+            store.delete(bucket, key)
+            return self._send(204)
+
+        obj = store.get(bucket, key)
+        if obj is None:
+            body = f"<Error><Code>NoSuchKey</Code><Key>{escape(key)}</Key></Error>".encode()
+            return self._send(404, body)
+
+        data, status, headers = obj["data"], 200, self._s3_object_headers(obj)
+        match = re.match(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start, end = self._parse_range(match, len(data))
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            data, status = data[start:end + 1], 206
+        if method == "HEAD":
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return None
+        return self._send(status, data, headers, "application/octet-stream")
+
+    def _s3_error(self, status: int, code: str, message: str):
+        body = f"<Error><Code>{code}</Code><Message>{escape(message)}</Message></Error>"
+        self._send(status, body.encode())
+
+    def _s3_create_bucket(self, bucket: str):
+        """CreateBucket: 서버 리전과 LocationConstraint 가 맞아야 하고, 재생성은 리전에 따라 처리"""
+        store = self.server.store
+        match = re.search(rb"<LocationConstraint>([^<]*)</LocationConstraint>", self._read_body())
+        location = match.group(1).decode() if match and match.group(1) else "us-east-1"
+        if location != self.server.region:
+            return self._s3_error(400, "IllegalLocationConstraintException",
+                                  f"The {location} location constraint is incompatible "
+                                  f"for the region specific endpoint this request was sent to.")
+        with store.lock:
+            exists = bucket in store.buckets
+            store.buckets.setdefault(bucket, {})
+        # us-east-1 은 소유자의 재생성 요청을 성공으로 응답하고, 다른 리전은 409 를 반환
+        if exists and self.server.region != "us-east-1":
+            return self._s3_error(409, "BucketAlreadyOwnedByYou",
+                                  "Your previous request to create the named bucket succeeded and you already own it.")
+        return self._send(200, headers={"Location": f"/{bucket}"})
+
+    def _s3_delete_bucket(self, bucket: str):
+        store = self.server.store
+        with store.lock:
+            if bucket not in store.buckets:
+                objects = None
+            else:
+                objects = store.buckets[bucket]
+                if not objects:
+                    del store.buckets[bucket]
+        if objects is None:
+            return self._s3_error(404, "NoSuchBucket", "The specified bucket does not exist")
+        if objects:
+            return self._s3_error(409, "BucketNotEmpty", "The bucket you tried to delete is not empty")
+        return self._send(204)
+
+    @staticmethod
+    def _parse_range(match, size: int) -> Tuple[int, int]:
+        start_s, end_s = match.groups()
+        if start_s == "":
+            return max(0, size - int(end_s)), size - 1
+        return int(start_s), min(size - 1, int(end_s)) if end_s else size - 1
+
+    def _s3_list(self, bucket: str, query: Dict[str, str]):
+        objects = self.server.store.list(bucket, query.get("prefix", ""))
+        contents = "".join(
+            f"<Contents><Key>{escape(k)}</Key><ETag>\"{v['etag']}\"</ETag><Size>{len(v['data'])}</Size>"
+            f"<LastModified>{time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(v['updated']))}"
+            f"</LastModified><StorageClass>STANDARD</StorageClass></Contents>"
+            for k, v in objects.items())
+        body = (f'<ListBucketResult xmlns="{S3_NS}"><Name>{escape(bucket)}</Name>'
+                f'<Prefix>{escape(query.get("prefix", ""))}</Prefix><KeyCount>{len(objects)}</KeyCount>'
+                f'<MaxKeys>1000</MaxKeys><IsTruncated>false</IsTruncated>{contents}</ListBucketResult>')
+        self._send(200, body.encode())
+
+    # ---- GCS ----
+
+    @staticmethod
+    def _gcs_resource(bucket: str, name: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        return {"kind": "storage#object", "bucket": bucket, "name": name,
+                "size": str(len(obj["data"])), "md5Hash": obj["md5_b64"],
+                "updated": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(obj["updated"]))}
+
+    def _handle_gcs(self, path: str, query: Dict[str, str]):
+        store = self.server.store
+        method = self.command
+        match = re.match(r"^/(upload/)?storage/v1/b(?:/([^/]+))?(?:/o(?:/(.+))?)?$", path)
+        if not match:
+            return self._send_json(404, {"error": {"code": 404, "message": "Not Found"}})
+        is_upload, bucket, name = match.group(1), match.group(2), match.group(3)
+        bucket = unquote(bucket) if bucket else None
+        name = unquote(name) if name else None
+
+        if is_upload:
+            return self._gcs_upload(bucket, query)
+
+        if bucket is None and method == "POST":
+            body = json.loads(self._read_body() or b"{}")
+            if not query.get("project"):
+                return self._send_json(400, {"error": {"code": 400, "message": "Required parameter: project"}})
+            with store.lock:
+                exists = body["name"] in store.buckets
+                store.buckets.setdefault(body["name"], {})
+            if exists:
+                return self._send_json(409, {"error": {
+                    "code": 409, "message": "Your previous request to create the named bucket succeeded "
+                                            "and you already own it."}})
+            return self._send_json(200, {"kind": "storage#bucket", "name": body["name"],
+                                         "projectNumber": query["project"]})
+
+        if name is None and method == "DELETE":
+            with store.lock:
+                objects = store.buckets.get(bucket)
+                if objects == {}:
+                    del store.buckets[bucket]
+            if objects is None:
+                return self._send_json(404, {"error": {"code": 404, "message": "Not Found"}})
+            if objects:
+                return self._send_json(409, {"error": {"code": 409,
+                                                       "message": "The bucket you tried to delete is not empty."}})
+            return self._send(204, content_type="application/json")
+
+        if name is None:
+            objects = store.list(bucket, query.get("prefix", ""))
+            items = [self._gcs_resource(bucket, k, v) for k, v in objects.items()]
+            return self._send_json(200, {"kind": "storage#objects", "items": items})
+
+        if method == "DELETE":
+            found = store.delete(bucket, name)
+            return self._send(204 if found else 404, content_type="application/json")
+
+        obj = store.get(bucket, name)
+        if obj is None:
+            return self._send_json(404, {"error": {"code": 404, "message": "No such object"}})
+        if query.get("alt") == "media":
+            return self._send(200, obj["data"], content_type="application/octet-stream")
+        return self._send_json(200, self._gcs_resource(bucket, name, obj))
+
+    def _gcs_upload(self, bucket: str, query: Dict[str, str]):
+        store = self.server.store
+        upload_type = query.get("uploadType", "media")
+
+        if "upload_id" in query:
+            data = self._read_body()
+            with store.lock:
+                session = store.resumable[query["upload_id"]]
+                session["data"] += data
+            match = re.match(r"bytes (\*|\d+-\d+)/(\*|\d+)", self.headers.get("Content-Range", ""))
+            total = match.group(2) if match else str(len(session["data"]))
+            if total != "*" and len(session["data"]) >= int(total):
+                with store.lock:
+                    store.resumable.pop(query["upload_id"], None)
+                obj = store.put(session["bucket"], session["name"], session["data"])
+                return self._send_json(200, self._gcs_resource(session["bucket"], session["name"], obj))
+            return self._send(308, headers={"Range": f"bytes=0-{len(session['data']) - 1}"},
+                              content_type="text/plain")
+
+        if upload_type == "resumable":
+            body = self._read_body()
+            metadata = json.loads(body) if body else {}
+            name = query.get("name") or metadata.get("name")
+            upload_id = uuid.uuid4().hex
+            with store.lock:
+                store.resumable[upload_id] = {"bucket": bucket, "name": name, "data": b""}
+            host = self.headers.get("Host", "%s:%d" % self.server.server_address[:2])
+            location = (f"http://{host}/upload/storage/v1/b/{quote(bucket)}/o"
+                        f"?uploadType=resumable&upload_id={upload_id}")
+            return self._send(200, headers={"Location": location}, content_type="application/json")
+
+        body = self._read_body()
+        name = query.get("name")
+        if upload_type == "multipart":
+            # multipart/related: 첫 파트는 JSON 메타데이터, 둘째 파트는 객체 본문
+            message = BytesParser(policy=HTTP).parsebytes(
+                b"Content-Type: " + self.headers.get("Content-Type", "").encode("ascii") + b"\r\n\r\n" + body)
+            metadata_part, media_part = list(message.iter_parts())[:2]
+            metadata = json.loads(metadata_part.get_payload(decode=True) or b"{}")
+            name = name or metadata.get("name")
+            body = media_part.get_payload(decode=True)
+        obj = store.put(bucket, name, body)
+        return self._send_json(200, self._gcs_resource(bucket, name, obj))
+
+
+class StorageStandinServer(ThreadingHTTPServer):
+    """백그라운드 스레드에서 동작하는 S3 / GCS 대체 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, region: str = "us-east-1"):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0 이면 임의 포트)
+            latency: 요청마다 추가할 지연 시간(초)
+            jitter: 지연 시간의 무작위 변동 폭(초)
+            region: S3 엔드포인트 리전 (CreateBucket LocationConstraint 검사 기준)
+        """
+        super().__init__((host, port), StandinHandler)
+        self.store = StandinStore()
+        self.region = region
+        self.latency = latency
+        self.jitter = jitter
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StorageStandinServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="storage-standin", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 로컬 스토리지 대체 서버 시작: {self.endpoint_url}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StorageStandinServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """명령행 실행: python storage_standin.py [--port 9000] [--latency 0.02]"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="로컬 S3 / GCS 호환 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StorageStandinServer(args.host, args.port, args.latency, args.jitter)
+    logger.info(f"🧪 로컬 스토리지 대체 서버: {server.endpoint_url} (Ctrl+C 로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import copy
+
+import boto3
+import httplib2
+import pytest
+from botocore.config import Config
+from googleapiclient.discovery import build_from_document
+
+from .asset_sync import AssetSync
+from .gcp_discovery import get_document
+
+
+def _s3_client(server):
+    return boto3.client("s3", endpoint_url=server.endpoint_url, region_name="us-east-1",
+                        aws_access_key_id="standin", aws_secret_access_key="standin",
+                        config=Config(s3={"addressing_style": "path"}))
+
+
+def _storage_service(server):
+    document = copy.deepcopy(get_document("storage", "v1"))
+    document["rootUrl"] = server.endpoint_url + "/"
+    document["baseUrl"] = server.endpoint_url + "/storage/v1/"
+    return build_from_document(document, http=httplib2.Http())
+
+
+@pytest.fixture
+def assets(tmp_path):
+    root = tmp_path / "assets"
+    (root / "sub").mkdir(parents=True)
+    (root / "index.html").write_text("<h1>cloud basic</h1>")
+    (root / "sub" / "data.bin").write_bytes(bytes(range(256)) * 12)
+    return root
+
+
+@pytest.fixture
+def syncer(storage_standin, assets):
+    s3 = _s3_client(storage_standin)
+    for bucket in ("sync-s3-a", "sync-s3-b"):
+        s3.create_bucket(Bucket=bucket)
+    storage_standin.store.buckets.setdefault("sync-gcs", {})
+
+    def factory():
+        # Files of 1KB and up take the multipart / resumable path
+        return AssetSync(assets, prefix="course", max_workers=4, multipart_threshold=1024,
+                         chunk_size=256 * 1024, s3_client=s3,
+                         storage_service_factory=lambda: _storage_service(storage_standin))
+
+    yield factory
+    for bucket in ("sync-s3-a", "sync-s3-b", "sync-gcs"):
+        storage_standin.store.buckets.pop(bucket, None)
+
+
+def _sync(syncer):
+    return syncer().sync(s3_buckets=["sync-s3-a", "sync-s3-b"], gcs_buckets=["sync-gcs"])
+
+
+def test_sync_uploads_every_file_to_every_bucket(syncer, storage_standin, assets):
+    summary = _sync(syncer)
+
+    assert summary["uploaded"] == 6 and summary["skipped"] == 0 and not summary["failed"]
+    for bucket in ("sync-s3-a", "sync-s3-b", "sync-gcs"):
+        objects = storage_standin.store.buckets[bucket]
+        assert sorted(objects) == ["course/index.html", "course/sub/data.bin"]
+        assert objects["course/sub/data.bin"]["data"] == (assets / "sub" / "data.bin").read_bytes()
+
+
+def test_second_sync_skips_unchanged_files(syncer, assets):
+    _sync(syncer)
+
+    summary = _sync(syncer)
+    assert summary["uploaded"] == 0 and summary["skipped"] == 6
+
+    # Only the edited file is sent again, to every bucket
+    (assets / "index.html").write_text("<h1>cloud basic v2</h1>")
+    summary = _sync(syncer)
+    assert summary["uploaded"] == 3 and summary["skipped"] == 3
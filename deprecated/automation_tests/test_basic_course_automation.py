@@ -1,124 +1,172 @@
-import pytest
-from unittest.mock import patch, MagicMock, ANY
-from pathlib import Path
-
-from .basic_course_automation import BasicCourseAutomation
-
-@pytest.fixture
-def automation():
-    """Fixture to create a BasicCourseAutomation instance with mocked clients."""
-    with patch('boto3.client') as mock_boto_client, \
-         patch('googleapiclient.discovery.build') as mock_gcp_build:
-        
-        mock_iam = MagicMock()
-        mock_ec2 = MagicMock()
-        mock_s3 = MagicMock()
-        
-        def boto_side_effect(service_name, region_name=None):
-            if service_name == 'iam':
-                return mock_iam
-            if service_name == 'ec2':
-                mock_ec2.create_security_group.return_value = {'GroupId': 'sg-12345'}
-                mock_ec2.run_instances.return_value = {'Instances': [{'InstanceId': 'i-12345'}]}
-                return mock_ec2
-            if service_name == 's3':
-                return mock_s3
-            return MagicMock()
-
-        mock_boto_client.side_effect = boto_side_effect
-
-        mock_gcp_iam_service = MagicMock()
-        mock_gcp_compute_service = MagicMock()
-        mock_gcp_storage_service = MagicMock()
-        
-        mock_images = MagicMock()
-        mock_images.getFromFamily.return_value.execute.return_value = {'selfLink': 'dummy-image-link'}
-        mock_gcp_compute_service.images.return_value = mock_images
-
-        def gcp_side_effect(service_name, version):
-            if service_name == 'iam':
-                return mock_gcp_iam_service
-            if service_name == 'compute':
-                return mock_gcp_compute_service
-            if service_name == 'storage':
-                return mock_gcp_storage_service
-            return MagicMock()
-
-        mock_gcp_build.side_effect = gcp_side_effect
-
-        automation_instance = BasicCourseAutomation(Path('/fake/path'))
-        
-        automation_instance.mock_aws_iam = mock_iam
-        automation_instance.mock_aws_ec2 = mock_ec2
-        automation_instance.mock_aws_s3 = mock_s3
-        automation_instance.mock_gcp_iam = mock_gcp_iam_service
-        automation_instance.mock_gcp_compute = mock_gcp_compute_service
-        automation_instance.mock_gcp_storage = mock_gcp_storage_service
-        
-        yield automation_instance
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
 
 
 class TestBasicCourseAutomation:
     """Tests for the updated BasicCourseAutomation script."""
 
-    def test_day1_aws_basics(self, automation):
+    def test_day1_aws_basics(self, automation, fake_cloud):
         """Verify that AWS resources are created correctly for Day 1."""
+        prefix = automation.config['project_prefix']
         result = automation.day1_aws_basics()
         assert result is True
 
-        automation.mock_aws_iam.create_user.assert_called_once_with(
-            UserName=f"{automation.config['project_prefix']}-user"
-        )
-
-        automation.mock_aws_ec2.create_security_group.assert_called_once_with(
-            GroupName=f"{automation.config['project_prefix']}-sg",
-            Description='Allow SSH, HTTP, HTTPS'
-        )
-        automation.mock_aws_ec2.authorize_security_group_ingress.assert_called_once()
-
-        automation.mock_aws_ec2.run_instances.assert_called_once_with(
-            ImageId=automation.config['aws_ami_id'],
-            InstanceType='t2.micro',
-            MinCount=1,
-            MaxCount=1,
-            SecurityGroupIds=['sg-12345'],
-            TagSpecifications=[{'ResourceType': 'instance', 'Tags': [{'Key': 'Name', 'Value': f"{automation.config['project_prefix']}-instance"}]}]
-        )
-
-        automation.mock_aws_s3.create_bucket.assert_called_once_with(
-            Bucket=ANY,
-            CreateBucketConfiguration={'LocationConstraint': automation.config['aws_region']}
-        )
-
-    def test_day2_gcp_basics(self, automation):
+        assert fake_cloud.calls_to('iam', 'create_user') == [{'UserName': f"{prefix}-user"}]
+
+        assert fake_cloud.calls_to('ec2', 'create_security_group') == [
+            {'GroupName': f"{prefix}-sg", 'Description': 'Allow SSH, HTTP, HTTPS'}
+        ]
+        assert len(fake_cloud.calls_to('ec2', 'authorize_security_group_ingress')) == 1
+        sg_id = next(iter(fake_cloud.security_groups))
+
+        assert fake_cloud.calls_to('ec2', 'run_instances') == [{
+            'ImageId': automation.config['aws_ami_id'],
+            'InstanceType': 't2.micro',
+            'MinCount': 1,
+            'MaxCount': 1,
+            'SecurityGroupIds': [sg_id],
+            'TagSpecifications': [{'ResourceType': 'instance', 'Tags': [{'Key': 'Name', 'Value': f"{prefix}-instance"}]}]
+        }]
+
+        create_bucket = fake_cloud.calls_to('s3', 'create_bucket')
+        assert len(create_bucket) == 1
+        assert create_bucket[0]['CreateBucketConfiguration'] == {'LocationConstraint': automation.config['aws_region']}
+
+    def test_day2_gcp_basics(self, automation, fake_cloud):
         """Verify that GCP resources are created correctly for Day 2."""
-        automation.config['gcp_project_id'] = 'mock-gcp-project'
-        
+        prefix = automation.config['project_prefix']
+
         result = automation.day2_gcp_basics()
         assert result is True
 
-        automation.mock_gcp_iam.projects().serviceAccounts().create.assert_called_once_with(
-            name='projects/mock-gcp-project',
-            body={'accountId': f"{automation.config['project_prefix']}-sa", 'serviceAccount': {'displayName': 'MCP Basic Course SA'}}
-        )
+        assert f"{prefix}-sa@mock-gcp-project.iam.gserviceaccount.com" in fake_cloud.gcp['serviceAccounts']
+        assert len(fake_cloud.gcp['instances']) == 1
+        assert len(fake_cloud.gcp['buckets']) == 1
+        assert len(fake_cloud.gcp['firewalls']) == 1
+        assert [r.type for r in automation.created_resources.by_provider('gcp')] == \
+            ['gcp_service_account', 'gcp_firewall', 'gcp_bucket', 'gcp_instance']
+
+    def test_gcp_cohort_provisioning_is_batched(self, automation, fake_cloud):
+        """A cohort's GCP setup takes one batch per API plus one for VMs, regardless of learner count."""
+        prefixes = [f"learner-{n:02d}" for n in range(12)]
+
+        assert automation.provision_gcp_basics(prefixes) == {}
+
+        batches = fake_cloud.calls_to('gcp', 'batch')
+        assert len(batches) == 4
+        assert sum(len(b['methods']) for b in batches) == 1 + 4 * len(prefixes)
+        assert len(fake_cloud.gcp['instances']) == len(prefixes)
 
-        automation.mock_gcp_compute.instances().insert.assert_called_once()
+        # Re-running is idempotent: 409s count as success and nothing is duplicated
+        assert automation.provision_gcp_basics(prefixes) == {}
+        assert len(fake_cloud.gcp['instances']) == len(prefixes)
 
-        automation.mock_gcp_storage.buckets().insert.assert_called_once()
+    def test_gcp_batch_retries_only_failed_items(self, automation, fake_cloud):
+        """Retryable per-item errors resend just those items; permanent errors are reported."""
+        automation.config['gcp_batch_retries'] = 2
+        fake_cloud.inject_gcp_errors('storage.buckets.insert', 503)
+        fake_cloud.inject_gcp_errors('compute.firewalls.insert', 403)
 
-    def test_cleanup_aws_resources(self, automation):
+        # gcp_batch calls time.sleep on the shared time module
+        with patch('time.sleep'):
+            failures = automation.provision_gcp_basics(['learner-a', 'learner-b'])
+
+        assert list(failures) == ['firewall:learner-a']
+        storage_batches = [b for b in fake_cloud.calls_to('gcp', 'batch')
+                           if b['methods'] and b['methods'][0] == 'storage.buckets.insert']
+        assert [len(b['methods']) for b in storage_batches] == [2, 1]
+        assert len(fake_cloud.gcp['buckets']) == 2
+
+    def test_cleanup_aws_resources(self, automation, fake_cloud):
         """Verify that AWS cleanup logic is called."""
-        automation.created_resources["aws"] = [
-            {"type": "ec2_instance", "id": "i-12345"},
-            {"type": "security_group", "id": "sg-12345"},
-            {"type": "iam_user", "name": "test-user"},
-            {"type": "s3_bucket", "name": "test-bucket"}
-        ]
-        
+        assert automation.day1_aws_basics() is True
+        resources = {r.type: r for r in automation.created_resources.by_provider('aws')}
+        assert resources['ec2_instance'].depends_on == (resources['security_group'].id,)
+
+        automation.cleanup_resources()
+
+        assert fake_cloud.calls_to('ec2', 'terminate_instances') == [{'InstanceIds': [resources['ec2_instance'].id]}]
+        assert fake_cloud.calls_to('ec2', 'delete_security_group') == [{'GroupId': resources['security_group'].id}]
+        assert fake_cloud.calls_to('iam', 'delete_user') == [{'UserName': resources['iam_user'].name}]
+        assert fake_cloud.calls_to('s3', 'delete_bucket') == [{'Bucket': resources['s3_bucket'].name}]
+        assert fake_cloud.resource_count() == 0
+        assert len(automation.created_resources) == 0
+
+    def test_cleanup_waits_for_termination_before_deleting_security_group(self, automation, fake_cloud):
+        """The security group is deleted once its instance reports terminated, not after a fixed sleep."""
+        fake_cloud.ec2_terminate_polls = 3
+        assert automation.day1_aws_basics() is True
+        instance_id = next(r.id for r in automation.created_resources.by_provider('aws') if r.type == 'ec2_instance')
+
+        assert automation.cleanup_resources() is True
+
+        assert fake_cloud.instances[instance_id]['State']['Name'] == 'terminated'
+        assert len(fake_cloud.calls_to('ec2', 'describe_instances')) >= 3
+        assert len(fake_cloud.calls_to('ec2', 'delete_security_group')) == 1
+        assert fake_cloud.resource_count() == 0
+
+    def test_cleanup_retries_security_group_still_in_use(self, automation, fake_cloud, monkeypatch):
+        """A DependencyViolation from a lingering network interface is retried, other errors are not."""
+        assert automation.day1_aws_basics() is True
+        client = automation.aws_ec2_client
+        delete = client.delete_security_group
+        attempts = []
+
+        def lingering_eni(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) < 3:
+                raise ClientError({'Error': {'Code': 'DependencyViolation', 'Message': 'in use'}},
+                                  'DeleteSecurityGroup')
+            return delete(**kwargs)
+
+        monkeypatch.setattr(client, 'delete_security_group', lingering_eni)
+        assert automation.cleanup_resources() is True
+        assert len(attempts) == 3 and not fake_cloud.security_groups
+
+    def test_cleanup_gcp_resources(self, automation, fake_cloud):
+        """Day 2 resources are torn down too: VM and firewall via GcpTeardown, then bucket and service account."""
+        fake_cloud.gcp_operation_polls = 2
+        automation.config['gcp_poll_interval'] = 0
+        fake_cloud.gcp['firewalls']['other-course-allow-web'] = {'name': 'other-course-allow-web',
+                                                                'network': 'global/networks/default'}
+        # Another learner's VM shares the name prefix but was not created by this run
+        prefix = automation.config['project_prefix']
+        fake_cloud.gcp_service('compute').instances().insert(
+            project='mock-gcp-project', zone='asia-northeast3-a',
+            body={'name': f'{prefix}-2-vm', 'status': 'RUNNING'}).execute()
+        assert automation.day2_gcp_basics() is True
+
+        assert automation.cleanup_resources() is True
+
+        assert list(fake_cloud.gcp['instances']) == [f'{prefix}-2-vm'] and fake_cloud.gcp['buckets'] == {}
+        assert fake_cloud.gcp['serviceAccounts'] == {}
+        assert list(fake_cloud.gcp['firewalls']) == ['other-course-allow-web']
+        assert len(automation.created_resources) == 0
+
+    def test_gcp_cleanup_failure_keeps_resources_registered(self, automation, fake_cloud):
+        """A VM that cannot be deleted stays in the registry and fails the cleanup."""
+        assert automation.day2_gcp_basics() is True
+        fake_cloud.inject_gcp_errors('compute.instances.delete', 403)
+
+        assert automation.cleanup_resources() is False
+
+        assert [r.type for r in automation.created_resources.by_provider('gcp')] == ['gcp_instance']
+        assert fake_cloud.gcp['serviceAccounts'] == {}
+
+    def test_vm_creation_waits_for_new_service_account(self, automation, fake_cloud):
+        """A VM rejected because its brand-new service account is not visible yet is retried."""
+        prefix = automation.config['project_prefix']
+        fake_cloud.inject_gcp_errors(
+            'compute.instances.insert', 400, 400,
+            message=f"The resource '{prefix}-sa@mock-gcp-project.iam.gserviceaccount.com' was not found")
+
         with patch('time.sleep'):
-            automation.cleanup_resources()
+            assert automation.day2_gcp_basics() is True
+
+        assert len(fake_cloud.gcp['instances']) == 1
 
-            automation.mock_aws_ec2.terminate_instances.assert_called_once_with(InstanceIds=['i-12345'])
-            automation.mock_aws_ec2.delete_security_group.assert_called_once_with(GroupId='sg-12345')
-            automation.mock_aws_iam.delete_user.assert_called_once_with(UserName='test-user')
-            automation.mock_aws_s3.delete_bucket.assert_called_once_with(Bucket='test-bucket')
\ No newline at end of file
+    def test_day2_reports_transport_errors(self, automation, fake_cloud):
+        """Auth and connection failures end Day 2 as failed instead of crashing the run."""
+        with patch.object(automation, 'provision_gcp_basics', side_effect=ConnectionResetError()):
+            assert automation.day2_gcp_basics() is False
@@ -0,0 +1,65 @@
+import pytest
+
+# hypothesis is an optional test dependency; skip these property tests when it is not installed
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, settings, strategies as st
+
+prefixes = st.from_regex(r"[a-z][a-z0-9-]{2,16}[a-z0-9]", fullmatch=True)
+resource_types = st.sets(st.sampled_from(["iam_user", "security_group", "ec2_instance", "s3_bucket"]))
+
+
+def _precreate(fake_cloud, automation, existing):
+    """Create a subset of the Day 1 resources directly on the fake backend."""
+    prefix = automation.config['project_prefix']
+    if "iam_user" in existing:
+        fake_cloud.client('iam').create_user(UserName=f"{prefix}-user")
+    if "security_group" in existing:
+        fake_cloud.client('ec2').create_security_group(GroupName=f"{prefix}-sg", Description="pre-existing")
+    if "ec2_instance" in existing:
+        fake_cloud.client('ec2').run_instances(
+            ImageId="ami-test", InstanceType="t2.micro", MinCount=1, MaxCount=1,
+            TagSpecifications=[{'ResourceType': 'instance', 'Tags': [{'Key': 'Name', 'Value': f"{prefix}-instance"}]}])
+    if "s3_bucket" in existing:
+        fake_cloud.client('s3').create_bucket(Bucket=f"{prefix}-bucket-{automation.config['aws_region']}")
+
+
+def _mutating_calls(fake_cloud):
+    return [(s, op) for s, op, _ in fake_cloud.calls
+            if op.startswith(("create_", "run_", "authorize_"))]
+
+
+@settings(max_examples=30, deadline=None)
+@given(prefix=prefixes, existing=resource_types)
+def test_day1_is_idempotent(fake_cloud, automation_factory, prefix, existing):
+    """Running Day 1 twice leaves the same resources and makes no new mutating calls."""
+    fake_cloud.reset()
+    first = automation_factory(project_prefix=prefix)
+    _precreate(fake_cloud, first, existing)
+
+    assert first.day1_aws_basics() is True
+    snapshot = fake_cloud.snapshot()
+    mutations = len(_mutating_calls(fake_cloud))
+
+    second = automation_factory(project_prefix=prefix)
+    assert second.day1_aws_basics() is True
+
+    assert fake_cloud.snapshot() == snapshot
+    assert len(_mutating_calls(fake_cloud)) == mutations
+    assert [r.to_dict() for r in first.created_resources] == \
+        [r.to_dict() for r in second.created_resources]
+
+
+@settings(max_examples=30, deadline=None)
+@given(prefix=prefixes, existing=resource_types)
+def test_cleanup_removes_everything_day1_tracked(fake_cloud, automation_factory, prefix, existing):
+    """Teardown after Day 1 leaves no resources behind, including pre-existing ones it adopted."""
+    fake_cloud.reset()
+    automation = automation_factory(project_prefix=prefix)
+    _precreate(fake_cloud, automation, existing)
+
+    assert automation.day1_aws_basics() is True
+    assert fake_cloud.resource_count() == 4
+
+    automation.cleanup_resources()
+    assert fake_cloud.resource_count() == 0
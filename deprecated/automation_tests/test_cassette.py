@@ -0,0 +1,111 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence
+
+from . import gcp_discovery
+from .cassette import Cassette, CassetteHttp, CassetteMissError
+
+LAUNCHED = datetime(2024, 5, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def _ec2():
+    return boto3.client("ec2", region_name="ap-northeast-2",
+                        aws_access_key_id="testing", aws_secret_access_key="testing")
+
+
+def _instance(state):
+    return {"Reservations": [{"Instances": [
+        {"InstanceId": "i-1", "LaunchTime": LAUNCHED, "State": {"Name": state}}]}]}
+
+
+def _record_ec2(path):
+    cassette = Cassette(path, mode="record")
+    client = _ec2()
+    cassette.attach(client)
+    with Stubber(client) as stubber:
+        stubber.add_response("describe_instances", _instance("pending"), {"InstanceIds": ["i-1"]})
+        stubber.add_response("describe_instances", _instance("running"), {"InstanceIds": ["i-1"]})
+        stubber.add_client_error("run_instances", "InsufficientInstanceCapacity", http_status_code=500)
+        client.describe_instances(InstanceIds=["i-1"])
+        client.describe_instances(InstanceIds=["i-1"])
+        with pytest.raises(ClientError):
+            client.run_instances(ImageId="ami-1", MinCount=1, MaxCount=1, ClientToken="abc")
+    cassette.save()
+    return cassette
+
+
+def test_boto3_record_then_replay_offline(tmp_path):
+    path = tmp_path / "aws.json.gz"
+    assert _record_ec2(path).recorded == 3
+
+    cassette = Cassette(path, mode="replay")
+    client = _ec2()
+    cassette.attach(client)
+
+    states = [client.describe_instances(InstanceIds=["i-1"])["Reservations"][0]["Instances"][0]
+              for _ in range(3)]
+    assert [s["State"]["Name"] for s in states] == ["pending", "running", "running"]
+    assert states[0]["LaunchTime"] == LAUNCHED
+
+    # Errors replay as the same ClientError; volatile idempotency tokens do not affect matching
+    with pytest.raises(ClientError) as excinfo:
+        client.run_instances(ImageId="ami-1", MinCount=1, MaxCount=1, ClientToken="other")
+    assert excinfo.value.response["Error"]["Code"] == "InsufficientInstanceCapacity"
+
+    with pytest.raises(CassetteMissError):
+        client.describe_instances(InstanceIds=["i-unknown"])
+
+
+def test_replay_can_play_back_recorded_latency(tmp_path):
+    path = tmp_path / "aws.json.gz"
+    _record_ec2(path)
+    cassette = Cassette(path, mode="replay", latency_scale=2.0)
+    cassette._interactions = {key: [dict(r, elapsed=0.25) for r in responses]
+                              for key, responses in cassette._interactions.items()}
+    client = _ec2()
+    cassette.attach(client)
+
+    with patch("automation_tests.cassette.time.sleep") as sleep:
+        client.describe_instances(InstanceIds=["i-1"])
+    sleep.assert_called_once_with(0.5)
+
+
+def _compute(http):
+    return gcp_discovery.build("compute", "v1", http=http)
+
+
+def test_googleapiclient_replay_serves_batches_from_individual_recordings(tmp_path):
+    path = tmp_path / "gcp.json.gz"
+    recorder = Cassette(path, mode="record")
+    upstream = HttpMockSequence([
+        ({"status": "200"}, json.dumps({"name": "vm-0", "status": "RUNNING"})),
+        ({"status": "404"}, json.dumps({"error": {"code": 404, "message": "vm-1 not found"}})),
+    ])
+    compute = _compute(CassetteHttp(upstream, recorder))
+    compute.instances().get(project="p", zone="asia-northeast3-a", instance="vm-0").execute()
+    with pytest.raises(HttpError):
+        compute.instances().get(project="p", zone="asia-northeast3-a", instance="vm-1").execute()
+    recorder.save()
+
+    player = Cassette(path, mode="replay")
+    compute = _compute(CassetteHttp(None, player))
+    assert compute.instances().get(project="p", zone="asia-northeast3-a",
+                                   instance="vm-0").execute()["status"] == "RUNNING"
+
+    results = {}
+    batch = compute.new_batch_http_request(
+        callback=lambda request_id, response, exception: results.update({request_id: (response, exception)}))
+    for name in ("vm-0", "vm-1"):
+        batch.add(compute.instances().get(project="p", zone="asia-northeast3-a", instance=name),
+                  request_id=name)
+    batch.execute()
+
+    assert results["vm-0"][0]["name"] == "vm-0"
+    assert results["vm-1"][1].resp.status == 404
@@ -0,0 +1,16 @@
+from .client_registry import get_client_registry
+
+
+def test_registry_is_shared_per_configuration():
+    default = get_client_registry()
+
+    assert get_client_registry({"aws_region": "us-east-1"}) is default
+    assert get_client_registry({"aws_max_pool_connections": 50}) is default
+
+    # A different pool size or retry policy gets its own registry instead of being silently ignored
+    wide = get_client_registry({"aws_max_pool_connections": 200})
+    assert wide is not default and wide.max_pool_connections == 200
+    assert get_client_registry({"aws_max_pool_connections": 200}) is wide
+    unlimited = get_client_registry({"aws_rate_limit": False, "aws_max_attempts": 2})
+    assert unlimited.rate_limiter is None and unlimited.max_attempts == 2
+    assert default.rate_limiter is not None
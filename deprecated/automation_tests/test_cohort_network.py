@@ -0,0 +1,152 @@
+import time
+
+import pytest
+
+from .cohort_network import CidrAllocator, CidrExhaustedError, CohortNetwork, get_cohort_network
+from .testing.fake_cloud import FakeCloud
+
+
+@pytest.fixture
+def cloud():
+    return FakeCloud(latency=0.02)
+
+
+def _network(cloud, cohort="cohort-a", **kwargs):
+    return CohortNetwork(cloud.client("ec2"), cohort, **kwargs)
+
+
+def test_one_vpc_per_cohort_and_one_subnet_call_per_learner(cloud):
+    learners = [f"learner{n:02d}" for n in range(20)]
+    network = _network(cloud, availability_zones=["ap-northeast-2a", "ap-northeast-2c"])
+
+    started = time.perf_counter()
+    subnets = network.ensure_subnets(learners)
+    elapsed = time.perf_counter() - started
+
+    assert len(cloud.vpcs) == 1 and len(cloud.internet_gateways) == 1
+    assert len(cloud.calls_to("ec2", "create_vpc")) == 1
+    assert len(cloud.calls_to("ec2", "create_subnet")) == len(learners)
+    assert set(subnets) == set(learners) and len(set(subnets.values())) == len(learners)
+    cidrs = {s["CidrBlock"] for s in cloud.subnets.values()}
+    assert "10.0.0.0/24" in cidrs and len(cidrs) == len(learners)
+    assert {s["AvailabilityZone"] for s in cloud.subnets.values()} == {"ap-northeast-2a", "ap-northeast-2c"}
+    # Subnets ride the main route table, which now routes to the internet gateway
+    main_table = cloud.client("ec2").describe_route_tables(
+        Filters=[{"Name": "association.main", "Values": ["true"]}])["RouteTables"][0]
+    assert any(r.get("GatewayId") == network.internet_gateway_id for r in main_table["Routes"])
+    assert not cloud.calls_to("ec2", "associate_route_table")
+    # 20 subnet calls at 20ms each run concurrently rather than back to back
+    assert elapsed < 0.3
+
+
+def test_reruns_reuse_existing_network_and_only_add_new_learners(cloud):
+    first = _network(cloud).ensure_subnets(["alice", "bob"])
+    cloud.calls.clear()
+
+    # A fresh process discovers the VPC and subnets with one describe call each
+    network = _network(cloud)
+    again = network.ensure_subnets(["alice", "bob", "carol"])
+
+    assert {k: again[k] for k in first} == first
+    assert [op for _, op, _ in cloud.calls if op.startswith("create")] == ["create_subnet"]
+    assert len(cloud.calls_to("ec2", "describe_subnets")) == 1
+    assert network.ensure_subnet("carol") == again["carol"]
+    assert len(cloud.calls_to("ec2", "describe_subnets")) == 1
+
+    assert network.release(["bob"]) == {}
+    assert network.ensure_subnet("dave") == next(
+        s["SubnetId"] for s in cloud.subnets.values() if s["CidrBlock"] == "10.0.1.0/24")
+
+    assert network.teardown() == {}
+    assert not cloud.vpcs and not cloud.subnets and not cloud.internet_gateways
+    assert _network(cloud).teardown() == {} and not cloud.vpcs
+
+
+def test_conflicting_cidr_is_skipped_and_exhaustion_is_reported(cloud):
+    network = _network(cloud, vpc_cidr="10.1.0.0/22")
+    vpc_id = network.ensure_vpc()
+    # Another process grabbed the first block after this process loaded the subnets
+    network._load_subnets()
+    cloud.client("ec2").create_subnet(VpcId=vpc_id, CidrBlock="10.1.0.0/24")
+
+    subnets = network.ensure_subnets(["alice", "bob", "carol"])
+
+    assert sorted(cloud.subnets[s]["CidrBlock"] for s in subnets.values()) == [
+        "10.1.1.0/24", "10.1.2.0/24", "10.1.3.0/24"]
+    with pytest.raises(CidrExhaustedError):
+        network.ensure_subnet("dave")
+
+
+def test_partially_built_vpc_is_repaired_on_reuse(cloud):
+    ec2 = cloud.client("ec2")
+    # A previous run created the tagged VPC and then died before the gateway and route
+    network = _network(cloud)
+    ec2.create_vpc(CidrBlock="10.0.0.0/16", TagSpecifications=network._tags("vpc", "cohort-a-vpc"))
+
+    vpc_id = _network(cloud).ensure_vpc()
+
+    assert len(cloud.vpcs) == 1 and len(cloud.internet_gateways) == 1
+    main_table = ec2.describe_route_tables(Filters=[{"Name": "vpc-id", "Values": [vpc_id]},
+                                                    {"Name": "association.main", "Values": ["true"]}])
+    assert [r["DestinationCidrBlock"] for r in main_table["RouteTables"][0]["Routes"]
+            if r.get("GatewayId", "").startswith("igw-")] == ["0.0.0.0/0"]
+    cloud.calls.clear()
+    assert _network(cloud).ensure_vpc() == vpc_id
+    assert not [op for _, op, _ in cloud.calls if op.startswith(("create", "attach"))]
+
+
+def test_failed_gateway_leaves_vpc_unrecorded(cloud):
+    ec2 = cloud.client("ec2")
+    network = CohortNetwork(ec2, "cohort-a")
+    ec2.attach_internet_gateway = lambda **kwargs: (_ for _ in ()).throw(RuntimeError("throttled"))
+
+    with pytest.raises(RuntimeError):
+        network.ensure_vpc()
+    assert network.vpc_id is None and not cloud.internet_gateways
+
+    del ec2.attach_internet_gateway
+    assert network.ensure_vpc() == next(iter(cloud.vpcs))
+    assert network.internet_gateway_id is not None
+
+
+def test_concurrently_created_vpcs_converge_on_one(cloud):
+    ec2 = cloud.client("ec2")
+    other = _network(cloud)
+    create_vpc = ec2.create_vpc
+
+    def racing_create_vpc(**kwargs):
+        # Another process creates its VPC first, so it holds the lower id
+        create_vpc(CidrBlock="10.0.0.0/16", TagSpecifications=other._tags("vpc", "cohort-a-vpc"))
+        return create_vpc(**kwargs)
+
+    network = CohortNetwork(ec2, "cohort-a")
+    ec2.create_vpc = racing_create_vpc
+    vpc_id = network.ensure_vpc()
+
+    assert list(cloud.vpcs) == [vpc_id]
+    assert other.ensure_vpc() == vpc_id and len(cloud.internet_gateways) == 1
+
+
+def test_shared_networks_are_keyed_by_account_region_and_cohort(cloud):
+    ec2 = cloud.client("ec2")
+    network = get_cohort_network(ec2, "cohort-key", account="111111111111")
+
+    assert get_cohort_network(cloud.client("ec2"), "cohort-key", account="111111111111") is network
+    assert get_cohort_network(ec2, "cohort-key", account="222222222222") is not network
+    other_region = cloud.client("ec2")
+    other_region.meta.region_name = "other-region"
+    assert get_cohort_network(other_region, "cohort-key", account="111111111111") is not network
+
+
+def test_cidr_allocator_is_idempotent_and_reuses_released_blocks():
+    allocator = CidrAllocator("10.0.0.0/16", 24)
+    allocator.mark_used("10.0.0.0/23")
+
+    assert allocator.allocate("alice") == "10.0.2.0/24"
+    assert allocator.allocate("alice") == "10.0.2.0/24"
+    assert allocator.allocate("bob") == "10.0.3.0/24"
+    allocator.release("alice")
+    assert allocator.allocate("carol") == "10.0.2.0/24"
+    assert allocator.available == 256 - 4
+    with pytest.raises(ValueError):
+        CidrAllocator("10.0.0.0/24", 16)
@@ -0,0 +1,144 @@
+import json
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError, NoCredentialsError
+
+from .desired_state import DesiredStateReconciler, PlanCache, build_desired_state
+
+COURSE_CONFIG = json.loads((Path(__file__).parent / "cloud_basic_config.json").read_text(encoding="utf-8"))
+MUTATING_PREFIXES = ("create_", "update_", "delete_", "authorize_", "compute.networks.insert",
+                     "compute.networks.delete", "compute.subnetworks.insert", "compute.subnetworks.delete")
+
+
+def _mutations(fake_cloud):
+    return [op for _, op, _ in fake_cloud.calls if op.startswith(MUTATING_PREFIXES)]
+
+
+@pytest.fixture
+def make_reconciler(fake_cloud, tmp_path):
+    fake_cloud.reset()
+    clients = {name: fake_cloud.client(name) for name in ("ec2", "s3", "iam")}
+    compute = fake_cloud.gcp_service("compute")
+
+    def factory(course_config=COURSE_CONFIG, cache=True):
+        resources = build_desired_state(course_config, "cb-test")
+        return DesiredStateReconciler(resources, "cb-test", clients, compute, "mock-gcp-project",
+                                      PlanCache(tmp_path) if cache else None, max_workers=4)
+    return factory
+
+
+def test_build_desired_state_from_course_config():
+    resources = {r.key: r for r in build_desired_state(COURSE_CONFIG, "cb")}
+
+    assert set(resources) == {"vpc", "subnet", "security_group", "s3_bucket", "iam_role",
+                              "gcp_network", "gcp_subnetwork"}
+    assert resources["vpc"].properties["CidrBlock"] == "10.0.0.0/16"
+    assert resources["subnet"].properties["CidrBlock"] == "10.0.0.0/24"
+    assert resources["subnet"].depends_on == ("vpc",)
+    assert resources["s3_bucket"].name == "cb-shared-us-west-2"
+
+
+def test_apply_creates_everything_then_converges(make_reconciler, fake_cloud):
+    plan, result = make_reconciler().reconcile()
+
+    assert plan.summary() == {"create": 7, "update": 0, "delete": 0}
+    assert not result["failed"] and not result["skipped"]
+    subnet = next(iter(fake_cloud.subnets.values()))
+    assert subnet["VpcId"] == result["ids"]["vpc"]
+    assert len(fake_cloud.gcp["networks"]) == 1 and len(fake_cloud.gcp["subnetworks"]) == 1
+
+    fake_cloud.calls.clear()
+    plan, _ = make_reconciler().reconcile()
+    assert plan.empty
+    assert _mutations(fake_cloud) == []
+
+
+def test_partial_environment_only_plans_missing_pieces(make_reconciler, fake_cloud):
+    make_reconciler().reconcile()
+    group = next(iter(fake_cloud.security_groups.values()))
+    group["IpPermissions"] = [p for p in group["IpPermissions"] if p["FromPort"] != 443]
+    fake_cloud.buckets.clear()
+
+    plan = make_reconciler().plan()
+
+    operations = {(op.action, op.type): op for op in plan.operations}
+    assert sorted(operations) == [("create", "s3_bucket"), ("update", "security_group")]
+    assert operations[("update", "security_group")].params["IngressPorts"] == [443]
+
+
+def test_prune_deletes_resources_removed_from_spec(make_reconciler, fake_cloud):
+    make_reconciler().reconcile()
+    reduced = dict(COURSE_CONFIG, shared_resources={"aws_resources": ["S3 Bucket", "IAM Role"],
+                                                    "gcp_resources": ["Project", "Network"]})
+
+    plan, result = make_reconciler(reduced).reconcile(prune=True)
+
+    assert plan.summary()["delete"] == 4
+    assert not result["failed"] and not result["skipped"]
+    assert not fake_cloud.vpcs and not fake_cloud.subnets and not fake_cloud.security_groups
+    assert not fake_cloud.gcp["subnetworks"] and len(fake_cloud.gcp["networks"]) == 1
+
+
+def test_plan_cache_reuses_plan_and_skips_fetch_when_converged(make_reconciler, fake_cloud):
+    reconciler = make_reconciler()
+    first = reconciler.plan()
+    assert not first.cached
+    assert reconciler.plan().cached
+
+    reconciler.reconcile()
+    fake_cloud.calls.clear()
+    plan, result = make_reconciler().reconcile(trust_converged=60)
+    assert plan.empty and plan.cached and result is None
+    assert fake_cloud.calls == []
+
+
+def test_prune_only_touches_resources_this_prefix_owns(make_reconciler, fake_cloud):
+    make_reconciler().reconcile()
+    # Same name prefix but another owner: an unlabeled network and an untagged bucket
+    fake_cloud.gcp["networks"]["cb-test-manual"] = {"name": "cb-test-manual"}
+    fake_cloud.gcp["networks"]["cb-test-2-net"] = {
+        "name": "cb-test-2-net", "description": "managed-by=cloud-basic-desired-state;desired-state-prefix=cb-test-2"}
+    fake_cloud.client("s3").create_bucket(Bucket="cb-test-shared-archive")
+
+    reduced = dict(COURSE_CONFIG, shared_resources={"aws_resources": ["VPC", "Subnet", "Security Group",
+                                                                      "S3 Bucket", "IAM Role"],
+                                                    "gcp_resources": ["Project", "Network"]})
+    plan, result = make_reconciler(reduced).reconcile(prune=True)
+
+    assert [(op.action, op.name) for op in plan.operations] == [("delete", "cb-test-subnet")]
+    assert not result["failed"]
+    assert {"cb-test-manual", "cb-test-2-net"} <= set(fake_cloud.gcp["networks"])
+    assert "cb-test-shared-archive" in fake_cloud.buckets
+
+
+def test_bucket_left_untagged_is_cleaned_up_or_adopted(make_reconciler, fake_cloud, monkeypatch):
+    reconciler = make_reconciler(cache=False)
+    s3 = reconciler.aws_clients["s3"]
+    put_tagging = s3.put_bucket_tagging
+
+    def denied(**kwargs):
+        raise ClientError({"Error": {"Code": "AccessDenied", "Message": "denied"}}, "PutBucketTagging")
+    monkeypatch.setattr(s3, "put_bucket_tagging", denied, raising=False)
+    _, result = reconciler.reconcile()
+    assert "create:s3_bucket" in result["failed"] and "cb-test-shared-us-west-2" not in fake_cloud.buckets
+
+    # A bucket an earlier apply created but never tagged is adopted instead of failing forever
+    monkeypatch.setattr(s3, "put_bucket_tagging", put_tagging, raising=False)
+    s3.create_bucket(Bucket="cb-test-shared-us-west-2")
+    _, result = make_reconciler(cache=False).reconcile()
+    assert not result["failed"]
+    assert reconciler._owns_bucket("cb-test-shared-us-west-2")
+
+
+def test_unexpected_errors_fail_one_operation_not_the_apply(make_reconciler, fake_cloud, monkeypatch):
+    def no_credentials(op, params):
+        raise NoCredentialsError()
+
+    reconciler = make_reconciler(cache=False)
+    monkeypatch.setattr(reconciler, "_create_iam_role", no_credentials)
+
+    plan, result = reconciler.reconcile()
+
+    assert list(result["failed"]) == ["create:iam_role"]
+    assert len(result["succeeded"]) == plan.summary()["create"] - 1
@@ -0,0 +1,59 @@
+import json
+import threading
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from . import gcp_discovery
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("GCP_DISCOVERY_CACHE_DIR", str(tmp_path))
+    gcp_discovery.clear()
+    yield tmp_path
+    gcp_discovery.clear()
+
+
+def test_document_is_parsed_once_and_shared_across_threads():
+    first = gcp_discovery.get_document("compute", "v1")
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(gcp_discovery.get_document("compute", "v1")))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(document is first for document in seen)
+
+
+def test_build_works_offline_from_static_documents():
+    service = gcp_discovery.build("compute", "v1", credentials=Credentials("token"))
+    request = service.instances().list(project="p", zone="asia-northeast3-a")
+    assert request.uri.startswith("https://compute.googleapis.com/compute/v1/projects/p/zones/asia-northeast3-a/instances")
+
+
+def test_local_cache_takes_precedence(fresh_cache):
+    document = dict(gcp_discovery.get_document("storage", "v1"), revision="pinned-revision")
+    gcp_discovery.clear()
+    (fresh_cache / "storage.v1.json").write_text(json.dumps(document), encoding="utf-8")
+
+    assert gcp_discovery.get_document("storage", "v1")["revision"] == "pinned-revision"
+
+
+def test_thread_local_service_is_reused_per_thread_only():
+    credentials = Credentials("token")
+    main_service = gcp_discovery.thread_local_service("iam", "v1", credentials)
+    assert gcp_discovery.thread_local_service("iam", "v1", credentials) is main_service
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(
+        gcp_discovery.thread_local_service("iam", "v1", credentials)))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_service
+
+
+def test_missing_document_names_refresh_command():
+    with pytest.raises(FileNotFoundError, match="refresh"):
+        gcp_discovery.get_document("no-such-api", "v9")
@@ -0,0 +1,133 @@
+import pytest
+
+from .gcp_inventory import GcpInventory
+
+PROJECT = "mock-gcp-project"
+
+
+@pytest.fixture
+def make_inventory(fake_cloud, tmp_path):
+    fake_cloud.reset()
+
+    def factory(**kwargs):
+        return GcpInventory(PROJECT, service_factory=fake_cloud.gcp_service,
+                            snapshot_path=tmp_path / "inventory.json", **kwargs)
+    return factory
+
+
+@pytest.fixture
+def seeded(fake_cloud):
+    compute, storage = fake_cloud.gcp_service("compute"), fake_cloud.gcp_service("storage")
+    for n, zone in enumerate(("asia-northeast3-a", "asia-northeast3-b", "us-central1-a")):
+        compute.instances().insert(project=PROJECT, zone=zone, body={
+            "name": f"vm-{n}", "status": "RUNNING", "machineType": f"zones/{zone}/machineTypes/e2-micro",
+            "disks": [{"source": f"zones/{zone}/disks/disk-{n}"}],
+            "networkInterfaces": [{"accessConfigs": [{"natIP": f"34.0.0.{n}"}]}]}).execute()
+        compute.disks().insert(project=PROJECT, zone=zone, body={"name": f"disk-{n}", "status": "READY"}).execute()
+    compute.disks().insert(project=PROJECT, zone="asia-northeast3-a",
+                           body={"name": "orphan-disk", "status": "READY", "sizeGb": "10"}).execute()
+    compute.addresses().insert(project=PROJECT, region="asia-northeast3",
+                               body={"name": "spare-ip", "status": "RESERVED", "address": "34.1.1.1"}).execute()
+    for name in ("bucket-a", "bucket-b", "bucket-empty"):
+        storage.buckets().insert(project=PROJECT, body={"name": name}).execute()
+    for n in range(2500):
+        fake_cloud.put_gcs_object("bucket-a", f"obj-{n}", size=10)
+    fake_cloud.put_gcs_object("bucket-b", "index.html", size=512)
+    fake_cloud.calls.clear()
+    return compute
+
+
+def test_first_refresh_sweeps_each_type_once_and_scans_buckets(fake_cloud, make_inventory, seeded):
+    inventory = make_inventory()
+
+    changes = inventory.refresh()
+
+    for method in ("compute.instances.aggregatedList", "compute.disks.aggregatedList",
+                   "compute.addresses.aggregatedList", "storage.buckets.list"):
+        assert len(fake_cloud.calls_to("gcp", method)) == 1
+    assert len(fake_cloud.calls_to("gcp", "storage.objects.list")) == 3 + 2   # bucket-a has three pages
+    assert len(changes["added"]) == 3 + 4 + 1 + 3 and changes["scanned_buckets"] == 3
+
+    vm = inventory.resources["instances"]["asia-northeast3-b/vm-1"]
+    assert (vm["machineType"], vm["externalIP"]) == ("e2-micro", "34.0.0.1")
+    assert inventory.resources["buckets"]["bucket-a"]["total_bytes"] == 25000
+    assert [d["name"] for d in inventory.unused_disks()] == ["orphan-disk"]
+    assert [a["name"] for a in inventory.unused_addresses()] == ["spare-ip"]
+    assert [b["name"] for b in inventory.empty_buckets()] == ["bucket-empty"]
+
+
+def test_incremental_refresh_records_only_changes(fake_cloud, make_inventory, seeded):
+    make_inventory().refresh()
+    fake_cloud.gcp["instances"]["vm-0"].update(status="TERMINATED", lastStopTimestamp=fake_cloud.timestamp())
+    del fake_cloud.gcp["disks"]["orphan-disk"]
+    fake_cloud.gcp["buckets"]["bucket-b"]["updated"] = fake_cloud.timestamp()
+    fake_cloud.calls.clear()
+
+    # A new process picks up the stored snapshot
+    inventory = make_inventory()
+    changes = inventory.refresh()
+
+    assert changes["added"] == []
+    assert sorted(changes["changed"]) == ["buckets/bucket-b", "instances/asia-northeast3-a/vm-0"]
+    assert changes["removed"] == ["disks/asia-northeast3-a/orphan-disk"]
+    assert len(fake_cloud.calls_to("gcp", "storage.objects.list")) == 1
+    assert inventory.resources["buckets"]["bucket-a"]["object_count"] == 2500
+
+
+def test_stale_bucket_counts_are_rescanned(fake_cloud, make_inventory, seeded):
+    make_inventory().refresh()
+    fake_cloud.put_gcs_object("bucket-empty", "late.txt", size=1)
+
+    assert make_inventory().refresh()["scanned_buckets"] == 0
+    inventory = make_inventory(bucket_ttl=0)
+    assert inventory.refresh()["scanned_buckets"] == 3
+    assert inventory.empty_buckets() == []
+
+
+def test_instance_type_and_label_changes_are_recorded(fake_cloud, make_inventory, seeded):
+    make_inventory().refresh()
+    fake_cloud.gcp["instances"]["vm-1"]["machineType"] = "zones/asia-northeast3-b/machineTypes/e2-small"
+    fake_cloud.gcp["instances"]["vm-2"]["labels"] = {"owner": "learner-02"}
+
+    inventory = make_inventory()
+    changes = inventory.refresh()
+
+    assert sorted(changes["changed"]) == ["instances/asia-northeast3-b/vm-1", "instances/us-central1-a/vm-2"]
+    assert inventory.resources["instances"]["asia-northeast3-b/vm-1"]["machineType"] == "e2-small"
+    assert inventory.resources["instances"]["us-central1-a/vm-2"]["labels"] == {"owner": "learner-02"}
+
+
+def test_unreadable_bucket_does_not_abort_the_refresh(fake_cloud, make_inventory, seeded):
+    inventory = make_inventory(max_workers=1)     # scans run in order, so the injected 403 hits bucket-b
+    scan = inventory._scan_bucket
+
+    def forbidden_b(bucket):
+        if bucket == "bucket-b":
+            fake_cloud.inject_gcp_errors("storage.objects.list", 403)
+        return scan(bucket)
+    inventory._scan_bucket = forbidden_b
+
+    changes = inventory.refresh()
+
+    assert list(changes["scan_errors"]) == ["bucket-b"]
+    buckets = inventory.resources["buckets"]
+    assert "scan_error" in buckets["bucket-b"] and "scanned_at" not in buckets["bucket-b"]
+    assert buckets["bucket-a"]["object_count"] == 2500
+    assert len(inventory.resources["instances"]) == 3
+
+    # The failed bucket is retried on the next refresh and the error is cleared
+    changes = make_inventory().refresh()
+    assert changes["scanned_buckets"] == 1 and changes["scan_errors"] == {}
+    assert make_inventory().resources["buckets"]["bucket-b"]["object_count"] == 1
+
+
+def test_failed_rescan_of_a_known_bucket_is_retried_next_refresh(fake_cloud, make_inventory, seeded):
+    make_inventory().refresh()
+    fake_cloud.gcp["buckets"]["bucket-b"]["updated"] = fake_cloud.timestamp()
+    fake_cloud.inject_gcp_errors("storage.objects.list", 403)
+
+    assert list(make_inventory().refresh()["scan_errors"]) == ["bucket-b"]
+
+    # Well inside bucket_ttl, but the failed bucket has no fresh scan to rely on
+    changes = make_inventory().refresh()
+    assert changes["scanned_buckets"] == 1 and changes["scan_errors"] == {}
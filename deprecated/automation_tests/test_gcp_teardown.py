@@ -0,0 +1,113 @@
+import pytest
+
+from .gcp_teardown import STAGES, GcpTeardown
+
+PROJECT = "mock-gcp-project"
+ZONES = ("asia-northeast3-a", "asia-northeast3-b", "asia-northeast3-c")
+
+
+@pytest.fixture
+def compute(fake_cloud):
+    fake_cloud.reset()
+    return fake_cloud.gcp_service("compute")
+
+
+def _insert(request):
+    request.execute()
+
+
+def _cohort(compute, prefix="cb", learners=6):
+    """Network, subnet, firewall, and per-learner VMs with attached data disks spread across zones."""
+    network = f"projects/{PROJECT}/global/networks/{prefix}-network"
+    _insert(compute.networks().insert(project=PROJECT, body={"name": f"{prefix}-network"}))
+    _insert(compute.subnetworks().insert(project=PROJECT, region="asia-northeast3",
+                                         body={"name": f"{prefix}-subnet", "network": network}))
+    _insert(compute.firewalls().insert(project=PROJECT, body={"name": f"{prefix}-allow-web", "network": network}))
+    for n in range(learners):
+        zone = ZONES[n % len(ZONES)]
+        _insert(compute.disks().insert(project=PROJECT, zone=zone, body={"name": f"{prefix}-data-{n}"}))
+        _insert(compute.instances().insert(project=PROJECT, zone=zone, body={
+            "name": f"{prefix}-vm-{n}",
+            "networkInterfaces": [{"network": network,
+                                   "subnetwork": f"regions/asia-northeast3/subnetworks/{prefix}-subnet"}],
+            "disks": [{"source": f"zones/{zone}/disks/{prefix}-data-{n}"}]}))
+
+
+def _stage_of(batch):
+    return batch["methods"][0].split(".")[1]
+
+
+def test_teardown_deletes_in_dependency_order(fake_cloud, compute):
+    _cohort(compute)
+    fake_cloud.gcp_operation_polls = 3
+    teardown = GcpTeardown(compute, PROJECT, prefix="cb", poll_interval=0, max_poll_interval=0)
+
+    result = teardown.run()
+
+    assert result["failures"] == {}
+    assert result["deleted"] == {"instances": 6, "disks": 6, "firewalls": 1, "subnetworks": 1, "networks": 1}
+    assert all(not fake_cloud.gcp[kind] for kind in STAGES)
+
+    delete_batches = [b for b in fake_cloud.calls_to("gcp", "batch") if b["methods"][0].endswith(".delete")]
+    stages = [_stage_of(b) for b in delete_batches]
+    assert stages == sorted(stages, key=STAGES.index)
+    # One delete batch per zone for zonal resources, one per stage otherwise
+    assert stages.count("instances") == len(ZONES) and stages.count("disks") == len(ZONES)
+
+
+def test_stage_waits_for_slowest_operation_not_the_sum(fake_cloud, compute):
+    _cohort(compute, learners=30)
+    fake_cloud.gcp_operation_polls = 4
+    teardown = GcpTeardown(compute, PROJECT, prefix="cb", poll_interval=0, max_poll_interval=0)
+
+    teardown.run()
+
+    # Every operation of a stage completes on the same shared poll round
+    assert teardown.poller.polls == 4 * len(STAGES)
+    poll_batches = [b for b in fake_cloud.calls_to("gcp", "batch") if b["methods"][0].endswith("Operations.get")]
+    assert len(poll_batches) == teardown.poller.polls
+
+
+def test_keep_label_default_network_and_other_prefixes_are_untouched(fake_cloud, compute):
+    _cohort(compute, prefix="cb", learners=2)
+    _cohort(compute, prefix="other", learners=1)
+    _insert(compute.networks().insert(project=PROJECT, body={"name": "default"}))
+    _insert(compute.instances().insert(project=PROJECT, zone=ZONES[0], body={
+        "name": "cb-keep-vm", "labels": {"keep": "true"}, "networkInterfaces": [{"network": "global/networks/default"}]}))
+
+    result = GcpTeardown(compute, PROJECT, prefix="cb", poll_interval=0).run()
+
+    assert result["failures"] == {}
+    assert sorted(fake_cloud.gcp["instances"]) == ["cb-keep-vm", "other-vm-0"]
+    assert sorted(fake_cloud.gcp["networks"]) == ["default", "other-network"]
+
+
+def test_prefix_is_required_and_scopes_default_network_rules(fake_cloud, compute):
+    with pytest.raises(ValueError):
+        GcpTeardown(compute, PROJECT, prefix="")
+    for name in ("default-allow-ssh", "cb-allow-web"):
+        _insert(compute.firewalls().insert(project=PROJECT, body={"name": name,
+                                                                  "network": "global/networks/default"}))
+
+    assert GcpTeardown(compute, PROJECT, prefix="cb").discover("firewalls") == [(None, "cb-allow-web")]
+
+
+def test_dry_run_only_lists_targets(fake_cloud, compute):
+    _cohort(compute, learners=3)
+    before = fake_cloud.snapshot()
+
+    result = GcpTeardown(compute, PROJECT, prefix="cb").run(dry_run=True)
+
+    assert result["deleted"]["instances"] == 3
+    assert fake_cloud.snapshot() == before
+
+
+def test_failed_delete_is_reported_and_dependents_surface_in_use(fake_cloud, compute):
+    _cohort(compute, learners=1)
+    fake_cloud.inject_gcp_errors("compute.instances.delete", 403)
+
+    result = GcpTeardown(compute, PROJECT, prefix="cb", poll_interval=0).run()
+
+    assert set(result["failures"]) == {f"instances/{ZONES[0]}/cb-vm-0", "subnetworks/asia-northeast3/cb-subnet",
+                                       "networks/cb-network"}
+    assert "cb-vm-0" in fake_cloud.gcp["instances"] and not fake_cloud.gcp["firewalls"]
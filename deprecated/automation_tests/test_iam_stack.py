@@ -0,0 +1,184 @@
+import pytest
+
+from .testing.fake_cloud import FakeCloud
+from .iam_stack import CohortIamStack, IamStackError, learner_bucket
+
+
+def _cfn_operations(cloud):
+    return [op for service, op, _ in cloud.calls if service == "cloudformation"]
+
+
+def test_cohort_onboarding_replaces_per_learner_iam_calls(automation, fake_cloud):
+    automation.config.update({"iam_onboarding": "stack", "cfn_poll_interval": 0, "cohort": "2026-fall"})
+    fake_cloud.cfn_stack_polls = 2
+    prefixes = [f"learner{n:02d}" for n in range(30)]
+
+    assert automation.onboard_cohort_iam(prefixes) == {"2026-fall-iam": "CREATE_COMPLETE"}
+
+    group = fake_cloud.iam_groups["2026-fall-learners"]
+    assert sorted(group["Users"]) == [f"{p}-user" for p in prefixes]
+    assert group["AttachedPolicies"] == ["arn:aws:iam::000000000000:policy/2026-fall-BasicCoursePolicy"]
+    # A handful of stack operations instead of ~90 IAM calls
+    assert not [call for call in fake_cloud.calls if call[0] == "iam"]
+    assert _cfn_operations(fake_cloud).count("create_stack") == 1
+    # One listing finds the cohort's stacks and their recorded placements (none yet)
+    assert _cfn_operations(fake_cloud)[0] == "list_stacks"
+    assert len(_cfn_operations(fake_cloud)) <= 7
+
+    # Day 1 leaves the stack-managed user alone
+    automation.config["project_prefix"] = "learner00"
+    assert automation.day1_aws_basics() is True
+    assert not fake_cloud.calls_to("iam", "create_user")
+    assert not [r for r in automation.created_resources.teardown_order(provider="aws") if r.type == "iam_user"]
+
+    fake_cloud.calls.clear()
+    assert automation.onboard_cohort_iam(prefixes) == {}
+    assert _cfn_operations(fake_cloud) == ["list_stacks", "get_template", "describe_stacks", "update_stack"]
+    assert automation.onboard_cohort_iam(prefixes + ["late-joiner"]) == {"2026-fall-iam": "UPDATE_COMPLETE"}
+    assert "late-joiner-user" in fake_cloud.iam_users
+
+    automation.iam_stack().teardown()
+    assert not fake_cloud.iam_users and not fake_cloud.iam_groups and not fake_cloud.iam_policies
+
+
+def test_learner_stacks_keep_learners_in_place_as_the_cohort_grows():
+    cloud = FakeCloud()
+    stack = CohortIamStack(cloud.client("cloudformation"), "big cohort", learner_stacks=3, poll_interval=0)
+    learners = [f"l{n:03d}" for n in range(120)]
+
+    results = stack.deploy(learners)
+
+    assert set(results) == {"big-cohort-iam"} | set(stack.learner_stack_names())
+    assert len(cloud.iam_users) == 120 and len(cloud.iam_groups["big-cohort-learners"]["Users"]) == 120
+    creates = cloud.calls_to("cloudformation", "create_stack")
+    assert [c["StackName"] for c in creates][0] == "big-cohort-iam"
+
+    # A new learner only changes the stack its name hashes to; nobody else is recreated
+    user_ids = {name: user["UserId"] for name, user in cloud.iam_users.items()}
+    results = stack.deploy(learners + ["l999"])
+    target = stack.learner_stack_names()[learner_bucket("l999", 3)]
+    assert results == {target: "UPDATE_COMPLETE"}
+    assert {name: cloud.iam_users[name]["UserId"] for name in user_ids} == user_ids
+
+    stack.teardown()
+    assert cloud.resource_count() == 0
+
+
+def test_changing_learner_stacks_keeps_recorded_placements():
+    cloud = FakeCloud()
+    cfn = cloud.client("cloudformation")
+    learners = [f"l{n:03d}" for n in range(60)]
+    CohortIamStack(cfn, "grow", learner_stacks=3, poll_interval=0).deploy(learners)
+    user_ids = {name: user["UserId"] for name, user in cloud.iam_users.items()}
+
+    # More stacks: every learner stays where it was recorded, so nothing is recreated
+    assert CohortIamStack(cfn, "grow", learner_stacks=4, poll_interval=0).deploy(learners) == {}
+    assert {name: user["UserId"] for name, user in cloud.iam_users.items()} == user_ids
+
+    # Fewer stacks: the retired stack is deleted first, then only its learners move
+    fewer = CohortIamStack(cfn, "grow", learner_stacks=2, poll_interval=0)
+    moved = set(fewer.recorded_users()["grow-iam-learners-02"])
+    results = fewer.deploy(learners)
+    assert results["grow-iam-learners-02"] == "DELETE_COMPLETE"
+    assert len(cloud.iam_users) == 60 and sum(
+        cloud.iam_users[name]["UserId"] != user_id for name, user_id in user_ids.items()) == len(moved)
+
+    single = CohortIamStack(cfn, "grow", poll_interval=0)
+    single.deploy(learners)
+    assert list(single.recorded_users()) == ["grow-iam"] and len(cloud.iam_groups["grow-learners"]["Users"]) == 60
+    single.teardown()
+    assert cloud.resource_count() == 0
+
+
+def test_stacks_past_a_gap_are_found_retired_and_torn_down():
+    cloud = FakeCloud()
+    cfn = cloud.client("cloudformation")
+    learners = [f"l{n:03d}" for n in range(30)]
+    CohortIamStack(cfn, "gap", learner_stacks=3, poll_interval=0).deploy(learners)
+    # learners-01 emptied out and was deleted; learners-02 is still deployed
+    cfn.delete_stack(StackName="gap-iam-learners-01")
+
+    single = CohortIamStack(cfn, "gap", poll_interval=0)
+    assert set(single.recorded_users()) == {"gap-iam", "gap-iam-learners-00", "gap-iam-learners-02"}
+    results = single.deploy(learners)
+
+    assert results["gap-iam-learners-02"] == "DELETE_COMPLETE" and results["gap-iam"] == "UPDATE_COMPLETE"
+    assert len(cloud.iam_groups["gap-learners"]["Users"]) == 30
+    single.teardown()
+    assert cloud.resource_count() == 0
+
+
+def test_deploy_waits_for_another_process_and_replans():
+    cloud = FakeCloud()
+    cfn = cloud.client("cloudformation")
+    other = CohortIamStack(cfn, "busy", poll_interval=0)
+    # Another process has just created the stack with alice; it reports in progress for a few polls
+    cloud.cfn_stack_polls = 3
+    cfn.create_stack(StackName="busy-iam", TemplateBody=other.render(other.templates(["alice"])["busy-iam"]),
+                     Capabilities=["CAPABILITY_NAMED_IAM"], ClientRequestToken="other")
+
+    results = CohortIamStack(cfn, "busy", poll_interval=0).deploy(["bob"], keep_existing=True)
+
+    assert results == {"busy-iam": "UPDATE_COMPLETE"}
+    assert sorted(cloud.iam_groups["busy-learners"]["Users"]) == ["alice-user", "bob-user"]
+
+
+def test_rendezvous_placement_moves_few_learners_when_stacks_are_added():
+    learners = [f"l{n:03d}" for n in range(400)]
+
+    moved = [learner for learner in learners if learner_bucket(learner, 4) != learner_bucket(learner, 5)]
+
+    # Only learners whose best score is the new stack move (about a fifth), never between old stacks
+    assert len(moved) < 400 * 0.3 and all(learner_bucket(learner, 5) == 4 for learner in moved)
+
+
+def test_run_course_adds_the_learner_to_the_cohort_stack(automation, fake_cloud):
+    automation.config.update({"iam_onboarding": "stack", "cfn_poll_interval": 0, "cohort": "2026-fall",
+                              "quota_admission": False})
+    automation.onboard_cohort_iam(["alice", "bob"])
+
+    automation.run_course()
+
+    assert sorted(fake_cloud.iam_groups["2026-fall-learners"]["Users"]) == [
+        "alice-user", "bob-user", f"{automation.config['project_prefix']}-user"]
+    assert not fake_cloud.calls_to("iam", "create_user")
+    assert automation.run_history.recent_runs(1)[0]["status"] == "success"
+
+
+def test_run_course_only_reads_the_stack_when_the_cohort_is_onboarded(automation, fake_cloud):
+    automation.config.update({"iam_onboarding": "stack", "cfn_poll_interval": 0, "cohort": "2026-fall",
+                              "quota_admission": False})
+    automation.onboard_cohort_iam(["alice", automation.config["project_prefix"]])
+    fake_cloud.calls.clear()
+
+    automation.run_course()
+
+    assert _cfn_operations(fake_cloud) == ["list_stacks", "get_template"]
+    assert automation.run_history.recent_runs(1)[0]["status"] == "success"
+
+
+def test_failed_resource_rolls_back_and_a_rerun_recreates_the_stack():
+    cloud = FakeCloud()
+    cloud.client("iam").create_user(UserName="bob-user")
+    stack = CohortIamStack(cloud.client("cloudformation"), "c1", poll_interval=0)
+
+    with pytest.raises(IamStackError) as excinfo:
+        stack.deploy(["alice", "bob", "carol"])
+
+    reasons = excinfo.value.failures["c1-iam"]
+    assert any("bob-user already exists" in reason for reason in reasons)
+    # Server-side rollback leaves nothing half-created
+    assert list(cloud.iam_users) == ["bob-user"] and not cloud.iam_groups and not cloud.iam_policies
+
+    cloud.client("iam").delete_user(UserName="bob-user")
+    assert stack.deploy(["alice", "bob", "carol"]) == {"c1-iam": "CREATE_COMPLETE"}
+    assert sorted(cloud.iam_groups["c1-learners"]["Users"]) == ["alice-user", "bob-user", "carol-user"]
+
+
+def test_oversized_template_is_rejected_before_submission():
+    cloud = FakeCloud()
+    stack = CohortIamStack(cloud.client("cloudformation"), "huge", poll_interval=0)
+
+    with pytest.raises(IamStackError, match="learner_stacks"):
+        stack.deploy([f"learner-with-a-long-name-{n:04d}" for n in range(600)])
+    assert _cfn_operations(cloud) == ["list_stacks"]
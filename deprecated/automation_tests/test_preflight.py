@@ -0,0 +1,125 @@
+import os
+import shutil
+import time
+
+from .preflight import DEFAULT_PROBES, PreflightCheck, Probe, _aws_files, parse_version
+
+
+def _tool(bin_dir, name, output, delay=0.0, exit_code=0):
+    path = bin_dir / name
+    # exec so that a timeout kill reaches the sleeping process itself
+    tail = f"exit {exit_code}" if exit_code else f"exec {shutil.which('sleep')} {delay}"
+    path.write_text(f"#!/bin/sh\necho '{output}'\n{tail}\n")
+    path.chmod(0o755)
+    return path
+
+
+def _checker(tmp_path, probes, **kwargs):
+    return PreflightCheck(probes, cache_path=tmp_path / "cache.json", path=str(tmp_path / "bin"), **kwargs)
+
+
+def _probes():
+    return [
+        Probe("aws", ["aws"], ["--version"], min_version=(2, 0)),
+        Probe("git", ["git"], ["--version"], min_version=(2, 0)),
+        Probe("docker", ["docker"], ["--version"], min_version=(20, 10), required=False),
+        Probe("aws_credentials", ["aws"], ["sts"], credential=True),
+    ]
+
+
+def test_cold_run_is_concurrent_and_warm_run_is_served_from_cache(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _tool(bin_dir, "aws", "aws-cli/2.15.0 Python/3.11.6", delay=0.4)
+    _tool(bin_dir, "git", "git version 2.43.0", delay=0.4)
+    _tool(bin_dir, "docker", "Docker version 19.03.1, build 1", delay=0.4)
+
+    cold = _checker(tmp_path, _probes()).run()
+
+    # Four 0.4s probes finish in roughly the time of one
+    assert cold["elapsed"] < 1.2
+    assert cold["ok"] and cold["cached"] == 0
+    assert cold["results"]["aws"]["version"] == "2.15.0"
+    assert not cold["results"]["docker"]["ok"] and "20.10" in cold["results"]["docker"]["detail"]
+
+    warm = _checker(tmp_path, _probes()).run()
+    assert warm["cached"] == 4 and warm["elapsed"] < 0.2
+    assert warm["results"] == {name: dict(r, cached=True, elapsed=0.0) for name, r in cold["results"].items()}
+
+
+def test_binary_change_invalidates_only_its_probes(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    aws = _tool(bin_dir, "aws", "aws-cli/1.18.0")
+    _tool(bin_dir, "git", "git version 2.43.0")
+    _checker(tmp_path, _probes()).run()
+
+    _tool(bin_dir, "aws", "aws-cli/2.15.0")
+    os.utime(aws, ns=(time.time_ns(), time.time_ns() + 10**9))
+    report = _checker(tmp_path, _probes()).run()
+
+    assert report["results"]["aws"]["ok"] and not report["results"]["aws"]["cached"]
+    assert not report["results"]["aws_credentials"]["cached"]
+    assert report["results"]["git"]["cached"] and report["results"]["docker"]["cached"]
+
+    # A different PATH is a different machine setup
+    other = PreflightCheck(_probes(), cache_path=tmp_path / "cache.json", path=f"{bin_dir}:/nonexistent").run()
+    assert other["cached"] == 0
+
+
+def test_missing_tools_timeouts_and_expired_credentials(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _tool(bin_dir, "aws", "")
+    _tool(bin_dir, "git", "git version 2.43.0", delay=5)
+
+    report = _checker(tmp_path, _probes(), timeout=0.3).run()
+
+    assert not report["ok"]
+    assert report["results"]["git"]["timed_out"]
+    assert report["results"]["docker"]["detail"] == "docker 설치 필요"
+    assert not report["results"]["aws_credentials"]["ok"]
+
+    again = _checker(tmp_path, _probes(), timeout=0.3, credential_ttl=0).run()
+    # Timeouts are retried and credential results expire; the rest comes from the cache
+    assert {name for name, r in again["results"].items() if r["cached"]} == {"aws", "docker"}
+
+
+def test_failed_credentials_are_rechecked_right_after_login(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _tool(bin_dir, "aws", "", exit_code=255)
+    _tool(bin_dir, "git", "git version 2.43.0")
+    assert not _checker(tmp_path, _probes()).run()["results"]["aws_credentials"]["ok"]
+
+    _tool(bin_dir, "aws", "arn:aws:iam::123456789012:user/learner")
+    report = _checker(tmp_path, _probes()).run()
+
+    credentials = report["results"]["aws_credentials"]
+    assert credentials["ok"] and not credentials["cached"]
+    assert _checker(tmp_path, _probes()).run()["results"]["aws_credentials"]["cached"]
+
+
+def test_sso_login_and_optional_probes(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    sso_cache = tmp_path / ".aws" / "sso" / "cache"
+    sso_cache.mkdir(parents=True)
+    (sso_cache / "token.json").write_text("{}")
+
+    probes = {probe.name: probe for probe in DEFAULT_PROBES}
+    checker = PreflightCheck(DEFAULT_PROBES, cache_path=tmp_path / "cache.json", path="")
+    before = checker.cache_key(probes["aws_credentials"])
+    # `aws sso login` only writes a new token into the SSO cache
+    (sso_cache / "fresh-token.json").write_text("{}")
+    assert str(sso_cache / "fresh-token.json") in _aws_files()
+    assert checker.cache_key(probes["aws_credentials"]) != before
+
+    assert not probes["docker"].required and not probes["gcp_credentials"].required
+    assert probes["aws"].required and probes["aws_credentials"].required
+
+
+def test_parse_version():
+    assert parse_version("Google Cloud SDK 460.0.0\nbq 2.0.101") == (460, 0, 0)
+    assert parse_version("Python 3.12") == (3, 12)
+    assert parse_version("unknown") is None
@@ -0,0 +1,76 @@
+import json
+import pstats
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .profiling import AutomationProfiler
+
+
+def _busy_worker(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def _setup_step():
+    return sorted(range(20000), key=lambda n: -n)
+
+
+def test_phases_threads_and_reports(tmp_path):
+    results = tmp_path / "results.json"
+    results.write_text(json.dumps({"success": True}))
+    profiler = AutomationProfiler(tmp_path / "profile", top_n=5, interval=0.005, prefix="run")
+
+    with profiler:
+        with profiler.phase("setup"):
+            _setup_step()
+        with profiler.phase("practice"):
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                list(pool.map(_busy_worker, [0.2] * 3))
+        with profiler.phase("setup"):
+            _setup_step()
+    summary = profiler.write_reports(results)
+
+    assert set(summary["phases"]) == {"setup", "practice"}
+    setup = summary["phases"]["setup"]
+    assert setup["runs"] == 2 and len(setup["top"]) == 5
+    assert any("_setup_step" in row["function"] for row in setup["top"])
+    loaded = pstats.Stats(setup["pstats"])
+    assert any(func == "_setup_step" for _, _, func in loaded.stats)
+
+    # Worker threads are only visible to the sampler, grouped by pool
+    sampling = summary["sampling"]
+    assert sampling["samples"] > 10 and sampling["phase_samples"]["practice"] > 0
+    assert any(thread.startswith("ThreadPoolExecutor-") and not thread.endswith(("_0", "_1", "_2"))
+               for thread in sampling["threads"])
+    collapsed = (tmp_path / "profile" / "run.collapsed").read_text().splitlines()
+    worker_stacks = [line for line in collapsed if "_busy_worker (test_profiling.py" in line]
+    assert worker_stacks and all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+    assert worker_stacks[0].startswith("ThreadPoolExecutor-")
+
+    # The summary lands in the existing results file without clobbering it
+    written = json.loads(results.read_text())
+    assert written["success"] is True and written["profile"] == summary
+
+
+def test_course_methods_record_phases_when_profiling(automation, tmp_path):
+    automation.config.update({"cfn_poll_interval": 0, "gcp_poll_interval": 0})
+    automation.profiler = AutomationProfiler(tmp_path, top_n=50)
+
+    automation.onboard_cohort_iam(["learner00"])
+    assert automation.day1_aws_basics() is True
+    assert automation.day2_gcp_basics() is True
+    automation.cleanup_resources()
+    summary = automation.profiler.write_reports()
+
+    assert set(summary["phases"]) == {"setup", "practice", "cleanup"}
+    # Day 1 and the day 2 GCP batches both land in the practice phase
+    assert summary["phases"]["practice"]["runs"] == 2
+    assert any("day1_aws_basics" in row["function"] for row in summary["phases"]["practice"]["top"])
+    assert any("deploy" in row["function"] for row in summary["phases"]["setup"]["top"])
+
+    # Without a profiler the decorated methods run untouched
+    automation.profiler = None
+    assert automation.day1_aws_basics() is True
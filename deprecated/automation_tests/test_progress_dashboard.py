@@ -0,0 +1,63 @@
+import io
+import logging
+import time
+
+from .progress_dashboard import ProgressDashboard
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def test_events_are_counted_and_written_to_html(tmp_path):
+    stream = io.StringIO()
+    dashboard = ProgressDashboard(refresh_interval=0.01, stream=stream, html_path=tmp_path / "d.html").start()
+    dashboard.emit("l1", "VPC 생성", "running")
+    dashboard.emit("l1", "VPC 생성", "success")
+    dashboard.emit("l2", "VPC 생성", "failed", error="quota exceeded")
+    dashboard.emit("l1", "", "finished")
+    dashboard.stop()
+
+    summary = dashboard.summary()
+    assert (summary["learners"], summary["finished"], summary["completed_steps"], summary["errors"]) == (2, 1, 2, 1)
+    assert "오류 1개" in stream.getvalue().splitlines()[-1]
+    assert "quota exceeded" in (tmp_path / "d.html").read_text(encoding="utf-8")
+
+
+def test_final_render_waits_for_an_in_flight_render():
+    active, overlaps = [], []
+
+    class SlowDashboard(ProgressDashboard):
+        def render(self):
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(len(active))
+            time.sleep(0.2)
+            active.pop()
+
+    dashboard = SlowDashboard(refresh_interval=0.01, stream=io.StringIO()).start()
+    dashboard.emit("l1", "VPC 생성", "running")
+    time.sleep(0.05)
+    dashboard.stop()
+    assert not overlaps and not active
+
+
+def test_console_logs_go_under_the_dashboard_while_it_runs():
+    terminal = _Terminal()
+    handler = logging.StreamHandler(terminal)
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        dashboard = ProgressDashboard(refresh_interval=0.01, stream=terminal).start()
+        assert handler not in root.handlers
+        logging.getLogger("automation_tests.worker").warning("버킷 생성 재시도")
+        dashboard.emit("l1", "S3 버킷 생성", "running")
+        dashboard.stop()
+
+        screens = terminal.getvalue().split("\033[H\033[J")
+        assert "버킷 생성 재시도" in screens[-1]
+        assert all(screen.startswith("📊") for screen in screens[1:])
+        assert handler in root.handlers
+    finally:
+        root.removeHandler(handler)
@@ -0,0 +1,41 @@
+from .provisioning_benchmark import (FakeCloud, _automation, compare_baseline, load_baseline, run_case,
+                                     save_baseline, standin_backend)
+
+
+def test_strategies_provision_every_learner_and_cohort_batches_day2():
+    cases = {strategy: run_case(strategy, learners=4, latency=0, workers=4)
+             for strategy in ("sequential", "threaded", "cohort")}
+
+    assert all(case["failures"] == 0 for case in cases.values())
+    # Concurrent learners share readiness polls, so threading never adds API calls
+    assert cases["threaded"]["api_calls"] <= cases["sequential"]["api_calls"]
+    # One cohort-wide batch per GCP API instead of one per learner
+    assert cases["cohort"]["api_calls"] < cases["threaded"]["api_calls"]
+    assert cases["threaded"]["peak_threads"] > cases["sequential"]["peak_threads"]
+    assert all(case["ready_p50_s"] <= case["ready_p95_s"] <= case["wall_s"] + 1e-3 for case in cases.values())
+
+
+def test_simulated_learners_get_their_own_learner_key():
+    with standin_backend(FakeCloud()):
+        keys = [_automation(prefix).learner_key for prefix in ("bench-000", "bench-001")]
+
+    assert keys == ["bench-000", "bench-001"]
+
+
+def test_baseline_round_trip_and_regression_detection(tmp_path):
+    path = tmp_path / "baseline.json"
+    base = {"strategy": "threaded", "learners": 10, "wall_s": 1.0, "ready_p95_s": 0.9,
+            "api_calls": 130, "peak_memory_mb": 2.0, "failures": 0}
+    save_baseline(path, [base], latency=0.02, workers=32)
+    baseline = load_baseline(path)
+
+    # Noise within the threshold or the absolute slack is not a regression
+    assert compare_baseline([dict(base, wall_s=1.05, peak_memory_mb=2.5)], baseline) == []
+
+    regressions = compare_baseline([dict(base, wall_s=1.5, api_calls=131, failures=1)], baseline)
+    assert {(r["metric"], r["current"]) for r in regressions} == {("wall_s", 1.5), ("api_calls", 131),
+                                                                   ("failures", 1)}
+    assert regressions[0]["case"] == "threaded/10" and regressions[0]["change_pct"] == 50.0
+
+    # Unknown cases are skipped rather than flagged
+    assert compare_baseline([dict(base, learners=50, wall_s=9.0)], baseline) == []
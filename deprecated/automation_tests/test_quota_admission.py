@@ -0,0 +1,87 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from botocore.exceptions import NoCredentialsError
+
+from . import cloud_basic_course_automation
+from .quota_admission import AdmissionController, QuotaSnapshot, ResourceBudget
+
+
+def test_vcpu_usage_counts_only_standard_families(fake_cloud):
+    fake_cloud.reset()
+    ec2 = fake_cloud.client("ec2")
+    for instance_type in ("t2.micro", "t3.large", "inf1.xlarge", "trn1.2xlarge", "dl1.24xlarge",
+                          "mac1.metal", "hpc6a.48xlarge", "x2idn.16xlarge"):
+        ec2.run_instances(ImageId="ami-1", InstanceType=instance_type, MinCount=1, MaxCount=1)
+
+    assert QuotaSnapshot({"ec2": ec2})._usage("vcpus") == 3
+
+
+class _ChangingSnapshot:
+    """Returns the next budget on every fetch, like usage dropping as other runs clean up."""
+
+    def __init__(self, *available):
+        self.available = list(available)
+        self.fetches = 0
+
+    def fetch(self, resources):
+        self.fetches += 1
+        limit = self.available[min(self.fetches, len(self.available)) - 1]
+        return {"vcpus": ResourceBudget("vcpus", limit, 0)}
+
+
+def test_acquire_waits_and_sees_capacity_freed_elsewhere():
+    snapshot = _ChangingSnapshot(0, 0, 1)
+    controller = AdmissionController({"vcpus": ResourceBudget("vcpus", 0, 0)}, {"vcpus": 1},
+                                     snapshot=snapshot, max_age=0.01)
+
+    assert controller.acquire("l1", timeout=2).learner == "l1"
+    assert snapshot.fetches >= 3
+    assert controller.stats()["budgets"]["vcpus"]["reserved"] == 1
+
+
+def test_refresh_keeps_reservations_and_respects_max_age():
+    snapshot = _ChangingSnapshot(5)
+    controller = AdmissionController({"vcpus": ResourceBudget("vcpus", 2, 0)}, {"vcpus": 1},
+                                     snapshot=snapshot, max_age=60)
+    controller.acquire("l1")
+
+    assert controller.refresh() is False and snapshot.fetches == 0
+    assert controller.refresh(force=True) is True
+    assert controller.capacity() == 4
+
+
+def test_released_capacity_wakes_a_waiting_learner():
+    controller = AdmissionController({"vcpus": ResourceBudget("vcpus", 1, 0)}, {"vcpus": 1})
+    controller.acquire("l1")
+    threading.Timer(0.05, controller.release, args=("l1",)).start()
+
+    assert controller.acquire("l2", timeout=2).learner == "l2"
+
+
+def test_quota_lookup_failures_do_not_block_the_run(automation_factory, fake_cloud):
+    fake_cloud.reset()
+    automation = automation_factory()
+
+    with patch.object(cloud_basic_course_automation, "get_admission_controller",
+                      side_effect=NoCredentialsError()):
+        assert automation.admit() is True
+    assert automation.admission is None
+
+    # The fake registry has no service-quotas client either: the run still completes
+    automation.run_course()
+    assert automation.run_history.recent_runs(1)[0]["status"] == "success"
+
+
+def test_unexpected_errors_finish_the_run_as_failed(automation_factory, fake_cloud):
+    fake_cloud.reset()
+    automation = automation_factory(quota_admission=False)
+
+    with patch.object(automation, "day1_aws_basics", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            automation.run_course()
+
+    assert automation.status == "failed"
+    assert automation.run_history.recent_runs(1)[0]["status"] == "failed"
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import MagicMock
+
+from .rate_limiter import AdaptiveRateLimiter, AdaptiveTokenBucket, classify_operation, is_exempt
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for the AIMD token-bucket rate limiter."""
+
+    def test_classify_operation(self):
+        assert classify_operation("DescribeInstances") == "read"
+        assert classify_operation("ListUsers") == "read"
+        assert classify_operation("CreateUser") == "mutate"
+        assert classify_operation("AddUserToGroup") == "mutate"
+
+    def test_throttle_halves_rate_once_per_cooldown(self):
+        bucket = AdaptiveTokenBucket(rate=10.0, max_rate=20.0, cooldown=60.0)
+        bucket.record_throttle()
+        bucket.record_throttle()
+        assert bucket.rate == pytest.approx(5.0)
+
+    def test_success_ramps_up_to_max_rate(self):
+        bucket = AdaptiveTokenBucket(rate=1.0, max_rate=3.0)
+        for _ in range(100):
+            bucket.record_success()
+        assert bucket.rate == pytest.approx(3.0)
+
+    def test_acquire_times_out_when_bucket_is_empty(self):
+        bucket = AdaptiveTokenBucket(rate=0.5, max_rate=1.0)
+        assert bucket.acquire(timeout=0) is True
+        assert bucket.acquire(timeout=0) is False
+
+    def test_buckets_are_shared_per_service_and_operation_class(self):
+        limiter = AdaptiveRateLimiter()
+        assert limiter.bucket("iam", "CreateUser") is limiter.bucket("iam", "AttachUserPolicy")
+        assert limiter.bucket("iam", "CreateUser") is not limiter.bucket("iam", "GetUser")
+        assert limiter.bucket("iam", "CreateUser") is not limiter.bucket("ec2", "CreateVpc")
+
+    def test_needs_retry_event_records_throttling(self):
+        limiter = AdaptiveRateLimiter()
+        initial = limiter.bucket("iam", "CreateUser").rate
+        http_response = MagicMock(status_code=400)
+        parsed = {"Error": {"Code": "Throttling"}}
+
+        limiter._on_needs_retry("needs-retry.iam.CreateUser", response=(http_response, parsed))
+
+        assert limiter.throttle_count == 1
+        assert limiter.bucket("iam", "CreateUser").rate < initial
+
+    def test_s3_object_operations_are_not_rate_limited(self):
+        limiter = AdaptiveRateLimiter()
+        assert is_exempt("s3", "PutObject") and is_exempt("s3", "UploadPart")
+        assert not is_exempt("s3", "CreateBucket") and not is_exempt("ec2", "PutObject")
+
+        for _ in range(500):
+            limiter.acquire("s3", "PutObject")
+        limiter.record_response("s3", "PutObject", "SlowDown")
+
+        assert limiter.throttle_count == 1
+        assert "s3:mutate" not in limiter.rates()
@@ -0,0 +1,78 @@
+import pytest
+from botocore.exceptions import NoCredentialsError
+
+from .testing.fake_cloud import FakeCloud
+from .readiness_poller import ReadinessPoller, get_readiness_poller
+
+
+def _instance(cloud, state="pending"):
+    instance_id = cloud.client("ec2").run_instances(ImageId="ami-1", InstanceType="t2.micro",
+                                                    MinCount=1, MaxCount=1)["Instances"][0]["InstanceId"]
+    cloud.instances[instance_id]["State"] = {"Name": state}
+    return instance_id
+
+
+def test_waiters_are_batched_and_termination_passes_through_shutting_down():
+    cloud = FakeCloud()
+    poller = ReadinessPoller(cloud.client("ec2"), min_interval=0.01, max_interval=0.02)
+    try:
+        ids = [_instance(cloud) for _ in range(5)]
+        futures = [poller.wait_for_instance(i, timeout=5) for i in ids]
+        for instance_id in ids:
+            cloud.instances[instance_id]["State"] = {"Name": "running"}
+        assert [f.result(timeout=5) for f in futures] == ["running"] * 5
+        # One describe per polling round for all five instances, not one per instance
+        assert len(cloud.calls_to("ec2", "describe_instances")) < 5 * 2
+
+        stopping = poller.wait_for_instance(ids[0], "terminated", timeout=5)
+        still_running = poller.wait_for_instance(ids[1], timeout=5)
+        cloud.instances[ids[0]]["State"] = {"Name": "shutting-down"}
+        cloud.instances[ids[1]]["State"] = {"Name": "shutting-down"}
+        with pytest.raises(RuntimeError, match="shutting-down"):
+            still_running.result(timeout=5)
+        assert not stopping.done()
+        cloud.instances[ids[0]]["State"] = {"Name": "terminated"}
+        assert stopping.result(timeout=5) == "terminated"
+    finally:
+        poller.stop()
+
+
+def test_waiters_added_right_after_stop_get_a_fresh_thread():
+    cloud = FakeCloud()
+    poller = ReadinessPoller(cloud.client("ec2"), min_interval=0.01, max_interval=0.02)
+    try:
+        poller.wait_for_instance(_instance(cloud), timeout=5)
+        old = poller._thread
+        poller.stop()
+        instance_id = _instance(cloud, "running")
+
+        # The old thread may still be alive here; the new waiter must not depend on it
+        future = poller.wait_for_instance(instance_id, timeout=5)
+        assert old is not None and poller._thread is not old
+        assert future.result(timeout=5) == "running"
+    finally:
+        poller.stop()
+
+
+class _BrokenEc2:
+    def get_paginator(self, operation):
+        raise NoCredentialsError()
+
+
+def test_non_api_errors_fail_pending_waiters_instead_of_hanging():
+    poller = ReadinessPoller(_BrokenEc2(), min_interval=0.01)
+    futures = [poller.wait_for_instance(f"i-{n}", timeout=60) for n in range(3)]
+
+    for future in futures:
+        with pytest.raises(NoCredentialsError):
+            future.result(timeout=5)
+    assert poller.pending() == 0
+
+
+def test_shared_pollers_are_keyed_by_credentials():
+    role = "arn:aws:iam::111122223333:role/CloudBasicLab"
+    base = get_readiness_poller("ap-northeast-2")
+
+    assert get_readiness_poller("ap-northeast-2") is base
+    assert get_readiness_poller("ap-northeast-2", role_arn=role) is not base
+    assert get_readiness_poller("us-east-1") is not base
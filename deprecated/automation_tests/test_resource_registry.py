@@ -0,0 +1,89 @@
+import tracemalloc
+
+import pytest
+
+from .resource_registry import ResourceRegistry
+
+
+def _populate(registry, learners=3):
+    for n in range(learners):
+        learner = f"learner-{n}"
+        registry.add("aws", "iam_user", f"{learner}-user", learner=learner)
+        registry.add("aws", "security_group", f"sg-{n}", f"{learner}-sg", learner=learner)
+        registry.add("aws", "ec2_instance", f"i-{n}", f"{learner}-instance", learner=learner,
+                     depends_on=[f"sg-{n}"])
+        registry.add("gcp", "gcp_instance", f"{learner}-vm", learner=learner)
+
+
+def test_lookup_and_secondary_indexes():
+    registry = ResourceRegistry()
+    _populate(registry)
+
+    record = registry.get("i-1")
+    assert (record.type, record.name, record.learner) == ("ec2_instance", "learner-1-instance", "learner-1")
+    assert record.depends_on == ("sg-1",)
+    assert registry.get("learner-0-user").name == "learner-0-user"
+    assert [r.id for r in registry.by_type("security_group")] == ["sg-0", "sg-1", "sg-2"]
+    assert [r.id for r in registry.by_learner("learner-2")] == ["learner-2-user", "sg-2", "i-2", "learner-2-vm"]
+    assert len(list(registry.by_provider("gcp"))) == 3
+    assert [r.id for r in registry.dependents("sg-0")] == ["i-0"]
+    assert list(registry.by_type("unknown")) == []
+
+
+def test_add_is_idempotent_and_requires_registered_dependencies():
+    registry = ResourceRegistry()
+    first = registry.add("aws", "security_group", "sg-1")
+    assert registry.add("aws", "security_group", "sg-1") == first
+    assert len(registry) == 1
+
+    with pytest.raises(KeyError):
+        registry.add("aws", "ec2_instance", "i-1", depends_on=["sg-missing"])
+
+
+def test_teardown_order_puts_dependents_first_and_skips_removed():
+    registry = ResourceRegistry()
+    _populate(registry, learners=2)
+    registry.remove("learner-0-user")
+
+    order = [r.id for r in registry.teardown_order(provider="aws")]
+    assert order == ["i-1", "sg-1", "learner-1-user", "i-0", "sg-0"]
+    assert [r.id for r in registry.teardown_order(learner="learner-1")] == \
+        ["learner-1-vm", "i-1", "sg-1", "learner-1-user"]
+
+
+def test_compact_keeps_indexes_consistent():
+    registry = ResourceRegistry()
+    _populate(registry, learners=2)
+    for resource_id in ("learner-0-user", "i-0"):
+        registry.remove(resource_id)
+
+    registry.compact()
+
+    assert len(registry) == 6
+    assert registry.get("i-1").depends_on == ("sg-1",)
+    assert [r.id for r in registry.by_learner("learner-0")] == ["sg-0", "learner-0-vm"]
+    assert [r.id for r in registry.dependents("sg-1")] == ["i-1"]
+
+
+def test_memory_is_a_fraction_of_dict_per_resource_layout():
+    count = 20000
+
+    tracemalloc.start()
+    legacy = {"aws": []}
+    for n in range(count):
+        legacy["aws"].append({"type": "ec2_instance", "id": f"i-{n:017x}", "name": f"learner-{n % 500}-instance",
+                              "learner": f"learner-{n % 500}", "region": "ap-northeast-2"})
+    legacy_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del legacy
+
+    tracemalloc.start()
+    registry = ResourceRegistry()
+    for n in range(count):
+        registry.add("aws", "ec2_instance", f"i-{n:017x}", f"learner-{n % 500}-instance",
+                     learner=f"learner-{n % 500}", region="ap-northeast-2")
+    registry_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Even with the ID index the registry must stay well below the list-of-dicts layout.
+    assert registry_bytes < legacy_bytes * 0.7
@@ -0,0 +1,115 @@
+import time
+import threading
+
+from botocore.exceptions import ClientError
+
+from .client_registry import ClientRegistry
+from .testing.fake_cloud import FakeCloud
+from .role_credentials import AssumedRoleCredentialCache
+
+ROLE = "arn:aws:iam::111122223333:role/CloudBasicLab"
+OTHER_ROLE = "arn:aws:iam::444455556666:role/CloudBasicLab"
+
+
+def _assume_calls(cloud, role_arn=ROLE):
+    return [c for c in cloud.calls_to("sts", "assume_role") if c["RoleArn"] == role_arn]
+
+
+def test_credentials_are_shared_across_threads_and_keyed_by_role_and_session():
+    cloud = FakeCloud(latency=0.05)
+    sts = cloud.client("sts")
+    cache = AssumedRoleCredentialCache()
+    try:
+        keys = []
+
+        def worker():
+            keys.append(cache.credentials(ROLE, sts).get_frozen_credentials().access_key)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # One AssumeRole for sixteen concurrent first uses
+        assert len(_assume_calls(cloud)) == 1 and len(set(keys)) == 1
+        assert cache.credentials(ROLE, sts) is cache.credentials(ROLE, sts)
+        assert cache.credentials(ROLE, sts, "grader") is not cache.credentials(ROLE, sts)
+        cache.credentials(OTHER_ROLE, sts, external_id="cohort-7").get_frozen_credentials()
+        assert _assume_calls(cloud, OTHER_ROLE) == [{
+            "RoleArn": OTHER_ROLE, "RoleSessionName": "cloud-basic-automation",
+            "DurationSeconds": 3600, "ExternalId": "cohort-7"}]
+        # Declaring a credential is lazy: no STS call until it is used
+        assert len(cloud.calls_to("sts", "assume_role")) == 2
+    finally:
+        cache.close()
+
+
+def test_background_refresh_keeps_sts_off_the_request_path():
+    cloud = FakeCloud()
+    cache = AssumedRoleCredentialCache(duration_seconds=3, refresh_margin=2)
+    try:
+        credentials = cache.credentials(ROLE, cloud.client("sts"))
+        first = credentials.get_frozen_credentials().access_key
+
+        # The refresher renews one second in, before any caller needs it
+        time.sleep(1.3)
+        assert len(_assume_calls(cloud)) == 2
+        assert credentials.get_frozen_credentials().access_key == first
+
+        # Once botocore's own advisory window opens it picks up the cached renewal without calling STS
+        time.sleep(0.9)
+        assert credentials.get_frozen_credentials().access_key != first
+        # Any further call comes from the refresher renewing the second credential, not from the caller
+        assert len(_assume_calls(cloud)) in (2, 3)
+        assert cache.stats()[0]["failures"] == 0
+    finally:
+        cache.close()
+
+
+class _FlakySts:
+    """Fails every AssumeRole after the first until healed."""
+
+    def __init__(self, client):
+        self.client = client
+        self.healed = False
+        self.attempts = 0
+
+    def assume_role(self, **kwargs):
+        self.attempts += 1
+        if self.attempts > 1 and not self.healed:
+            raise ClientError({"Error": {"Code": "Throttling", "Message": "Rate exceeded"}}, "AssumeRole")
+        return self.client.assume_role(**kwargs)
+
+
+def test_failed_background_refresh_falls_back_to_one_caller():
+    cloud = FakeCloud()
+    sts = _FlakySts(cloud.client("sts"))
+    cache = AssumedRoleCredentialCache(duration_seconds=4, refresh_margin=3.6)
+    try:
+        credentials = cache.credentials(ROLE, sts)
+        first = credentials.get_frozen_credentials().access_key
+        time.sleep(0.6)
+        assert cache.stats()[0]["failures"] >= 1
+
+        # Inside the mandatory window a caller refreshes synchronously once STS recovers
+        sts.healed = True
+        time.sleep(2.6)
+        assert credentials.get_frozen_credentials().access_key != first
+        assert cache.stats()[0]["failures"] == 0
+    finally:
+        cache.close()
+
+
+def test_registry_shares_one_session_per_assumed_role():
+    registry = ClientRegistry(rate_limiter=None)
+
+    s3 = registry.get_client("s3", "ap-northeast-2", role_arn=ROLE)
+    ec2 = registry.get_client("ec2", "ap-northeast-2", role_arn=ROLE)
+    other = registry.get_client("s3", "ap-northeast-2", role_arn=OTHER_ROLE)
+
+    assert registry.get_client("s3", "ap-northeast-2", role_arn=ROLE) is s3
+    assert other is not s3 and registry.get_client("s3", "ap-northeast-2") is not s3
+    assert s3._request_signer._credentials is ec2._request_signer._credentials
+    assert s3._request_signer._credentials.method == "assume-role-cache"
+    assert list(registry.client_map("ap-northeast-2", role_arn=ROLE)) == ["s3", "ec2"]
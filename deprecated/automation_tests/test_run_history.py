@@ -0,0 +1,61 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+
+from . import run_history
+from .run_history import RunHistoryStore
+
+
+def _record(store, cohort, step, status, duration=1.0):
+    run_id = store.start_run("test", "Cloud Basic", learner="l1", cohort=cohort)
+    store.record_step(run_id, step, status, 0.0, duration)
+    store.finish_run(run_id, status)
+
+
+def test_default_database_lives_outside_the_source_tree():
+    source_dir = Path(run_history.__file__).resolve().parent
+    assert source_dir not in run_history.DEFAULT_DB_PATH.resolve().parents
+
+
+def test_durations_and_rising_failures_need_enough_history():
+    store = RunHistoryStore(Path(":memory:"))
+    for n, duration in enumerate([3.0, 1.0, 2.0, 10.0]):
+        _record(store, f"c{n}", "RDS 인스턴스 생성", "success", duration)
+    assert store.step_duration_percentile("RDS 인스턴스 생성", 50) == 2.0
+    assert store.step_duration_percentile("RDS 인스턴스 생성", 95, last_cohorts=2) == 10.0
+
+    # A single failing cohort is not a trend
+    store = RunHistoryStore(Path(":memory:"))
+    for _ in range(3):
+        _record(store, "c9", "VPC 생성", "failed")
+    assert store.rising_failure_steps(window=2, min_runs=3) == []
+
+    store = RunHistoryStore(Path(":memory:"))
+    for cohort in ("old1", "old2"):
+        for status in ("success", "success", "failed"):
+            _record(store, cohort, "VPC 생성", status)
+    for cohort in ("new1", "new2"):
+        for status in ("failed", "failed", "success"):
+            _record(store, cohort, "VPC 생성", status)
+    rising = store.rising_failure_steps(window=2, min_runs=3)
+    assert [item["step"] for item in rising] == ["VPC 생성"]
+    assert rising[0]["previous_rate"] < rising[0]["recent_rate"]
+
+
+def test_run_course_records_the_real_cleanup_outcome(automation):
+    automation.config["quota_admission"] = False
+    automation.run_course()
+    run = automation.run_history.recent_runs(1)[0]
+    steps = automation.run_history._query("SELECT step, status FROM steps WHERE run_id = ?", (run["id"],))
+    assert {row["step"]: row["status"] for row in steps}["cleanup_resources"] == "success"
+    assert run["status"] == "success"
+
+    error = ClientError({"Error": {"Code": "BucketNotEmpty", "Message": "not empty"}}, "DeleteBucket")
+    automation.aws_s3_client = Mock(delete_bucket=Mock(side_effect=error))
+    automation.run_course()
+    run = automation.run_history.recent_runs(1)[0]
+    failed = automation.run_history._query(
+        "SELECT status, error FROM steps WHERE run_id = ? AND step = 'cleanup_resources'", (run["id"],))[0]
+    assert failed["status"] == "failed" and "s3_bucket" in failed["error"]
+    assert run["status"] == "failed"
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+from .script_analyzer import ScriptAnalyzer, index_script
+
+AUTOMATION_DIR = Path(__file__).resolve().parents[2] / "automation"
+
+SCRIPT = r'''#!/bin/bash
+set -euo pipefail
+# $COMMENTED is not a reference
+log_info() { echo "$1"; }
+function cleanup {
+    echo 'literal $SINGLE' "escaped \$ESCAPED"
+}
+REGION="${AWS_REGION:-us-west-2}"
+VPC_ID=$(aws --region "$REGION" ec2 create-vpc --cidr-block 10.0.0.0/16 \
+    --query 'Vpc.VpcId' --output text)
+echo "subnet: $(aws ec2 create-subnet --vpc-id "$VPC_ID" --cidr-block 10.0.1.0/24)"
+COUNT=$((COUNT_BASE + 1))
+cat <<'EOF'
+$QUOTED_HEREDOC
+EOF
+cat <<EOF
+$EXPANDED_HEREDOC
+EOF
+gcloud compute firewall-rules create allow-web --network=basic-course-network
+gsutil web set -m index.html gs://$BUCKET
+read -r -p "name: " LEARNER
+for zone in a b; do echo "$zone"; done
+echo "$UNDEFINED_AFTER_HEREDOC"
+TOOLS=("aws" "gcloud"
+       "$EXTRA_TOOL")
+gcloud version 2>&1 >/dev/null | head -1
+'''
+
+
+def test_single_pass_index_understands_shell_quoting_and_expansions():
+    index = index_script(SCRIPT)
+
+    assert set(index.functions) == {"log_info", "cleanup"}
+    assert {"REGION", "VPC_ID", "COUNT", "LEARNER", "zone", "TOOLS"} <= set(index.assignments)
+    assert set(index.references) == {"AWS_REGION", "REGION", "VPC_ID", "COUNT_BASE", "EXPANDED_HEREDOC",
+                                     "BUCKET", "zone", "UNDEFINED_AFTER_HEREDOC", "EXTRA_TOOL"}
+    # Array values and redirection targets are not commands
+    assert set(index.calls) == {"set", "echo", "aws", "cat", "gcloud", "gsutil", "read", "head"}
+    assert len(index.calls["aws"]) == 2 and len(index.calls["gcloud"]) == 2
+    assert index.guarded == ["AWS_REGION"]
+    # Line continuations keep later line numbers accurate
+    assert index.references["VPC_ID"] == [11]
+    assert index.references["EXPANDED_HEREDOC"] == [17]
+    assert index.references["UNDEFINED_AFTER_HEREDOC"] == [23]
+    assert [(c["tool"], c["service"], c["operation"]) for c in index.cloud_commands] == [
+        ("aws", "ec2", "create-vpc"), ("aws", "ec2", "create-subnet"),
+        ("gcloud", "compute", "firewall-rules create"), ("gsutil", "storage", "web set"),
+        ("gcloud", "version", None)]
+
+
+def _write(directory, name, body):
+    path = directory / name
+    path.write_text("#!/bin/bash\nset -e\n" + body)
+    return path
+
+
+def test_cross_script_variable_flow_and_per_hash_cache(tmp_path):
+    scripts = tmp_path / "automation"
+    scripts.mkdir()
+    _write(scripts, "networking.sh", "VPC_ID=$(aws ec2 create-vpc --query Vpc.VpcId --output text)\n")
+    security = _write(scripts, "security.sh", "aws ec2 create-security-group --vpc-id $VPC_ID\n")
+    _write(scripts, "sourced.sh", 'source "networking.sh"\naws ec2 describe-vpcs --vpc-ids "$VPC_ID"\n')
+    _write(scripts, "checked.sh", 'if [ -z "$PROJECT_ID" ]; then exit 1; fi\ngcloud config set project "$PROJECT_ID"\n')
+    cache = tmp_path / "cache.json"
+
+    analyzer = ScriptAnalyzer(cache_path=cache)
+    analyzer.load([scripts])
+    issues = analyzer.analyze(scripts)
+
+    assert analyzer.tokenized == 4
+    assert [(i["path"], i["line"], i["check"]) for i in issues] == [("security.sh", 3, "undefined-variable")]
+    assert "networking.sh:3" in issues[0]["message"]
+
+    warm = ScriptAnalyzer(cache_path=cache)
+    warm.load([scripts])
+    assert warm.tokenized == 0 and warm.analyze(scripts) == issues
+
+    security.write_text(security.read_text().replace("$VPC_ID", '"${VPC_ID:?}"'))
+    edited = ScriptAnalyzer(cache_path=cache)
+    edited.load([scripts])
+    assert edited.tokenized == 1 and edited.analyze(scripts) == []
+
+
+def test_lab_scripts_pass_static_analysis(tmp_path):
+    analyzer = ScriptAnalyzer(cache_path=tmp_path / "cache.json")
+    analyzer.load([AUTOMATION_DIR])
+
+    assert analyzer.analyze(AUTOMATION_DIR) == []
+    assert analyzer.cloud_summary()["aws ec2"] > 0
@@ -0,0 +1,130 @@
+import importlib
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from . import cloud_basic_course_automation
+from .shard_scheduler import NoShardCapacityError, PlacementStore, Shard, ShardScheduler
+from .testing.fake_cloud import FakeClientRegistry
+
+# The automation module imports its siblings as top-level modules; schedulers and quota
+# controllers handed to it must come from those copies so its exception handling matches.
+automation_shards = importlib.import_module(cloud_basic_course_automation.NoShardCapacityError.__module__)
+automation_quotas = importlib.import_module(cloud_basic_course_automation.AdmissionRejectedError.__module__)
+
+
+def _scheduler(fake_cloud=None, module=None, **capacities):
+    module = module or sys.modules[__name__]
+    shards = [module.Shard(name, f"region-{name}", max_learners=n) for name, n in capacities.items()]
+    registry = FakeClientRegistry(fake_cloud) if fake_cloud is not None else None
+    return module.ShardScheduler(shards, module.PlacementStore(Path(":memory:")), registry=registry)
+
+
+def test_placement_fills_shards_by_headroom_and_is_idempotent():
+    scheduler = _scheduler(a=4, b=2)
+
+    placed = [scheduler.place(f"l{n}").name for n in range(6)]
+    assert placed.count("a") == 4 and placed.count("b") == 2
+    assert scheduler.place("l0").name == placed[0]
+    with pytest.raises(NoShardCapacityError):
+        scheduler.place("l6")
+
+    scheduler.release("l1")
+    assert scheduler.shard_for("l1") is None and scheduler.place("l6").name == placed[1]
+    scheduler.set_capacity("a", 5)
+    assert scheduler.place("l7").name == "a"
+
+
+def test_placements_survive_a_restart(tmp_path):
+    store = PlacementStore(tmp_path / "placements.db")
+    placed = ShardScheduler([Shard("a", "r1"), Shard("b", "r2")], store).place("l1", cohort="c1").name
+
+    restarted = ShardScheduler([Shard("a", "r1"), Shard("b", "r2")], PlacementStore(tmp_path / "placements.db"))
+    assert restarted.shard_for("l1").name == placed and restarted.shards[placed].assigned == 1
+    assert [p["learner"] for p in restarted.store.list(cohort="c1")] == ["l1"]
+
+
+def test_shard_clients_feed_throttles_into_the_score(fake_cloud):
+    scheduler = _scheduler(fake_cloud, a=10)
+    shard = scheduler.shards["a"]
+    client = scheduler.client(shard, "ec2")
+    assert scheduler.client(shard, "ec2") is client
+
+    hook = client.meta.events.handlers["needs-retry"][0]
+    before = shard.score()
+    hook(response=(None, {"Error": {"Code": "RequestLimitExceeded"}}))
+    assert shard.score() < before
+
+
+def _controllers(vcpus_by_region):
+    controllers = {region: automation_quotas.AdmissionController(
+                       {"vcpus": automation_quotas.ResourceBudget("vcpus", limit, 0)}, {"vcpus": 1})
+                   for region, limit in vcpus_by_region.items()}
+    return lambda region, *args, **kwargs: controllers[region]
+
+
+def test_run_course_places_learners_and_moves_off_a_full_quota(automation_factory, fake_cloud):
+    fake_cloud.reset()
+    scheduler = _scheduler(fake_cloud, automation_shards, a=10, b=10)
+    quotas = _controllers({"region-a": 3, "region-b": 0})
+
+    with patch.object(cloud_basic_course_automation, "get_admission_controller", side_effect=quotas):
+        first = automation_factory(learner_id="l1")
+        first.shard_scheduler = scheduler
+        # Nothing is placed until the run starts
+        assert first.shard is None and not scheduler.store.list()
+
+        first.place_and_admit()
+
+    # The first pick had no vCPU quota left: capped at its current size and the learner moved on
+    assert scheduler.shards["b"].max_learners == 0
+    assert first.shard.name == "a" and first.config["aws_region"] == "region-a"
+    assert first.aws_ec2_client is scheduler.client(first.shard, "ec2")
+    # The admitting shard's capacity now follows its quota: this learner plus two more
+    assert scheduler.shards["a"].max_learners == 3
+    assert [p["shard"] for p in scheduler.store.list()] == ["a"]
+
+
+def test_run_course_is_rejected_when_no_shard_has_room(automation_factory, fake_cloud):
+    fake_cloud.reset()
+    scheduler = _scheduler(fake_cloud, automation_shards, a=0)
+    automation = automation_factory(quota_admission=False)
+    automation.shard_scheduler = scheduler
+
+    automation.run_course()
+
+    assert automation.status == "rejected" and automation.shard is None
+    assert not fake_cloud.calls
+    assert automation.run_history.recent_runs(1)[0]["status"] == "rejected"
+
+
+def test_unexpected_errors_release_the_reservation_and_placement(automation_factory, fake_cloud):
+    fake_cloud.reset()
+    scheduler = _scheduler(fake_cloud, automation_shards, a=10)
+    quotas = _controllers({"region-a": 1})
+    automation = automation_factory(learner_id="l1")
+    automation.shard_scheduler = scheduler
+
+    with patch.object(cloud_basic_course_automation, "get_admission_controller", side_effect=quotas), \
+            patch.object(automation, "day1_aws_basics", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            automation.run_course()
+
+    assert automation.run_history.recent_runs(1)[0]["status"] == "failed"
+    assert automation.admission.stats()["budgets"]["vcpus"]["reserved"] == 0
+    assert not scheduler.store.list()
+
+
+def test_placement_is_kept_while_resources_are_left_over(automation_factory, fake_cloud):
+    fake_cloud.reset()
+    scheduler = _scheduler(fake_cloud, automation_shards, a=10)
+    automation = automation_factory(learner_id="l1", quota_admission=False)
+    automation.shard_scheduler = scheduler
+
+    with patch.object(automation, "cleanup_resources", return_value=False):
+        automation.run_course()
+
+    assert len(automation.created_resources) > 0
+    assert [p["learner"] for p in scheduler.store.list()] == [automation.learner_key]
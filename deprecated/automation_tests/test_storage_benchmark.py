@@ -0,0 +1,35 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from .storage_benchmark import GcsTarget, S3Target, run_benchmark
+from .storage_standin import StorageStandinServer
+
+
+def test_benchmark_reruns_in_a_regional_bucket_and_cleans_up():
+    with StorageStandinServer(region="ap-northeast-2") as server:
+        targets = [S3Target("bench", server.endpoint_url, region="ap-northeast-2"),
+                   GcsTarget("bench-gcs", server.endpoint_url, project="demo-project")]
+
+        for _ in range(2):
+            # The second run finds both buckets already owned and reuses them
+            results = run_benchmark(targets, [64 * 1024], [2], [5 * 1024 * 1024], objects_per_worker=2)
+            assert [r["provider"] for r in results] == ["s3", "gcs"]
+            assert all(r["upload"]["ops_per_s"] > 0 and r["download"]["ops_per_s"] > 0 for r in results)
+
+        # Benchmark objects are deleted, only the reusable buckets remain
+        assert server.store.buckets == {"bench": {}, "bench-gcs": {}}
+
+
+def test_stand_in_rejects_bucket_requests_real_endpoints_reject(storage_standin):
+    # us-east-1 answers a repeated create from the owner with success
+    s3 = S3Target("no-location", storage_standin.endpoint_url, region="us-east-1")
+    s3.prepare()
+    s3.prepare()
+    storage_standin.store.buckets.pop("no-location")
+
+    with StorageStandinServer(region="eu-west-1") as server:
+        with pytest.raises(ClientError, match="IllegalLocationConstraintException"):
+            S3Target("wrong-region", server.endpoint_url, region="us-east-1").prepare()
+
+    with pytest.raises(RuntimeError, match="400"):
+        GcsTarget("no-project", storage_standin.endpoint_url, project="").prepare()
@@ -0,0 +1,94 @@
+import time
+
+from botocore.exceptions import ClientError
+
+from . import cloud_basic_course_automation
+from .testing.fake_cloud import FakeCloud
+from .warm_pool import Ec2PoolProvider, WarmPool, TAG_CREATED, TAG_STATE, TAG_CLAIMED_BY
+
+
+def _live(cloud):
+    return {i: inst for i, inst in cloud.instances.items() if inst["State"]["Name"] != "terminated"}
+
+
+def test_claim_hands_out_spares_and_refill_tops_the_pool_back_up():
+    cloud = FakeCloud()
+    pool = WarmPool("lab", Ec2PoolProvider(cloud.client("ec2"), "ami-1"), target_size=2)
+
+    pool.refill()
+    assert len(_live(cloud)) == 2 and pool.claim("alice") is None  # still "creating"
+    pool.refill()
+    assert pool.stats() == {"ready": 2, "creating": 0, "claimed": 0}
+
+    claimed = pool.claim("alice")
+    assert cloud.instances[claimed["id"]]["Tags"][TAG_CLAIMED_BY] == "alice"
+    pool.refill()
+    assert len(_live(cloud)) == 3 and pool.stats()["ready"] == 1
+
+    # Claimed resources are found again by tag and removed on release
+    assert pool.release("alice") == [claimed["id"]]
+    assert claimed["id"] not in _live(cloud)
+
+
+def test_expired_spares_are_deleted_and_never_claimed():
+    cloud = FakeCloud()
+    pool = WarmPool("lab", Ec2PoolProvider(cloud.client("ec2"), "ami-1"), target_size=1, ttl_seconds=60)
+    pool.refill()
+    pool.refill()
+    (spare_id,) = _live(cloud)
+
+    # The spare ages past its TTL before the next refill: claim() must not hand it out
+    cloud.instances[spare_id]["Tags"][TAG_CREATED] = str(int(time.time()) - 120)
+    pool._ready[0]["tags"][TAG_CREATED] = str(int(time.time()) - 120)
+    assert pool.claim("bob") is None
+
+    pool.refill()
+    assert cloud.instances[spare_id]["State"]["Name"] == "terminated"
+    assert len(_live(cloud)) == 1
+
+
+class _FailingTagProvider(Ec2PoolProvider):
+    def __init__(self, client):
+        super().__init__(client, "ami-1")
+        self.failures = 1
+
+    def tag(self, resource, tags):
+        if tags.get(TAG_STATE) == "claimed" and self.failures:
+            self.failures -= 1
+            raise ClientError({"Error": {"Code": "RequestLimitExceeded", "Message": "slow down"}}, "CreateTags")
+        super().tag(resource, tags)
+
+
+def test_spare_whose_claim_tag_fails_is_discarded_not_handed_out():
+    cloud = FakeCloud()
+    pool = WarmPool("lab", _FailingTagProvider(cloud.client("ec2")), target_size=2)
+    pool.refill()
+    pool.refill()
+    first, second = pool._ready[0]["id"], pool._ready[1]["id"]
+
+    claimed = pool.claim("carol")
+
+    assert claimed["id"] == second
+    assert cloud.instances[first]["State"]["Name"] == "terminated"
+
+
+def test_day1_uses_a_warm_instance_and_cleanup_terminates_it(automation, fake_cloud):
+    automation.config["ec2_warm_pool"] = "day1-test"
+    # Register through the automation module's own import so both sides see the same process-wide pool
+    module = cloud_basic_course_automation
+    pool = module.register_warm_pool(
+        module.WarmPool("day1-test-ap-northeast-2", module.Ec2PoolProvider(fake_cloud.client("ec2"), "ami-1"),
+                        target_size=1),
+        start=False)
+    pool.refill()
+    pool.refill()
+    (spare_id,) = _live(fake_cloud)
+
+    assert automation.day1_aws_basics() is True
+    assert not fake_cloud.calls_to("ec2", "run_instances")[1:]  # only the pool's own launch
+    instance = fake_cloud.instances[spare_id]
+    assert instance["Tags"]["Name"] == "mcp-basic-course-instance"
+    assert instance["SecurityGroupIds"] == list(fake_cloud.security_groups)
+
+    automation.cleanup_resources()
+    assert fake_cloud.instances[spare_id]["State"]["Name"] == "terminated"
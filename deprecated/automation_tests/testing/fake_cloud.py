@@ -0,0 +1,1151 @@
+#!/usr/bin/env python3
+"""
+테스트 / 벤치마크용 상태 보존형 가짜 클라우드 백엔드
+boto3 클라이언트와 googleapiclient 서비스의 호출 형태를 흉내내며 리소스 상태를 메모리에 보관합니다.
+
+- 주요 기능:
+  - IAM / EC2 / S3 (AWS), IAM / Compute / Storage (GCP) 의 실습에서 쓰는 API 를 지원합니다.
+  - 존재하지 않는 리소스, 중복 생성 등은 실제와 같은 오류 코드(ClientError, HttpError)로 응답합니다.
+  - 한 번 생성한 뒤 reset() 으로 상태만 비워 재사용하므로 테스트마다 Mock 트리를 새로 만들 필요가 없습니다.
+  - 호출 기록(calls)과 요청 지연 주입(latency), GCP 오류 주입(inject_gcp_errors)을 제공합니다.
+  - GCP 서비스는 new_batch_http_request() 배치를 지원하며 배치 하나를 한 번의 호출로 기록합니다.
+  - Compute 삭제는 작업(operation)을 반환하며, gcp_operation_polls 를 지정하면 그 횟수만큼 조회해야 완료됩니다.
+    다른 리소스가 사용 중인 네트워크 / 서브넷 / 디스크 삭제는 400 으로 거부합니다.
+  - GCP 리소스에는 생성 시각(creationTimestamp / timeCreated, updated)이 기록되고, GCS 객체는 gcp_objects 에 보관합니다.
+  - VPC 는 기본 라우트 테이블과 함께 생성되고, 서브넷 CIDR 이 VPC 범위를 벗어나거나 겹치면 InvalidSubnet.* 으로 거부합니다.
+  - STS AssumeRole 은 DurationSeconds 만큼 유효한 임시 자격 증명을 발급합니다. (최소 시간 제한 없음)
+  - CloudFormation 은 IAM 그룹 / 사용자 / 관리형 정책 리소스만 다루며, 실패하면 스택 단위로 롤백하고 스택 이벤트를 남깁니다.
+    cfn_stack_polls 를 지정하면 그 횟수만큼 조회해야 스택 작업이 완료됩니다.
+  - 종료한 EC2 인스턴스는 shutting-down 을 거치며, ec2_terminate_polls 를 지정하면 그 횟수만큼
+    describe_instances 를 호출해야 terminated 가 됩니다. 종료되지 않은 인스턴스가 쓰는 보안 그룹은 삭제할 수 없습니다.
+"""
+
+import copy
+import json
+import time
+import itertools
+import ipaddress
+from datetime import datetime, timezone
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import httplib2
+from botocore.exceptions import ClientError
+from googleapiclient.errors import HttpError
+
+
+def _client_error(code: str, operation: str, message: str = "", status: int = 400) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message or code},
+                        "ResponseMetadata": {"HTTPStatusCode": status}}, operation)
+
+
+def _http_error(status: int, message: str = "") -> HttpError:
+    resp = httplib2.Response({"status": status})
+    resp.reason = message or str(status)
+    content = json.dumps({"error": {"code": status, "message": message}}).encode("utf-8")
+    return HttpError(resp, content)
+
+
+def _tag_list(tags: Dict[str, str]) -> List[Dict[str, str]]:
+    return [{"Key": k, "Value": v} for k, v in tags.items()]
+
+
+def _filter(resources: List[Dict[str, Any]], filters: Optional[List[Dict[str, Any]]],
+            fields: Dict[str, str]) -> List[Dict[str, Any]]:
+    """EC2 Filters 적용 (tag:키 와 fields 에 지정한 필드 이름 지원)"""
+    for f in filters or []:
+        name, values = f["Name"], f["Values"]
+        if name.startswith("tag:"):
+            resources = [r for r in resources if r["Tags"].get(name[4:]) in values]
+        elif name in fields:
+            resources = [r for r in resources if r.get(fields[name]) in values]
+    return resources
+
+
+def _tags(tag_specifications: Optional[List[Dict[str, Any]]], resource_type: str) -> Dict[str, str]:
+    tags = {}
+    for spec in tag_specifications or []:
+        if spec.get("ResourceType") == resource_type:
+            tags.update({t["Key"]: t["Value"] for t in spec.get("Tags", [])})
+    return tags
+
+
+class FakeCloud:
+    """AWS / GCP 리소스 상태를 메모리에 보관하는 가짜 백엔드"""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: API 호출마다 추가할 지연 시간(초)
+        """
+        self.latency = latency
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """모든 리소스와 호출 기록 초기화"""
+        with self.lock:
+            self.iam_users: Dict[str, Dict[str, Any]] = {}
+            self.iam_roles: Dict[str, Dict[str, Any]] = {}
+            self.iam_groups: Dict[str, Dict[str, Any]] = {}
+            self.iam_policies: Dict[str, Dict[str, Any]] = {}
+            self.stacks: Dict[str, Dict[str, Any]] = {}
+            self.cfn_stack_polls = 0
+            self.vpcs: Dict[str, Dict[str, Any]] = {}
+            self.subnets: Dict[str, Dict[str, Any]] = {}
+            self.internet_gateways: Dict[str, Dict[str, Any]] = {}
+            self.route_tables: Dict[str, Dict[str, Any]] = {}
+            self.security_groups: Dict[str, Dict[str, Any]] = {}
+            self.instances: Dict[str, Dict[str, Any]] = {}
+            self.terminating: Dict[str, int] = {}
+            self.ec2_terminate_polls = 0
+            self.buckets: Dict[str, Dict[str, Any]] = {}
+            self.gcp: Dict[str, Dict[str, Dict[str, Any]]] = {
+                "serviceAccounts": {}, "instances": {}, "firewalls": {}, "buckets": {},
+                "networks": {}, "subnetworks": {}, "disks": {}, "addresses": {},
+            }
+            self.gcp_operations: Dict[str, List[Any]] = {}
+            self.gcp_objects: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            self.gcp_operation_polls = 0
+            self.calls: List[Tuple[str, str, Dict[str, Any]]] = []
+            self.gcp_errors: Dict[str, List[Tuple[int, str]]] = {}
+            self._ids = itertools.count(1)
+
+    def _next_id(self, prefix: str) -> str:
+        return f"{prefix}-{next(self._ids):017x}"
+
+    def record(self, service: str, operation: str, kwargs: Dict[str, Any]):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.calls.append((service, operation, kwargs))
+
+    def inject_gcp_errors(self, method_id: str, *statuses: int, message: Optional[str] = None):
+        """다음 GCP 호출(method_id 예: 'compute.instances.insert')들이 차례로 반환할 오류 상태 코드"""
+        with self.lock:
+            self.gcp_errors.setdefault(method_id, []).extend(
+                (status, message or f"injected {method_id}") for status in statuses)
+
+    def _take_gcp_error(self, method_id: str) -> Optional[HttpError]:
+        errors = self.gcp_errors.get(method_id)
+        if errors:
+            return _http_error(*errors.pop(0))
+        return None
+
+    @staticmethod
+    def timestamp() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+    def put_gcs_object(self, bucket: str, name: str, size: int = 0):
+        """GCS 객체 추가 (버킷 updated 는 바뀌지 않음, 실제 GCS 와 동일)"""
+        with self.lock:
+            self.gcp_objects.setdefault(bucket, {})[name] = {
+                "name": name, "bucket": bucket, "size": str(size), "updated": self.timestamp()}
+
+    def _gcp_users(self, kind: str, name: str) -> List[str]:
+        """리소스를 사용 중인 다른 GCP 리소스 이름 목록"""
+        def refers(value: Optional[str], collection: str) -> bool:
+            return bool(value) and (value == name or value.endswith(f"/{collection}/{name}"))
+
+        users = []
+        if kind == "networks":
+            for other in ("firewalls", "subnetworks"):
+                users += [n for n, item in self.gcp[other].items() if refers(item.get("network"), "networks")]
+        for instance_name, instance in self.gcp["instances"].items():
+            interfaces = instance.get("networkInterfaces", [])
+            if ((kind == "networks" and any(refers(i.get("network"), "networks") for i in interfaces))
+                    or (kind == "subnetworks" and any(refers(i.get("subnetwork"), "subnetworks")
+                                                      for i in interfaces))
+                    or (kind == "disks" and any(refers(d.get("source"), "disks")
+                                                for d in instance.get("disks", [])))):
+                users.append(instance_name)
+        return users
+
+    def _gcp_operation(self, target: str, kwargs: Dict[str, Any], finish: Callable[[], Any]) -> Dict[str, Any]:
+        """Compute 작업 생성 (gcp_operation_polls 가 0 이면 즉시 완료)"""
+        operation = {"kind": "compute#operation", "name": f"operation-{next(self._ids)}-{target}",
+                     "status": "DONE", "targetLink": target}
+        for scope in ("zone", "region"):
+            if scope in kwargs:
+                operation[scope] = f"projects/{kwargs.get('project')}/{scope}s/{kwargs[scope]}"
+        if self.gcp_operation_polls:
+            operation["status"] = "RUNNING"
+            self.gcp_operations[operation["name"]] = [operation, self.gcp_operation_polls, finish]
+        else:
+            finish()
+        return dict(operation)
+
+    def _poll_gcp_operation(self, name: str) -> Dict[str, Any]:
+        entry = self.gcp_operations.get(name)
+        if entry is None:
+            raise _http_error(404, f"operation {name} not found")
+        operation, remaining, finish = entry
+        entry[1] = remaining - 1
+        if entry[1] <= 0 and operation["status"] != "DONE":
+            finish()
+            operation["status"] = "DONE"
+        return dict(operation)
+
+    def calls_to(self, service: str, operation: str) -> List[Dict[str, Any]]:
+        """특정 API 호출 인자 목록"""
+        with self.lock:
+            return [kwargs for s, op, kwargs in self.calls if s == service and op == operation]
+
+    def resource_count(self) -> int:
+        """현재 존재하는 리소스 수 (종료된 인스턴스 제외)"""
+        with self.lock:
+            live_instances = [i for i in self.instances.values() if i["State"]["Name"] != "terminated"]
+            return (len(self.iam_users) + len(self.iam_roles) + len(self.iam_groups) + len(self.iam_policies)
+                    + len(self.vpcs) + len(self.subnets)
+                    + len(self.internet_gateways) + len(self.security_groups) + len(live_instances)
+                    + len(self.buckets) + sum(len(v) for v in self.gcp.values()))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """리소스 상태 비교용 스냅샷 (ID 제외, 이름 기준)"""
+        with self.lock:
+            return {
+                "iam_users": sorted(self.iam_users),
+                "iam_roles": sorted(self.iam_roles),
+                "vpcs": sorted(v["Tags"].get("Name", "") for v in self.vpcs.values()),
+                "subnets": sorted(s["Tags"].get("Name", "") for s in self.subnets.values()),
+                "security_groups": sorted(sg["GroupName"] for sg in self.security_groups.values()),
+                "instances": sorted(
+                    i["Tags"].get("Name", "") for i in self.instances.values()
+                    if i["State"]["Name"] != "terminated"),
+                "buckets": sorted(self.buckets),
+                "gcp": {kind: sorted(items) for kind, items in self.gcp.items()},
+            }
+
+    def client(self, service_name: str) -> "FakeAwsClient":
+        handlers = {"iam": _IamHandlers, "ec2": _Ec2Handlers, "s3": _S3Handlers,
+                    "sts": _StsHandlers, "cloudformation": _CloudFormationHandlers}.get(service_name)
+        if handlers is None:
+            raise ValueError(f"지원하지 않는 가짜 AWS 서비스: {service_name}")
+        return FakeAwsClient(self, service_name, handlers(self))
+
+    def gcp_service(self, service_name: str, version: str = "v1", **kwargs) -> "FakeGcpService":
+        return FakeGcpService(self, service_name)
+
+
+# ---------------------------------------------------------------- AWS
+
+class _FakeEvents:
+    """client.meta.events 대체 (등록한 핸들러는 handlers 에 보관만 하고 호출하지 않음)"""
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Callable[..., Any]]] = {}
+
+    def register(self, event_name: str, handler: Callable[..., Any], *args, **kwargs):
+        self.handlers.setdefault(event_name, []).append(handler)
+
+
+class _FakeMeta:
+    def __init__(self, service_name: str):
+        self.service_model = type("ServiceModel", (), {"service_name": service_name})()
+        self.events = _FakeEvents()
+        self.region_name = "fake-region"
+
+
+class _FakePaginator:
+    def __init__(self, method: Callable[..., Dict[str, Any]]):
+        self._method = method
+
+    def paginate(self, **kwargs):
+        yield self._method(**kwargs)
+
+
+class FakeAwsClient:
+    """boto3 클라이언트 형태의 가짜 클라이언트"""
+
+    def __init__(self, cloud: FakeCloud, service_name: str, handlers: Any):
+        self._cloud = cloud
+        self._service_name = service_name
+        self._handlers = handlers
+        self.meta = _FakeMeta(service_name)
+
+    def __getattr__(self, operation: str):
+        handler = getattr(self._handlers, operation, None)
+        if handler is None or operation.startswith("_"):
+            raise AttributeError(f"가짜 {self._service_name} 클라이언트에 {operation} 없음")
+
+        def call(**kwargs):
+            self._cloud.record(self._service_name, operation, kwargs)
+            with self._cloud.lock:
+                return handler(**kwargs)
+        return call
+
+    def get_paginator(self, operation: str) -> _FakePaginator:
+        return _FakePaginator(getattr(self, operation))
+
+
+class _IamHandlers:
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+
+    def get_user(self, UserName: str):
+        user = self.cloud.iam_users.get(UserName)
+        if user is None:
+            raise _client_error("NoSuchEntity", "GetUser", status=404)
+        return {"User": user}
+
+    def create_user(self, UserName: str, **kwargs):
+        if UserName in self.cloud.iam_users:
+            raise _client_error("EntityAlreadyExists", "CreateUser", status=409)
+        user = {"UserName": UserName, "UserId": self.cloud._next_id("AIDA"),
+                "Arn": f"arn:aws:iam::000000000000:user/{UserName}"}
+        self.cloud.iam_users[UserName] = user
+        return {"User": user}
+
+    def delete_user(self, UserName: str):
+        if self.cloud.iam_users.pop(UserName, None) is None:
+            raise _client_error("NoSuchEntity", "DeleteUser", status=404)
+        return {}
+
+    def list_users(self, **kwargs):
+        return {"Users": list(self.cloud.iam_users.values()), "IsTruncated": False}
+
+    def create_role(self, RoleName: str, AssumeRolePolicyDocument: str, Path: str = "/", **kwargs):
+        if RoleName in self.cloud.iam_roles:
+            raise _client_error("EntityAlreadyExists", "CreateRole", status=409)
+        role = {"RoleName": RoleName, "Path": Path, "RoleId": self.cloud._next_id("AROA"),
+                "Arn": f"arn:aws:iam::000000000000:role{Path}{RoleName}",
+                "AssumeRolePolicyDocument": json.loads(AssumeRolePolicyDocument)}
+        self.cloud.iam_roles[RoleName] = role
+        return {"Role": role}
+
+    def update_assume_role_policy(self, RoleName: str, PolicyDocument: str):
+        role = self.cloud.iam_roles.get(RoleName)
+        if role is None:
+            raise _client_error("NoSuchEntity", "UpdateAssumeRolePolicy", status=404)
+        role["AssumeRolePolicyDocument"] = json.loads(PolicyDocument)
+        return {}
+
+    def delete_role(self, RoleName: str):
+        if self.cloud.iam_roles.pop(RoleName, None) is None:
+            raise _client_error("NoSuchEntity", "DeleteRole", status=404)
+        return {}
+
+    def list_roles(self, PathPrefix: str = "/", **kwargs):
+        roles = [r for r in self.cloud.iam_roles.values() if r["Path"].startswith(PathPrefix)]
+        return {"Roles": roles, "IsTruncated": False}
+
+
+class _Ec2Handlers:
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+
+    def describe_vpcs(self, Filters: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        vpcs = _filter(list(self.cloud.vpcs.values()), Filters, {"vpc-id": "VpcId"})
+        return {"Vpcs": [dict(v, Tags=_tag_list(v["Tags"])) for v in vpcs]}
+
+    def create_vpc(self, CidrBlock: str, TagSpecifications: Optional[List[Dict[str, Any]]] = None,
+                   **kwargs):
+        vpc_id = self.cloud._next_id("vpc")
+        self.cloud.vpcs[vpc_id] = {"VpcId": vpc_id, "CidrBlock": CidrBlock,
+                                   "Tags": _tags(TagSpecifications, "vpc")}
+        # VPC 마다 기본(main) 라우트 테이블이 함께 생성됨
+        table_id = self.cloud._next_id("rtb")
+        self.cloud.route_tables[table_id] = {
+            "RouteTableId": table_id, "VpcId": vpc_id,
+            "Routes": [{"DestinationCidrBlock": CidrBlock, "GatewayId": "local"}],
+            "Associations": [{"Main": True, "RouteTableId": table_id}]}
+        return {"Vpc": dict(self.cloud.vpcs[vpc_id], Tags=_tag_list(self.cloud.vpcs[vpc_id]["Tags"]))}
+
+    def delete_vpc(self, VpcId: str):
+        if VpcId not in self.cloud.vpcs:
+            raise _client_error("InvalidVpcID.NotFound", "DeleteVpc")
+        in_use = (any(s["VpcId"] == VpcId for s in self.cloud.subnets.values())
+                  or any(g["VpcId"] == VpcId for g in self.cloud.security_groups.values())
+                  or any(a["VpcId"] == VpcId for igw in self.cloud.internet_gateways.values()
+                         for a in igw["Attachments"]))
+        if in_use:
+            raise _client_error("DependencyViolation", "DeleteVpc")
+        del self.cloud.vpcs[VpcId]
+        for table_id in [t for t, table in self.cloud.route_tables.items() if table["VpcId"] == VpcId]:
+            del self.cloud.route_tables[table_id]
+        return {}
+
+    def create_internet_gateway(self, TagSpecifications: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        igw_id = self.cloud._next_id("igw")
+        self.cloud.internet_gateways[igw_id] = {"InternetGatewayId": igw_id, "Attachments": [],
+                                                "Tags": _tags(TagSpecifications, "internet-gateway")}
+        igw = self.cloud.internet_gateways[igw_id]
+        return {"InternetGateway": dict(igw, Tags=_tag_list(igw["Tags"]))}
+
+    def _internet_gateway(self, igw_id: str, operation: str) -> Dict[str, Any]:
+        if igw_id not in self.cloud.internet_gateways:
+            raise _client_error("InvalidInternetGatewayID.NotFound", operation)
+        return self.cloud.internet_gateways[igw_id]
+
+    def attach_internet_gateway(self, InternetGatewayId: str, VpcId: str):
+        igw = self._internet_gateway(InternetGatewayId, "AttachInternetGateway")
+        if igw["Attachments"]:
+            raise _client_error("Resource.AlreadyAssociated", "AttachInternetGateway")
+        igw["Attachments"] = [{"VpcId": VpcId, "State": "available"}]
+        return {}
+
+    def detach_internet_gateway(self, InternetGatewayId: str, VpcId: str):
+        igw = self._internet_gateway(InternetGatewayId, "DetachInternetGateway")
+        if not any(a["VpcId"] == VpcId for a in igw["Attachments"]):
+            raise _client_error("Gateway.NotAttached", "DetachInternetGateway")
+        igw["Attachments"] = []
+        return {}
+
+    def delete_internet_gateway(self, InternetGatewayId: str):
+        igw = self._internet_gateway(InternetGatewayId, "DeleteInternetGateway")
+        if igw["Attachments"]:
+            raise _client_error("DependencyViolation", "DeleteInternetGateway")
+        del self.cloud.internet_gateways[InternetGatewayId]
+        return {}
+
+    def describe_internet_gateways(self, Filters: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        gateways = list(self.cloud.internet_gateways.values())
+        for f in Filters or []:
+            if f["Name"] == "attachment.vpc-id":
+                gateways = [g for g in gateways if any(a["VpcId"] in f["Values"] for a in g["Attachments"])]
+        gateways = _filter(gateways, [f for f in Filters or [] if f["Name"].startswith("tag:")], {})
+        return {"InternetGateways": [dict(g, Tags=_tag_list(g["Tags"])) for g in gateways]}
+
+    def describe_route_tables(self, Filters: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        tables = list(self.cloud.route_tables.values())
+        for f in Filters or []:
+            if f["Name"] == "vpc-id":
+                tables = [t for t in tables if t["VpcId"] in f["Values"]]
+            elif f["Name"] == "association.main":
+                main = "true" in f["Values"]
+                tables = [t for t in tables if any(a["Main"] == main for a in t["Associations"])]
+        return {"RouteTables": [dict(t, Routes=list(t["Routes"])) for t in tables]}
+
+    def create_route(self, RouteTableId: str, DestinationCidrBlock: str, GatewayId: Optional[str] = None,
+                     **kwargs):
+        table = self.cloud.route_tables.get(RouteTableId)
+        if table is None:
+            raise _client_error("InvalidRouteTableID.NotFound", "CreateRoute")
+        if any(r["DestinationCidrBlock"] == DestinationCidrBlock for r in table["Routes"]):
+            raise _client_error("RouteAlreadyExists", "CreateRoute")
+        table["Routes"].append({"DestinationCidrBlock": DestinationCidrBlock, "GatewayId": GatewayId})
+        return {"Return": True}
+
+    def describe_subnets(self, Filters: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        subnets = _filter(list(self.cloud.subnets.values()), Filters, {"vpc-id": "VpcId"})
+        return {"Subnets": [dict(s, Tags=_tag_list(s["Tags"])) for s in subnets]}
+
+    def create_subnet(self, VpcId: str, CidrBlock: str, AvailabilityZone: Optional[str] = None,
+                      TagSpecifications: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        if VpcId not in self.cloud.vpcs:
+            raise _client_error("InvalidVpcID.NotFound", "CreateSubnet")
+        block = ipaddress.ip_network(CidrBlock)
+        if not block.subnet_of(ipaddress.ip_network(self.cloud.vpcs[VpcId]["CidrBlock"])):
+            raise _client_error("InvalidSubnet.Range", "CreateSubnet", f"The CIDR '{CidrBlock}' is invalid.")
+        if any(s["VpcId"] == VpcId and block.overlaps(ipaddress.ip_network(s["CidrBlock"]))
+               for s in self.cloud.subnets.values()):
+            raise _client_error("InvalidSubnet.Conflict", "CreateSubnet",
+                                f"The CIDR '{CidrBlock}' conflicts with another subnet")
+        subnet_id = self.cloud._next_id("subnet")
+        self.cloud.subnets[subnet_id] = {"SubnetId": subnet_id, "VpcId": VpcId, "CidrBlock": CidrBlock,
+                                         "AvailabilityZone": AvailabilityZone,
+                                         "Tags": _tags(TagSpecifications, "subnet")}
+        return {"Subnet": dict(self.cloud.subnets[subnet_id],
+                               Tags=_tag_list(self.cloud.subnets[subnet_id]["Tags"]))}
+
+    def delete_subnet(self, SubnetId: str):
+        if self.cloud.subnets.pop(SubnetId, None) is None:
+            raise _client_error("InvalidSubnetID.NotFound", "DeleteSubnet")
+        return {}
+
+    def describe_security_groups(self, GroupNames: Optional[List[str]] = None,
+                                 GroupIds: Optional[List[str]] = None,
+                                 Filters: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        groups = _filter(list(self.cloud.security_groups.values()), Filters,
+                         {"group-name": "GroupName", "vpc-id": "VpcId"})
+        if GroupNames:
+            groups = [g for g in groups if g["GroupName"] in GroupNames]
+            if len(groups) < len(GroupNames):
+                raise _client_error("InvalidGroup.NotFound", "DescribeSecurityGroups")
+        if GroupIds:
+            groups = [g for g in groups if g["GroupId"] in GroupIds]
+            if len(groups) < len(GroupIds):
+                raise _client_error("InvalidGroup.NotFound", "DescribeSecurityGroups")
+        return {"SecurityGroups": [dict(g, Tags=_tag_list(g["Tags"])) for g in groups]}
+
+    def create_security_group(self, GroupName: str, Description: str, VpcId: Optional[str] = None,
+                              TagSpecifications: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        if any(g["GroupName"] == GroupName for g in self.cloud.security_groups.values()):
+            raise _client_error("InvalidGroup.Duplicate", "CreateSecurityGroup")
+        group_id = self.cloud._next_id("sg")
+        self.cloud.security_groups[group_id] = {
+            "GroupId": group_id, "GroupName": GroupName, "Description": Description,
+            "VpcId": VpcId, "IpPermissions": [], "Tags": _tags(TagSpecifications, "security-group"),
+        }
+        return {"GroupId": group_id}
+
+    def authorize_security_group_ingress(self, GroupId: str, IpPermissions: List[Dict[str, Any]],
+                                         **kwargs):
+        group = self.cloud.security_groups.get(GroupId)
+        if group is None:
+            raise _client_error("InvalidGroup.NotFound", "AuthorizeSecurityGroupIngress")
+        group["IpPermissions"].extend(IpPermissions)
+        return {"Return": True}
+
+    def delete_security_group(self, GroupId: Optional[str] = None, GroupName: Optional[str] = None):
+        if GroupId is None:
+            GroupId = next((g["GroupId"] for g in self.cloud.security_groups.values()
+                            if g["GroupName"] == GroupName), None)
+        if GroupId not in self.cloud.security_groups:
+            raise _client_error("InvalidGroup.NotFound", "DeleteSecurityGroup")
+        in_use = any(GroupId in i["SecurityGroupIds"] for i in self.cloud.instances.values()
+                     if i["State"]["Name"] != "terminated")
+        if in_use:
+            raise _client_error("DependencyViolation", "DeleteSecurityGroup")
+        del self.cloud.security_groups[GroupId]
+        return {}
+
+    def run_instances(self, ImageId: str, InstanceType: str, MinCount: int, MaxCount: int,
+                      SecurityGroupIds: Optional[List[str]] = None,
+                      TagSpecifications: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        created = []
+        for _ in range(MaxCount):
+            instance_id = self.cloud._next_id("i")
+            instance = {
+                "InstanceId": instance_id, "ImageId": ImageId, "InstanceType": InstanceType,
+                "State": {"Name": "running"}, "SecurityGroupIds": list(SecurityGroupIds or []),
+                "Tags": _tags(TagSpecifications, "instance"),
+            }
+            self.cloud.instances[instance_id] = instance
+            created.append(self._describe(instance))
+        return {"Instances": created}
+
+    @staticmethod
+    def _describe(instance: Dict[str, Any]) -> Dict[str, Any]:
+        described = dict(instance)
+        described["Tags"] = [{"Key": k, "Value": v} for k, v in instance["Tags"].items()]
+        return described
+
+    def _advance_terminations(self):
+        """조회할 때마다 shutting-down 인스턴스의 남은 조회 횟수를 줄이고 0 이 되면 terminated"""
+        for instance_id, polls_left in list(self.cloud.terminating.items()):
+            if polls_left <= 1:
+                del self.cloud.terminating[instance_id]
+                self.cloud.instances[instance_id]["State"] = {"Name": "terminated"}
+            else:
+                self.cloud.terminating[instance_id] = polls_left - 1
+
+    def describe_instances(self, InstanceIds: Optional[List[str]] = None,
+                           Filters: Optional[List[Dict[str, Any]]] = None, **kwargs):
+        self._advance_terminations()
+        instances = list(self.cloud.instances.values())
+        if InstanceIds:
+            missing = [i for i in InstanceIds if i not in self.cloud.instances]
+            if missing:
+                raise _client_error("InvalidInstanceID.NotFound", "DescribeInstances")
+            instances = [i for i in instances if i["InstanceId"] in InstanceIds]
+        for f in Filters or []:
+            name, values = f["Name"], f["Values"]
+            if name == "instance-id":
+                instances = [i for i in instances if i["InstanceId"] in values]
+            elif name == "instance-state-name":
+                instances = [i for i in instances if i["State"]["Name"] in values]
+            elif name.startswith("tag:"):
+                key = name[4:]
+                instances = [i for i in instances if i["Tags"].get(key) in values]
+        return {"Reservations": [{"Instances": [self._describe(i)]} for i in instances]}
+
+    def create_tags(self, Resources: List[str], Tags: List[Dict[str, str]]):
+        for resource_id in Resources:
+            instance = self.cloud.instances.get(resource_id)
+            if instance is None:
+                raise _client_error("InvalidInstanceID.NotFound", "CreateTags")
+            instance["Tags"].update({t["Key"]: t["Value"] for t in Tags})
+        return {}
+
+    def modify_instance_attribute(self, InstanceId: str, Groups: Optional[List[str]] = None, **kwargs):
+        instance = self.cloud.instances.get(InstanceId)
+        if instance is None:
+            raise _client_error("InvalidInstanceID.NotFound", "ModifyInstanceAttribute")
+        if Groups is not None:
+            instance["SecurityGroupIds"] = list(Groups)
+        return {}
+
+    def terminate_instances(self, InstanceIds: List[str]):
+        changes = []
+        for instance_id in InstanceIds:
+            instance = self.cloud.instances.get(instance_id)
+            if instance is None:
+                raise _client_error("InvalidInstanceID.NotFound", "TerminateInstances")
+            previous = instance["State"]["Name"]
+            if previous not in ("shutting-down", "terminated"):
+                if self.cloud.ec2_terminate_polls:
+                    instance["State"] = {"Name": "shutting-down"}
+                    self.cloud.terminating[instance_id] = self.cloud.ec2_terminate_polls
+                else:
+                    instance["State"] = {"Name": "terminated"}
+            changes.append({"InstanceId": instance_id, "PreviousState": {"Name": previous},
+                            "CurrentState": dict(instance["State"])})
+        return {"TerminatingInstances": changes}
+
+
+class _S3Handlers:
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+
+    def head_bucket(self, Bucket: str):
+        if Bucket not in self.cloud.buckets:
+            raise _client_error("404", "HeadBucket", "Not Found", status=404)
+        return {}
+
+    def create_bucket(self, Bucket: str, **kwargs):
+        if Bucket in self.cloud.buckets:
+            raise _client_error("BucketAlreadyOwnedByYou", "CreateBucket", status=409)
+        self.cloud.buckets[Bucket] = {"Name": Bucket, "objects": {}}
+        return {"Location": f"/{Bucket}"}
+
+    def delete_bucket(self, Bucket: str):
+        bucket = self.cloud.buckets.get(Bucket)
+        if bucket is None:
+            raise _client_error("NoSuchBucket", "DeleteBucket", status=404)
+        if bucket["objects"]:
+            raise _client_error("BucketNotEmpty", "DeleteBucket", status=409)
+        del self.cloud.buckets[Bucket]
+        return {}
+
+    def list_buckets(self):
+        return {"Buckets": [{"Name": name} for name in self.cloud.buckets]}
+
+    def put_bucket_tagging(self, Bucket: str, Tagging: Dict[str, Any]):
+        if Bucket not in self.cloud.buckets:
+            raise _client_error("NoSuchBucket", "PutBucketTagging", status=404)
+        self.cloud.buckets[Bucket]["tags"] = {t["Key"]: t["Value"] for t in Tagging["TagSet"]}
+        return {}
+
+    def get_bucket_tagging(self, Bucket: str):
+        bucket = self.cloud.buckets.get(Bucket)
+        if bucket is None:
+            raise _client_error("NoSuchBucket", "GetBucketTagging", status=404)
+        if not bucket.get("tags"):
+            raise _client_error("NoSuchTagSet", "GetBucketTagging", status=404)
+        return {"TagSet": _tag_list(bucket["tags"])}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes = b"", **kwargs):
+        if Bucket not in self.cloud.buckets:
+            raise _client_error("NoSuchBucket", "PutObject", status=404)
+        self.cloud.buckets[Bucket]["objects"][Key] = Body
+        return {"ETag": '"fake"'}
+
+
+# ---------------------------------------------------------------- GCP
+
+class _StsHandlers:
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+
+    def assume_role(self, RoleArn: str, RoleSessionName: str, DurationSeconds: int = 3600, **kwargs):
+        if ":role/" not in RoleArn:
+            raise _client_error("ValidationError", "AssumeRole", f"Invalid RoleArn: {RoleArn}")
+        expiration = datetime.fromtimestamp(time.time() + DurationSeconds, timezone.utc)
+        account = RoleArn.split(":")[4]
+        return {
+            "Credentials": {"AccessKeyId": self.cloud._next_id("ASIA"),
+                            "SecretAccessKey": self.cloud._next_id("secret"),
+                            "SessionToken": self.cloud._next_id("token"),
+                            "Expiration": expiration},
+            "AssumedRoleUser": {"AssumedRoleId": f"AROA:{RoleSessionName}",
+                                "Arn": f"arn:aws:sts::{account}:assumed-role/"
+                                       f"{RoleArn.rsplit('/', 1)[-1]}/{RoleSessionName}"},
+        }
+
+
+class _StackFailure(Exception):
+    def __init__(self, logical_id: str, resource_type: str, reason: str):
+        super().__init__(reason)
+        self.logical_id = logical_id
+        self.resource_type = resource_type
+
+
+class _CloudFormationHandlers:
+    """IAM 리소스만 다루는 CloudFormation (템플릿 적용은 즉시, 상태 공개는 cfn_stack_polls 회 조회 후)"""
+
+    TEMPLATE_BODY_LIMIT = 51200
+    # 적용 순서: 그룹 → 정책(그룹 연결) → 사용자(그룹 가입), 삭제는 역순
+    ORDER = ("AWS::IAM::Group", "AWS::IAM::ManagedPolicy", "AWS::IAM::User")
+
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+
+    def _find(self, StackName: str, operation: str) -> Dict[str, Any]:
+        for stack in self.cloud.stacks.values():
+            if stack["StackId"] == StackName or (
+                    stack["StackName"] == StackName and stack["final_status"] != "DELETE_COMPLETE"):
+                return stack
+        raise _client_error("ValidationError", operation, f"Stack with id {StackName} does not exist")
+
+    def _parse(self, TemplateBody: str, Capabilities: Optional[List[str]], operation: str) -> Dict[str, Any]:
+        if len(TemplateBody.encode("utf-8")) > self.TEMPLATE_BODY_LIMIT:
+            raise _client_error("ValidationError", operation,
+                                "Templates with a size greater than 51,200 bytes must be deployed via an S3 Bucket")
+        resources = json.loads(TemplateBody).get("Resources") or {}
+        if not resources:
+            raise _client_error("ValidationError", operation,
+                                "Template format error: At least one Resources member must be defined.")
+        for resource in resources.values():
+            if resource["Type"] not in self.ORDER:
+                raise _client_error("ValidationError", operation, f"Unsupported resource type {resource['Type']}")
+        if "CAPABILITY_NAMED_IAM" not in (Capabilities or []):
+            raise _client_error("InsufficientCapabilitiesException", operation,
+                                "Requires capabilities : [CAPABILITY_NAMED_IAM]")
+        return resources
+
+    def _event(self, stack: Dict[str, Any], logical_id: str, resource_type: str, status: str,
+               physical_id: str = "", reason: Optional[str] = None):
+        stack["events"].append({
+            "EventId": self.cloud._next_id("event"), "StackId": stack["StackId"], "StackName": stack["StackName"],
+            "LogicalResourceId": logical_id, "PhysicalResourceId": physical_id, "ResourceType": resource_type,
+            "ResourceStatus": status, "ResourceStatusReason": reason, "Timestamp": datetime.now(timezone.utc),
+            "ClientRequestToken": stack["token"]})
+
+    def _resolve(self, stack: Dict[str, Any], values: List[Any]) -> List[str]:
+        return [stack["physical"][v["Ref"]][1] if isinstance(v, dict) else v for v in values]
+
+    def _create_resource(self, stack: Dict[str, Any], logical_id: str, resource: Dict[str, Any]) -> str:
+        kind, props = resource["Type"], resource.get("Properties", {})
+        iam = self.cloud
+        if kind == "AWS::IAM::Group":
+            name = props["GroupName"]
+            if name in iam.iam_groups:
+                raise _StackFailure(logical_id, kind, f"{name} already exists")
+            iam.iam_groups[name] = {"GroupName": name, "Arn": f"arn:aws:iam::000000000000:group/{name}",
+                                    "Users": [], "AttachedPolicies": []}
+            return name
+        groups = self._resolve(stack, props.get("Groups", []))
+        missing = [g for g in groups if g not in iam.iam_groups]
+        if missing:
+            raise _StackFailure(logical_id, kind, f"The group with name {missing[0]} cannot be found.")
+        if kind == "AWS::IAM::ManagedPolicy":
+            arn = f"arn:aws:iam::000000000000:policy/{props['ManagedPolicyName']}"
+            if arn in iam.iam_policies:
+                raise _StackFailure(logical_id, kind, f"A policy called {props['ManagedPolicyName']} already exists.")
+            iam.iam_policies[arn] = {"PolicyName": props["ManagedPolicyName"], "Arn": arn,
+                                     "Document": props["PolicyDocument"]}
+            for group in groups:
+                iam.iam_groups[group]["AttachedPolicies"].append(arn)
+            return arn
+        name = props["UserName"]
+        if name in iam.iam_users:
+            raise _StackFailure(logical_id, kind, f"{name} already exists")
+        iam.iam_users[name] = {"UserName": name, "UserId": iam._next_id("AIDA"),
+                               "Arn": f"arn:aws:iam::000000000000:user/{name}"}
+        for group in groups:
+            iam.iam_groups[group]["Users"].append(name)
+        return name
+
+    def _delete_resource(self, kind: str, physical_id: str):
+        iam = self.cloud
+        if kind == "AWS::IAM::User":
+            iam.iam_users.pop(physical_id, None)
+            for group in iam.iam_groups.values():
+                if physical_id in group["Users"]:
+                    group["Users"].remove(physical_id)
+        elif kind == "AWS::IAM::ManagedPolicy":
+            iam.iam_policies.pop(physical_id, None)
+            for group in iam.iam_groups.values():
+                if physical_id in group["AttachedPolicies"]:
+                    group["AttachedPolicies"].remove(physical_id)
+        else:
+            iam.iam_groups.pop(physical_id, None)
+
+    def _apply(self, stack: Dict[str, Any], resources: Dict[str, Any], action: str):
+        """템플릿 적용 (실패 시 IAM 상태와 스택 리소스를 원래대로 되돌림)"""
+        saved = copy.deepcopy((self.cloud.iam_users, self.cloud.iam_groups, self.cloud.iam_policies,
+                               stack["physical"]))
+        old = stack["resources"]
+        try:
+            # 변경되거나 빠진 리소스 제거 (사용자 → 정책 → 그룹 순)
+            for kind in reversed(self.ORDER):
+                for logical_id, (rkind, physical_id) in list(stack["physical"].items()):
+                    if rkind == kind and resources.get(logical_id) != old.get(logical_id):
+                        self._delete_resource(kind, physical_id)
+                        del stack["physical"][logical_id]
+                        if logical_id not in resources:
+                            self._event(stack, logical_id, kind, "DELETE_COMPLETE", physical_id)
+            for kind in self.ORDER:
+                for logical_id, resource in resources.items():
+                    if resource["Type"] != kind or logical_id in stack["physical"]:
+                        continue
+                    status = f"{action}_COMPLETE" if logical_id in old else "CREATE_COMPLETE"
+                    self._event(stack, logical_id, kind, "CREATE_IN_PROGRESS")
+                    physical_id = self._create_resource(stack, logical_id, resource)
+                    stack["physical"][logical_id] = (kind, physical_id)
+                    self._event(stack, logical_id, kind, status, physical_id)
+        except _StackFailure as failure:
+            self._event(stack, failure.logical_id, failure.resource_type, "CREATE_FAILED", reason=str(failure))
+            (self.cloud.iam_users, self.cloud.iam_groups, self.cloud.iam_policies, stack["physical"]) = saved
+            prefix = "ROLLBACK" if action == "CREATE" else "UPDATE_ROLLBACK"
+            self._event(stack, stack["StackName"], "AWS::CloudFormation::Stack", f"{prefix}_IN_PROGRESS",
+                        stack["StackId"], "The following resource(s) failed: " + failure.logical_id)
+            self._finish(stack, f"{prefix}_COMPLETE")
+            return
+        stack["resources"] = resources
+        self._finish(stack, f"{action}_COMPLETE")
+
+    def _finish(self, stack: Dict[str, Any], status: str):
+        self._event(stack, stack["StackName"], "AWS::CloudFormation::Stack", status, stack["StackId"])
+        stack["final_status"] = status
+        stack["polls_left"] = self.cloud.cfn_stack_polls
+
+    def _start(self, stack: Dict[str, Any], status: str, token: Optional[str]):
+        stack["token"] = token
+        self._event(stack, stack["StackName"], "AWS::CloudFormation::Stack", status, stack["StackId"])
+        stack["visible_until"] = len(stack["events"])
+
+    def _poll(self, stack: Dict[str, Any]):
+        if stack["polls_left"] > 0:
+            stack["polls_left"] -= 1
+        else:
+            stack["visible_until"] = len(stack["events"])
+
+    def create_stack(self, StackName: str, TemplateBody: str, Capabilities: Optional[List[str]] = None,
+                     Tags: Optional[List[Dict[str, str]]] = None, ClientRequestToken: Optional[str] = None,
+                     OnFailure: str = "ROLLBACK", **kwargs):
+        for stack in self.cloud.stacks.values():
+            if stack["StackName"] == StackName and stack["final_status"] != "DELETE_COMPLETE":
+                raise _client_error("AlreadyExistsException", "CreateStack", f"Stack [{StackName}] already exists")
+        resources = self._parse(TemplateBody, Capabilities, "CreateStack")
+        stack_id = f"arn:aws:cloudformation:ap-northeast-2:000000000000:stack/{StackName}/{self.cloud._next_id('stk')}"
+        stack = {"StackName": StackName, "StackId": stack_id, "Tags": Tags or [], "resources": {},
+                 "physical": {}, "events": [], "final_status": "CREATE_IN_PROGRESS", "polls_left": 0}
+        self.cloud.stacks[stack_id] = stack
+        self._start(stack, "CREATE_IN_PROGRESS", ClientRequestToken)
+        self._apply(stack, resources, "CREATE")
+        if OnFailure == "DELETE" and stack["final_status"] == "ROLLBACK_COMPLETE":
+            self._finish(stack, "DELETE_COMPLETE")
+        return {"StackId": stack_id}
+
+    def update_stack(self, StackName: str, TemplateBody: str, Capabilities: Optional[List[str]] = None,
+                     ClientRequestToken: Optional[str] = None, **kwargs):
+        stack = self._find(StackName, "UpdateStack")
+        if stack["final_status"] not in ("CREATE_COMPLETE", "UPDATE_COMPLETE", "UPDATE_ROLLBACK_COMPLETE") \
+                or stack["visible_until"] < len(stack["events"]):
+            raise _client_error("ValidationError", "UpdateStack",
+                                f"Stack:{stack['StackId']} is in {stack['final_status']} state and can not be updated.")
+        resources = self._parse(TemplateBody, Capabilities, "UpdateStack")
+        if resources == stack["resources"]:
+            raise _client_error("ValidationError", "UpdateStack", "No updates are to be performed.")
+        self._start(stack, "UPDATE_IN_PROGRESS", ClientRequestToken)
+        self._apply(stack, resources, "UPDATE")
+        return {"StackId": stack["StackId"]}
+
+    def delete_stack(self, StackName: str, ClientRequestToken: Optional[str] = None, **kwargs):
+        try:
+            stack = self._find(StackName, "DeleteStack")
+        except ClientError:
+            return {}
+        self._start(stack, "DELETE_IN_PROGRESS", ClientRequestToken)
+        for kind in reversed(self.ORDER):
+            for logical_id, (rkind, physical_id) in list(stack["physical"].items()):
+                if rkind == kind:
+                    self._delete_resource(kind, physical_id)
+                    self._event(stack, logical_id, kind, "DELETE_COMPLETE", physical_id)
+        stack["physical"], stack["resources"] = {}, {}
+        self._finish(stack, "DELETE_COMPLETE")
+        return {}
+
+    def list_stacks(self, StackStatusFilter: Optional[List[str]] = None, NextToken: Optional[str] = None):
+        summaries = [{"StackName": stack["StackName"], "StackId": stack["StackId"],
+                      "StackStatus": stack["final_status"]} for stack in self.cloud.stacks.values()]
+        if StackStatusFilter:
+            summaries = [s for s in summaries if s["StackStatus"] in StackStatusFilter]
+        return {"StackSummaries": summaries}
+
+    def get_template(self, StackName: str, **kwargs):
+        stack = self._find(StackName, "GetTemplate")
+        return {"TemplateBody": json.loads(json.dumps({"Resources": stack["resources"]}))}
+
+    def describe_stacks(self, StackName: str):
+        stack = self._find(StackName, "DescribeStacks")
+        self._poll(stack)
+        visible = stack["events"][:stack["visible_until"]]
+        status = next(e["ResourceStatus"] for e in reversed(visible)
+                      if e["ResourceType"] == "AWS::CloudFormation::Stack")
+        return {"Stacks": [{"StackName": stack["StackName"], "StackId": stack["StackId"],
+                            "StackStatus": status, "Tags": stack["Tags"]}]}
+
+    def describe_stack_events(self, StackName: str, NextToken: Optional[str] = None):
+        stack = self._find(StackName, "DescribeStackEvents")
+        self._poll(stack)
+        return {"StackEvents": list(reversed(stack["events"][:stack["visible_until"]]))}
+
+
+class FakeGcpRequest:
+    """googleapiclient HttpRequest 형태의 가짜 요청"""
+
+    def __init__(self, cloud: FakeCloud, method_id: str, func: Callable[[], Dict[str, Any]]):
+        self._cloud = cloud
+        self.methodId = method_id
+        self._func = func
+        self.kwargs: Dict[str, Any] = {}
+
+    def execute(self, num_retries: int = 0) -> Dict[str, Any]:
+        self._cloud.record("gcp", self.methodId, {})
+        return self._run()
+
+    def _run(self) -> Dict[str, Any]:
+        with self._cloud.lock:
+            error = self._cloud._take_gcp_error(self.methodId)
+            if error is not None:
+                raise error
+            return self._func()
+
+
+class FakeBatchHttpRequest:
+    """BatchHttpRequest 형태의 가짜 배치 (배치 전체를 호출 한 번으로 기록)"""
+
+    def __init__(self, cloud: FakeCloud, callback: Optional[Callable[..., None]] = None):
+        self._cloud = cloud
+        self._callback = callback
+        self._requests: List[Tuple[str, FakeGcpRequest, Optional[Callable[..., None]]]] = []
+
+    def add(self, request: FakeGcpRequest, callback: Optional[Callable[..., None]] = None,
+            request_id: Optional[str] = None):
+        request_id = request_id or str(len(self._requests) + 1)
+        if any(rid == request_id for rid, _, _ in self._requests):
+            raise KeyError(f"A request with this ID already exists: {request_id}")
+        self._requests.append((request_id, request, callback))
+
+    def execute(self):
+        self._cloud.record("gcp", "batch", {"methods": [r.methodId for _, r, _ in self._requests]})
+        for request_id, request, callback in self._requests:
+            callback = callback or self._callback
+            try:
+                response, exception = request._run(), None
+            except HttpError as e:
+                response, exception = None, e
+            if callback is not None:
+                callback(request_id, response, exception)
+
+
+class _FakeGcpCollection:
+    """이름 → 리소스 사전 위에서 insert/get/delete/list 를 제공하는 컬렉션"""
+
+    def __init__(self, cloud: FakeCloud, kind: str, method_prefix: str,
+                 name_of: Callable[[Dict[str, Any], Dict[str, Any]], str],
+                 key_of: Callable[[Dict[str, Any]], str]):
+        self._cloud = cloud
+        self._kind = kind
+        self._prefix = method_prefix
+        self._name_of = name_of
+        self._key_of = key_of
+
+    @property
+    def _items(self) -> Dict[str, Dict[str, Any]]:
+        return self._cloud.gcp[self._kind]
+
+    def _insert(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        body = kwargs.get("body", {})
+        name = self._name_of(kwargs, body)
+        if name in self._items:
+            raise _http_error(409, f"{name} already exists")
+        item = dict(body, name=name)
+        for scope in ("zone", "region"):
+            if scope in kwargs:
+                item.setdefault(scope, kwargs[scope])
+        if self._prefix.startswith("storage."):
+            item.setdefault("timeCreated", self._cloud.timestamp())
+            item.setdefault("updated", item["timeCreated"])
+        else:
+            item.setdefault("creationTimestamp", self._cloud.timestamp())
+        self._items[name] = item
+        return {"kind": "operation", "name": f"op-{name}", "status": "DONE", "targetLink": name}
+
+    def _get(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        name = self._key_of(kwargs)
+        if name not in self._items:
+            raise _http_error(404, f"{name} not found")
+        return self._items[name]
+
+    def _delete(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        name = self._key_of(kwargs)
+        if name not in self._items:
+            raise _http_error(404, f"{name} not found")
+        users = self._cloud._gcp_users(self._kind, name)
+        if users:
+            raise _http_error(400, f"resourceInUseByAnotherResource: {name} is used by {users[0]}")
+        if not self._prefix.startswith("compute."):
+            # Storage / IAM 삭제는 작업(operation) 없이 바로 끝남
+            self._items.pop(name, None)
+            return {}
+        return self._cloud._gcp_operation(name, kwargs, lambda: self._items.pop(name, None))
+
+    def insert(self, **kwargs):
+        return FakeGcpRequest(self._cloud, f"{self._prefix}.insert", lambda: self._insert(kwargs))
+
+    create = insert
+
+    def get(self, **kwargs):
+        return FakeGcpRequest(self._cloud, f"{self._prefix}.get", lambda: self._get(kwargs))
+
+    def delete(self, **kwargs):
+        return FakeGcpRequest(self._cloud, f"{self._prefix}.delete", lambda: self._delete(kwargs))
+
+    def list(self, **kwargs):
+        return FakeGcpRequest(self._cloud, f"{self._prefix}.list",
+                              lambda: {"items": list(self._items.values())})
+
+    def list_next(self, previous_request, previous_response):
+        return None
+
+    def aggregatedList(self, **kwargs):
+        def scoped():
+            items: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+            for item in self._items.values():
+                users = self._cloud._gcp_users(self._kind, item["name"]) if self._kind == "disks" else []
+                if users:
+                    item = dict(item, users=users)
+                scope = (f"zones/{item['zone']}" if "zone" in item
+                         else f"regions/{item['region']}" if "region" in item else "global")
+                items.setdefault(scope, {}).setdefault(self._kind, []).append(item)
+            return {"items": items}
+        return FakeGcpRequest(self._cloud, f"{self._prefix}.aggregatedList", scoped)
+
+    def aggregatedList_next(self, previous_request, previous_response):
+        return None
+
+
+class _FakeObjects:
+    """GCS objects 컬렉션 (list 만 지원, maxResults 단위 페이지)"""
+
+    def __init__(self, cloud: FakeCloud):
+        self._cloud = cloud
+
+    def list(self, bucket: str, pageToken: Optional[str] = None, maxResults: int = 1000, **kwargs):
+        def page():
+            if bucket not in self._cloud.gcp["buckets"]:
+                raise _http_error(404, f"bucket {bucket} not found")
+            objects = sorted(self._cloud.gcp_objects.get(bucket, {}).values(), key=lambda o: o["name"])
+            start = int(pageToken or 0)
+            response: Dict[str, Any] = {"items": [dict(o) for o in objects[start:start + maxResults]]}
+            if start + maxResults < len(objects):
+                response["nextPageToken"] = str(start + maxResults)
+            return response
+        request = FakeGcpRequest(self._cloud, "storage.objects.list", page)
+        request.kwargs = dict(kwargs, bucket=bucket, maxResults=maxResults)
+        return request
+
+    def list_next(self, previous_request, previous_response):
+        token = previous_response.get("nextPageToken")
+        if not token:
+            return None
+        return self.list(pageToken=token, **previous_request.kwargs)
+
+
+class _FakeOperations:
+    def __init__(self, cloud: FakeCloud, scope: str):
+        self._cloud = cloud
+        self._scope = scope
+
+    def get(self, project: str, operation: str, **kwargs):
+        return FakeGcpRequest(self._cloud, f"compute.{self._scope}Operations.get",
+                              lambda: self._cloud._poll_gcp_operation(operation))
+
+
+class _FakeImages:
+    def __init__(self, cloud: FakeCloud):
+        self._cloud = cloud
+
+    def getFromFamily(self, project: str, family: str):
+        return FakeGcpRequest(self._cloud, "compute.images.getFromFamily", lambda: {
+            "name": f"{family}-latest",
+            "selfLink": f"projects/{project}/global/images/{family}-latest",
+        })
+
+
+class _FakeProjects:
+    def __init__(self, cloud: FakeCloud):
+        self._cloud = cloud
+
+    def serviceAccounts(self):
+        def name_of(kwargs, body):
+            project_id = kwargs["name"].split("/")[-1]
+            return f"{body['accountId']}@{project_id}.iam.gserviceaccount.com"
+        return _FakeGcpCollection(self._cloud, "serviceAccounts", "iam.projects.serviceAccounts",
+                                  name_of, lambda kwargs: kwargs["name"].split("/")[-1])
+
+
+class FakeGcpService:
+    """googleapiclient 서비스 형태의 가짜 서비스 (iam / compute / storage)"""
+
+    def __init__(self, cloud: FakeCloud, service_name: str):
+        self._cloud = cloud
+        self._service_name = service_name
+
+    def projects(self):
+        return _FakeProjects(self._cloud)
+
+    def new_batch_http_request(self, callback: Optional[Callable[..., None]] = None):
+        return FakeBatchHttpRequest(self._cloud, callback)
+
+    def instances(self):
+        return _FakeGcpCollection(self._cloud, "instances", "compute.instances",
+                                  lambda kwargs, body: body["name"],
+                                  lambda kwargs: kwargs["instance"])
+
+    def firewalls(self):
+        return _FakeGcpCollection(self._cloud, "firewalls", "compute.firewalls",
+                                  lambda kwargs, body: body["name"],
+                                  lambda kwargs: kwargs["firewall"])
+
+    def images(self):
+        return _FakeImages(self._cloud)
+
+    def disks(self):
+        return _FakeGcpCollection(self._cloud, "disks", "compute.disks",
+                                  lambda kwargs, body: body["name"],
+                                  lambda kwargs: kwargs["disk"])
+
+    def zoneOperations(self):
+        return _FakeOperations(self._cloud, "zone")
+
+    def regionOperations(self):
+        return _FakeOperations(self._cloud, "region")
+
+    def globalOperations(self):
+        return _FakeOperations(self._cloud, "global")
+
+    def networks(self):
+        return _FakeGcpCollection(self._cloud, "networks", "compute.networks",
+                                  lambda kwargs, body: body["name"],
+                                  lambda kwargs: kwargs["network"])
+
+    def subnetworks(self):
+        return _FakeGcpCollection(self._cloud, "subnetworks", "compute.subnetworks",
+                                  lambda kwargs, body: body["name"],
+                                  lambda kwargs: kwargs["subnetwork"])
+
+    def addresses(self):
+        return _FakeGcpCollection(self._cloud, "addresses", "compute.addresses",
+                                  lambda kwargs, body: body["name"],
+                                  lambda kwargs: kwargs["address"])
+
+    def objects(self):
+        return _FakeObjects(self._cloud)
+
+    def buckets(self):
+        return _FakeGcpCollection(self._cloud, "buckets", "storage.buckets",
+                                  lambda kwargs, body: body["name"],
+                                  lambda kwargs: kwargs["bucket"])
+
+
+class FakeClientRegistry:
+    """ClientRegistry 대체: 모든 서비스에 가짜 클라이언트 반환"""
+
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+        self._clients: Dict[str, FakeAwsClient] = {}
+
+    def get_client(self, service_name: str, region_name: Optional[str] = None, *args, **kwargs):
+        client = self._clients.get(service_name)
+        if client is None:
+            client = self.cloud.client(service_name)
+            self._clients[service_name] = client
+        return client
+
+    def client_map(self, region_name: Optional[str] = None, *args, **kwargs):
+        return {name: self.get_client(name) for name in ("iam", "ec2", "s3")}
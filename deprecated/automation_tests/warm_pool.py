@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+생성 시간이 긴 실습 리소스의 웜 풀 관리
+RDS MySQL, Cloud SQL, EC2 인스턴스를 미리 준비해 두고 학습자에게 즉시 할당합니다.
+
+- 교재 연계성:
+  - Cloud Basic 2일차: 데이터베이스 서비스 기초 (RDS / Cloud SQL 생성 대기 시간 단축)
+- 주요 기능:
+  - 풀 태그(레이블)가 붙은 예비 리소스를 목표 개수만큼 유지합니다.
+  - claim() 은 준비된 예비 리소스를 즉시 반환하고, 백그라운드 스레드가 부족분을 다시 채웁니다.
+  - TTL 이 지난 미할당 예비 리소스는 비용 관리를 위해 삭제합니다. (만료 판정과 할당은 같은 잠금 안에서 처리)
+  - 할당 태그 기록에 실패한 리소스는 학습자에게 넘기지 않고 폐기하며, 할당된 리소스는 release() 로 정리합니다.
+  - 풀 상태는 리소스 태그에 기록되므로 프로세스가 재시작되어도 이어서 관리할 수 있습니다.
+"""
+
+import time
+import threading
+import logging
+from typing import Dict, Any, List, Optional
+
+from botocore.exceptions import ClientError
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+TAG_POOL = "warm-pool"
+TAG_STATE = "pool-state"
+TAG_CREATED = "pool-created"
+TAG_CLAIMED_BY = "claimed-by"
+
+STATE_SPARE = "spare"
+STATE_CLAIMED = "claimed"
+
+
+class PoolResourceProvider:
+    """웜 풀 리소스 제공자 인터페이스"""
+
+    kind = "resource"
+
+    def create(self, name: str, tags: Dict[str, str]) -> str:
+        """리소스 생성 요청 후 ID 반환 (준비 완료까지 기다리지 않음)"""
+        raise NotImplementedError
+
+    def list(self, pool_name: str) -> List[Dict[str, Any]]:
+        """풀에 속한 리소스 목록 (id, ready, tags 포함)"""
+        raise NotImplementedError
+
+    def tag(self, resource: Dict[str, Any], tags: Dict[str, str]):
+        """리소스 태그 갱신"""
+        raise NotImplementedError
+
+    def delete(self, resource: Dict[str, Any]):
+        """리소스 삭제"""
+        raise NotImplementedError
+
+
+class RdsPoolProvider(PoolResourceProvider):
+    """RDS MySQL 인스턴스 제공자"""
+
+    kind = "rds"
+
+    def __init__(self, rds_client: Any, db_params: Optional[Dict[str, Any]] = None):
+        self.rds_client = rds_client
+        self.db_params = {
+            "DBInstanceClass": "db.t3.micro",
+            "Engine": "mysql",
+            "MasterUsername": "admin",
+            "ManageMasterUserPassword": True,
+            "AllocatedStorage": 20,
+        }
+        self.db_params.update(db_params or {})
+
+    def create(self, name: str, tags: Dict[str, str]) -> str:
+        self.rds_client.create_db_instance(
+            DBInstanceIdentifier=name,
+            Tags=[{"Key": k, "Value": v} for k, v in tags.items()],
+            **self.db_params
+        )
+        return name
+
+    def list(self, pool_name: str) -> List[Dict[str, Any]]:
+        resources = []
+        paginator = self.rds_client.get_paginator("describe_db_instances")
+        for page in paginator.paginate():
+            for db in page.get("DBInstances", []):
+                tags = {t["Key"]: t["Value"] for t in db.get("TagList", [])}
+                if tags.get(TAG_POOL) != pool_name or db["DBInstanceStatus"] == "deleting":
+                    continue
+                resources.append({
+                    "id": db["DBInstanceIdentifier"],
+                    "arn": db["DBInstanceArn"],
+                    "ready": db["DBInstanceStatus"] == "available",
+                    "endpoint": db.get("Endpoint", {}).get("Address"),
+                    "tags": tags,
+                })
+        return resources
+
+    def tag(self, resource: Dict[str, Any], tags: Dict[str, str]):
+        self.rds_client.add_tags_to_resource(
+            ResourceName=resource["arn"],
+            Tags=[{"Key": k, "Value": v} for k, v in tags.items()]
+        )
+
+    def delete(self, resource: Dict[str, Any]):
+        self.rds_client.delete_db_instance(
+            DBInstanceIdentifier=resource["id"],
+            SkipFinalSnapshot=True,
+            DeleteAutomatedBackups=True
+        )
+
+
+class Ec2PoolProvider(PoolResourceProvider):
+    """EC2 인스턴스 제공자"""
+
+    kind = "ec2"
+
+    def __init__(self, ec2_client: Any, image_id: str, instance_type: str = "t2.micro",
+                 launch_params: Optional[Dict[str, Any]] = None):
+        self.ec2_client = ec2_client
+        self.image_id = image_id
+        self.instance_type = instance_type
+        self.launch_params = launch_params or {}
+
+    def create(self, name: str, tags: Dict[str, str]) -> str:
+        all_tags = dict(tags, Name=name)
+        response = self.ec2_client.run_instances(
+            ImageId=self.image_id,
+            InstanceType=self.instance_type,
+            MinCount=1,
+            MaxCount=1,
+            TagSpecifications=[{
+                "ResourceType": "instance",
+                "Tags": [{"Key": k, "Value": v} for k, v in all_tags.items()]
+            }],
+            **self.launch_params
+        )
+        return response["Instances"][0]["InstanceId"]
+
+    def list(self, pool_name: str) -> List[Dict[str, Any]]:
+        resources = []
+        paginator = self.ec2_client.get_paginator("describe_instances")
+        filters = [
+            {"Name": f"tag:{TAG_POOL}", "Values": [pool_name]},
+            {"Name": "instance-state-name", "Values": ["pending", "running"]},
+        ]
+        for page in paginator.paginate(Filters=filters):
+            for reservation in page.get("Reservations", []):
+                for instance in reservation.get("Instances", []):
+                    resources.append({
+                        "id": instance["InstanceId"],
+                        "ready": instance["State"]["Name"] == "running",
+                        "endpoint": instance.get("PublicIpAddress"),
+                        "tags": {t["Key"]: t["Value"] for t in instance.get("Tags", [])},
+                    })
+        return resources
+
+    def tag(self, resource: Dict[str, Any], tags: Dict[str, str]):
+        self.ec2_client.create_tags(
+            Resources=[resource["id"]],
+            Tags=[{"Key": k, "Value": v} for k, v in tags.items()]
+        )
+
+    def delete(self, resource: Dict[str, Any]):
+        self.ec2_client.terminate_instances(InstanceIds=[resource["id"]])
+
+
+class CloudSqlPoolProvider(PoolResourceProvider):
+    """GCP Cloud SQL MySQL 인스턴스 제공자 (sqladmin v1)"""
+
+    kind = "cloudsql"
+
+    def __init__(self, sqladmin_service: Any, project_id: str, region: str,
+                 tier: str = "db-f1-micro", database_version: str = "MYSQL_8_0"):
+        self.sqladmin = sqladmin_service
+        self.project_id = project_id
+        self.region = region
+        self.tier = tier
+        self.database_version = database_version
+
+    def create(self, name: str, tags: Dict[str, str]) -> str:
+        body = {
+            "name": name,
+            "region": self.region,
+            "databaseVersion": self.database_version,
+            "settings": {"tier": self.tier, "userLabels": tags},
+        }
+        self.sqladmin.instances().insert(project=self.project_id, body=body).execute()
+        return name
+
+    def list(self, pool_name: str) -> List[Dict[str, Any]]:
+        resources = []
+        request = self.sqladmin.instances().list(project=self.project_id)
+        while request is not None:
+            response = request.execute()
+            for instance in response.get("items", []):
+                labels = instance.get("settings", {}).get("userLabels", {})
+                if labels.get(TAG_POOL) != pool_name:
+                    continue
+                addresses = instance.get("ipAddresses", [])
+                resources.append({
+                    "id": instance["name"],
+                    "ready": instance.get("state") == "RUNNABLE",
+                    "endpoint": addresses[0]["ipAddress"] if addresses else None,
+                    "tags": labels,
+                })
+            request = self.sqladmin.instances().list_next(request, response)
+        return resources
+
+    def tag(self, resource: Dict[str, Any], tags: Dict[str, str]):
+        labels = dict(resource["tags"], **tags)
+        body = {"settings": {"userLabels": labels}}
+        self.sqladmin.instances().patch(project=self.project_id, instance=resource["id"],
+                                        body=body).execute()
+
+    def delete(self, resource: Dict[str, Any]):
+        self.sqladmin.instances().delete(project=self.project_id,
+                                         instance=resource["id"]).execute()
+
+
+class WarmPool:
+    """예비 리소스를 목표 개수만큼 유지하고 학습자에게 할당하는 웜 풀"""
+
+    def __init__(self, name: str, provider: PoolResourceProvider,
+                 target_size: int = 2, ttl_seconds: float = 4 * 3600,
+                 refill_interval: float = 30.0, max_creating: int = 5):
+        """
+        WarmPool 초기화
+
+        Args:
+            name: 풀 이름 (리소스 태그 및 이름 접두사로 사용)
+            provider: 리소스 제공자
+            target_size: 유지할 예비 리소스 수 (생성 중 포함)
+            ttl_seconds: 미할당 예비 리소스 보존 시간
+            refill_interval: 백그라운드 보충 주기(초)
+            max_creating: 한 주기에 동시에 생성 요청할 최대 개수
+        """
+        self.name = name
+        self.provider = provider
+        self.target_size = target_size
+        self.ttl_seconds = ttl_seconds
+        self.refill_interval = refill_interval
+        self.max_creating = max_creating
+        self._ready: List[Dict[str, Any]] = []
+        self._pending: Dict[str, float] = {}
+        self._claimed_ids: set = set()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sequence = 0
+
+    def start(self):
+        """백그라운드 보충 스레드 시작"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name=f"warm-pool-{self.name}",
+                                            daemon=True)
+            self._thread.start()
+            logger.info(f"🔥 웜 풀 시작: {self.name} (목표 {self.target_size}개)")
+
+    def stop(self):
+        """백그라운드 보충 중지 (리소스는 유지)"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.refill_interval + 5)
+
+    def _expired(self, resource: Dict[str, Any], now: float) -> bool:
+        created_at = float(resource["tags"].get(TAG_CREATED, now))
+        return now - created_at > self.ttl_seconds
+
+    def claim(self, learner_id: str, timeout: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        준비된 예비 리소스 할당
+
+        Args:
+            learner_id: 할당받을 학습자 ID
+            timeout: 준비된 리소스가 없을 때 기다릴 시간(초)
+
+        Returns:
+            할당된 리소스 정보, 없으면 None
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._available:
+                # TTL 이 지난 예비 리소스는 할당하지 않음 (삭제는 다음 보충 주기에서)
+                self._ready = [r for r in self._ready if not self._expired(r, time.time())]
+                while not self._ready:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning(f"⚠️ 웜 풀 {self.name}: 준비된 예비 리소스 없음")
+                        return None
+                    self._available.wait(remaining)
+                    self._ready = [r for r in self._ready if not self._expired(r, time.time())]
+                resource = self._ready.pop(0)
+                self._claimed_ids.add(resource["id"])
+
+            try:
+                self.provider.tag(resource, {TAG_STATE: STATE_CLAIMED, TAG_CLAIMED_BY: learner_id})
+            except (ClientError, HttpError) as e:
+                # 할당 기록이 없는 리소스는 다른 학습자에게 다시 할당될 수 있으므로 폐기
+                logger.error(f"❌ 웜 풀 할당 태그 기록 실패, 폐기합니다 {resource['id']}: {e}")
+                self._discard(resource)
+                continue
+            resource["tags"] = dict(resource["tags"], **{TAG_STATE: STATE_CLAIMED, TAG_CLAIMED_BY: learner_id})
+            logger.info(f"✅ 웜 풀 할당: {resource['id']} → {learner_id}")
+            return resource
+
+    def _discard(self, resource: Dict[str, Any]):
+        try:
+            self.provider.delete(resource)
+        except (ClientError, HttpError) as e:
+            logger.error(f"❌ 웜 풀 리소스 삭제 실패 {resource['id']}: {e}")
+
+    def release(self, learner_id: str) -> List[str]:
+        """
+        학습자에게 할당된 풀 리소스 삭제 (과정 정리 시)
+
+        할당 상태는 리소스 태그로 찾으므로 할당한 프로세스가 아니어도 정리할 수 있습니다.
+
+        Returns:
+            삭제 요청한 리소스 ID 목록
+        """
+        released = []
+        for resource in self.provider.list(self.name):
+            tags = resource["tags"]
+            if tags.get(TAG_STATE) == STATE_CLAIMED and tags.get(TAG_CLAIMED_BY) == learner_id:
+                self.provider.delete(resource)
+                released.append(resource["id"])
+        with self._lock:
+            self._claimed_ids.difference_update(released)
+        for resource_id in released:
+            logger.info(f"🧹 웜 풀 할당 리소스 삭제: {resource_id} ({learner_id})")
+        return released
+
+    def stats(self) -> Dict[str, int]:
+        """풀 현황"""
+        with self._lock:
+            return {"ready": len(self._ready), "creating": len(self._pending),
+                    "claimed": len(self._claimed_ids)}
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refill()
+            except Exception as e:
+                logger.error(f"❌ 웜 풀 {self.name} 보충 실패: {e}")
+            self._stopped.wait(self.refill_interval)
+
+    def refill(self):
+        """현재 상태 조회 → 만료 예비 리소스 삭제 → 부족분 생성 (한 주기)"""
+        now = time.time()
+        resources = self.provider.list(self.name)
+        ready, creating, expired = [], [], []
+
+        for resource in resources:
+            if resource["tags"].get(TAG_STATE) != STATE_SPARE:
+                continue
+            if self._expired(resource, now):
+                expired.append(resource)
+            elif resource["ready"]:
+                ready.append(resource)
+            else:
+                creating.append(resource)
+
+        with self._available:
+            # 만료 판정과 _ready 교체를 같은 잠금 안에서 처리해, 삭제할 리소스가 동시에 할당되지 않게 함
+            expired = [r for r in expired if r["id"] not in self._claimed_ids]
+            ready = [r for r in ready if r["id"] not in self._claimed_ids]
+            listed_ids = {r["id"] for r in resources}
+            # 목록 조회에 아직 나타나지 않은 방금 생성한 리소스는 생성 중으로 간주
+            self._pending = {rid: ts for rid, ts in self._pending.items()
+                             if rid not in listed_ids and now - ts < self.refill_interval * 4}
+            self._pending.update({r["id"]: now for r in creating})
+            self._ready = ready
+            if ready:
+                self._available.notify_all()
+            shortage = self.target_size - len(self._ready) - len(self._pending)
+
+        for resource in expired:
+            logger.info(f"🧹 웜 풀 TTL 만료 예비 리소스 삭제: {resource['id']}")
+            self.provider.delete(resource)
+
+        for _ in range(min(max(shortage, 0), self.max_creating)):
+            self._sequence += 1
+            name = f"{self.name}-{int(now)}-{self._sequence}"
+            tags = {TAG_POOL: self.name, TAG_STATE: STATE_SPARE, TAG_CREATED: str(int(now))}
+            resource_id = self.provider.create(name, tags)
+            with self._lock:
+                self._pending[resource_id] = now
+            logger.info(f"➕ 웜 풀 예비 리소스 생성 요청: {resource_id}")
+
+    def drain(self):
+        """미할당 예비 리소스 전체 삭제 (과정 종료 시)"""
+        self.stop()
+        for resource in self.provider.list(self.name):
+            if resource["tags"].get(TAG_STATE) == STATE_SPARE and \
+                    resource["id"] not in self._claimed_ids:
+                self.provider.delete(resource)
+        with self._lock:
+            self._ready.clear()
+            self._pending.clear()
+        logger.info(f"🧹 웜 풀 정리 완료: {self.name}")
+
+
+_pools: Dict[str, WarmPool] = {}
+_pools_lock = threading.Lock()
+
+
+def register_warm_pool(pool: WarmPool, start: bool = True) -> WarmPool:
+    """
+    프로세스 공용 웜 풀 등록
+
+    같은 이름의 풀이 이미 등록되어 있으면 기존 풀을 반환하므로, 여러 학습자 자동화가 동시에 등록해도 풀은 하나입니다.
+    """
+    with _pools_lock:
+        registered = _pools.setdefault(pool.name, pool)
+    if start and registered is pool:
+        pool.start()
+    return registered
+
+
+def get_warm_pool(name: str) -> Optional[WarmPool]:
+    """등록된 웜 풀 조회"""
+    with _pools_lock:
+        return _pools.get(name)
@@ -37,7 +37,8 @@ log_header() { echo -e "${PURPLE}[HEADER]${NC} $1"; }
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$(dirname "$SCRIPT_DIR")")"
 AUTOMATION_DIR="$PROJECT_ROOT/repo/automation"
-AUTOMATION_TESTS_DIR="$PROJECT_ROOT/repo/automation_tests"
+# Python 도구 / 테스트는 저장소의 deprecated/automation_tests 에 있음
+AUTOMATION_TESTS_DIR="$(dirname "$SCRIPT_DIR")/deprecated/automation_tests"
 LOG_FILE="$PROJECT_ROOT/cloud-basic-advanced.log"
 
 # Initialize log file
@@ -120,6 +121,16 @@ check_python() {
 comprehensive_environment_check() {
     log_header "=== Cloud Basic 환경 체크 시작 ==="
     
+    # 도구 / 버전 / 자격 증명을 동시에 점검하고 결과를 캐시 (PATH·도구가 같으면 즉시 응답)
+    if [ -f "$AUTOMATION_TESTS_DIR/preflight.py" ] && command -v python3 &> /dev/null; then
+        if python3 "$AUTOMATION_TESTS_DIR/preflight.py"; then
+            log_success "🎉 모든 환경 체크 통과!"
+            return 0
+        fi
+        log_warning "⚠️ 일부 환경 체크 실패. 설정을 확인하세요."
+        return 1
+    fi
+    
     local checks_passed=0
     local total_checks=3
     
@@ -167,13 +178,26 @@ list_gcp_resources() {
         return 1
     fi
     
-    # Compute instances
-    log_info "Compute 인스턴스 조회 중..."
-    gcloud compute instances list --format="table(name,zone,status,machineType,externalIP)" 2>/dev/null || log_warning "Compute 인스턴스 조회 실패"
-    
-    # Cloud Storage buckets
-    log_info "Cloud Storage 버킷 조회 중..."
-    gsutil ls 2>/dev/null || log_warning "Cloud Storage 버킷 조회 실패"
+    local gcp_project inventory_done=false
+    gcp_project=$(gcloud config get-value project 2>/dev/null)
+    if [ -f "$AUTOMATION_TESTS_DIR/gcp_inventory.py" ] && [ -n "$gcp_project" ]; then
+        # Compute instances + Cloud Storage buckets (aggregatedList, incremental snapshot)
+        log_info "Compute 인스턴스 / Cloud Storage 버킷 조회 중..."
+        if python3 "$AUTOMATION_TESTS_DIR/gcp_inventory.py" list --project "$gcp_project"; then
+            inventory_done=true
+        else
+            log_warning "GCP 인벤토리 조회 실패, gcloud 로 다시 조회합니다"
+        fi
+    fi
+    if [ "$inventory_done" != true ]; then
+        # Compute instances
+        log_info "Compute 인스턴스 조회 중..."
+        gcloud compute instances list --format="table(name,zone,status,machineType,externalIP)" 2>/dev/null || log_warning "Compute 인스턴스 조회 실패"
+        
+        # Cloud Storage buckets
+        log_info "Cloud Storage 버킷 조회 중..."
+        gsutil ls 2>/dev/null || log_warning "Cloud Storage 버킷 조회 실패"
+    fi
     
     # IAM service accounts
     log_info "IAM 서비스 계정 조회 중..."
@@ -226,6 +250,13 @@ analyze_gcp_costs() {
     # Check for unused resources
     log_info "사용하지 않는 리소스 검색 중..."
     
+    local gcp_project
+    gcp_project=$(gcloud config get-value project 2>/dev/null)
+    if [ -f "$AUTOMATION_TESTS_DIR/gcp_inventory.py" ] && [ -n "$gcp_project" ]; then
+        python3 "$AUTOMATION_TESTS_DIR/gcp_inventory.py" costs --project "$gcp_project" && return 0
+        log_warning "GCP 인벤토리 조회 실패, gcloud 로 다시 조회합니다"
+    fi
+    
     # Unused persistent disks
     log_info "사용하지 않는 영구 디스크:"
     gcloud compute disks list --filter="status:READY AND -users:*" --format="table(name,zone,sizeGb,type)" 2>/dev/null || log_warning "영구 디스크 조회 실패"
@@ -414,27 +445,60 @@ cleanup_gcp_resources() {
     if [[ "$response" =~ ^[Yy]$ ]]; then
         log_info "GCP 리소스 정리 중..."
         
-        # Delete all instances (except those with "keep" label)
-        log_info "Compute 인스턴스 삭제 중..."
-        gcloud compute instances list --filter="NOT labels.keep:*" --format="value(name,zone)" | while read -r name zone; do
-            if [ -n "$name" ] && [ -n "$zone" ]; then
-                gcloud compute instances delete "$name" --zone="$zone" --quiet 2>/dev/null || log_warning "인스턴스 $name 삭제 실패"
-            fi
-        done
+        # Only resources named "<prefix>-..." are deleted, never the whole project
+        # (keep label / default network are preserved)
+        local gcp_project prefix teardown_done=false
+        gcp_project=$(gcloud config get-value project 2>/dev/null)
+        log_info "삭제할 리소스 이름 접두사를 입력하세요 (예: mcp-basic-course):"
+        read -r prefix
+        if [ -z "$prefix" ]; then
+            log_error "접두사 없이 정리하면 프로젝트의 모든 리소스가 대상이 되므로 중단합니다"
+            return 1
+        fi
         
-        # Delete unused persistent disks
-        log_info "사용하지 않는 영구 디스크 삭제 중..."
-        gcloud compute disks list --filter="status:READY AND -users:*" --format="value(name,zone)" | while read -r name zone; do
-            if [ -n "$name" ] && [ -n "$zone" ]; then
-                gcloud compute disks delete "$name" --zone="$zone" --quiet 2>/dev/null || log_warning "디스크 $name 삭제 실패"
+        # Delete instances, unused disks, firewalls, subnets and networks in parallel
+        if [ -f "$AUTOMATION_TESTS_DIR/gcp_teardown.py" ] && [ -n "$gcp_project" ]; then
+            log_info "Compute 리소스 병렬 삭제 중 (인스턴스 → 디스크 → 방화벽 → 서브넷 → 네트워크)..."
+            if python3 "$AUTOMATION_TESTS_DIR/gcp_teardown.py" --project "$gcp_project" --prefix "$prefix"; then
+                teardown_done=true
+            else
+                log_warning "병렬 삭제 실패, gcloud 로 남은 리소스를 삭제합니다"
             fi
-        done
+        fi
+        if [ "$teardown_done" != true ]; then
+            # Delete instances (except those with "keep" label)
+            log_info "Compute 인스턴스 삭제 중..."
+            gcloud compute instances list --filter="name ~ ^${prefix}- AND NOT labels.keep:*" --format="value(name,zone)" | while read -r name zone; do
+                if [ -n "$name" ] && [ -n "$zone" ]; then
+                    gcloud compute instances delete "$name" --zone="$zone" --quiet 2>/dev/null || log_warning "인스턴스 $name 삭제 실패"
+                fi
+            done
+            
+            # Delete unused persistent disks
+            log_info "사용하지 않는 영구 디스크 삭제 중..."
+            gcloud compute disks list --filter="name ~ ^${prefix}- AND status:READY AND -users:*" --format="value(name,zone)" | while read -r name zone; do
+                if [ -n "$name" ] && [ -n "$zone" ]; then
+                    gcloud compute disks delete "$name" --zone="$zone" --quiet 2>/dev/null || log_warning "디스크 $name 삭제 실패"
+                fi
+            done
+            
+            # Delete firewall rules
+            log_info "방화벽 규칙 삭제 중..."
+            gcloud compute firewall-rules list --filter="name ~ ^${prefix}-" --format="value(name)" | while read -r name; do
+                if [ -n "$name" ]; then
+                    gcloud compute firewall-rules delete "$name" --quiet 2>/dev/null || log_warning "방화벽 규칙 $name 삭제 실패"
+                fi
+            done
+        fi
         
         # Delete empty Cloud Storage buckets
         log_info "비어있는 Cloud Storage 버킷 삭제 중..."
         gsutil ls 2>/dev/null | while read -r bucket_uri; do
             if [ -n "$bucket_uri" ]; then
                 bucket_name=$(echo "$bucket_uri" | sed 's|gs://||' | sed 's|/||')
+                if [[ "$bucket_name" != "$prefix"-* ]]; then
+                    continue
+                fi
                 object_count=$(gsutil ls -l "gs://$bucket_name" 2>/dev/null | wc -l)
                 if [ "$object_count" -le 1 ]; then
                     log_info "비어있는 버킷 삭제: $bucket_name"
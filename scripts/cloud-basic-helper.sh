@@ -37,7 +37,8 @@ log_header() { echo -e "${PURPLE}[HEADER]${NC} $1"; }
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$(dirname "$SCRIPT_DIR")")"
 AUTOMATION_DIR="$PROJECT_ROOT/repo/automation"
-AUTOMATION_TESTS_DIR="$PROJECT_ROOT/repo/automation_tests"
+# Python 도구 / 테스트는 저장소의 deprecated/automation_tests 에 있음
+AUTOMATION_TESTS_DIR="$(dirname "$SCRIPT_DIR")/deprecated/automation_tests"
 
 # Environment check functions
 check_aws_cli() {
@@ -104,6 +105,16 @@ check_python() {
 comprehensive_environment_check() {
     log_header "=== Cloud Basic 환경 체크 시작 ==="
     
+    # 도구 / 버전 / 자격 증명을 동시에 점검하고 결과를 캐시 (PATH·도구가 같으면 즉시 응답)
+    if [ -f "$AUTOMATION_TESTS_DIR/preflight.py" ] && command -v python3 &> /dev/null; then
+        if python3 "$AUTOMATION_TESTS_DIR/preflight.py"; then
+            log_success "🎉 모든 환경 체크 통과!"
+            return 0
+        fi
+        log_warning "⚠️ 일부 환경 체크 실패. 설정을 확인하세요."
+        return 1
+    fi
+    
     local checks_passed=0
     local total_checks=3
     
@@ -365,6 +365,31 @@ test_automation_system() {
     done
 }
 
+# 실습 스크립트 정적 분석 (스크립트마다 한 번 토큰화한 색인으로 정의되지 않은 변수 등 검사)
+test_static_analysis() {
+    log_header "실습 스크립트 정적 분석"
+    
+    local analyzer=""
+    for candidate in "../automation_tests/script_analyzer.py" "../deprecated/automation_tests/script_analyzer.py"; do
+        if [[ -f "$candidate" ]]; then
+            analyzer="$candidate"
+            break
+        fi
+    done
+    if [[ -z "$analyzer" ]] || [[ ! -d "../automation" ]] || ! command -v python3 &> /dev/null; then
+        log_warning "⚠️ 정적 분석기 또는 실습 스크립트 디렉토리 없음"
+        return
+    fi
+    
+    local status script
+    while read -r status script; do
+        run_test "정적 분석: $script" "[[ $status == PASS ]]" "static_analysis_clean"
+    done < <(python3 "$analyzer" --summary ../automation)
+    
+    # 실패한 스크립트의 상세 원인 출력
+    python3 "$analyzer" ../automation | grep -v "^스크립트 " || true
+}
+
 # 결과 요약
 print_summary() {
     log_header "테스트 결과 요약"
@@ -415,6 +440,7 @@ main() {
     test_cloud_services
     test_practice_automation
     test_automation_system
+    test_static_analysis
     
     # 결과 출력
     print_summary